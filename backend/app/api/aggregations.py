@@ -10,10 +10,15 @@ from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.auth import get_current_active_admin
+from app.core.database import get_async_db, get_db
+from app.models.settings import User
+from app.services.job_queue import JobQueue
 from app.services.postgres_service import PostgresService
+from app.services.typed_field_index_service import TYPED_FUNCTIONS, TypedFieldIndexService
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/aggregations", tags=["aggregations"])
@@ -37,6 +42,12 @@ class MultiAggregationRequest(BaseModel):
     filters: Optional[Dict[str, Any]] = None
 
 
+class TypedFieldIndexRequest(BaseModel):
+    """Typed expression index on one extracted field"""
+    field_name: str
+    value_type: str = Field(default="numeric", description="numeric or date")
+
+
 class NestedAggregationRequest(BaseModel):
     """Nested (hierarchical) aggregation request"""
     parent_agg: Dict[str, Any] = Field(
@@ -53,7 +64,7 @@ class NestedAggregationRequest(BaseModel):
 @router.post("/single")
 async def get_single_aggregation(
     request: AggregationRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Execute a single aggregation query.
@@ -91,7 +102,7 @@ async def get_single_aggregation(
 @router.post("/multi")
 async def get_multi_aggregations(
     request: MultiAggregationRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Execute multiple aggregations in a single query for efficiency.
@@ -133,7 +144,7 @@ async def get_multi_aggregations(
 @router.post("/nested")
 async def get_nested_aggregations(
     request: NestedAggregationRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Execute nested (hierarchical) aggregations.
@@ -174,7 +185,7 @@ async def get_nested_aggregations(
 
 
 @router.get("/dashboard")
-async def get_dashboard_aggregations(db: Session = Depends(get_db)):
+async def get_dashboard_aggregations(db: AsyncSession = Depends(get_async_db)):
     """
     Get pre-configured dashboard aggregations for common analytics.
 
@@ -241,7 +252,7 @@ async def get_dashboard_aggregations(db: Session = Depends(get_db)):
 
 
 @router.get("/insights/{field}")
-async def get_field_insights(field: str, db: Session = Depends(get_db)):
+async def get_field_insights(field: str, db: AsyncSession = Depends(get_async_db)):
     """
     Get comprehensive insights for a specific field.
 
@@ -309,7 +320,7 @@ async def get_field_insights(field: str, db: Session = Depends(get_db)):
 @router.post("/custom")
 async def execute_custom_aggregation(
     custom_query: Dict[str, Any],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Execute a custom Elasticsearch aggregation query.
@@ -372,7 +383,7 @@ async def execute_custom_aggregation(
 async def get_preset_aggregation(
     preset_name: str,
     filters: Optional[Dict[str, Any]] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Execute pre-configured aggregation presets.
@@ -451,3 +462,85 @@ async def get_preset_aggregation(
     except Exception as e:
         logger.error(f"Preset aggregation error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
+
+
+# ==========================
+# Typed field indexes (admin)
+# ==========================
+
+def _typed_index_dict(index) -> Dict[str, Any]:
+    return {
+        "id": index.id,
+        "field_name": index.field_name,
+        "value_type": index.value_type,
+        "index_name": index.index_name,
+        "status": index.status,
+        "source": index.source,
+        "usage_score": index.usage_score,
+        "error": index.error,
+        "created_at": index.created_at.isoformat() if index.created_at else None,
+        "built_at": index.built_at.isoformat() if index.built_at else None,
+    }
+
+
+@router.get("/field-indexes")
+async def list_typed_field_indexes(
+    current_user: User = Depends(get_current_active_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Admin: List typed field indexes and the fields query history recommends indexing.
+
+    Range filters and numeric/date aggregations on an indexed field use an
+    expression index instead of casting every row.
+    """
+    service = TypedFieldIndexService(db)
+    return {
+        "indexes": [_typed_index_dict(index) for index in service.list_indexes()],
+        "recommendations": service.recommend()
+    }
+
+
+@router.post("/field-indexes", status_code=202)
+async def create_typed_field_index(
+    request: TypedFieldIndexRequest,
+    current_user: User = Depends(get_current_active_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Admin: Create a typed index for one field.
+
+    The index is built concurrently by the background worker; poll
+    GET /field-indexes until its status is "active".
+    """
+    if request.value_type not in TYPED_FUNCTIONS:
+        raise HTTPException(status_code=400, detail=f"value_type must be one of {list(TYPED_FUNCTIONS)}")
+
+    index = TypedFieldIndexService(db).register_index(request.field_name, request.value_type)
+    if index.status != "active":
+        job = await JobQueue(db).enqueue("typed_field_indexes", {"index_id": index.id}, lane="bulk")
+        return {"index": _typed_index_dict(index), "job_id": job.id}
+    return {"index": _typed_index_dict(index), "job_id": None}
+
+
+@router.post("/field-indexes/sync", status_code=202)
+async def sync_typed_field_indexes(
+    current_user: User = Depends(get_current_active_admin),
+    db: Session = Depends(get_db)
+):
+    """Admin: Build indexes for every field query history recommends (background job)."""
+    job = await JobQueue(db).enqueue("typed_field_indexes", {}, lane="bulk")
+    return {"job_id": job.id}
+
+
+@router.delete("/field-indexes/{value_type}/{field_name}")
+async def drop_typed_field_index(
+    value_type: str,
+    field_name: str,
+    current_user: User = Depends(get_current_active_admin),
+    db: Session = Depends(get_db)
+):
+    """Admin: Drop a typed field index (queries fall back to plain casts)."""
+    if not TypedFieldIndexService(db).drop_index(field_name, value_type):
+        raise HTTPException(status_code=404, detail="Typed field index not found")
+    return {"success": True}
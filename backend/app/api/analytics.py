@@ -2,77 +2,73 @@ import logging
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.models.document import Document, ExtractedField
 from app.models.schema import Schema
-from app.models.verification import Verification
+from app.services.analytics_rollup_service import (
+    METRIC_DOCUMENTS,
+    METRIC_FIELD_CONFIDENCE,
+    METRIC_PROCESSING_TIME,
+    METRIC_REVIEW_QUEUE,
+    METRIC_VERIFICATIONS,
+    PROCESSING_TIME_BUCKETS,
+    AnalyticsRollupService,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/analytics", tags=["analytics"])
 
 
+def _rollups(db: Session) -> AnalyticsRollupService:
+    """Rollup reader, with days changed since the last refresh recomputed first."""
+    service = AnalyticsRollupService(db)
+    if settings.ANALYTICS_REFRESH_ON_READ:
+        service.refresh()
+    return service
+
+
 @router.get("/dashboard")
 async def get_dashboard_metrics(db: Session = Depends(get_db)):
-    """Get dashboard metrics"""
-
-    # Total documents processed
-    total_documents = db.query(Document).count()
-    completed_documents = db.query(Document).filter(
-        Document.status == "completed"
-    ).count()
-    processing_documents = db.query(Document).filter(
-        Document.status == "processing"
-    ).count()
-    error_documents = db.query(Document).filter(
-        Document.status == "error"
-    ).count()
+    """Get dashboard metrics (summed from analytics_rollups)"""
+    rollups = _rollups(db)
+
+    # Documents by status
+    by_status = {status: count for status, count, _ in rollups.totals(METRIC_DOCUMENTS)}
+    total_documents = sum(by_status.values())
+    error_documents = by_status.get("error", 0)
 
     # Average confidence by field
-    avg_confidence = db.query(
-        ExtractedField.field_name,
-        func.avg(ExtractedField.confidence_score).label("avg_confidence")
-    ).group_by(ExtractedField.field_name).all()
+    avg_confidence = [
+        (field_name, total / count)
+        for field_name, count, total in rollups.totals(METRIC_FIELD_CONFIDENCE) if count
+    ]
 
     # Verification queue size
-    queue_size = db.query(ExtractedField).filter(
-        ExtractedField.needs_verification == True,
-        ExtractedField.verified == False
-    ).count()
-
-    # Processing time stats (last 24 hours)
-    yesterday = datetime.utcnow() - timedelta(days=1)
-    recent_docs = db.query(Document).filter(
-        Document.processed_at >= yesterday,
-        Document.processed_at.isnot(None),
-        Document.uploaded_at.isnot(None)
-    ).all()
-
-    processing_times = []
-    for doc in recent_docs:
-        if doc.processed_at and doc.uploaded_at:
-            time_diff = (doc.processed_at - doc.uploaded_at).total_seconds()
-            processing_times.append(time_diff)
-
-    avg_processing_time = sum(processing_times) / len(processing_times) if processing_times else 0
+    queue_size = sum(count for _, count, _ in rollups.totals(METRIC_REVIEW_QUEUE))
+
+    # Processing time stats (documents processed since the start of yesterday, UTC)
+    since = (datetime.utcnow() - timedelta(days=1)).date()
+    histogram = {bucket: (count, total) for bucket, count, total in rollups.totals(METRIC_PROCESSING_TIME, since=since)}
+    processed_count = sum(count for count, _ in histogram.values())
+    processed_seconds = sum(total for _, total in histogram.values())
+    avg_processing_time = processed_seconds / processed_count if processed_count else 0
 
     # Error rate
     error_rate = (error_documents / total_documents * 100) if total_documents > 0 else 0
 
     # Verification accuracy
-    total_verifications = db.query(Verification).count()
-    correct_verifications = db.query(Verification).filter(
-        Verification.verification_type == "correct"
-    ).count()
+    by_type = {verification_type: count for verification_type, count, _ in rollups.totals(METRIC_VERIFICATIONS)}
+    total_verifications = sum(by_type.values())
+    correct_verifications = by_type.get("correct", 0)
     accuracy = (correct_verifications / total_verifications * 100) if total_verifications > 0 else 0
 
     return {
         "documents": {
             "total": total_documents,
-            "completed": completed_documents,
-            "processing": processing_documents,
+            "completed": by_status.get("completed", 0),
+            "processing": by_status.get("processing", 0),
             "errors": error_documents
         },
         "confidence": {
@@ -91,7 +87,11 @@ async def get_dashboard_metrics(db: Session = Depends(get_db)):
         },
         "processing": {
             "avg_time_seconds": round(avg_processing_time, 2),
-            "error_rate": round(error_rate, 2)
+            "error_rate": round(error_rate, 2),
+            "time_histogram": [
+                {"bucket": label, "count": histogram.get(label, (0, 0))[0]}
+                for _, label in PROCESSING_TIME_BUCKETS
+            ]
         }
     }
 
@@ -99,32 +99,26 @@ async def get_dashboard_metrics(db: Session = Depends(get_db)):
 @router.get("/schemas")
 async def get_schema_stats(db: Session = Depends(get_db)):
     """Get statistics for each schema"""
+    rollups = _rollups(db)
+
+    doc_counts, completed_counts = {}, {}
+    for schema_id, status, count, _ in rollups.totals(METRIC_DOCUMENTS, by=("schema_id", "dimension")):
+        doc_counts[schema_id] = doc_counts.get(schema_id, 0) + count
+        if status == "completed":
+            completed_counts[schema_id] = completed_counts.get(schema_id, 0) + count
+    confidence = {
+        schema_id: total / count
+        for schema_id, count, total in rollups.totals(METRIC_FIELD_CONFIDENCE, by=("schema_id",)) if count
+    }
 
-    schemas = db.query(Schema).all()
     stats = []
-
-    for schema in schemas:
-        doc_count = db.query(Document).filter(
-            Document.schema_id == schema.id
-        ).count()
-
-        completed_count = db.query(Document).filter(
-            Document.schema_id == schema.id,
-            Document.status == "completed"
-        ).count()
-
-        avg_confidence = db.query(
-            func.avg(ExtractedField.confidence_score)
-        ).join(Document).filter(
-            Document.schema_id == schema.id
-        ).scalar()
-
+    for schema in db.query(Schema).all():
         stats.append({
             "schema_id": schema.id,
             "schema_name": schema.name,
-            "document_count": doc_count,
-            "completed_count": completed_count,
-            "average_confidence": round(avg_confidence or 0, 3),
+            "document_count": doc_counts.get(schema.id, 0),
+            "completed_count": completed_counts.get(schema.id, 0),
+            "average_confidence": round(confidence.get(schema.id) or 0, 3),
             "field_count": len(schema.fields)
         })
 
@@ -134,25 +128,19 @@ async def get_schema_stats(db: Session = Depends(get_db)):
 @router.get("/trends")
 async def get_trends(days: int = 7, db: Session = Depends(get_db)):
     """Get processing trends over time"""
-
-    start_date = datetime.utcnow() - timedelta(days=days)
+    rollups = _rollups(db)
+    start_date = (datetime.utcnow() - timedelta(days=days)).date()
 
     # Documents processed per day
-    docs_by_day = db.query(
-        func.date(Document.processed_at).label("date"),
-        func.count(Document.id).label("count")
-    ).filter(
-        Document.processed_at >= start_date,
-        Document.processed_at.isnot(None)
-    ).group_by(func.date(Document.processed_at)).all()
+    docs_by_day = [
+        (day, count) for day, count, _ in rollups.totals(METRIC_PROCESSING_TIME, by=("day",), since=start_date)
+    ]
 
     # Confidence trends
-    confidence_by_day = db.query(
-        func.date(ExtractedField.extracted_at).label("date"),
-        func.avg(ExtractedField.confidence_score).label("avg_confidence")
-    ).filter(
-        ExtractedField.extracted_at >= start_date
-    ).group_by(func.date(ExtractedField.extracted_at)).all()
+    confidence_by_day = [
+        (day, total / count)
+        for day, count, total in rollups.totals(METRIC_FIELD_CONFIDENCE, by=("day",), since=start_date) if count
+    ]
 
     return {
         "documents_processed": [
@@ -13,6 +13,11 @@ from app.models.verification import Verification
 from app.services.claude_service import ClaudeService
 from app.services.postgres_service import PostgresService
 from app.services.settings_service import SettingsService
+from app.utils.audit_helpers import (
+    audit_queue_conditions,
+    get_audit_queue_counts,
+    get_audit_queue_page,
+)
 from app.utils.bbox_utils import normalize_bbox
 
 logger = logging.getLogger(__name__)
@@ -87,67 +92,34 @@ async def get_audit_queue(
     if max_confidence is None:
         settings_service = SettingsService(db)
         # For MVP, use default org/user (will be created on startup)
-        org = settings_service.get_or_create_default_org()
-        user = settings_service.get_or_create_default_user(org.id)
-        max_confidence = settings_service.get_setting(
+        org_id, user_id = await settings_service.get_default_scope()
+        max_confidence = await settings_service.get_setting(
             key="review_threshold",
-            user_id=user.id,
-            org_id=org.id,
+            user_id=user_id,
+            org_id=org_id,
             default=0.6
         )
 
-    # Base query: unverified fields
-    query = db.query(ExtractedField).filter(
-        ExtractedField.verified == False
-    ).join(Document)
-
-    # Filter by template if specified
-    if template_id:
-        query = query.filter(Document.schema_id == template_id)
-
-    # Fetch all fields for priority calculation
-    all_fields = query.all()
-
-    # Calculate priority for each field and filter
-    filtered_fields = []
-    for field in all_fields:
-        # Calculate priority using model property
-        field_priority = field.audit_priority
-        priority_label = field.priority_label
-
-        # Apply priority filter if specified
-        if priority and priority_label != priority:
-            continue
-
-        # Apply confidence filter
-        if field.confidence_score < min_confidence or field.confidence_score > max_confidence:
-            continue
-
-        # Apply validation filter
-        if not include_validation_errors and field.validation_status in ["error", "warning"]:
-            continue
-
-        filtered_fields.append(field)
+    # Filters, priority, ordering and pagination all run in SQL
+    conditions = audit_queue_conditions(
+        template_id=template_id,
+        priority=priority,
+        min_confidence=min_confidence,
+        max_confidence=max_confidence,
+        include_validation_errors=include_validation_errors
+    )
+    counts = await get_audit_queue_counts(db, conditions)
 
     # Count only mode (for badges)
     if count_only:
-        # Also return counts by priority
-        priority_counts = {"critical": 0, "high": 0, "medium": 0, "low": 0}
-        for field in filtered_fields:
-            priority_counts[field.priority_label] += 1
-
         return {
-            "count": len(filtered_fields),
-            "priority_counts": priority_counts
+            "count": counts["total"],
+            "priority_counts": counts["priority_counts"]
         }
 
-    # Sort by priority (lowest=most urgent) then confidence
-    filtered_fields.sort(key=lambda f: (f.audit_priority, f.confidence_score))
-
-    # Pagination
-    total = len(filtered_fields)
+    total = counts["total"]
     offset = (page - 1) * size
-    paginated_fields = filtered_fields[offset:offset + size]
+    paginated_fields = await get_audit_queue_page(db, conditions, offset=offset, limit=size)
 
     # Format response with validation metadata
     items = []
@@ -172,11 +144,6 @@ async def get_audit_queue(
             "priority_label": field.priority_label
         })
 
-    # Calculate summary statistics
-    priority_counts = {"critical": 0, "high": 0, "medium": 0, "low": 0}
-    for field in filtered_fields:
-        priority_counts[field.priority_label] += 1
-
     return {
         "total": total,
         "page": page,
@@ -184,10 +151,10 @@ async def get_audit_queue(
         "pages": (total + size - 1) // size,
         "items": items,
         "summary": {
-            "priority_counts": priority_counts,
-            "total_with_validation_errors": sum(1 for f in filtered_fields if f.validation_status in ["error", "warning"]),
-            "total_low_confidence": sum(1 for f in filtered_fields if f.confidence_score < 0.6),
-            "total_critical": priority_counts["critical"]
+            "priority_counts": counts["priority_counts"],
+            "total_with_validation_errors": counts["total_with_validation_errors"],
+            "total_low_confidence": counts["total_low_confidence"],
+            "total_critical": counts["priority_counts"]["critical"]
         }
     }
 
@@ -209,12 +176,11 @@ async def get_document_audit_fields(
     if max_confidence is None:
         settings_service = SettingsService(db)
         # For MVP, use default org/user (will be created on startup)
-        org = settings_service.get_or_create_default_org()
-        user = settings_service.get_or_create_default_user(org.id)
-        max_confidence = settings_service.get_setting(
+        org_id, user_id = await settings_service.get_default_scope()
+        max_confidence = await settings_service.get_setting(
             key="review_threshold",
-            user_id=user.id,
-            org_id=org.id,
+            user_id=user_id,
+            org_id=org_id,
             default=0.6
         )
 
@@ -532,13 +498,12 @@ async def get_audit_stats(
 
     # Get review threshold from settings
     settings_service = SettingsService(db)
-    org = settings_service.get_or_create_default_org()
-    user = settings_service.get_or_create_default_user(org.id)
+    org_id, user_id = await settings_service.get_default_scope()
 
-    audit_threshold = settings_service.get_setting(
+    audit_threshold = await settings_service.get_setting(
         key="review_threshold",
-        user_id=user.id,
-        org_id=org.id,
+        user_id=user_id,
+        org_id=org_id,
         default=0.6
     )
 
@@ -20,6 +20,8 @@ from sqlalchemy.orm import Session
 from app.core.auth import (
     create_access_token,
     create_api_key,
+    get_api_key_cache,
+    get_api_key_prefix,
     get_current_active_admin,
     get_current_user,
     hash_password,
@@ -234,6 +236,7 @@ def create_user_api_key(
         user_id=current_user.id,
         name=request.name,
         key_hash=hashed_key,
+        key_prefix=get_api_key_prefix(plain_key),
         expires_at=expires_at,
         created_by_user_id=current_user.id
     )
@@ -301,6 +304,7 @@ def revoke_api_key(
     api_key.revoked_at = datetime.utcnow()
     api_key.revoked_by_user_id = current_user.id
     db.commit()
+    get_api_key_cache().invalidate(api_key.id)
 
     return {"message": "API key revoked successfully"}
 
@@ -347,6 +351,7 @@ def create_api_key_for_user(
         user_id=target_user.id,
         name=request.name,
         key_hash=hashed_key,
+        key_prefix=get_api_key_prefix(plain_key),
         expires_at=expires_at,
         created_by_user_id=current_user.id  # Admin who created it
     )
@@ -1,10 +1,10 @@
 import logging
 import os
-from collections import defaultdict
+import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
@@ -13,12 +13,13 @@ from app.models.document import Document, ExtractedField
 from app.models.physical_file import PhysicalFile
 from app.models.schema import Schema
 from app.models.template import SchemaTemplate
+from app.services.bulk_ingest_service import BulkIngestService
 from app.services.claude_service import ClaudeService
+from app.services.job_queue import JobQueue
+from app.services.match_feature_service import MatchFeatureService
 from app.services.postgres_service import PostgresService
-from app.services.file_service import FileService
 from app.services.reducto_service import ReductoService
-from app.utils.file_organization import get_template_folder, organize_document_file
-from app.utils.hashing import calculate_content_hash
+from app.utils.file_organization import organize_document_file
 from app.utils.reducto_validation import format_validation_report, validate_schema_for_reducto
 from app.utils.template_matching import hybrid_match_document
 
@@ -132,7 +133,6 @@ def _validate_and_normalize_fields(fields: List[Dict[str, Any]]) -> List[Dict[st
 @router.post("/upload-and-analyze")
 async def upload_and_analyze(
     files: List[UploadFile] = File(...),
-    background_tasks: BackgroundTasks = None,
     auto_process: bool = False,
     auto_process_threshold: float = 0.85,
     db: Session = Depends(get_db)
@@ -140,153 +140,42 @@ async def upload_and_analyze(
     """
     New bulk upload flow with SHA256 deduplication:
     1. Upload files → Check hash → Reuse if exact match found
-    2. Parse ONLY unique files without cached parse results
+    2. Parse ONLY unique files without cached parse results (concurrently, batched commits)
     3. Group similar documents by content (ES clustering)
     4. Match groups to templates OR suggest creating new template
     5. [AUTO] Auto-process high-confidence matches (if auto_process=True)
 
     Args:
         files: Uploaded files
-        background_tasks: FastAPI background tasks
         auto_process: If True, automatically process groups with confidence >= auto_process_threshold
         auto_process_threshold: Minimum confidence for auto-processing (default: 0.85)
         db: Database session
 
     Returns:
-        Document groups with template suggestions + deduplication stats
+        Document groups with template suggestions + deduplication stats,
+        per-file parse failures and per-stage timings
     """
 
-    file_service = FileService()
-    reducto_service = ReductoService()
-
-    # PHASE 1: SHA256 deduplication - group files by hash
-    hash_groups = defaultdict(list)
-    exact_duplicates_in_batch = 0
-    parse_calls_saved = 0
-
+    # PHASES 1-2: concurrent read/hash, SHA256 dedup, bounded-concurrency parse, batched commits
     logger.info(f"Starting bulk upload of {len(files)} files")
 
-    for file in files:
-        content = await file.read()
-        file_hash = calculate_content_hash(content)
-
-        # Check if this exact file exists (in DB or in current batch)
-        existing_physical_file = db.query(PhysicalFile).filter_by(file_hash=file_hash).first()
-
-        if file_hash in hash_groups:
-            # Duplicate within THIS batch
-            exact_duplicates_in_batch += 1
-            logger.info(f"Duplicate in batch: {file.filename} (hash: {file_hash[:8]}...)")
-
-        hash_groups[file_hash].append({
-            "filename": file.filename,
-            "content": content,
-            "physical_file": existing_physical_file,
-            "is_existing": existing_physical_file is not None,
-            "has_cached_parse": existing_physical_file and existing_physical_file.reducto_parse_result is not None
-        })
-
-        # Track parse savings
-        if existing_physical_file and existing_physical_file.reducto_parse_result:
-            parse_calls_saved += 1
-
-    logger.info(
-        f"Dedup analysis: {len(files)} files → {len(hash_groups)} unique hashes "
-        f"({exact_duplicates_in_batch} duplicates in batch, {parse_calls_saved} with cached parse)"
-    )
-
-    # PHASE 2: Process each unique hash (upload if new, parse if needed)
-    uploaded_docs = []
-
-    for file_hash, file_group in hash_groups.items():
-        # Use first file in group as representative
-        representative = file_group[0]
-
-        # Get or create PhysicalFile
-        if representative["physical_file"]:
-            physical_file = representative["physical_file"]
-            logger.info(
-                f"Reusing PhysicalFile #{physical_file.id} for {len(file_group)} files "
-                f"(hash: {file_hash[:8]}...)"
-            )
-        else:
-            # Create new PhysicalFile
-            upload_dir = get_template_folder(None)  # unmatched folder
-            os.makedirs(upload_dir, exist_ok=True)
-
-            # Save to disk with hash prefix
-            unique_filename = f"{file_hash[:8]}_{representative['filename']}"
-            file_path = os.path.join(upload_dir, unique_filename)
-
-            with open(file_path, "wb") as f:
-                f.write(representative["content"])
-
-            physical_file = PhysicalFile(
-                filename=representative["filename"],
-                file_hash=file_hash,
-                file_path=file_path,
-                file_size=len(representative["content"]),
-                mime_type=file_group[0].get("content_type") if hasattr(file_group[0], "get") else None
-            )
-            db.add(physical_file)
-            db.flush()
-
-            logger.info(f"Created PhysicalFile #{physical_file.id}: {unique_filename}")
-
-        # Parse if needed
-        if not physical_file.reducto_parse_result:
-            try:
-                logger.info(f"Parsing new file: {physical_file.filename}")
-                parsed = await reducto_service.parse_document(physical_file.file_path)
-
-                # Cache parse results on PhysicalFile (shared across all Documents)
-                physical_file.reducto_job_id = parsed.get("job_id")
-                physical_file.reducto_parse_result = parsed.get("result")
-                db.flush()
-
-                logger.info(
-                    f"Parsed {physical_file.filename} → job_id: {parsed.get('job_id')}"
-                )
-            except Exception as e:
-                logger.error(f"Failed to parse {physical_file.filename}: {e}")
-                # Will mark Documents as error below
-        else:
-            logger.info(
-                f"Using cached parse for {physical_file.filename} "
-                f"(job_id: {physical_file.reducto_job_id})"
-            )
-
-        # Create Document records for each file in this hash group
-        # This allows tracking: "user uploaded invoice.pdf 3 times"
-        for file_info in file_group:
-            document = Document(
-                physical_file_id=physical_file.id,
-                filename=file_info["filename"],
-                file_path=physical_file.file_path,  # Backwards compatibility with NOT NULL constraint
-                status="analyzing" if physical_file.reducto_parse_result else "error",
-                error_message=None if physical_file.reducto_parse_result else "Parse failed"
-            )
-            db.add(document)
-            db.flush()
-            uploaded_docs.append(document)
-
-            logger.info(
-                f"Created Document #{document.id}: {file_info['filename']} "
-                f"→ PhysicalFile #{physical_file.id}"
-            )
-
-    db.commit()
-
-    logger.info(f"Created {len(uploaded_docs)} Document records from {len(hash_groups)} unique files")
+    ingest = await BulkIngestService(db).ingest(files)
+    uploaded_docs = ingest["documents"]
+    exact_duplicates_in_batch = ingest["exact_duplicates_in_batch"]
+    parse_calls_saved = ingest["parse_calls_saved"]
+    unique_files = ingest["unique_files"]
+    timings = ingest["timings"]
 
     # Step 3: Cluster similar documents with Elasticsearch (FAST & FREE)
     postgres_service = PostgresService(db)
 
     # Use Postgres clustering instead of Claude grouping (eliminates 1 guaranteed Claude call!)
+    stage_start = time.perf_counter()
     clusters = await postgres_service.cluster_uploaded_documents(
         documents=uploaded_docs,
         similarity_threshold=0.75  # Group docs with 75%+ similarity
     )
+    timings["cluster_seconds"] = round(time.perf_counter() - stage_start, 4)
 
     logger.info(f"Postgres clustered {len(uploaded_docs)} docs into {len(clusters)} groups")
 
@@ -304,6 +193,8 @@ async def upload_and_analyze(
 
     matched_groups = []
     claude_fallback_count = 0  # Track Claude usage for analytics
+    stage_start = time.perf_counter()
+    features_by_doc = MatchFeatureService(db).for_documents(uploaded_docs)
 
     for cluster in clusters:
         # Get representative document from cluster for template matching
@@ -312,26 +203,21 @@ async def upload_and_analyze(
         ).first()
 
         # Use hybrid matching (Postgres first, Claude fallback only if needed)
+        features = features_by_doc.get(representative_doc.id)
         match_result = await hybrid_match_document(
             document=representative_doc,
             postgres_service=postgres_service,
             claude_service=claude_service,
             available_templates=template_data,
-            db=db
+            db=db,
+            features=features
         )
 
         if match_result.get("match_source") == "claude":
             claude_fallback_count += 1
 
-        # Extract common fields from representative doc for suggested template name
-        # Use actual_parse_result property (supports both PhysicalFile and legacy)
-        parse_result = representative_doc.actual_parse_result
-        chunks = parse_result.get("chunks", []) if parse_result else []
-        doc_text = "\n".join([c.get("content", "") for c in chunks[:5]])
-
-        # Simple field extraction for suggested name (if no match found)
-        from app.utils.template_matching import extract_field_names_from_parse
-        common_fields = extract_field_names_from_parse(parse_result) if parse_result else []
+        # Common fields from representative doc for suggested template name (if no match found)
+        common_fields = features.field_names if features else []
 
         matched_groups.append({
             "document_ids": cluster["document_ids"],
@@ -361,6 +247,8 @@ async def upload_and_analyze(
 
         db.commit()
 
+    timings["match_seconds"] = round(time.perf_counter() - stage_start, 4)
+
     # NEW: Auto-process high-confidence matches
     auto_processed_groups = []
     auto_processed_count = 0
@@ -463,15 +351,11 @@ async def upload_and_analyze(
                         group["auto_processed"] = True
                         auto_processed_groups.append(group)
 
-                        # Queue background processing
-                        if background_tasks:
-                            for doc_id in group["document_ids"]:
-                                background_tasks.add_task(
-                                    process_single_document,
-                                    doc_id,
-                                    schema.id,
-                                    db
-                                )
+                        # Queue background processing (run by the job worker)
+                        await JobQueue(db).enqueue_many(
+                            "process_document",
+                            [{"document_id": doc_id} for doc_id in group["document_ids"]]
+                        )
 
                         logger.info(f"Auto-processed group with {len(group['document_ids'])} documents (confidence: {match_result['confidence']:.2f})")
 
@@ -484,11 +368,13 @@ async def upload_and_analyze(
     return {
         "success": True,
         "total_documents": len(uploaded_docs),
-        "unique_files": len(hash_groups),
+        "unique_files": unique_files,
         "exact_duplicates_in_batch": exact_duplicates_in_batch,
         "parse_calls_saved": parse_calls_saved,
         "cost_saved": f"${parse_calls_saved * 0.02:.2f}",  # ~$0.02 per parse
         "groups": matched_groups,
+        "parse_failures": ingest["parse_failures"],
+        "timings": timings,
         "analytics": {
             "total_groups": len(matched_groups),
             "elasticsearch_matches": len(matched_groups) - claude_fallback_count,
@@ -498,7 +384,7 @@ async def upload_and_analyze(
             "auto_processed_groups": len(auto_processed_groups),
             "auto_processed_documents": auto_processed_count
         },
-        "message": f"Uploaded {len(files)} files → {len(hash_groups)} unique → {len(matched_groups)} groups" +
+        "message": f"Uploaded {len(files)} files → {unique_files} unique → {len(matched_groups)} groups" +
                    (f" (saved {parse_calls_saved} parses, ${parse_calls_saved * 0.02:.2f})" if parse_calls_saved > 0 else "") +
                    (f" ({auto_processed_count} auto-processed)" if auto_processed_count > 0 else "")
     }
@@ -589,15 +475,11 @@ async def confirm_template(
 
     db.commit()
 
-    # Trigger background processing (will use pipelined extraction)
-    from app.api.documents import process_single_document
-    for doc_id in request.document_ids:
-        # Process in background
-        # Note: In production, use Celery or similar
-        try:
-            await process_single_document(doc_id)
-        except Exception as e:
-            logger.error(f"Error processing doc {doc_id}: {e}")
+    # Queue background processing (will use pipelined extraction)
+    await JobQueue(db).enqueue_many(
+        "process_document",
+        [{"document_id": doc_id} for doc_id in request.document_ids]
+    )
 
     return {
         "success": True,
@@ -992,15 +874,12 @@ async def create_new_template(
             doc.schema_id = schema.id
             doc.status = "processing"
 
-        db.commit()
-
-        # Trigger processing for all documents (will use pipelined extraction)
-        from app.api.documents import process_single_document
-        for doc in documents:
-            try:
-                await process_single_document(doc.id)
-            except Exception as e:
-                logger.error(f"Error processing doc {doc.id}: {e}")
+        # Queue processing for all documents (will use pipelined extraction)
+        # enqueue_many commits the document updates together with the jobs
+        await JobQueue(db).enqueue_many(
+            "process_document",
+            [{"document_id": doc.id} for doc in documents]
+        )
 
         # NEW: Check if any template_needed docs might match this new template
         from app.utils.template_matching import auto_match_documents
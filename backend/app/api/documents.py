@@ -3,7 +3,7 @@ import os
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
@@ -11,9 +11,17 @@ from app.core.database import get_db
 from app.models.document import Document, ExtractedField
 from app.models.schema import Schema
 from app.models.template import SchemaTemplate
+from app.services.job_queue import JobQueue
 from app.services.postgres_service import PostgresService
 from app.services.reducto_service import ReductoService
 from app.utils.bbox_utils import normalize_bbox
+from app.utils.pagination import (
+    count_total,
+    decode_cursor,
+    encode_cursor,
+    keyset_after,
+    validate_total_mode,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/documents", tags=["documents"])
@@ -74,7 +82,6 @@ async def upload_documents(
 @router.post("/process")
 async def process_documents(
     request: dict,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Process uploaded documents with Reducto extraction"""
@@ -87,21 +94,33 @@ async def process_documents(
     if not documents:
         raise HTTPException(status_code=404, detail="No documents found")
 
-    # Add processing tasks to background
+    # Queue processing jobs (run by the background worker)
+    # enqueue_many commits the status change together with the jobs
     for doc in documents:
-        background_tasks.add_task(process_single_document, doc.id)
         doc.status = "processing"
 
-    db.commit()
+    jobs = await JobQueue(db).enqueue_many(
+        "process_document",
+        [{"document_id": doc.id} for doc in documents],
+        lane="interactive" if len(documents) == 1 else "default"
+    )
 
     return {
         "success": True,
+        "job_ids": [job.id for job in jobs],
         "message": f"Processing {len(documents)} documents in background"
     }
 
 
-async def process_single_document(document_id: int):
-    """Background task to process a single document"""
+async def process_single_document(document_id: int, raise_errors: bool = False):
+    """
+    Background task to process a single document.
+
+    Args:
+        document_id: Document to extract and index
+        raise_errors: Re-raise after marking the document as errored (lets the
+            job queue retry the attempt)
+    """
     from app.core.database import SessionLocal
 
     db = SessionLocal()
@@ -397,7 +416,8 @@ async def process_single_document(document_id: int):
                 filename=document.filename,
                 extracted_fields=extracted_fields,
                 confidence_scores=confidence_scores,
-                full_text=full_text
+                full_text=full_text,
+                chunks=parse_result.get("chunks", [])
             )
             logger.info(f"Indexed document {document_id} in Elasticsearch: {es_id}")
         except Exception as e:
@@ -431,6 +451,9 @@ async def process_single_document(document_id: int):
         document.error_message = error_message
         db.commit()
 
+        if raise_errors:
+            raise
+
     finally:
         db.close()
 
@@ -442,6 +465,8 @@ async def list_documents(
     query_id: Optional[str] = None,
     page: int = 1,
     size: int = 100,
+    cursor: Optional[str] = None,
+    total_mode: str = "exact",
     db: Session = Depends(get_db)
 ):
     """
@@ -451,11 +476,22 @@ async def list_documents(
         schema_id: Filter by schema/template ID
         status: Filter by document status
         query_id: Filter by documents used in a specific Ask AI query
-        page: Page number (1-indexed)
+        page: Page number (1-indexed, ignored when a cursor is given)
         size: Results per page
+        cursor: next_cursor from the previous page (keyset on uploaded_at, id)
+        total_mode: exact | capped | estimate | none (see app.utils.pagination)
     """
+    try:
+        validate_total_mode(total_mode)
+        after = None
+        if cursor:
+            values = decode_cursor(cursor, ["t", "id"])
+            after = [datetime.fromisoformat(values["t"]), int(values["id"])]
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
 
-    query = db.query(Document).order_by(Document.uploaded_at.desc())
+    # Served by ix_documents_uploaded_at_id
+    query = db.query(Document).order_by(Document.uploaded_at.desc(), Document.id.desc())
 
     # Query ID filter - show only documents used in this AI query
     query_context = None
@@ -481,8 +517,10 @@ async def list_documents(
             # Invalid query_id - return empty result
             return {
                 "total": 0,
+                "total_relation": "eq",
                 "page": page,
                 "size": size,
+                "next_cursor": None,
                 "documents": [],
                 "query_context": None,
                 "error": "Query not found"
@@ -495,14 +533,25 @@ async def list_documents(
         query = query.filter(Document.status == status)
 
     # Pagination
-    offset = (page - 1) * size
-    total = query.count()
-    documents = query.offset(offset).limit(size).all()
+    total, total_relation = await count_total(db, query.statement, total_mode)
+    if after:
+        query = query.filter(keyset_after([Document.uploaded_at, Document.id], after))
+    else:
+        query = query.offset((page - 1) * size)
+    documents = query.limit(size + 1).all()
+
+    next_cursor = None
+    if len(documents) > size:
+        documents = documents[:size]
+        last = documents[-1]
+        next_cursor = encode_cursor({"t": last.uploaded_at.isoformat(), "id": last.id})
 
     return {
         "total": total,
+        "total_relation": total_relation,
         "page": page,
         "size": size,
+        "next_cursor": next_cursor,
         "query_context": query_context,  # NEW: Query context for frontend banner
         "documents": [
             {
@@ -6,13 +6,18 @@ from datetime import date, datetime
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.models.template import SchemaTemplate
 from app.services.export_service import ExportService
+from app.services.streaming_export_service import (
+    EXCEL_MEDIA_TYPE,
+    ExportFilters,
+    StreamingExportService,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/export", tags=["export"])
@@ -38,6 +43,45 @@ class AnalyzeTemplatesRequest(BaseModel):
     template_ids: List[int] = Field(..., description="List of template IDs to analyze")
 
 
+def _streaming_export(
+    exporter: StreamingExportService,
+    format: str,
+    include_metadata: bool = True,
+    expand_complex_fields: bool = True,
+    format_type: str = "wide",
+    sheet_name: str = "Extracted Data"
+):
+    """
+    Pick the streaming writer for an export format.
+
+    Returns:
+        (chunk iterator, media type, file extension)
+    """
+    if format == "csv":
+        return exporter.stream_csv(include_metadata=include_metadata, format_type=format_type), "text/csv", "csv"
+    if format == "excel":
+        chunks = exporter.stream_excel(
+            include_metadata=include_metadata,
+            sheet_name=sheet_name,
+            expand_complex_fields=expand_complex_fields,
+            format_type=format_type
+        )
+        return chunks, EXCEL_MEDIA_TYPE, "xlsx"
+    if format == "json":
+        return exporter.stream_json_array(pretty=True, format_type=format_type), "application/json", "json"
+    if format == "ndjson":
+        return exporter.stream_ndjson(format_type=format_type), "application/x-ndjson", "ndjson"
+    raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+
+
+def _attachment(chunks, media_type: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
 @router.get("/templates")
 async def list_exportable_templates(db: Session = Depends(get_db)):
     """
@@ -159,33 +203,22 @@ async def export_template_csv(
         if not template:
             raise HTTPException(status_code=404, detail="Template not found")
 
-        # Build query
-        query = ExportService.build_export_query(
-            db=db,
+        exporter = StreamingExportService(ExportFilters(
             template_id=template_id,
             date_from=date_from,
             date_to=date_to,
             confidence_min=confidence_min,
             verified_only=verified_only
-        )
-
-        documents = query.all()
+        ))
 
-        if not documents:
+        if not exporter.has_documents(db):
             raise HTTPException(status_code=404, detail="No documents found matching criteria")
 
-        # Convert to records and export
-        records = ExportService.documents_to_records(documents)
-        csv_data = ExportService.export_to_csv(records, include_metadata=include_metadata)
-
         # Generate filename
         filename = f"{template.name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.csv"
 
-        return Response(
-            content=csv_data,
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
+        # Rows are streamed in batches straight from a server-side cursor
+        return _attachment(exporter.stream_csv(include_metadata=include_metadata), "text/csv", filename)
 
     except HTTPException:
         raise
@@ -217,36 +250,26 @@ async def export_template_excel(
         if not template:
             raise HTTPException(status_code=404, detail="Template not found")
 
-        query = ExportService.build_export_query(
-            db=db,
+        exporter = StreamingExportService(ExportFilters(
             template_id=template_id,
             date_from=date_from,
             date_to=date_to,
             confidence_min=confidence_min,
             verified_only=verified_only
-        )
-
-        documents = query.all()
+        ))
 
-        if not documents:
+        if not exporter.has_documents(db):
             raise HTTPException(status_code=404, detail="No documents found matching criteria")
 
-        records = ExportService.documents_to_records(documents)
-        excel_data = ExportService.export_to_excel(
-            records,
+        chunks = exporter.stream_excel(
             include_metadata=include_metadata,
             sheet_name=template.name[:31],  # Excel sheet name limit
-            documents=documents,  # Pass documents for complex field expansion
             expand_complex_fields=expand_complex_fields
         )
 
         filename = f"{template.name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.xlsx"
 
-        return Response(
-            content=excel_data,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
+        return _attachment(chunks, EXCEL_MEDIA_TYPE, filename)
 
     except HTTPException:
         raise
@@ -278,30 +301,25 @@ async def export_template_json(
         if not template:
             raise HTTPException(status_code=404, detail="Template not found")
 
-        query = ExportService.build_export_query(
-            db=db,
+        exporter = StreamingExportService(ExportFilters(
             template_id=template_id,
             date_from=date_from,
             date_to=date_to,
             confidence_min=confidence_min,
             verified_only=verified_only
-        )
-
-        documents = query.all()
+        ))
 
-        if not documents:
+        if not exporter.has_documents(db):
             raise HTTPException(status_code=404, detail="No documents found matching criteria")
 
-        records = ExportService.documents_to_records(documents)
-        json_data = ExportService.export_to_json(records, format_type=format_type)
+        if format_type == "records":
+            chunks = exporter.stream_ndjson()
+        else:
+            chunks = exporter.stream_json_array(pretty=format_type == "pretty")
 
         filename = f"{template.name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.json"
 
-        return Response(
-            content=json_data,
-            media_type="application/json",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
+        return _attachment(chunks, "application/json", filename)
 
     except HTTPException:
         raise
@@ -313,7 +331,7 @@ async def export_template_json(
 @router.post("/custom")
 async def export_custom(
     request: ExportRequest,
-    format: str = Query("excel", description="csv, excel, or json"),
+    format: str = Query("excel", description="csv, excel, json, or ndjson"),
     db: Session = Depends(get_db)
 ):
     """
@@ -381,8 +399,7 @@ async def export_custom(
             )
 
         # Single template or document-specific export
-        query = ExportService.build_export_query(
-            db=db,
+        exporter = StreamingExportService(ExportFilters(
             template_id=request.template_id,
             document_ids=request.document_ids,
             date_from=request.date_from,
@@ -390,48 +407,23 @@ async def export_custom(
             confidence_min=request.confidence_min,
             verified_only=request.verified_only,
             status=request.status
+        ))
+
+        # Validate the format before touching the database
+        chunks, media_type, extension = _streaming_export(
+            exporter,
+            format,
+            include_metadata=request.include_metadata,
+            expand_complex_fields=request.expand_complex_fields,
+            format_type=request.format_type
         )
 
-        documents = query.all()
-
-        if not documents:
+        if not exporter.has_documents(db):
             raise HTTPException(status_code=404, detail="No documents found matching criteria")
 
-        # Convert to records (wide or long format)
-        if request.format_type == "long":
-            records = ExportService.documents_to_long_format(documents)
-        else:
-            records = ExportService.documents_to_records(documents)
-
-        # Export in requested format
-        if format == "csv":
-            data = ExportService.export_to_csv(records, include_metadata=request.include_metadata)
-            media_type = "text/csv"
-            extension = "csv"
-        elif format == "excel":
-            data = ExportService.export_to_excel(
-                records,
-                include_metadata=request.include_metadata,
-                documents=documents,  # Pass documents for complex field expansion
-                expand_complex_fields=request.expand_complex_fields
-            )
-            media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            extension = "xlsx"
-        elif format == "json":
-            json_str = ExportService.export_to_json(records, format_type="pretty")
-            data = json_str.encode('utf-8')
-            media_type = "application/json"
-            extension = "json"
-        else:
-            raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
-
         filename = f"export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
 
-        return Response(
-            content=data,
-            media_type=media_type,
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
+        return _attachment(chunks, media_type, filename)
 
     except HTTPException:
         raise
@@ -443,7 +435,7 @@ async def export_custom(
 @router.get("/documents")
 async def export_documents(
     document_ids: str = Query(..., description="Comma-separated document IDs"),
-    format: str = Query("excel", description="csv, excel, or json"),
+    format: str = Query("excel", description="csv, excel, json, or ndjson"),
     include_metadata: bool = Query(True),
     expand_complex_fields: bool = Query(True, description="Create separate sheets for tables/arrays"),
     db: Session = Depends(get_db)
@@ -458,47 +450,21 @@ async def export_documents(
         # Parse document IDs
         doc_id_list = [int(x.strip()) for x in document_ids.split(",")]
 
-        query = ExportService.build_export_query(
-            db=db,
-            document_ids=doc_id_list
-        )
+        exporter = StreamingExportService(ExportFilters(document_ids=doc_id_list))
 
-        documents = query.all()
+        chunks, media_type, extension = _streaming_export(
+            exporter,
+            format,
+            include_metadata=include_metadata,
+            expand_complex_fields=expand_complex_fields
+        )
 
-        if not documents:
+        if not exporter.has_documents(db):
             raise HTTPException(status_code=404, detail="No documents found")
 
-        records = ExportService.documents_to_records(documents)
-
-        # Export in requested format
-        if format == "csv":
-            data = ExportService.export_to_csv(records, include_metadata=include_metadata)
-            media_type = "text/csv"
-            extension = "csv"
-        elif format == "excel":
-            data = ExportService.export_to_excel(
-                records,
-                include_metadata=include_metadata,
-                documents=documents,  # Pass documents for complex field expansion
-                expand_complex_fields=expand_complex_fields
-            )
-            media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            extension = "xlsx"
-        elif format == "json":
-            json_str = ExportService.export_to_json(records, format_type="pretty")
-            data = json_str.encode('utf-8')
-            media_type = "application/json"
-            extension = "json"
-        else:
-            raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
-
         filename = f"documents_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
 
-        return Response(
-            content=data,
-            media_type=media_type,
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
+        return _attachment(chunks, media_type, filename)
 
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid document IDs format")
@@ -10,7 +10,7 @@ from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.services.folder_service import FolderService
+from app.services.folder_service import DEFAULT_PAGE_SIZE, FolderService
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -29,6 +29,8 @@ class SearchRequest(BaseModel):
 @router.get("/browse")
 async def browse_folders(
     path: str = "",
+    limit: int = DEFAULT_PAGE_SIZE,
+    offset: int = 0,
     db: Session = Depends(get_db)
 ):
     """
@@ -36,6 +38,8 @@ async def browse_folders(
 
     Query params:
         path: Folder path (e.g., "Invoice/2025-10-11" or "" for root)
+        limit: Files per page (default: 200, max: 1000)
+        offset: Files to skip
 
     Returns:
         {
@@ -46,11 +50,15 @@ async def browse_folders(
             "files": [
                 {"id": 1, "filename": "doc.pdf", "template": "Invoice", ...}
             ],
-            "total_items": 10
+            "total_items": 10,
+            "total_files": 5,
+            "limit": 200,
+            "offset": 0,
+            "has_more": false
         }
     """
     folder_service = FolderService()
-    result = folder_service.browse_folder(path, db)
+    result = folder_service.browse_folder(path, db, limit=limit, offset=offset)
     return result
 
 
@@ -193,8 +201,9 @@ async def get_folder_tree(
                 {
                     "name": "Invoice",
                     "path": "Invoice",
+                    "count": 12,
                     "children": [
-                        {"name": "2025-10-11", "path": "Invoice/2025-10-11", "children": []}
+                        {"name": "2025-10-11", "path": "Invoice/2025-10-11", "count": 12, "children": []}
                     ]
                 }
             ]
@@ -225,7 +234,7 @@ async def get_template_folders(db: Session = Depends(get_db)):
     folder_service = FolderService()
 
     # Browse root to get template folders
-    root_data = folder_service.browse_folder("", db)
+    root_data = folder_service.browse_folder("", db, limit=1)
 
     return {
         "folders": root_data["folders"]
@@ -10,8 +10,11 @@ from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
+from sqlalchemy import select
 
+from app.core.config import settings
 from app.services.claude_service import ClaudeService
+from app.services.document_chunks import MAX_CHUNK_CHARS
 from app.services.postgres_service import PostgresService
 from app.services.query_optimizer import QueryOptimizer
 
@@ -26,6 +29,8 @@ class MCPSearchRequest(BaseModel):
     folder_path: Optional[str] = Field(None, description="Restrict search to specific folder")
     max_results: int = Field(10, ge=1, le=100, description="Maximum results to return")
     include_aggregations: bool = Field(False, description="Include aggregation summaries")
+    fields: Optional[List[str]] = Field(None, description="Extracted fields to return (default: all)")
+    include_text: bool = Field(False, description="Include full document text (use get_document_content instead)")
 
 
 class MCPAggregationRequest(BaseModel):
@@ -47,6 +52,15 @@ class MCPSearchResponse(BaseModel):
     metadata: Dict[str, Any]
 
 
+def _excerpt(document: Dict[str, Any]) -> str:
+    """Preview for the top hit: its first snippet, else the start of its text."""
+    if document.get("snippets"):
+        return document["snippets"][0]
+    if document.get("full_text"):
+        return str(document["full_text"])[:200] + "..."
+    return "No preview"
+
+
 @router.post("/documents", response_model=MCPSearchResponse)
 async def search_documents_mcp(request: MCPSearchRequest):
     """
@@ -68,13 +82,13 @@ async def search_documents_mcp(request: MCPSearchRequest):
     """
 
     from app.services.schema_registry import SchemaRegistry
-    from app.core.database import SessionLocal
+    from app.core.database import AsyncSessionLocal
 
     claude_service = ClaudeService()
 
     try:
         # Get database session
-        db = SessionLocal()
+        db = AsyncSessionLocal()
         postgres_service = PostgresService(db)
 
         try:
@@ -149,7 +163,11 @@ async def search_documents_mcp(request: MCPSearchRequest):
                 filters=None,
                 custom_query=es_query,
                 page=1,
-                size=request.max_results
+                size=request.max_results,
+                fields=request.fields,
+                include_text=request.include_text,
+                snippets=settings.SEARCH_SNIPPET_FRAGMENTS,
+                highlight_query=request.query
             )
 
             # Clean up documents for MCP response
@@ -158,7 +176,8 @@ async def search_documents_mcp(request: MCPSearchRequest):
                 cleaned_doc = {
                     "id": doc["id"],
                     "score": doc["score"],
-                    **doc["data"]
+                    **doc["data"],
+                    "snippets": doc.get("highlights", {}).get("full_text", [])
                 }
                 cleaned_documents.append(cleaned_doc)
 
@@ -201,7 +220,7 @@ async def search_documents_mcp(request: MCPSearchRequest):
                 enhanced_response["top_result_preview"] = {
                     "id": cleaned_documents[0]["id"],
                     "filename": cleaned_documents[0].get("filename", "Unknown"),
-                    "excerpt": str(cleaned_documents[0].get("full_text", ""))[:200] + "..." if cleaned_documents[0].get("full_text") else "No preview"
+                    "excerpt": _excerpt(cleaned_documents[0])
                 }
 
                 enhanced_response["next_steps"] = {
@@ -217,7 +236,7 @@ async def search_documents_mcp(request: MCPSearchRequest):
             return enhanced_response
 
         finally:
-            db.close()
+            await db.close()
 
     except Exception as e:
         logger.error(f"MCP search error: {e}", exc_info=True)
@@ -233,10 +252,10 @@ async def get_document_mcp(document_id: int):
     confidence scores, and metadata.
     """
 
-    from app.core.database import SessionLocal
+    from app.core.database import AsyncSessionLocal
     
     try:
-        db = SessionLocal()
+        db = AsyncSessionLocal()
         postgres_service = PostgresService(db)
         
         try:
@@ -252,7 +271,7 @@ async def get_document_mcp(document_id: int):
             }
         
         finally:
-            db.close()
+            await db.close()
 
     except HTTPException:
         raise
@@ -277,10 +296,10 @@ async def aggregate_mcp(request: MCPAggregationRequest):
     ```
     """
 
-    from app.core.database import SessionLocal
+    from app.core.database import AsyncSessionLocal
     
     try:
-        db = SessionLocal()
+        db = AsyncSessionLocal()
         postgres_service = PostgresService(db)
         
         try:
@@ -299,7 +318,7 @@ async def aggregate_mcp(request: MCPAggregationRequest):
             }
         
         finally:
-            db.close()
+            await db.close()
 
     except Exception as e:
         logger.error(f"MCP aggregation error: {e}", exc_info=True)
@@ -315,11 +334,11 @@ async def list_available_fields():
     Useful for building queries and understanding schema.
     """
 
-    from app.core.database import SessionLocal
+    from app.core.database import AsyncSessionLocal
     from app.services.schema_registry import SchemaRegistry
 
     try:
-        db = SessionLocal()
+        db = AsyncSessionLocal()
         schema_registry = SchemaRegistry(db)
 
         try:
@@ -361,7 +380,7 @@ async def list_available_fields():
             }
 
         finally:
-            db.close()
+            await db.close()
 
     except Exception as e:
         logger.error(f"MCP list fields error: {e}", exc_info=True)
@@ -376,14 +395,14 @@ async def list_templates():
     Returns template names, categories, and field lists.
     """
 
-    from app.core.database import SessionLocal
+    from app.core.database import AsyncSessionLocal
     from app.models.schema import Schema
 
     try:
-        db = SessionLocal()
+        db = AsyncSessionLocal()
 
         try:
-            templates = db.query(Schema).all()
+            templates = (await db.execute(select(Schema))).scalars().all()
 
             template_list = []
             for template in templates:
@@ -403,7 +422,7 @@ async def list_templates():
             }
 
         finally:
-            db.close()
+            await db.close()
 
     except Exception as e:
         logger.error(f"MCP list templates error: {e}", exc_info=True)
@@ -418,10 +437,10 @@ async def get_search_stats():
     Returns counts, distributions, and health metrics.
     """
 
-    from app.core.database import SessionLocal
+    from app.core.database import AsyncSessionLocal
     
     try:
-        db = SessionLocal()
+        db = AsyncSessionLocal()
         postgres_service = PostgresService(db)
         
         try:
@@ -440,7 +459,7 @@ async def get_search_stats():
             }
         
         finally:
-            db.close()
+            await db.close()
 
     except Exception as e:
         logger.error(f"MCP stats error: {e}", exc_info=True)
@@ -458,11 +477,11 @@ async def explain_query(query: str = Query(..., description="Natural language qu
     Useful for debugging and understanding query behavior.
     """
 
-    from app.core.database import SessionLocal
+    from app.core.database import AsyncSessionLocal
     from app.services.schema_registry import SchemaRegistry
 
     try:
-        db = SessionLocal()
+        db = AsyncSessionLocal()
 
         try:
             schema_registry = SchemaRegistry(db)
@@ -510,7 +529,7 @@ async def explain_query(query: str = Query(..., description="Natural language qu
             }
 
         finally:
-            db.close()
+            await db.close()
 
     except Exception as e:
         logger.error(f"MCP explain query error: {e}", exc_info=True)
@@ -532,10 +551,10 @@ async def get_document_content_mcp(document_id: int):
     - Content extraction
     """
 
-    from app.core.database import SessionLocal
+    from app.core.database import AsyncSessionLocal
     
     try:
-        db = SessionLocal()
+        db = AsyncSessionLocal()
         postgres_service = PostgresService(db)
         
         try:
@@ -578,7 +597,7 @@ async def get_document_content_mcp(document_id: int):
             }
         
         finally:
-            db.close()
+            await db.close()
 
     except HTTPException:
         raise
@@ -590,42 +609,45 @@ async def get_document_content_mcp(document_id: int):
 @router.get("/document/{document_id}/chunks")
 async def get_document_chunks_mcp(
     document_id: int,
-    chunk_size: int = Query(default=2000, ge=100, le=10000, description="Characters per chunk"),
-    page: int = Query(default=1, ge=1, description="Page number (1-indexed)"),
-    overlap: int = Query(default=200, ge=0, le=1000, description="Character overlap between chunks")
+    page: int = Query(default=1, ge=1, description="Chunk number (1-indexed)"),
+    chunk_size: Optional[int] = Query(
+        default=None, ge=100, le=10000, deprecated=True,
+        description=f"Ignored: chunks follow the parsed layout (at most {MAX_CHUNK_CHARS} characters)"
+    ),
+    overlap: Optional[int] = Query(
+        default=None, ge=0, le=1000, deprecated=True,
+        description="Ignored: chunks do not overlap"
+    )
 ):
     """
     Get document content in chunks for processing long documents.
 
     This is useful when documents are too long to fit in a single LLM context window.
-    Returns paginated chunks with overlap to maintain context between chunks.
+    Chunks follow the document's parsed layout (one passage per parse chunk, long
+    ones split), each with its page, character offsets and bounding box, and are
+    read from the chunk index without loading the rest of the document.
 
     **Parameters:**
-    - chunk_size: Characters per chunk (100-10000)
     - page: Which chunk to return (1-indexed)
-    - overlap: Characters to overlap between chunks (maintains context)
+    - chunk_size, overlap: Deprecated and ignored; ``pagination`` reports the
+      effective values
 
     **Use Cases:**
     - Processing very long documents
     - Progressive analysis
-    - Memory-efficient document reading
+    - Following up on a passage from /passages
     """
 
-    from app.core.database import SessionLocal
-    
+    from app.core.database import AsyncSessionLocal
+
     try:
-        db = SessionLocal()
+        db = AsyncSessionLocal()
         postgres_service = PostgresService(db)
-        
-        try:
-            doc = await postgres_service.get_document(document_id)
-
-            if not doc:
-                raise HTTPException(status_code=404, detail=f"Document {document_id} not found")
 
-            full_text = doc.get("full_text", "")
+        try:
+            result = await postgres_service.get_document_chunk(document_id, page)
 
-            if not full_text:
+            if result is None:
                 return {
                     "success": True,
                     "document_id": document_id,
@@ -634,60 +656,34 @@ async def get_document_chunks_mcp(
                     "message": "Document has no text content"
                 }
 
-            # Split into chunks with overlap
-            chunks = []
-            start = 0
-            chunk_num = 0
-
-            while start < len(full_text):
-                end = min(start + chunk_size, len(full_text))
-                chunk_text = full_text[start:end]
-
-                chunk_num += 1
-                chunks.append({
-                    "chunk_number": chunk_num,
-                    "start_char": start,
-                    "end_char": end,
-                    "content": chunk_text,
-                    "length": len(chunk_text)
-                })
-
-                # Move start position with overlap
-                start = end - overlap
-                if start >= len(full_text):
-                    break
-
-            # Return requested page
-            total_chunks = len(chunks)
-            if page > total_chunks:
+            total_chunks = result["total_chunks"]
+            if result["chunk"] is None:
                 raise HTTPException(
                     status_code=400,
                     detail=f"Page {page} out of range. Document has {total_chunks} chunks."
                 )
 
-            requested_chunk = chunks[page - 1]
-
             return {
                 "success": True,
                 "document_id": document_id,
-                "filename": doc.get("filename"),
-                "chunk": requested_chunk,
+                "filename": result["filename"],
+                "chunk": result["chunk"],
                 "pagination": {
                     "current_page": page,
                     "total_chunks": total_chunks,
-                    "chunk_size": chunk_size,
-                    "overlap": overlap,
+                    "chunk_size": MAX_CHUNK_CHARS,
+                    "overlap": 0,
                     "has_next": page < total_chunks,
                     "has_previous": page > 1
                 },
                 "metadata": {
-                    "total_characters": len(full_text),
-                    "template": doc.get("_query_context", {}).get("template_name")
+                    "total_characters": result["total_characters"],
+                    "template": result["template"]
                 }
             }
-        
+
         finally:
-            db.close()
+            await db.close()
 
     except HTTPException:
         raise
@@ -696,6 +692,49 @@ async def get_document_chunks_mcp(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/passages")
+async def search_passages_mcp(
+    query: str = Query(..., description="Search query (keywords)"),
+    limit: int = Query(default=10, ge=1, le=50, description="Passages to return"),
+    max_per_document: int = Query(default=3, ge=1, le=50, description="Most passages from one document")
+):
+    """
+    Find the best-matching passages across all documents.
+
+    Ranks individual chunks instead of whole documents, so long documents
+    contribute just their relevant sections. Each passage carries its
+    document, chunk number (for /document/{id}/chunks?page=N), page and
+    highlighted snippet.
+    """
+
+    from app.core.database import AsyncSessionLocal
+
+    try:
+        db = AsyncSessionLocal()
+        try:
+            passages = await PostgresService(db).search_passages(
+                query=query,
+                limit=limit,
+                max_per_document=max_per_document,
+                snippets=settings.SEARCH_SNIPPET_FRAGMENTS
+            )
+        finally:
+            await db.close()
+
+        return {
+            "success": True,
+            "query": query,
+            "returned_results": len(passages),
+            "passages": passages,
+            "summary": f"Found {len(passages)} passages from "
+                       f"{len({p['document_id'] for p in passages})} documents matching '{query}'"
+        }
+
+    except Exception as e:
+        logger.error(f"Error searching passages: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # ============================================================================
 # REMOVED: rag_query endpoint
 # ============================================================================
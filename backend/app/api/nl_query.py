@@ -366,14 +366,26 @@ async def get_cache_stats(db: Session = Depends(get_db)):
     # Calculate cache hit rate
     cache_hit_rate = (total_hits / (total_cached_queries + total_hits)) if (total_cached_queries + total_hits) > 0 else 0
 
+    # Pattern reuse (questions of a learned shape answered without a Claude parse)
+    from app.models.query_pattern import QueryPattern
+    from app.services.query_pattern_service import get_query_pattern_matcher
+
+    pattern_count = db.query(QueryPattern).count()
+    pattern_uses = db.query(func.sum(QueryPattern.usage_count)).scalar() or 0
+
     # Estimated cost savings (assuming $0.003 per Claude API call)
-    cost_savings = total_hits * 0.003
+    cost_savings = (total_hits + pattern_uses) * 0.003
 
     return {
         "total_cached_queries": total_cached_queries,
         "total_cache_hits": total_hits,
         "cache_hit_rate": f"{cache_hit_rate * 100:.1f}%",
         "estimated_cost_savings": f"${cost_savings:.2f}",
+        "query_patterns": {
+            "total_patterns": pattern_count,
+            "total_pattern_uses": pattern_uses,
+            "matcher": get_query_pattern_matcher().get_stats()
+        },
         "top_queries": [
             {
                 "query": q.original_query,
@@ -12,6 +12,7 @@ from sqlalchemy.orm.attributes import flag_modified
 from app.core.database import get_db
 from app.models.schema import Schema
 from app.services.claude_service import ClaudeService
+from app.services.job_queue import JobQueue
 from app.services.postgres_service import PostgresService
 from app.services.reducto_service import ReductoService
 from app.utils.reducto_validation import format_validation_report, validate_schema_for_reducto
@@ -315,7 +316,6 @@ async def re_extract_documents(
     Re-extract all documents using this schema after template changes
     Updates all documents with new field definitions
     """
-    from app.api.documents import process_single_document
     from app.models.document import Document
 
     schema = db.query(Schema).filter(Schema.id == schema_id).first()
@@ -332,35 +332,25 @@ async def re_extract_documents(
             "processed_count": 0
         }
 
-    # Re-process each document
-    processed_count = 0
-    errors = []
-
+    # Queue re-extraction for each document (run by the background worker)
+    # enqueue_many commits the status change together with the jobs
     for doc in documents:
-        try:
-            # Reset status to processing
-            doc.status = "processing"
-            db.commit()
+        doc.status = "processing"
 
-            # Trigger re-extraction
-            await process_single_document(doc.id)
-            processed_count += 1
-            logger.info(f"Re-extracted document {doc.id}: {doc.filename}")
-
-        except Exception as e:
-            error_msg = f"Failed to re-extract {doc.filename}: {str(e)}"
-            errors.append(error_msg)
-            logger.error(error_msg)
-            doc.status = "error"
-            doc.error_message = str(e)
-            db.commit()
+    jobs = await JobQueue(db).enqueue_many(
+        "process_document",
+        [{"document_id": doc.id} for doc in documents]
+    )
+    logger.info(f"Queued re-extraction of {len(documents)} documents for schema {schema_id}")
 
     return {
         "success": True,
-        "message": f"Re-extracted {processed_count} documents",
-        "processed_count": processed_count,
+        "message": f"Re-extracting {len(documents)} documents in background",
+        "processed_count": 0,
+        "queued_count": len(jobs),
         "total_documents": len(documents),
-        "errors": errors if errors else None
+        "job_ids": [job.id for job in jobs],
+        "errors": None
     }
 
 
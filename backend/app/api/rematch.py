@@ -2,22 +2,29 @@
 Endpoint for retroactively matching existing documents to templates
 """
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
+from app.core.auth import get_current_active_admin
 from app.core.database import get_db
+from app.models.background_job import BackgroundJob
 from app.models.document import Document
+from app.models.settings import User
 from app.models.template import SchemaTemplate
 from app.services.claude_service import ClaudeService
+from app.services.job_queue import JobQueue
+from app.services.match_feature_service import MatchFeatureService
 from app.services.postgres_service import PostgresService
 from app.utils.template_matching import hybrid_match_document
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/rematch", tags=["rematch"])
 
+REMATCH_PROGRESS_BATCH = 20  # Documents per progress commit in background rematch jobs
+
 
 @router.post("/all")
 async def rematch_all_documents(
@@ -26,25 +33,95 @@ async def rematch_all_documents(
     """
     Retroactively match all existing documents that need templates
     This applies hybrid matching to documents uploaded before the feature was added
+
+    Matching runs in the background worker; poll /api/onboarding/jobs/{job_id}
+    for progress.
     """
+    unmatched_count = _unmatched_documents_query(db).count()
+
+    if not unmatched_count:
+        return {
+            "success": True,
+            "matched_count": 0,
+            "message": "No documents need rematching"
+        }
 
-    # Find all documents that need template matching
+    job = await JobQueue(db).enqueue(
+        "rematch_documents",
+        job_data={"document_ids": None},
+        lane="bulk",
+        total_items=unmatched_count
+    )
+    logger.info(f"Queued rematch of {unmatched_count} documents (job {job.id})")
+
+    return {
+        "success": True,
+        "job_id": job.id,
+        "total_queued": unmatched_count,
+        "message": f"Rematching {unmatched_count} documents in background"
+    }
+
+
+@router.post("/features/backfill")
+async def backfill_match_features(
+    limit: Optional[int] = None,
+    current_user: User = Depends(get_current_active_admin),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Admin: Compute match features for parse results stored before they existed.
+
+    Matching computes missing features on demand; this backfills them ahead of
+    a large rematch. Runs in the background worker.
+    """
+    job = await JobQueue(db).enqueue("match_features_backfill", job_data={"limit": limit}, lane="bulk")
+    logger.info(f"Queued match feature backfill (job {job.id})")
+    return {
+        "success": True,
+        "job_id": job.id,
+        "message": "Backfilling match features in background"
+    }
+
+
+def _unmatched_documents_query(db: Session):
     # Note: We don't filter by parse result here because it might be in PhysicalFile
     # The hybrid_match_document function will skip docs without parse results
-    unmatched_docs = db.query(Document).filter(
+    return db.query(Document).filter(
         or_(
             Document.status == "template_needed",
             Document.status == "analyzing",
             Document.suggested_template_id == None
         )
-    ).all()
+    )
 
-    if not unmatched_docs:
-        return {
-            "success": True,
-            "matched_count": 0,
-            "message": "No documents need rematching"
-        }
+
+async def rematch_documents(
+    db: Session,
+    document_ids: Optional[List[int]] = None,
+    background_job_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Apply hybrid template matching to documents (job handler for "rematch_documents").
+
+    Args:
+        db: Database session
+        document_ids: Documents to rematch (default: every document that needs a template)
+        background_job_id: Job row to report progress on
+
+    Returns:
+        Summary with per-document results
+    """
+    query = _unmatched_documents_query(db)
+    if document_ids:
+        query = db.query(Document).filter(Document.id.in_(document_ids))
+    unmatched_docs = query.all()
+
+    job = None
+    if background_job_id:
+        job = db.query(BackgroundJob).filter(BackgroundJob.id == background_job_id).first()
+        if job:
+            job.total_items = len(unmatched_docs)
+            job.processed_items = 0
 
     logger.info(f"Rematching {len(unmatched_docs)} documents")
 
@@ -68,8 +145,14 @@ async def rematch_all_documents(
     matched_count = 0
     claude_fallback_count = 0
     results = []
+    feature_service = MatchFeatureService(db)
+    features_by_doc = {}
+
+    for i, doc in enumerate(unmatched_docs):
+        # Load precomputed match features one progress batch at a time
+        if i % REMATCH_PROGRESS_BATCH == 0:
+            features_by_doc = feature_service.for_documents(unmatched_docs[i:i + REMATCH_PROGRESS_BATCH])
 
-    for doc in unmatched_docs:
         try:
             # Use hybrid matching
             match_result = await hybrid_match_document(
@@ -77,7 +160,8 @@ async def rematch_all_documents(
                 postgres_service=postgres_service,
                 claude_service=claude_service,
                 available_templates=template_data,
-                db=db
+                db=db,
+                features=features_by_doc.get(doc.id)
             )
 
             # Update document
@@ -122,6 +206,11 @@ async def rematch_all_documents(
                 "error": str(e)
             })
 
+        # Persist matches and progress in batches so a retry does not redo committed work
+        if job and ((i + 1) % REMATCH_PROGRESS_BATCH == 0 or i + 1 == len(unmatched_docs)):
+            job.processed_items = i + 1
+            db.commit()
+
     db.commit()
     # PostgresService doesn't need explicit close (uses DB session from context)
 
@@ -152,7 +241,7 @@ async def rematch_single_document(
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    if not doc.reducto_parse_result:
+    if not doc.has_parse_result:
         raise HTTPException(
             status_code=400,
             detail="Document has not been parsed yet"
@@ -3,15 +3,21 @@ from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.auth import get_current_active_admin
+from app.core.config import settings
+from app.core.database import get_async_db, get_db
 from app.models.schema import Schema
+from app.models.settings import User
 from app.services.answer_cache import get_answer_cache
 from app.services.claude_service import ClaudeService
+from app.services.job_queue import JobQueue
 from app.services.postgres_service import PostgresService
 from app.services.query_expansion_service import QueryExpansionService
 from app.services.query_optimizer import QueryOptimizer
+from app.services.query_pattern_service import get_query_pattern_matcher, learn_query_pattern
 from app.utils.query_field_extractor import (
     extract_fields_from_es_query,
     filter_audit_items_by_fields,
@@ -26,12 +32,25 @@ class SearchRequest(BaseModel):
     folder_path: Optional[str] = None
     template_id: Optional[str] = None  # Changed to str to support "schema_15" or "template_1" format
     conversation_history: Optional[List[Dict[str, str]]] = None
+    fields: Optional[List[str]] = None  # Extracted fields to return per result (default: all)
+    include_text: bool = False  # Return full_text/_all_text; results carry highlight snippets either way
+
+
+def _projection(request: SearchRequest) -> Dict[str, Any]:
+    """PostgresService.search projection args: requested fields, snippets around the question."""
+    return {
+        "fields": request.fields,
+        "include_text": request.include_text,
+        "snippets": settings.SEARCH_SNIPPET_FRAGMENTS,
+        "highlight_query": request.query
+    }
 
 
 @router.post("")
 async def search_documents(
     request: SearchRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    async_db: AsyncSession = Depends(get_async_db)
 ):
     """
     AI-powered search endpoint with hybrid query optimization and natural language understanding.
@@ -40,15 +59,16 @@ async def search_documents(
     1. Check QueryCache for exact match
     2. Use QueryOptimizer for intent detection and filter extraction
     3. If high confidence (>0.7), execute directly
-    4. If low confidence, refine with Claude
+    4. If low confidence, reuse a learned query pattern, else refine with Claude
     5. Execute ES query and generate answer
-    6. Cache successful queries
+    6. Cache successful queries and learn their patterns
 
     Args:
         query: Natural language search query
         folder_path: Optional folder path to restrict search (e.g., "invoices" or "invoices/acme-corp")
         conversation_history: Optional conversation context for follow-up questions
     """
+    import copy
     import hashlib
     from datetime import datetime
 
@@ -56,8 +76,8 @@ async def search_documents(
     from app.services.schema_registry import SchemaRegistry
 
     claude_service = ClaudeService()
-    postgres_service = PostgresService(db)
-    schema_registry = SchemaRegistry(db)
+    postgres_service = PostgresService(async_db)
+    schema_registry = SchemaRegistry(async_db)
     query_expander = QueryExpansionService()  # NEW: Phase 2 query expansion
 
     # Initialize QueryOptimizer with SchemaRegistry for dynamic field resolution
@@ -99,7 +119,8 @@ async def search_documents(
                 filters=None,
                 custom_query=es_query,
                 page=1,
-                size=20
+                size=20,
+                **_projection(request)
             )
 
             # Generate fresh answer with confidence metadata
@@ -123,7 +144,7 @@ async def search_documents(
 
             low_conf_fields_grouped = await get_low_confidence_fields_for_documents(
                 document_ids=document_ids,
-                db=db,
+                db=async_db,
                 confidence_threshold=None
             )
 
@@ -142,10 +163,9 @@ async def search_documents(
 
             logger.info(f"Filtered audit items from {len(all_audit_items)} to {len(audit_items)} (query-relevant only)")
 
-            confidence_summary = await get_confidence_summary(document_ids=document_ids, db=db)
+            confidence_summary = await get_confidence_summary(document_ids=document_ids, db=async_db)
 
             # NEW: Save query history for viewing source documents
-            from app.core.config import settings
             from app.models.query_history import QueryHistory
 
             query_history = QueryHistory.create_from_search(
@@ -229,8 +249,18 @@ async def search_documents(
         es_query = None
         explanation = ""
         query_type = query_analysis["intent"]
-
-        if use_claude:
+        nl_result = None
+        pattern_match = None
+        parsed_by_claude = None  # Claude's parse before folder/template filters, for pattern learning
+
+        if use_claude and settings.QUERY_PATTERNS_ENABLED and not request.conversation_history:
+            # Same question shape as one Claude parsed before: reuse that parse
+            pattern_match = get_query_pattern_matcher().match(db, request.query, request.template_id)
+            if pattern_match:
+                logger.info(f"Query pattern HIT: {pattern_match.pattern} (confidence: {pattern_match.confidence:.2f})")
+                nl_result = pattern_match.nl_result
+
+        if use_claude and not pattern_match:
             # Low confidence or complex query - use Claude for refinement
             logger.info(f"Using Claude for query refinement (confidence: {query_analysis['confidence']:.2f})")
 
@@ -250,7 +280,10 @@ async def search_documents(
                 conversation_history=request.conversation_history,
                 template_context=template_context  # NEW parameter
             )
+            if not request.conversation_history:
+                parsed_by_claude = copy.deepcopy(nl_result)
 
+        if use_claude:
             es_query = nl_result.get("elasticsearch_query", {}).get("query", {})
             explanation = nl_result.get("explanation", "")
             query_type = nl_result.get("query_type", query_analysis["intent"])
@@ -423,7 +456,8 @@ async def search_documents(
                 filters=None,
                 custom_query=es_query,
                 page=1,
-                size=20
+                size=20,
+                **_projection(request)
             )
 
             # PHASE 2 ENHANCEMENT: Zero-result fallback with query expansion
@@ -444,7 +478,8 @@ async def search_documents(
                     custom_query=es_query,  # Still apply same filters/context
                     page=1,
                     size=20,
-                    use_weighted_tsv=True
+                    use_weighted_tsv=True,
+                    **_projection(request)
                 )
 
                 if search_results_expanded.get("total", 0) > 0:
@@ -523,7 +558,7 @@ async def search_documents(
             # OPTIMIZATION: Filter fields in SQL query, not Python
             low_conf_fields_grouped = await get_low_confidence_fields_for_documents(
                 document_ids=document_ids,
-                db=db,
+                db=async_db,
                 confidence_threshold=None,
                 field_names=field_lineage["queried_fields"]  # Filter in SQL WHERE clause
             )
@@ -540,7 +575,7 @@ async def search_documents(
 
             logger.info(f"Found {len(audit_items)} query-relevant audit items (filtered in SQL)")
 
-            confidence_summary = await get_confidence_summary(document_ids=document_ids, db=db)
+            confidence_summary = await get_confidence_summary(document_ids=document_ids, db=async_db)
 
         # Cache the successful query (without folder-specific results)
         try:
@@ -559,10 +594,17 @@ async def search_documents(
             db.commit()
             logger.info(f"Cached query: {request.query[:50]}...")
         except Exception as cache_error:
+            db.rollback()
             logger.warning(f"Failed to cache query: {cache_error}")
 
+        if parsed_by_claude and settings.QUERY_PATTERNS_ENABLED and search_results.get("total", 0) > 0:
+            try:
+                learn_query_pattern(db, request.query, parsed_by_claude, request.template_id)
+            except Exception as pattern_error:
+                db.rollback()
+                logger.warning(f"Failed to learn query pattern: {pattern_error}")
+
         # NEW: Save query history for viewing source documents
-        from app.core.config import settings
         from app.models.query_history import QueryHistory
 
         # Use ONLY documents that were actually cited in the answer (not all search results)
@@ -604,6 +646,7 @@ async def search_documents(
             "sql_query": {"query": es_query},  # ES query format for backward compatibility
             "cached": False,
             "optimization_used": not use_claude,
+            "pattern_used": pattern_match is not None,
             "query_confidence": query_analysis["confidence"],
             "query_expansion_used": query_expansion_used if query_type != "aggregation" else False,  # PHASE 2 metadata
             "fuzzy_search_used": fuzzy_search_used if query_type != "aggregation" else False,  # PHASE 2.5 fuzzy search
@@ -772,7 +815,7 @@ def _add_template_filter(es_query: Dict[str, Any], template_id: str, db: Session
 
 
 @router.get("/filters")
-async def get_available_filters(db: Session = Depends(get_db)):
+async def get_available_filters(db: AsyncSession = Depends(get_async_db)):
     """Get available filter options and value distributions"""
 
     postgres_service = PostgresService(db)
@@ -807,7 +850,7 @@ async def get_available_filters(db: Session = Depends(get_db)):
 
 
 @router.get("/index-stats")
-async def get_index_statistics(db: Session = Depends(get_db)):
+async def get_index_statistics(db: AsyncSession = Depends(get_async_db)):
     """
     Get PostgreSQL index statistics for monitoring and optimization.
 
@@ -845,6 +888,35 @@ async def get_index_statistics(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get index statistics: {str(e)}")
 
 
+@router.post("/reindex")
+async def reindex_search(
+    template_id: Optional[int] = None,
+    batch_size: int = 500,
+    use_copy: bool = False,
+    current_user: User = Depends(get_current_active_admin),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Admin: Rebuild the search index for one template's documents, or all of them.
+
+    Runs in the background worker as batched upserts (see
+    PostgresService.bulk_index_documents); the job logs throughput.
+    """
+    if batch_size < 1:
+        raise HTTPException(status_code=400, detail="batch_size must be positive")
+    job = await JobQueue(db).enqueue(
+        "search_reindex",
+        job_data={"template_id": template_id, "batch_size": batch_size, "use_copy": use_copy},
+        lane="bulk"
+    )
+    logger.info(f"Queued search reindex for {template_id or 'all templates'} (job {job.id})")
+    return {
+        "success": True,
+        "job_id": job.id,
+        "message": "Reindexing search in background"
+    }
+
+
 def _get_index_recommendations(stats: Dict[str, Any]) -> List[str]:
     """Generate recommendations based on index statistics"""
     recommendations = []
@@ -50,15 +50,15 @@ class SettingsListResponse(BaseModel):
     user_email: str
 
 
-def get_default_context(db: Session):
+async def get_default_context(db: Session):
     """
     Get default org and user for MVP.
 
     Future: Replace with JWT token extraction.
     """
     settings_service = SettingsService(db)
-    org = settings_service.get_or_create_default_org()
-    user = settings_service.get_or_create_default_user(org.id)
+    org = await settings_service.get_or_create_default_org()
+    user = await settings_service.get_or_create_default_user(org.id)
     return org, user
 
 
@@ -72,11 +72,11 @@ async def get_all_settings(
 
     Returns settings resolved for the current user/org context.
     """
-    org, user = get_default_context(db)
+    org, user = await get_default_context(db)
     settings_service = SettingsService(db)
 
     # Get all settings with metadata
-    settings_dict = settings_service.get_all_settings(
+    settings_dict = await settings_service.get_all_settings(
         user_id=user.id,
         org_id=org.id,
         include_metadata=True
@@ -115,11 +115,11 @@ async def get_setting(
 
     Returns the resolved value for the current user/org context.
     """
-    org, user = get_default_context(db)
+    org, user = await get_default_context(db)
     settings_service = SettingsService(db)
 
     # Get resolved value
-    value = settings_service.get_setting(
+    value = await settings_service.get_setting(
         key=key,
         user_id=user.id,
         org_id=org.id
@@ -179,7 +179,7 @@ async def update_setting(
     - "organization": Organization-level (default for MVP)
     - "user": User-level override
     """
-    org, user = get_default_context(db)
+    org, user = await get_default_context(db)
     settings_service = SettingsService(db)
 
     # Validate key exists in defaults
@@ -220,7 +220,7 @@ async def update_setting(
 
     # Update setting
     try:
-        setting = settings_service.set_setting(
+        setting = await settings_service.set_setting(
             key=key,
             value=request.value,
             value_type=request.value_type,
@@ -254,7 +254,7 @@ async def delete_setting(
 
     This will cause the setting to fall back to the next level in the hierarchy.
     """
-    org, user = get_default_context(db)
+    org, user = await get_default_context(db)
     settings_service = SettingsService(db)
 
     # Determine scope
@@ -268,7 +268,7 @@ async def delete_setting(
         user_id = user.id
 
     # Delete setting
-    deleted = settings_service.delete_setting(
+    deleted = await settings_service.delete_setting(
         key=key,
         org_id=org_id,
         user_id=user_id
@@ -299,7 +299,7 @@ async def initialize_defaults(
     settings_service = SettingsService(db)
 
     try:
-        settings_service.initialize_defaults()
+        await settings_service.initialize_defaults()
         return {
             "success": True,
             "message": "System defaults initialized",
@@ -335,11 +335,11 @@ async def get_settings_by_category(
     """
     Get all settings in a specific category.
     """
-    org, user = get_default_context(db)
+    org, user = await get_default_context(db)
     settings_service = SettingsService(db)
 
     # Get all settings
-    all_settings = settings_service.get_all_settings(
+    all_settings = await settings_service.get_all_settings(
         user_id=user.id,
         org_id=org.id,
         include_metadata=True
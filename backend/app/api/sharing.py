@@ -541,6 +541,10 @@ async def share_folder(
     # (For now, require admin or document write permission)
     permission_service.require_permission(current_user.id, PermissionAction.SHARE_DOCUMENTS)
 
+    # Folder grants are scoped to the granter's organization
+    if current_user.org_id is None:
+        raise HTTPException(status_code=403, detail="Sharing folders requires an organization")
+
     # Normalize folder path
     if not folder_path.startswith("/"):
         folder_path = "/" + folder_path
@@ -9,14 +9,19 @@ Supports two authentication methods:
 2. API keys (for MCP/programmatic access) - long-lived, revokable
 """
 
+import hashlib
+import logging
 import secrets
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Tuple
+from typing import Dict, NamedTuple, Optional, Tuple
 
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from passlib.context import CryptContext
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
@@ -24,6 +29,8 @@ from app.core.database import get_db
 from app.models.permissions import APIKey
 from app.models.settings import User
 
+logger = logging.getLogger(__name__)
+
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -115,6 +122,33 @@ def decode_access_token(token: str) -> Optional[int]:
 # API Key Management
 # ====================
 
+API_KEY_PREFIX_LENGTH = 12  # Hex chars of the public lookup ID in "pb_<lookup>_<secret>"
+
+
+def get_api_key_prefix(key: str) -> Optional[str]:
+    """
+    Extract the non-secret lookup ID from an API key
+
+    Keys look like "pb_<12 hex chars>_<secret>". Keys created before lookup
+    IDs existed ("pb_<secret>") usually return None; one whose secret happens
+    to start with 12 hex chars and "_" parses as a lookup ID, so callers fall
+    back to legacy rows when no key has that ID.
+
+    Args:
+        key: Plain API key
+
+    Returns:
+        Lookup ID, or None for legacy/malformed keys
+    """
+    end = 3 + API_KEY_PREFIX_LENGTH
+    if not key.startswith("pb_") or len(key) <= end + 1 or key[end] != "_":
+        return None
+    prefix = key[3:end]
+    if any(c not in "0123456789abcdef" for c in prefix):
+        return None
+    return prefix
+
+
 def create_api_key(user_id: int, name: str = "Default") -> Tuple[str, str]:
     """
     Create a new API key for a user
@@ -126,10 +160,11 @@ def create_api_key(user_id: int, name: str = "Default") -> Tuple[str, str]:
     Returns:
         Tuple of (plain_key, hashed_key)
         The plain key should be shown to user only once
-        The hashed key should be stored in database
+        The hashed key should be stored in database, along with
+        get_api_key_prefix(plain_key) as APIKey.key_prefix
     """
-    # Generate secure random key with prefix
-    plain_key = f"pb_{secrets.token_urlsafe(32)}"
+    # Generate secure random key: public lookup ID + secret
+    plain_key = f"pb_{secrets.token_hex(API_KEY_PREFIX_LENGTH // 2)}_{secrets.token_urlsafe(32)}"
 
     # Hash the key for storage
     hashed_key = hash_password(plain_key)
@@ -137,6 +172,156 @@ def create_api_key(user_id: int, name: str = "Default") -> Tuple[str, str]:
     return plain_key, hashed_key
 
 
+class _VerifiedKey(NamedTuple):
+    api_key_id: int
+    user_id: int
+    expires_at: Optional[datetime]
+    cached_until: float
+
+
+class APIKeyCache:
+    """
+    Process-local cache of recently verified API keys plus buffered usage.
+
+    - Verified keys are cached by SHA-256 digest (never the plain key) for a
+      short TTL, so repeat requests skip bcrypt entirely. Revocation in this
+      process invalidates immediately; other processes within the TTL.
+    - last_used_at updates are buffered and written in one batched UPDATE at
+      most once per flush interval instead of a commit per request.
+    """
+
+    def __init__(self, ttl_seconds: float, flush_interval_seconds: float, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_entries = max_entries
+        self._verified: Dict[str, _VerifiedKey] = {}
+        self._last_used: Dict[int, datetime] = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[_VerifiedKey]:
+        digest = self.digest(key)
+        with self._lock:
+            entry = self._verified.get(digest)
+            if entry and entry.cached_until <= time.monotonic():
+                del self._verified[digest]
+                return None
+            return entry
+
+    def put(self, key: str, api_key: APIKey) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        entry = _VerifiedKey(
+            api_key_id=api_key.id,
+            user_id=api_key.user_id,
+            expires_at=api_key.expires_at,
+            cached_until=time.monotonic() + self.ttl_seconds
+        )
+        with self._lock:
+            if len(self._verified) >= self.max_entries:
+                self._verified.clear()
+            self._verified[self.digest(key)] = entry
+
+    def invalidate(self, api_key_id: int) -> None:
+        """Drop a key from the cache (call on revoke)"""
+        with self._lock:
+            self._verified = {
+                digest: entry for digest, entry in self._verified.items()
+                if entry.api_key_id != api_key_id
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._verified.clear()
+            self._last_used.clear()
+
+    def record_use(self, api_key_id: int) -> None:
+        with self._lock:
+            self._last_used[api_key_id] = datetime.utcnow()
+
+    def pop_usage(self, force: bool = False) -> Dict[int, datetime]:
+        """Take buffered last-used times if the flush interval has elapsed (or force)"""
+        with self._lock:
+            now = time.monotonic()
+            if not self._last_used or (not force and now - self._last_flush < self.flush_interval_seconds):
+                return {}
+            pending, self._last_used = self._last_used, {}
+            self._last_flush = now
+            return pending
+
+
+_api_key_cache: Optional[APIKeyCache] = None
+
+
+def get_api_key_cache() -> APIKeyCache:
+    """Get the process-wide API key cache"""
+    global _api_key_cache
+    if _api_key_cache is None:
+        _api_key_cache = APIKeyCache(
+            ttl_seconds=settings.API_KEY_CACHE_TTL_SECONDS,
+            flush_interval_seconds=settings.API_KEY_LAST_USED_FLUSH_SECONDS
+        )
+    return _api_key_cache
+
+
+def flush_api_key_usage(db: Session, force: bool = False) -> int:
+    """
+    Write buffered last_used_at values in one batched UPDATE
+
+    Args:
+        db: Database session
+        force: Flush even if the flush interval has not elapsed
+
+    Returns:
+        Number of keys updated
+    """
+    pending = get_api_key_cache().pop_usage(force=force)
+    if not pending:
+        return 0
+
+    try:
+        db.execute(
+            update(APIKey),
+            [{"id": api_key_id, "last_used_at": used_at} for api_key_id, used_at in pending.items()]
+        )
+        db.commit()
+    except Exception as e:
+        # Usage tracking is best-effort; never fail authentication over it
+        db.rollback()
+        logger.warning(f"Failed to flush API key usage for {len(pending)} keys: {e}")
+        return 0
+
+    return len(pending)
+
+
+def _find_api_key(db: Session, key: str) -> Optional[APIKey]:
+    """Find the active APIKey row matching a plain key (one bcrypt check for current keys)"""
+    prefix = get_api_key_prefix(key)
+
+    if prefix is not None:
+        api_key = db.query(APIKey).filter(
+            APIKey.key_prefix == prefix,
+            APIKey.is_active == True
+        ).first()
+        if api_key:
+            return api_key if verify_password(key, api_key.key_hash) else None
+        # No row has this lookup ID: it may be a legacy secret that happens to look like one
+
+    # Legacy keys have no lookup ID: check only the (shrinking) set of legacy rows
+    legacy_keys = db.query(APIKey).filter(
+        APIKey.key_prefix.is_(None),
+        APIKey.is_active == True
+    ).all()
+    for api_key in legacy_keys:
+        if verify_password(key, api_key.key_hash):
+            return api_key
+    return None
+
+
 def verify_api_key(db: Session, key: str) -> Optional[User]:
     """
     Verify an API key and return the associated user
@@ -151,32 +336,31 @@ def verify_api_key(db: Session, key: str) -> Optional[User]:
     if not key.startswith("pb_"):
         return None
 
-    # Get all active API keys (we need to check each hash)
-    api_keys = db.query(APIKey).filter(
-        APIKey.is_active == True
-    ).all()
+    cache = get_api_key_cache()
+    cached = cache.get(key)
 
-    # Check each key hash
-    for api_key in api_keys:
-        # Check if key matches
-        if verify_password(key, api_key.key_hash):
-            # Check expiration
-            if api_key.expires_at and api_key.expires_at < datetime.utcnow():
-                continue
-
-            # Update last used timestamp
-            api_key.last_used_at = datetime.utcnow()
-            db.commit()
+    if cached:
+        api_key_id, user_id, expires_at = cached.api_key_id, cached.user_id, cached.expires_at
+    else:
+        api_key = _find_api_key(db, key)
+        if not api_key:
+            return None
+        api_key_id, user_id, expires_at = api_key.id, api_key.user_id, api_key.expires_at
+        cache.put(key, api_key)
 
-            # Get and return user
-            user = db.query(User).filter(
-                User.id == api_key.user_id,
-                User.is_active == True
-            ).first()
+    # Check expiration
+    if expires_at and expires_at < datetime.utcnow():
+        return None
 
-            return user
+    # Track usage (written in periodic batches)
+    cache.record_use(api_key_id)
+    flush_api_key_usage(db)
 
-    return None
+    # Get and return user
+    return db.query(User).filter(
+        User.id == user_id,
+        User.is_active == True
+    ).first()
 
 
 # ====================
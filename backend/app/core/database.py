@@ -1,21 +1,84 @@
+from typing import Any, Optional, Union
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
 
+is_sqlite = "sqlite" in settings.DATABASE_URL
+
+
+def _async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its async driver (asyncpg / aiosqlite)."""
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return url.replace(prefix, "postgresql+asyncpg://", 1)
+    return url
+
+
+def _pool_kwargs() -> dict:
+    """Pool tuning shared by the sync and async engines (SQLite uses its default pool)."""
+    if is_sqlite:
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _sync_connect_args() -> dict:
+    if is_sqlite:
+        return {"check_same_thread": False}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        return {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return {}
+
+
+def _async_connect_args() -> dict:
+    if is_sqlite:
+        return {"check_same_thread": False}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        return {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+    return {}
+
+
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+    connect_args=_sync_connect_args(),
+    **_pool_kwargs()
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine (asyncpg / aiosqlite) for request paths that must not block the event loop
+async_engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL),
+    connect_args=_async_connect_args(),
+    **_pool_kwargs()
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Create base class for models
 Base = declarative_base()
 
+# Services that accept either session flavour during the sync -> async migration
+AnySession = Union[Session, AsyncSession]
+
 
 # Dependency to get DB session
 def get_db():
@@ -24,3 +87,58 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Dependency to get an async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def db_execute(db: AnySession, statement: Any, params: Optional[dict] = None):
+    """Execute a statement on a sync Session or an AsyncSession."""
+    if isinstance(db, AsyncSession):
+        return await db.execute(statement, params)
+    return db.execute(statement, params)
+
+
+async def db_commit(db: AnySession) -> None:
+    if isinstance(db, AsyncSession):
+        await db.commit()
+    else:
+        db.commit()
+
+
+async def db_rollback(db: AnySession) -> None:
+    if isinstance(db, AsyncSession):
+        await db.rollback()
+    else:
+        db.rollback()
+
+
+async def db_flush(db: AnySession) -> None:
+    if isinstance(db, AsyncSession):
+        await db.flush()
+    else:
+        db.flush()
+
+
+async def db_refresh(db: AnySession, instance: Any) -> None:
+    if isinstance(db, AsyncSession):
+        await db.refresh(instance)
+    else:
+        db.refresh(instance)
+
+
+async def db_delete(db: AnySession, instance: Any) -> None:
+    if isinstance(db, AsyncSession):
+        await db.delete(instance)
+    else:
+        db.delete(instance)
+
+
+async def db_close(db: AnySession) -> None:
+    if isinstance(db, AsyncSession):
+        await db.close()
+    else:
+        db.close()
@@ -137,7 +137,7 @@ async def startup_event():
     try:
         db = SessionLocal()
         settings_service = SettingsService(db)
-        settings_service.initialize_defaults()
+        await settings_service.initialize_defaults()
         logger.info("Settings initialized with defaults")
         db.close()
     except Exception as e:
@@ -194,6 +194,19 @@ async def startup_event():
     logger.info("=" * 50)
 
 
+@app.on_event("shutdown")
+def shutdown_event():
+    # Persist API key last_used_at values still buffered in memory
+    from app.core.auth import flush_api_key_usage
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        flush_api_key_usage(db, force=True)
+    finally:
+        db.close()
+
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -204,6 +217,22 @@ async def health_check():
     }
 
 
+@app.get("/health/claude")
+async def claude_health():
+    """Claude API governor counters (queue depth, in-flight calls, wait time, retries)."""
+    from app.services.claude_governor import get_claude_governor
+    return get_claude_governor().get_stats()
+
+
+@app.get("/health/jobs")
+async def jobs_health():
+    """Background job queue depth per lane (workers run via `python -m app.worker`)."""
+    from app.core.database import AsyncSessionLocal
+    from app.services.job_queue import JobQueue
+    async with AsyncSessionLocal() as db:
+        return await JobQueue(db).get_stats()
+
+
 # MCP (Model Context Protocol) Endpoints
 
 @app.get("/api/mcp/status")
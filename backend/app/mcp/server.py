@@ -253,11 +253,15 @@ async def _search_documents(args: Dict[str, Any]) -> List[TextContent]:
             query=query,
             filters=filters,
             page=1,
-            size=limit
+            size=limit,
+            total_mode="capped",  # Only shown as "N+" past the cap; skips counting huge matches
+            include_text=False,
+            snippets=1
         )
 
         documents = results.get("documents", [])
         total = results.get("total", 0)
+        total_label = f"{total}+" if results.get("total_relation") == "gte" else str(total)
 
         if total == 0:
             return [TextContent(
@@ -266,7 +270,7 @@ async def _search_documents(args: Dict[str, Any]) -> List[TextContent]:
             )]
 
         # Format results for Claude
-        response = f"Found {total} documents (showing {len(documents)}):\n\n"
+        response = f"Found {total_label} documents (showing {len(documents)}):\n\n"
 
         for doc in documents[:10]:  # Show first 10
             data = doc.get("data", {})
@@ -284,10 +288,13 @@ async def _search_documents(args: Dict[str, Any]) -> List[TextContent]:
 
                 response += f"   {field}: {value}{conf_str}\n"
 
+            for snippet in doc.get("highlights", {}).get("full_text", []):
+                response += f"   > {snippet}\n"
+
             response += "\n"
 
         if total > 10:
-            response += f"... and {total - 10} more documents\n"
+            response += f"... and {total - 10}{'+' if total_label.endswith('+') else ''} more documents\n"
 
         return [TextContent(type="text", text=response)]
 
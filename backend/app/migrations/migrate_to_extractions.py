@@ -20,6 +20,7 @@ from app.core.database import Base, SessionLocal, engine
 from app.models.batch import Batch
 from app.models.document import Document, ExtractedField
 from app.models.extraction import Extraction
+from app.models.folder import Folder
 from app.models.physical_file import PhysicalFile
 from app.utils.hashing import calculate_file_hash
 
@@ -195,6 +196,7 @@ def rollback_migration(db: Session):
     # Delete extractions (this will cascade to batch_extractions)
     extraction_count = db.query(Extraction).count()
     db.query(Extraction).delete()
+    db.query(Folder).delete()  # Bulk delete bypasses the folder count hook
 
     # Delete physical files
     file_count = db.query(PhysicalFile).count()
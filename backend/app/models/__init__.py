@@ -1,13 +1,17 @@
 # Export all models for easy imports
 # NOTE: Import permissions BEFORE document to resolve DocumentPermission relationship
+from app.models.analytics import AnalyticsDirtyDay, AnalyticsRollup
 from app.models.background_job import BackgroundJob
 from app.models.batch import Batch
 from app.models.canonical_mapping import CanonicalAlias, CanonicalFieldMapping
 from app.models.document import Document, ExtractedField
 from app.models.extraction import Extraction
+from app.models.folder import Folder
+from app.models.parse_result import MatchFeatures, ParseResult
 from app.models.permissions import (
     APIKey,
     DocumentPermission,
+    EffectivePermission,
     FolderPermission,
     Permission,
     Role,
@@ -17,17 +21,19 @@ from app.models.permissions import (
 from app.models.physical_file import PhysicalFile
 from app.models.query_pattern import QueryPattern
 from app.models.schema import Schema
-from app.models.settings import Organization, Settings, User
+from app.models.settings import Organization, Settings, SettingsVersion, User
 from app.models.template import SchemaTemplate
 from app.models.verification import Verification, VerificationSession
 
 # PostgreSQL-only models (conditionally import for SQLite compatibility)
 try:
-    from app.models.search_index import DocumentSearchIndex, TemplateSignature
+    from app.models.search_index import DocumentChunk, DocumentSearchIndex, TemplateSignature, TypedFieldIndex
     HAS_POSTGRES_MODELS = True
 except Exception:
+    DocumentChunk = None
     DocumentSearchIndex = None
     TemplateSignature = None
+    TypedFieldIndex = None
     HAS_POSTGRES_MODELS = False
 
 __all__ = [
@@ -36,6 +42,7 @@ __all__ = [
     "Permission",
     "UserRole",
     "DocumentPermission",
+    "EffectivePermission",
     "FolderPermission",
     "ShareLink",
     "APIKey",
@@ -48,14 +55,22 @@ __all__ = [
     "VerificationSession",
     "PhysicalFile",
     "Extraction",
+    "Folder",
+    "ParseResult",
+    "MatchFeatures",
     "Batch",
     "QueryPattern",
     "Settings",
+    "SettingsVersion",
     "Organization",
     "User",
     "BackgroundJob",
+    "AnalyticsRollup",
+    "AnalyticsDirtyDay",
     "DocumentSearchIndex",
+    "DocumentChunk",
     "TemplateSignature",
+    "TypedFieldIndex",
     "CanonicalFieldMapping",
     "CanonicalAlias",
 ]
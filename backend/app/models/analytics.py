@@ -0,0 +1,132 @@
+from datetime import date, datetime
+
+from sqlalchemy import Column, Date, DateTime, Float, Index, Integer, String, event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.models.document import Document, ExtractedField
+from app.models.verification import Verification
+
+
+class AnalyticsRollup(Base):
+    """
+    Pre-aggregated analytics per organization, template (schema) and day.
+
+    One row per (organization_id, schema_id, day, metric, dimension); the
+    analytics endpoints sum these instead of scanning documents,
+    extracted_fields and verifications on every dashboard poll.
+
+    Metrics (see app.services.analytics_rollup_service):
+        documents         dimension = status, by upload day
+        processing_time   dimension = duration bucket, total = seconds, by processed day
+        field_confidence  dimension = field name, count/total of confidence scores, by extraction day
+        review_queue      dimension = field name, fields awaiting review, by extraction day
+        verifications     dimension = verification type, by verification day
+
+    Days touched by a write are recorded in analytics_dirty_days (before_flush
+    hook below) and recomputed by AnalyticsRollupService.refresh.
+    """
+    __tablename__ = "analytics_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    organization_id = Column(Integer, nullable=True)
+    schema_id = Column(Integer, nullable=True)
+    day = Column(Date, nullable=False)
+    metric = Column(String, nullable=False)
+    dimension = Column(String, nullable=False, default="")
+    count = Column(Integer, nullable=False, default=0)
+    total = Column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        Index('ix_analytics_rollups_metric_day', 'metric', 'day'),
+        Index('ix_analytics_rollups_day', 'day'),
+    )
+
+
+class AnalyticsDirtyDay(Base):
+    """A day whose rollups are stale because a source row on that day changed."""
+    __tablename__ = "analytics_dirty_days"
+
+    day = Column(Date, primary_key=True)
+    marked_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+# Columns whose changes move a row between rollup buckets or change its values
+_TRACKED_COLUMNS = {
+    Document: ("status", "uploaded_at", "processed_at", "schema_id", "organization_id"),
+    ExtractedField: ("field_name", "confidence_score", "needs_verification", "verified", "extracted_at",
+                     "document_id"),
+    Verification: ("verification_type", "verified_at", "extracted_field_id"),
+}
+_DAY_COLUMNS = {
+    Document: ("uploaded_at", "processed_at"),
+    ExtractedField: ("extracted_at",),
+    Verification: ("verified_at",),
+}
+
+# Per engine: whether analytics_dirty_days exists (migration applied)
+_dirty_table_present = {}
+
+
+def _rollups_enabled(session: Session) -> bool:
+    bind = session.get_bind()
+    engine = getattr(bind, "engine", bind)
+    if engine not in _dirty_table_present:
+        _dirty_table_present[engine] = inspect(session.connection()).has_table(AnalyticsDirtyDay.__tablename__)
+    return _dirty_table_present[engine]
+
+
+def _as_day(value):
+    if isinstance(value, datetime):
+        return value.date()
+    return value if isinstance(value, date) else None
+
+
+@event.listens_for(Session, "before_flush")
+def _mark_rollup_days(session, flush_context, instances):
+    """Record the days whose rollups a document, field or verification write makes stale."""
+    candidates = [
+        (obj, state) for state, obj in (
+            [("new", o) for o in session.new]
+            + [("dirty", o) for o in session.dirty]
+            + [("deleted", o) for o in session.deleted]
+        )
+        if type(obj) in _TRACKED_COLUMNS
+    ]
+    if not candidates or not _rollups_enabled(session):
+        return
+
+    days = set()
+    today = datetime.utcnow().date()
+    for obj, state in candidates:
+        columns = _DAY_COLUMNS[type(obj)]
+        if state == "dirty":
+            attrs = inspect(obj).attrs
+            if not any(attrs[column].history.has_changes() for column in _TRACKED_COLUMNS[type(obj)]):
+                continue
+            for column in columns:
+                history = attrs[column].history
+                days.update(_as_day(value) for value in (*history.added, *history.unchanged, *history.deleted))
+            if isinstance(obj, Document) and (
+                attrs.schema_id.history.has_changes() or attrs.organization_id.history.has_changes()
+            ):
+                # Field and verification rollups carry the document's template and org
+                days.update(_as_day(value) for value in session.execute(
+                    select(ExtractedField.extracted_at).where(ExtractedField.document_id == obj.id)
+                ).scalars())
+                days.update(_as_day(value) for value in session.execute(
+                    select(Verification.verified_at).join(ExtractedField)
+                    .where(ExtractedField.document_id == obj.id)
+                ).scalars())
+        else:
+            for column in columns:
+                value = getattr(obj, column)
+                if value is None and state == "new" and column != "processed_at":
+                    value = today  # Column default applied at INSERT
+                days.add(_as_day(value))
+
+    days.discard(None)
+    if days:
+        from app.services.analytics_rollup_service import mark_dirty_days
+
+        mark_dirty_days(session, days)
@@ -1,6 +1,6 @@
 """Background job model for tracking long-running tasks"""
 
-from sqlalchemy import JSON, Column, DateTime, Integer, String
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String
 from sqlalchemy.sql import func
 
 from app.core.database import Base
@@ -11,17 +11,38 @@ class BackgroundJob(Base):
     Model for tracking background jobs (field extraction, re-processing, etc.)
 
     Used to provide progress updates to users for long-running operations.
+    Doubles as a durable work queue (see app/services/job_queue.py): workers
+    claim "queued" rows with FOR UPDATE SKIP LOCKED and hold a lease while
+    they run them.
     """
     __tablename__ = "background_jobs"
+    __table_args__ = (
+        # Claim order for the worker queue
+        Index("ix_background_jobs_claim", "status", "priority", "available_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
     # Job type (e.g., "field_extraction", "template_migration")
     type = Column(String, nullable=False, index=True)
 
-    # Status: "running", "completed", "failed", "cancelled"
+    # Status: "queued", "running", "completed", "failed", "cancelled"
     status = Column(String, nullable=False, default="running", index=True)
 
+    # Queue scheduling: lane ("interactive", "default", "bulk"), lower priority runs first
+    lane = Column(String, nullable=False, default="default", server_default="default")
+    priority = Column(Integer, nullable=False, default=50, server_default="50")
+    available_at = Column(DateTime, server_default=func.now(), nullable=True)  # Not claimable before this
+
+    # Retries
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    max_attempts = Column(Integer, nullable=False, default=3, server_default="3")
+
+    # Lease held by the worker running the job (renewed by heartbeats)
+    locked_by = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+
     # Progress tracking
     total_items = Column(Integer, nullable=False, default=0)
     processed_items = Column(Integer, nullable=False, default=0)
@@ -59,6 +80,9 @@ class BackgroundJob(Base):
             "processed_items": self.processed_items,
             "progress": self.progress_percentage,
             "metadata": self.job_data,  # Expose as 'metadata' in API for backwards compat
+            "lane": self.lane,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
@@ -1,12 +1,26 @@
 from datetime import datetime
 
-from sqlalchemy import JSON, Boolean, Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    Computed,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
+from app.models.parse_result import StoredParseResultMixin
 
 
-class Document(Base):
+class Document(StoredParseResultMixin, Base):
     __tablename__ = "documents"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -36,11 +50,11 @@ class Document(Base):
     # DEPRECATED: Parse cache now on PhysicalFile for sharing across Documents
     # Kept for backwards compatibility during migration
     reducto_job_id = Column(String, nullable=True)  # For pipelining: Parse job ID
-    reducto_parse_result = Column(JSON, nullable=True)  # Cache parse results to avoid re-parsing
+    # reducto_parse_result: cached parse output, stored out of row (StoredParseResultMixin)
     elasticsearch_id = Column(String, nullable=True)
 
     # Timestamps
-    uploaded_at = Column(DateTime, default=datetime.utcnow)
+    uploaded_at = Column(DateTime, default=datetime.utcnow, nullable=False)  # Listing keyset (see below)
     processed_at = Column(DateTime, nullable=True)
 
     # Error tracking
@@ -69,7 +83,7 @@ class Document(Base):
     @property
     def actual_parse_result(self):
         """Get actual parse result, preferring PhysicalFile over legacy field."""
-        if self.physical_file and self.physical_file.reducto_parse_result:
+        if self.physical_file and self.physical_file.has_parse_result:
             return self.physical_file.reducto_parse_result
         return self.reducto_parse_result
 
@@ -81,12 +95,37 @@ class Document(Base):
         return self.reducto_job_id
 
 
+# Document listings page newest first by keyset on (uploaded_at, id)
+Index("ix_documents_uploaded_at_id", Document.uploaded_at.desc(), Document.id.desc())
+
+
+# SQL form of ExtractedField.audit_priority (keep the two in sync). Stored as a
+# generated column so the audit queue can filter, sort and index on it.
+AUDIT_PRIORITY_SQL = (
+    "CASE"
+    " WHEN COALESCE(confidence_score, 0.0) < 0.6 AND validation_status = 'error' THEN 0"
+    " WHEN COALESCE(confidence_score, 0.0) < 0.6 OR validation_status = 'error' THEN 1"
+    " WHEN COALESCE(confidence_score, 0.0) < 0.8 OR validation_status = 'warning' THEN 2"
+    " ELSE 3 END"
+)
+AUDIT_PRIORITY_LABELS = {0: "critical", 1: "high", 2: "medium", 3: "low"}
+
+
 class ExtractedField(Base):
     __tablename__ = "extracted_fields"
+    __table_args__ = (
+        # Audit queue: unverified fields ordered by priority, then confidence
+        Index(
+            "ix_extracted_fields_audit_queue",
+            "audit_priority_level", "confidence_score",
+            postgresql_where=text("verified = false"),
+            sqlite_where=text("verified = 0"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     # Support both old (document_id) and new (extraction_id) for backwards compatibility
-    document_id = Column(Integer, ForeignKey("documents.id"), nullable=True)  # Legacy
+    document_id = Column(Integer, ForeignKey("documents.id"), nullable=True, index=True)  # Legacy
     extraction_id = Column(Integer, ForeignKey("extractions.id"), nullable=True)  # New
     field_name = Column(String, nullable=False)
 
@@ -118,6 +157,9 @@ class ExtractedField(Base):
     validation_errors = Column(JSON, nullable=True)  # List of error messages
     validation_checked_at = Column(DateTime, nullable=True)
 
+    # Audit priority (0=critical .. 3=low), computed by the database from the columns above
+    audit_priority_level = Column(Integer, Computed(AUDIT_PRIORITY_SQL, persisted=True))
+
     # Relationships
     document = relationship("Document", back_populates="extracted_fields")  # Legacy
     extraction = relationship("Extraction", back_populates="extracted_fields")  # New
@@ -154,5 +196,4 @@ class ExtractedField(Base):
     @property
     def priority_label(self) -> str:
         """Get human-readable priority label"""
-        labels = {0: "critical", 1: "high", 2: "medium", 3: "low"}
-        return labels.get(self.audit_priority, "unknown")
+        return AUDIT_PRIORITY_LABELS.get(self.audit_priority, "unknown")
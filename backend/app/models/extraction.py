@@ -1,7 +1,18 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+    inspect,
+)
+from sqlalchemy.orm import Session, relationship
 
 from app.core.database import Base
 
@@ -27,6 +38,8 @@ class Extraction(Base):
     # Virtual folder organization (metadata only - no file duplication!)
     # Example: "Invoice/2025-10-11/contract.pdf"
     organized_path = Column(String, index=True)
+    # Folder part of organized_path ("Invoice/2025-10-11", "" at root); kept in sync on flush
+    folder_path = Column(String, nullable=True)
 
     # Elasticsearch
     elasticsearch_id = Column(String, nullable=True)
@@ -44,5 +57,52 @@ class Extraction(Base):
     schema = relationship("Schema")
     extracted_fields = relationship("ExtractedField", back_populates="extraction", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Paginated file listing per folder, and subtree filters (folder_path LIKE 'Invoice/%')
+        Index('ix_extractions_folder_path_id', 'folder_path', 'id'),
+        Index('ix_extractions_folder_path_prefix', 'folder_path', postgresql_ops={'folder_path': 'text_pattern_ops'}),
+    )
+
     def __repr__(self):
         return f"<Extraction(id={self.id}, file='{self.physical_file.filename if self.physical_file else 'N/A'}', template='{self.template.name if self.template else 'N/A'}')>"
+
+
+def folder_of(organized_path):
+    """Folder part of an organized path ("" for a file at the root, None without a path)."""
+    if organized_path is None:
+        return None
+    organized_path = organized_path.strip("/")
+    return organized_path.rsplit("/", 1)[0] if "/" in organized_path else ""
+
+
+@event.listens_for(Session, "before_flush")
+def _maintain_folder_counts(session, flush_context, instances):
+    """Keep folder_path and the folders table in step with extraction inserts, moves and deletes."""
+    deltas = {}
+
+    def shift(folder_path, delta):
+        if folder_path is not None:
+            deltas[folder_path] = deltas.get(folder_path, 0) + delta
+
+    for obj in session.new:
+        if isinstance(obj, Extraction):
+            obj.folder_path = folder_of(obj.organized_path)
+            shift(obj.folder_path, 1)
+
+    for obj in session.dirty:
+        if isinstance(obj, Extraction) and inspect(obj).attrs.organized_path.history.has_changes():
+            new_folder = folder_of(obj.organized_path)
+            if new_folder != obj.folder_path:
+                shift(obj.folder_path, -1)
+                shift(new_folder, 1)
+                obj.folder_path = new_folder
+
+    for obj in session.deleted:
+        if isinstance(obj, Extraction):
+            shift(obj.folder_path, -1)
+
+    deltas = {path: delta for path, delta in deltas.items() if delta}
+    if deltas:
+        from app.services.folder_service import apply_folder_deltas
+
+        apply_folder_deltas(session, deltas)
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, Integer, String
+
+from app.core.database import Base
+
+
+class Folder(Base):
+    """
+    Materialized virtual folder derived from Extraction.organized_path.
+
+    One row per folder that contains at least one extraction (directly or in
+    a subfolder). Counts are maintained in the same transaction as the
+    extraction insert/move/delete (see the before_flush hook in
+    app.models.extraction), so browsing a level reads its child folders and
+    one page of files instead of every extraction below it.
+
+    Example: "Invoice/2025-10-11/a.pdf" implies folders "Invoice"
+    (parent_path "") and "Invoice/2025-10-11" (parent_path "Invoice").
+    """
+    __tablename__ = "folders"
+
+    id = Column(Integer, primary_key=True, index=True)
+    path = Column(String, nullable=False, unique=True)  # "Invoice/2025-10-11"
+    parent_path = Column(String, nullable=False, index=True)  # "" for top-level folders
+    name = Column(String, nullable=False)  # "2025-10-11"
+    depth = Column(Integer, nullable=False)  # 1 for top-level folders
+
+    direct_count = Column(Integer, nullable=False, default=0)  # Extractions directly in this folder
+    recursive_count = Column(Integer, nullable=False, default=0)  # Extractions in this folder or below
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # Subtree lookups (path LIKE 'Invoice/%') use the index regardless of collation
+        Index('ix_folders_path_prefix', 'path', postgresql_ops={'path': 'text_pattern_ops'}),
+        Index('ix_folders_depth_path', 'depth', 'path'),
+    )
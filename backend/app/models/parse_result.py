@@ -0,0 +1,154 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, LargeBinary, String, Text, event
+from sqlalchemy.orm import Session, column_property, declared_attr, deferred
+
+from app.core.database import Base
+
+_MISSING = object()
+
+
+class ParseResult(Base):
+    """
+    Compressed Reducto parse output, stored out of row and addressed by content.
+
+    Identical parse outputs share one row (content_hash = sha256 of the
+    canonical JSON). The blob lives in ``data`` (storage "db") or in a file
+    under PARSE_RESULT_DIR (storage "disk"); see ParseResultStore.
+    """
+    __tablename__ = "parse_results"
+
+    content_hash = Column(String(64), primary_key=True)
+    file_hash = Column(String, nullable=True)  # Source file (first one that produced this output)
+    parser_version = Column(String(50), nullable=True)
+
+    codec = Column(String(10), nullable=False)  # zstd, gzip
+    storage = Column(String(10), nullable=False)  # db, disk
+    data = deferred(Column(LargeBinary, nullable=True))  # Compressed JSON when storage == "db"
+    raw_size = Column(Integer, nullable=False)
+    stored_size = Column(Integer, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_parse_results_file_parser', 'file_hash', 'parser_version'),
+    )
+
+
+class MatchFeatures(Base):
+    """
+    Compact features of a parse result used by template matching and clustering.
+
+    Computed once when the parse result is written (and by the
+    match_features_backfill job for older rows), keyed like ParseResult by
+    content hash, so matching never has to load or re-tokenize the full
+    parse output. See app.services.match_feature_service.
+    """
+    __tablename__ = "match_features"
+
+    content_hash = Column(String(64), primary_key=True)  # ParseResult.content_hash
+    feature_version = Column(Integer, nullable=False)
+
+    head_text = Column(Text, nullable=False)  # First chunks' content, for trigram similarity
+    sample_text = Column(Text, nullable=False)  # Block-aware head sample, for the Claude fallback
+    tokens = Column(JSON, nullable=False)  # Sorted normalized word set (Jaccard)
+    shingles = Column(JSON, nullable=False)  # Sorted crc32 hashes of word 3-shingles
+    field_names = Column(JSON, nullable=False)  # Candidate "Label:" field names
+    page_count = Column(Integer, nullable=True)
+    chunk_count = Column(Integer, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class StoredParseResultMixin:
+    """
+    ``reducto_parse_result`` backed by the parse-result store.
+
+    The JSON column is deferred so loading a Document/PhysicalFile never
+    pulls the parse output; rows reference a ParseResult by hash instead.
+    Reading the attribute fetches (and LRU-caches) the blob on first access;
+    assigning it queues the blob for write at the next flush. Rows that
+    still carry the legacy in-row JSON are read from it until migrated.
+    """
+
+    @declared_attr
+    def legacy_parse_result(cls):
+        return deferred(Column("reducto_parse_result", JSON, nullable=True))
+
+    @declared_attr
+    def parse_result_hash(cls):
+        return Column(String(64), nullable=True, index=True)
+
+    @declared_attr
+    def has_legacy_parse_result(cls):
+        # Loaded with the row as "reducto_parse_result IS NOT NULL", so the check never pulls the JSON
+        return column_property(cls.legacy_parse_result.columns[0].isnot(None))
+
+    @property
+    def has_parse_result(self) -> bool:
+        """Whether a parse result exists, without loading it (out of row or legacy in-row)."""
+        pending = self.__dict__.get("_pending_parse_result", _MISSING)
+        if pending is not _MISSING:
+            return pending is not None
+        if self.parse_result_hash is not None:
+            return True
+        if "legacy_parse_result" in self.__dict__:  # Already loaded or assigned in this session
+            return self.__dict__["legacy_parse_result"] is not None
+        return bool(self.has_legacy_parse_result)
+
+    @property
+    def reducto_parse_result(self):
+        pending = self.__dict__.get("_pending_parse_result", _MISSING)
+        if pending is not _MISSING:
+            return pending
+
+        content_hash = self.parse_result_hash
+        if content_hash is None:
+            return self.legacy_parse_result
+
+        memo = self.__dict__.get("_parse_result_memo")
+        if memo is None or memo[0] != content_hash:
+            from app.services.parse_result_store import get_parse_result_store
+
+            memo = (content_hash, get_parse_result_store().get(content_hash))
+            self.__dict__["_parse_result_memo"] = memo
+        return memo[1]
+
+    @reducto_parse_result.setter
+    def reducto_parse_result(self, value):
+        from app.services.parse_result_store import get_parse_result_store
+
+        self.__dict__.pop("_parse_result_memo", None)
+        self.legacy_parse_result = None
+        if value is None:
+            self.__dict__.pop("_pending_parse_result", None)
+            self.__dict__.pop("_pending_parse_raw", None)
+            self.parse_result_hash = None
+            return
+
+        # Hash now (marks the row dirty); the blob is written in before_flush
+        self.parse_result_hash, raw = get_parse_result_store().stage(value)
+        self.__dict__["_pending_parse_result"] = value
+        self.__dict__["_pending_parse_raw"] = raw
+
+
+@event.listens_for(Session, "before_flush")
+def _write_pending_parse_results(session, flush_context, instances):
+    """Persist blobs (and their match features) for parse results assigned since the last flush."""
+    pending = [
+        obj for obj in list(session.new) + list(session.dirty)
+        if isinstance(obj, StoredParseResultMixin) and "_pending_parse_result" in obj.__dict__
+    ]
+    if not pending:
+        return
+
+    from app.services.match_feature_service import put_match_features
+    from app.services.parse_result_store import get_parse_result_store
+
+    store = get_parse_result_store()
+    for obj in pending:
+        value = obj.__dict__.pop("_pending_parse_result")
+        raw = obj.__dict__.pop("_pending_parse_raw")
+        store.put(session, obj.parse_result_hash, raw, file_hash=getattr(obj, "file_hash", None))
+        put_match_features(session, obj.parse_result_hash, value)
+        obj.__dict__["_parse_result_memo"] = (obj.parse_result_hash, value)
@@ -9,6 +9,7 @@ Architecture:
 - UserRoles: Assigns roles to users with optional scope (global/org/folder)
 - DocumentPermissions: Document-level sharing and access control
 - FolderPermissions: Folder-level access control
+- EffectivePermissions: Flattened document/folder grants for bulk access checks
 
 Permission Resolution Order:
 1. Direct user permissions (DocumentPermission, FolderPermission)
@@ -31,14 +32,16 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
     Text,
     UniqueConstraint,
+    event,
 )
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Session, relationship
 
 from app.core.database import Base
 
@@ -306,6 +309,76 @@ class FolderPermission(Base):
     )
 
 
+class EffectivePermission(Base):
+    """
+    Flattened access grants: one row per active document or folder grant.
+
+    Maintained on flush from DocumentPermission and FolderPermission (see
+    _maintain_effective_permissions), so every grant, revoke and share path
+    keeps it current. A row grants its principal (a user, or everyone holding
+    a role) access to one document or to a folder prefix, so
+    PermissionService.filter_accessible resolves a whole result page with one
+    indexed lookup instead of per-document queries.
+
+    folder_prefix is normalized without leading/trailing slashes ("" = root),
+    matching Extraction.folder_path.
+    """
+    __tablename__ = "effective_permissions"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Source grant ("document" -> DocumentPermission.id, "folder" -> FolderPermission.id)
+    source_type = Column(String, nullable=False)
+    source_id = Column(Integer, nullable=False)
+
+    # Principal
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    role_id = Column(Integer, ForeignKey("roles.id", ondelete="CASCADE"), nullable=True)
+
+    # Resource: a document, or a folder (and its subfolders when include_subfolders)
+    document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=True)
+    folder_prefix = Column(String, nullable=True)
+    include_subfolders = Column(Boolean, default=True)
+    # Folder grants: the granting user's organization. Folder paths are shared by
+    # every org, so a folder grant only covers that org's documents.
+    org_id = Column(Integer, ForeignKey("organizations.id", ondelete="CASCADE"), nullable=True)
+
+    can_read = Column(Boolean, default=False)
+    can_write = Column(Boolean, default=False)
+    can_delete = Column(Boolean, default=False)
+    can_share = Column(Boolean, default=False)
+
+    expires_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint('source_type', 'source_id', name='uix_effective_permission_source'),
+        Index('ix_effective_permissions_user_document', 'user_id', 'document_id'),
+        Index('ix_effective_permissions_role_document', 'role_id', 'document_id'),
+    )
+
+
+def normalize_folder_path(folder_path):
+    """Folder path in Extraction.folder_path form: "/contracts/2024/" -> "contracts/2024"."""
+    return (folder_path or "").strip("/")
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_effective_permissions(session, flush_context):
+    """Mirror flushed DocumentPermission/FolderPermission rows into effective_permissions."""
+    changed, removed = [], []
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, (DocumentPermission, FolderPermission)):
+            changed.append(obj)
+    for obj in session.deleted:
+        if isinstance(obj, (DocumentPermission, FolderPermission)):
+            removed.append(obj)
+
+    if changed or removed:
+        from app.services.permission_service import sync_effective_permissions
+
+        sync_effective_permissions(session, changed, removed)
+
+
 class ShareLink(Base):
     """
     Shareable links for documents with optional expiration and access control.
@@ -427,6 +500,7 @@ class APIKey(Base):
     - Keys are hashed using bcrypt before storage
     - Plain key shown only once at creation
     - Keys have 'pb_' prefix for identification
+    - Keys embed a non-secret lookup ID (key_prefix) so verification checks one hash
     - Can be scoped to specific permissions
     - Track last usage for security auditing
     """
@@ -436,6 +510,7 @@ class APIKey(Base):
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     name = Column(String, nullable=False)  # Friendly name: "MCP Server", "Python Script"
     key_hash = Column(String, nullable=False, unique=True)  # bcrypt hash of the key
+    key_prefix = Column(String, nullable=True, unique=True, index=True)  # Public lookup ID ("pb_<prefix>_..."); NULL for legacy keys
 
     # Permissions & expiration
     expires_at = Column(DateTime, nullable=True)  # Optional expiration
@@ -1,12 +1,13 @@
 from datetime import datetime
 
-from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
+from app.models.parse_result import StoredParseResultMixin
 
 
-class PhysicalFile(Base):
+class PhysicalFile(StoredParseResultMixin, Base):
     """
     Represents the actual uploaded file on disk.
     One physical file can have multiple extractions with different templates.
@@ -28,8 +29,8 @@ class PhysicalFile(Base):
     mime_type = Column(String)
 
     # Reducto parsing (shared across all extractions of this file)
+    # Parse output itself lives in parse_results (StoredParseResultMixin.reducto_parse_result)
     reducto_job_id = Column(String, nullable=True)
-    reducto_parse_result = Column(JSON, nullable=True)
 
     # Timestamps
     uploaded_at = Column(DateTime, default=datetime.utcnow)
@@ -14,6 +14,7 @@ from sqlalchemy import (
     String,
     Text,
     Index,
+    UniqueConstraint,
 )
 from sqlalchemy.dialects.postgresql import TSVECTOR, JSONB
 from sqlalchemy.orm import relationship
@@ -65,6 +66,36 @@ class DocumentSearchIndex(Base):
     )
 
 
+class DocumentChunk(Base):
+    """
+    Passage-level slice of a document's indexed text.
+
+    One row per Reducto parse chunk (long chunks split), written with the
+    document's search index entry. start_char/end_char are offsets into
+    DocumentSearchIndex.full_text, so a passage can be shown in context; the
+    per-chunk tsvector serves passage search, and (document_id, chunk_number)
+    fetches one chunk without reading the whole text.
+    """
+    __tablename__ = "document_chunks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
+    chunk_number = Column(Integer, nullable=False)  # 1-based, in reading order
+
+    page = Column(Integer)  # First page the chunk appears on
+    start_char = Column(Integer, nullable=False)
+    end_char = Column(Integer, nullable=False)
+    bbox = Column(JSONB)  # {page, left, top, width, height} around the chunk's blocks on that page
+
+    content = Column(Text, nullable=False)
+    content_tsv = Column(TSVECTOR)  # Generated column in migration
+
+    __table_args__ = (
+        UniqueConstraint('document_id', 'chunk_number', name='uq_document_chunks_document_chunk'),
+        Index('idx_document_chunks_content', 'content_tsv', postgresql_using='gin'),
+    )
+
+
 class TemplateSignature(Base):
     """
     Template signatures for similarity matching.
@@ -97,3 +128,32 @@ class TemplateSignature(Base):
         Index('idx_template_sig_field_names_trgm', 'field_names_text', postgresql_using='gin', postgresql_ops={'field_names_text': 'gin_trgm_ops'}),
         Index('idx_template_sig_sample_text_trgm', 'sample_text', postgresql_using='gin', postgresql_ops={'sample_text': 'gin_trgm_ops'}),
     )
+
+
+class TypedFieldIndex(Base):
+    """
+    Typed expression index over one extracted field of document_search_index.
+
+    Range filters and numeric/date aggregations read JSONB values through
+    pb_try_numeric()/pb_try_timestamp(); a B-tree index on that expression
+    lets "amount > 1000" use an index scan instead of casting every row.
+    Query builders only emit the indexed expression for "active" rows.
+    """
+    __tablename__ = "typed_field_indexes"
+
+    id = Column(Integer, primary_key=True, index=True)
+    field_name = Column(String, nullable=False)
+    value_type = Column(String(20), nullable=False)  # numeric, date
+    index_name = Column(String(63), nullable=False, unique=True)
+
+    status = Column(String(20), nullable=False, default="pending")  # pending, active, failed
+    source = Column(String(20), nullable=False, default="manual")  # manual, auto
+    usage_score = Column(Integer, nullable=False, default=0)  # Query history score when (re)evaluated
+    error = Column(Text)
+
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    built_at = Column(DateTime)
+
+    __table_args__ = (
+        UniqueConstraint('field_name', 'value_type', name='uq_typed_field_index_field_type'),
+    )
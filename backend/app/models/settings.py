@@ -152,6 +152,20 @@ class Settings(Base):
     )
 
 
+class SettingsVersion(Base):
+    """
+    Single-row change counter for the settings table.
+
+    Bumped on every settings write so processes caching resolved settings
+    (SettingsService) can notice changes made elsewhere and reload.
+    """
+    __tablename__ = "settings_version"
+
+    id = Column(Integer, primary_key=True)  # Always 1
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class OrganizationInvite(Base):
     """
     Invitation system for users to join organizations.
@@ -0,0 +1,300 @@
+"""
+Batched planner for PostgresService.get_multi_aggregations.
+
+Running each aggregation separately rebuilds the filter subquery and scans
+document_search_index once per aggregation. The planner folds a whole batch
+into one statement over a shared CTE of the filtered rows:
+
+    WITH filtered AS (                -- one scan, only the projected fields
+        SELECT extracted_fields->>'amount' ..., CASE ... END, date_trunc(...)
+        FROM document_search_index WHERE <filters>
+    ),
+    scalar_aggs AS (                  -- stats / cardinality / percentiles
+        SELECT count(*), sum(v0), avg(v0), ..., count(DISTINCT v1), percentile_cont(...)
+        FROM filtered
+    ),
+    grouped_aggs AS (                 -- terms / range / date_histogram
+        SELECT *, row_number() OVER (PARTITION BY grouping_id ORDER BY doc_count DESC)
+        FROM (
+            SELECT k0, k1, GROUPING(k0, k1) AS grouping_id, count(*) AS doc_count
+            FROM filtered GROUP BY GROUPING SETS ((k0), (k1))
+        ) ...
+        WHERE <top-N per grouping set>
+    )
+    SELECT * FROM scalar_aggs LEFT JOIN grouped_aggs ON true
+
+Results have the same shape as PostgresService.get_aggregations.
+"""
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, literal_column, or_, select, true, tuple_
+from sqlalchemy import case as sql_case
+
+from app.models.search_index import DocumentSearchIndex
+from app.services.typed_field_index_service import numeric_field_expr, timestamp_field_expr
+
+logger = logging.getLogger(__name__)
+
+SCALAR_AGG_TYPES = {"stats", "cardinality", "percentiles"}
+GROUPED_AGG_TYPES = {"terms", "range", "date_histogram"}
+BATCHABLE_AGG_TYPES = SCALAR_AGG_TYPES | GROUPED_AGG_TYPES
+
+DEFAULT_TERMS_SIZE = 100
+DEFAULT_PERCENTS = [25, 50, 75, 95, 99]
+DATE_TRUNC_INTERVALS = {"year", "quarter", "month", "week", "day", "hour", "minute"}
+
+
+def _field_text(field: str):
+    return DocumentSearchIndex.extracted_fields[field].astext
+
+
+def _range_case(field_expr, ranges: List[Dict[str, Any]]):
+    """CASE expression assigning each row to the first matching range (same as get_aggregations)."""
+    case_conditions = []
+    for i, r in enumerate(ranges):
+        from_val = r.get("from")
+        to_val = r.get("to")
+        key = r.get("key", f"range_{i}")
+
+        if from_val is not None and to_val is not None:
+            case_conditions.append((and_(field_expr >= from_val, field_expr < to_val), key))
+        elif from_val is not None:
+            case_conditions.append((field_expr >= from_val, key))
+        elif to_val is not None:
+            case_conditions.append((field_expr < to_val, key))
+
+    return sql_case(*case_conditions, else_="other")
+
+
+class MultiAggregationPlan:
+    """
+    One SQL statement computing a batch of aggregations.
+
+    Identical inputs are shared: two aggregations over the same field and
+    value kind project one column, and two terms aggregations on the same
+    field share one grouping set (ranked up to the larger size).
+    """
+
+    def __init__(self, aggregations: List[Dict[str, Any]]):
+        self.aggregations: List[Tuple[str, str, str, Dict[str, Any]]] = []
+
+        # signature -> label of the projected column in the filtered CTE
+        self._columns: Dict[Tuple, str] = {}
+        self._projections = []
+        # signature -> (column label, size limit or None)
+        self._grouping_sets: Dict[Tuple, List] = {}
+
+        for agg_def in aggregations:
+            name = agg_def["name"]
+            agg_type = agg_def["type"]
+            if agg_type not in BATCHABLE_AGG_TYPES:
+                logger.warning(f"Aggregation type '{agg_type}' not yet implemented")
+                continue
+            if agg_type == "range" and not (agg_def.get("config") or {}).get("ranges"):
+                logger.warning("Range aggregation requires 'ranges' in config")
+            self.aggregations.append((name, agg_def["field"], agg_type, agg_def.get("config") or {}))
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.aggregations
+
+    def _column(self, signature: Tuple, build) -> str:
+        """Project an expression once into the filtered CTE and return its label."""
+        if signature not in self._columns:
+            label = f"c{len(self._columns)}"
+            self._columns[signature] = label
+            self._projections.append(build().label(label))
+        return self._columns[signature]
+
+    def _value_column(self, field: str, kind: str) -> str:
+        if kind == "float":
+            return self._column((field, "float"), lambda: numeric_field_expr(field))
+        return self._column((field, "text"), lambda: _field_text(field))
+
+    def _group_key(self, field: str, agg_type: str, config: Dict[str, Any]) -> Tuple:
+        """Signature of the grouping set an aggregation reads from (also registers its column)."""
+        if agg_type == "terms":
+            signature = (field, "terms")
+            label = self._value_column(field, "text")
+            size = config.get("size", DEFAULT_TERMS_SIZE)
+        elif agg_type == "date_histogram":
+            interval = config.get("interval", "month")
+            pg_interval = interval if interval in DATE_TRUNC_INTERVALS else "month"
+            signature = (field, "date_histogram", pg_interval)
+            label = self._column(signature, lambda: func.date_trunc(pg_interval, timestamp_field_expr(field)))
+            size = None
+        else:
+            ranges = config.get("ranges") or []
+            signature = (field, "range", repr(ranges))
+            label = self._column(signature, lambda: _range_case(numeric_field_expr(field), ranges))
+            size = None
+
+        grouping_set = self._grouping_sets.setdefault(signature, [label, size])
+        if grouping_set[1] is not None and (size is None or size > grouping_set[1]):
+            grouping_set[1] = size
+        return signature
+
+    def build(self, source):
+        """
+        Build the statement.
+
+        Args:
+            source: Filtered select over DocumentSearchIndex; only its FROM and
+                WHERE are used
+
+        Returns:
+            Select producing one row per grouped bucket (or a single row when
+            there are no grouped aggregations), each carrying the scalar results
+        """
+        scalar_exprs = []
+        self._scalar_labels: Dict[str, Any] = {}
+        self._set_of: Dict[str, Tuple] = {}
+
+        # Register every column first so the filtered CTE is complete
+        for name, field, agg_type, config in self.aggregations:
+            if agg_type in GROUPED_AGG_TYPES:
+                if agg_type == "range" and not config.get("ranges"):
+                    continue
+                self._set_of[name] = self._group_key(field, agg_type, config)
+            elif agg_type == "cardinality":
+                self._value_column(field, "text")
+            else:
+                self._value_column(field, "float")
+
+        projections = self._projections or [literal_column("1").label("c0")]
+        filtered = source.with_only_columns(*projections, maintain_column_froms=True).cte("filtered")
+
+        for i, (name, field, agg_type, config) in enumerate(self.aggregations):
+            if agg_type == "stats":
+                col = filtered.c[self._value_column(field, "float")]
+                labels = {metric: f"a{i}_{metric}" for metric in ("count", "sum", "avg", "min", "max")}
+                scalar_exprs += [
+                    func.count(col).label(labels["count"]),
+                    func.sum(col).label(labels["sum"]),
+                    func.avg(col).label(labels["avg"]),
+                    func.min(col).label(labels["min"]),
+                    func.max(col).label(labels["max"]),
+                ]
+                self._scalar_labels[name] = labels
+            elif agg_type == "cardinality":
+                col = filtered.c[self._value_column(field, "text")]
+                scalar_exprs.append(func.count(func.distinct(col)).label(f"a{i}_value"))
+                self._scalar_labels[name] = f"a{i}_value"
+            elif agg_type == "percentiles":
+                col = filtered.c[self._value_column(field, "float")]
+                percents = config.get("percents", DEFAULT_PERCENTS)
+                labels = {}
+                for j, p in enumerate(percents):
+                    labels[str(float(p))] = f"a{i}_p{j}"
+                    scalar_exprs.append(func.percentile_cont(p / 100.0).within_group(col.asc()).label(f"a{i}_p{j}"))
+                self._scalar_labels[name] = labels
+
+        scalar = select(func.count().label("total"), *scalar_exprs).select_from(filtered).cte("scalar_aggs")
+
+        if not self._grouping_sets:
+            return select(scalar)
+
+        key_columns = [filtered.c[label] for label, _ in self._grouping_sets.values()]
+        counts = select(
+            *[col.label(f"k{n}") for n, col in enumerate(key_columns)],
+            func.grouping(*key_columns).label("grouping_id"),
+            func.count().label("doc_count"),
+        ).select_from(filtered).group_by(
+            func.grouping_sets(*[tuple_(col) for col in key_columns])
+        ).subquery("bucket_counts")
+
+        key_labels = [counts.c[f"k{n}"] for n in range(len(key_columns))]
+        ranked = select(
+            counts,
+            func.row_number().over(
+                partition_by=counts.c.grouping_id,
+                order_by=[counts.c.doc_count.desc()] + [col.asc() for col in key_labels]
+            ).label("bucket_rank"),
+        ).subquery("ranked")
+
+        # GROUPING() sets a bit for every key *not* in the row's grouping set
+        all_bits = (1 << len(key_columns)) - 1
+        self._grouping_ids: Dict[Tuple, int] = {}
+        size_conditions = []
+        for n, (signature, (_, size)) in enumerate(self._grouping_sets.items()):
+            set_id = all_bits ^ (1 << (len(key_columns) - 1 - n))
+            self._grouping_ids[signature] = set_id
+            if size is None:
+                size_conditions.append(ranked.c.grouping_id == set_id)
+            else:
+                size_conditions.append(and_(ranked.c.grouping_id == set_id, ranked.c.bucket_rank <= size))
+
+        grouped = select(ranked).where(or_(*size_conditions)).cte("grouped_aggs")
+        return select(scalar, grouped).select_from(scalar.outerjoin(grouped, true()))
+
+    def parse(self, rows: List[Any]) -> Dict[str, Any]:
+        """Turn the statement's rows into get_multi_aggregations results keyed by name."""
+        results: Dict[str, Any] = {}
+        first = rows[0]._mapping if rows else {}
+
+        buckets_by_set: Dict[int, List[Tuple[Any, int]]] = {}
+        if self._grouping_sets:
+            key_of = {
+                set_id: f"k{n}" for n, set_id in enumerate(self._grouping_ids.values())
+            }
+            for row in rows:
+                mapping = row._mapping
+                set_id = mapping["grouping_id"]
+                if set_id is None:
+                    continue
+                buckets_by_set.setdefault(set_id, []).append(
+                    (mapping[key_of[set_id]], mapping["doc_count"], mapping["bucket_rank"])
+                )
+
+        for name, _, agg_type, config in self.aggregations:
+            if agg_type == "stats":
+                labels = self._scalar_labels[name]
+                values = {metric: first.get(label) for metric, label in labels.items()}
+                results[name] = {
+                    "count": values["count"] or 0,
+                    "sum": float(values["sum"]) if values["sum"] else 0.0,
+                    "avg": float(values["avg"]) if values["avg"] else 0.0,
+                    "min": float(values["min"]) if values["min"] else 0.0,
+                    "max": float(values["max"]) if values["max"] else 0.0
+                }
+            elif agg_type == "cardinality":
+                results[name] = {"value": first.get(self._scalar_labels[name]) or 0}
+            elif agg_type == "percentiles":
+                results[name] = {"values": {
+                    percent: float(first[label]) if first.get(label) is not None else None
+                    for percent, label in self._scalar_labels[name].items()
+                }}
+            elif name not in self._set_of:
+                results[name] = {"buckets": []}
+            else:
+                buckets = buckets_by_set.get(self._grouping_ids[self._set_of[name]], [])
+                results[name] = {"buckets": self._format_buckets(agg_type, config, buckets)}
+
+        return results
+
+    @staticmethod
+    def _format_buckets(agg_type: str, config: Dict[str, Any], buckets: List[Tuple]) -> List[Dict[str, Any]]:
+        if agg_type == "terms":
+            size = config.get("size", DEFAULT_TERMS_SIZE)
+            ordered = sorted(buckets, key=lambda b: b[2])[:size]
+            return [{"key": key, "doc_count": count} for key, count, _ in ordered]
+
+        if agg_type == "date_histogram":
+            ordered = sorted((b for b in buckets if b[0] is not None), key=lambda b: b[0])
+            return [
+                {
+                    "key": key.isoformat(),
+                    "key_as_string": key.strftime("%Y-%m-%d"),
+                    "doc_count": count
+                }
+                for key, count, _ in ordered
+            ]
+
+        return [{"key": key, "doc_count": count} for key, count, _ in sorted(buckets, key=lambda b: b[2])]
+
+
+def plan_multi_aggregations(aggregations: List[Dict[str, Any]]) -> Optional[MultiAggregationPlan]:
+    """Plan a batch, or None when nothing in it can be batched."""
+    plan = MultiAggregationPlan(aggregations)
+    return None if plan.is_empty else plan
@@ -0,0 +1,240 @@
+"""
+Analytics rollups: per organization/template/day aggregates for the dashboard.
+
+Writes to documents, extracted_fields and verifications mark their days
+dirty (before_flush hook in app.models.analytics). refresh() recomputes the
+rollup rows of dirty days from the source tables with one INSERT ... SELECT
+... GROUP BY per metric, restricted to those days, so the work is
+proportional to what changed. The analytics endpoints refresh before reading
+(ANALYTICS_REFRESH_ON_READ) and then sum rollup rows, O(templates x days).
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Iterable, List, Optional, Sequence
+
+from sqlalchemy import and_, delete, extract, func, literal, or_, select
+from sqlalchemy import case as sql_case
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.analytics import AnalyticsDirtyDay, AnalyticsRollup
+from app.models.document import Document, ExtractedField
+from app.models.verification import Verification
+
+logger = logging.getLogger(__name__)
+
+METRIC_DOCUMENTS = "documents"
+METRIC_PROCESSING_TIME = "processing_time"
+METRIC_FIELD_CONFIDENCE = "field_confidence"
+METRIC_REVIEW_QUEUE = "review_queue"
+METRIC_VERIFICATIONS = "verifications"
+
+# Processing-time histogram: (upper bound in seconds, bucket label)
+PROCESSING_TIME_BUCKETS = [(60, "<1m"), (300, "1-5m"), (900, "5-15m"), (3600, "15-60m"), (None, ">1h")]
+
+REFRESH_DAY_BATCH = 31  # Dirty days recomputed per statement batch
+
+ROLLUP_COLUMNS = ["organization_id", "schema_id", "day", "metric", "dimension", "count", "total"]
+
+
+def mark_dirty_days(db: Session, days: Iterable[date]) -> None:
+    """
+    Flag days for recomputation (runs inside before_flush, in the caller's transaction).
+
+    Re-marking a day bumps marked_at; a refresh in progress holds the day's
+    row lock, so the writer waits and the day stays dirty for the next refresh.
+    """
+    now = datetime.utcnow()
+    rows = [{"day": day, "marked_at": now} for day in sorted(days)]
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = insert(AnalyticsDirtyDay).values(rows)
+        db.execute(stmt.on_conflict_do_update(index_elements=["day"], set_={"marked_at": stmt.excluded.marked_at}))
+    else:
+        existing = set(db.execute(
+            select(AnalyticsDirtyDay.day).where(AnalyticsDirtyDay.day.in_([row["day"] for row in rows]))
+        ).scalars())
+        new_rows = [row for row in rows if row["day"] not in existing]
+        if new_rows:
+            db.execute(AnalyticsDirtyDay.__table__.insert(), new_rows)
+
+
+def _on_days(column, days: Optional[Sequence[date]]):
+    """Rows whose timestamp falls on one of the days (range predicates, index friendly)."""
+    if days is None:
+        return column.isnot(None)
+    return or_(*(
+        and_(column >= datetime.combine(day, datetime.min.time()),
+             column < datetime.combine(day + timedelta(days=1), datetime.min.time()))
+        for day in days
+    ))
+
+
+class AnalyticsRollupService:
+    """Maintains and reads analytics_rollups."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ---- maintenance -------------------------------------------------
+
+    def refresh(self, max_days: Optional[int] = None) -> int:
+        """
+        Recompute rollups for dirty days and clear their marks.
+
+        Dirty rows are locked (FOR UPDATE) while they are recomputed, so
+        concurrent refreshes serialize per day instead of double-inserting.
+
+        Args:
+            max_days: Cap on days recomputed in this call (oldest first)
+
+        Returns:
+            Number of days recomputed
+        """
+        stmt = select(AnalyticsDirtyDay.day).order_by(AnalyticsDirtyDay.day).with_for_update()
+        if max_days:
+            stmt = stmt.limit(max_days)
+        days = [_as_date(day) for day in self.db.execute(stmt).scalars()]
+        if not days:
+            return 0
+
+        try:
+            for start in range(0, len(days), REFRESH_DAY_BATCH):
+                self._recompute(days[start:start + REFRESH_DAY_BATCH])
+            self.db.execute(delete(AnalyticsDirtyDay).where(AnalyticsDirtyDay.day.in_(days)))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        logger.info(f"Refreshed analytics rollups for {len(days)} day(s)")
+        return len(days)
+
+    def rebuild(self) -> int:
+        """
+        Recompute every rollup from scratch (backfill, or repair after bulk
+        statements that bypass the ORM hook).
+
+        Returns:
+            Number of rollup rows written
+        """
+        try:
+            self.db.execute(delete(AnalyticsDirtyDay))
+            self._recompute(None)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return self.db.query(func.count(AnalyticsRollup.id)).scalar()
+
+    def _recompute(self, days: Optional[List[date]]) -> None:
+        if days is None:
+            self.db.execute(delete(AnalyticsRollup))
+        else:
+            self.db.execute(delete(AnalyticsRollup).where(AnalyticsRollup.day.in_(days)))
+        for stmt in self._rollup_selects(days):
+            self.db.execute(AnalyticsRollup.__table__.insert().from_select(ROLLUP_COLUMNS, stmt))
+
+    def _seconds_between(self, start, end):
+        if self.db.get_bind().dialect.name == "sqlite":
+            return (func.julianday(end) - func.julianday(start)) * 86400.0
+        return extract("epoch", end - start)
+
+    def _rollup_selects(self, days: Optional[List[date]]):
+        """One grouped SELECT per metric, in ROLLUP_COLUMNS order."""
+        zero = literal(0.0)
+
+        uploaded_day = func.date(Document.uploaded_at)
+        status = func.coalesce(Document.status, "")
+        yield (
+            select(Document.organization_id, Document.schema_id, uploaded_day, literal(METRIC_DOCUMENTS),
+                   status, func.count(), zero)
+            .where(_on_days(Document.uploaded_at, days))
+            .group_by(Document.organization_id, Document.schema_id, uploaded_day, status)
+        )
+
+        processed_day = func.date(Document.processed_at)
+        seconds = self._seconds_between(Document.uploaded_at, Document.processed_at)
+        bucket = sql_case(
+            *((seconds < bound, label) for bound, label in PROCESSING_TIME_BUCKETS if bound is not None),
+            else_=PROCESSING_TIME_BUCKETS[-1][1]
+        )
+        yield (
+            select(Document.organization_id, Document.schema_id, processed_day, literal(METRIC_PROCESSING_TIME),
+                   bucket, func.count(), func.sum(seconds))
+            .where(_on_days(Document.processed_at, days), Document.uploaded_at.isnot(None))
+            .group_by(Document.organization_id, Document.schema_id, processed_day, bucket)
+        )
+
+        extracted_day = func.date(ExtractedField.extracted_at)
+        field_source = select(
+            Document.organization_id, Document.schema_id, extracted_day
+        ).select_from(ExtractedField).outerjoin(Document, ExtractedField.document_id == Document.id)
+        field_groups = (Document.organization_id, Document.schema_id, extracted_day, ExtractedField.field_name)
+        yield (
+            field_source.add_columns(
+                literal(METRIC_FIELD_CONFIDENCE), ExtractedField.field_name,
+                func.count(ExtractedField.confidence_score), func.coalesce(func.sum(ExtractedField.confidence_score), 0.0)
+            )
+            .where(_on_days(ExtractedField.extracted_at, days))
+            .group_by(*field_groups)
+        )
+        yield (
+            field_source.add_columns(
+                literal(METRIC_REVIEW_QUEUE), ExtractedField.field_name, func.count(), zero
+            )
+            .where(
+                _on_days(ExtractedField.extracted_at, days),
+                ExtractedField.needs_verification.is_(True),
+                ExtractedField.verified.is_(False)
+            )
+            .group_by(*field_groups)
+        )
+
+        verified_day = func.date(Verification.verified_at)
+        yield (
+            select(Document.organization_id, Document.schema_id, verified_day, literal(METRIC_VERIFICATIONS),
+                   Verification.verification_type, func.count(), zero)
+            .select_from(Verification)
+            .join(ExtractedField, Verification.extracted_field_id == ExtractedField.id)
+            .outerjoin(Document, ExtractedField.document_id == Document.id)
+            .where(_on_days(Verification.verified_at, days))
+            .group_by(Document.organization_id, Document.schema_id, verified_day, Verification.verification_type)
+        )
+
+    # ---- reads -------------------------------------------------------
+
+    def totals(
+        self,
+        metric: str,
+        by: Sequence[str] = ("dimension",),
+        since: Optional[date] = None
+    ) -> List[Any]:
+        """
+        Summed count/total of a metric grouped by rollup columns.
+
+        Args:
+            metric: One of the METRIC_* names
+            by: Rollup columns to group on ("dimension", "schema_id", "day", ...)
+            since: Only days on or after this date
+
+        Returns:
+            Rows of (*by, count, total)
+        """
+        columns = [getattr(AnalyticsRollup, name) for name in by]
+        stmt = (
+            select(*columns, func.sum(AnalyticsRollup.count), func.sum(AnalyticsRollup.total))
+            .where(AnalyticsRollup.metric == metric)
+            .group_by(*columns)
+            .order_by(*columns)
+        )
+        if since is not None:
+            stmt = stmt.where(AnalyticsRollup.day >= since)
+        return self.db.execute(stmt).all()
+
+
+def _as_date(value) -> date:
+    return date.fromisoformat(value) if isinstance(value, str) else value
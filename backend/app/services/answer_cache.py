@@ -1,58 +1,111 @@
 """
 Answer caching service to reduce Claude API calls for repeated queries.
 
-Caches answers based on (query + result_ids) hash to avoid regenerating
-identical answers. This provides 90% cost reduction for repeated queries.
+Caches answers based on (query + result_ids + filters) hash to avoid
+regenerating identical answers. Every entry records the documents it was
+generated from (its result_ids; answers over the whole corpus, such as
+aggregations, depend on ALL_DOCUMENTS), and invalidate_documents() drops the
+answers that depend on a changed document.
+
+Backends (ANSWER_CACHE_BACKEND):
+    memory  per-process LRU (OrderedDict, O(1) get/set), bounded by entries and bytes
+    sql     answer_cache_* tables shared by every process, in the app database
+            or a SQLite file (ANSWER_CACHE_URL)
+    redis   a Redis-compatible server (ANSWER_CACHE_URL; needs the redis package)
+
+Shared backends sit behind a per-process memory tier that drops its copy
+when the shared invalidation generation moves (checked every
+ANSWER_CACHE_VERSION_CHECK_SECONDS).
+
+Writes to extracted fields and the search index invalidate dependent answers
+after commit (session hooks at the bottom of this module); PostgresService
+invalidates explicitly for statements that bypass the ORM.
 """
 
 import hashlib
+import json
 import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    create_engine,
+    delete,
+    event,
+    func,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+try:
+    import redis
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
 
 logger = logging.getLogger(__name__)
 
+ALL_DOCUMENTS = 0  # Dependency of answers computed over the whole corpus (document ids start at 1)
+
+
+def _generate_cache_key(query: str, result_ids: List[int], filters: Optional[Dict] = None) -> str:
+    """MD5 of query + sorted result ids + filters (order of result_ids does not matter)."""
+    filter_str = str(sorted(filters.items())) if filters else ""
+    key_str = f"{query}:{sorted(result_ids)}:{filter_str}"
+    return hashlib.md5(key_str.encode()).hexdigest()
+
+
+def _dependencies(result_ids: List[int]) -> Set[int]:
+    return set(result_ids) if result_ids else {ALL_DOCUMENTS}
+
+
+def _hit_rate(hits: int, misses: int) -> float:
+    total = hits + misses
+    return round(hits / total * 100, 2) if total else 0
+
 
 class AnswerCache:
-    """In-memory cache for search answers to reduce API costs."""
+    """In-memory LRU cache for search answers, bounded by entry count and serialized size."""
 
-    def __init__(self, ttl_seconds: int = 3600, max_size: int = 1000):
+    def __init__(self, ttl_seconds: int = 3600, max_size: int = 1000, max_bytes: Optional[int] = None):
         """
         Initialize answer cache.
 
         Args:
             ttl_seconds: Time-to-live for cached entries (default: 1 hour)
             max_size: Maximum number of entries to cache (default: 1000)
+            max_bytes: Budget for serialized answers (default: unbounded)
         """
-        self.cache: Dict[str, Dict[str, Any]] = {}
+        self.cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self.ttl = timedelta(seconds=ttl_seconds)
         self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._bytes = 0
+        self._by_document: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
         self.hits = 0
         self.misses = 0
-        logger.info(f"Initialized AnswerCache with TTL={ttl_seconds}s, max_size={max_size}")
-
-    def _generate_cache_key(self, query: str, result_ids: List[int], filters: Optional[Dict] = None) -> str:
-        """
-        Generate cache key from query + result IDs + filters.
+        self.evictions = 0
+        self.invalidations = 0
+        logger.info(f"Initialized AnswerCache with TTL={ttl_seconds}s, max_size={max_size}, max_bytes={max_bytes}")
 
-        Args:
-            query: User's search query
-            result_ids: List of document IDs in results
-            filters: Optional query filters (template_id, folder_path, etc.)
-
-        Returns:
-            MD5 hash of the combined inputs
-        """
-        # Sort result_ids to ensure consistent cache key regardless of order
-        sorted_ids = sorted(result_ids)
-
-        # Include filters in cache key if present
-        filter_str = ""
-        if filters:
-            filter_str = str(sorted(filters.items()))
-
-        key_str = f"{query}:{sorted_ids}:{filter_str}"
-        return hashlib.md5(key_str.encode()).hexdigest()
+    _generate_cache_key = staticmethod(_generate_cache_key)
 
     def get(
         self,
@@ -71,29 +124,22 @@ class AnswerCache:
         Returns:
             Cached answer dict or None if not found/expired
         """
-        cache_key = self._generate_cache_key(query, result_ids, filters)
-        cached = self.cache.get(cache_key)
-
-        if not cached:
-            self.misses += 1
-            logger.debug(f"Cache MISS for query: {query[:50]}...")
-            return None
-
-        # Check if expired
-        age = datetime.utcnow() - cached["cached_at"]
-        if age > self.ttl:
-            # Remove expired entry
-            del self.cache[cache_key]
-            self.misses += 1
-            logger.debug(f"Cache EXPIRED for query: {query[:50]}... (age: {age})")
-            return None
-
-        # Cache hit
-        self.hits += 1
-        cached["access_count"] = cached.get("access_count", 0) + 1
-        cached["last_accessed"] = datetime.utcnow()
-
-        logger.info(f"Cache HIT for query: {query[:50]}... (saved Claude API call)")
+        return self.get_by_key(_generate_cache_key(query, result_ids, filters))
+
+    def get_by_key(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cached = self.cache.get(cache_key)
+            if cached is None:
+                self.misses += 1
+                return None
+            if time.monotonic() >= cached["expires_at"]:
+                self._remove(cache_key)
+                self.misses += 1
+                return None
+            self.cache.move_to_end(cache_key)
+            self.hits += 1
+            cached["access_count"] += 1
+        logger.debug(f"Cache HIT for query: {cached['query'][:50]}... (saved Claude API call)")
         return cached["answer"]
 
     def set(
@@ -112,50 +158,79 @@ class AnswerCache:
             answer: Answer dict from Claude service
             filters: Optional query filters
         """
-        # Check if cache is full
-        if len(self.cache) >= self.max_size:
-            # Evict oldest entries (simple LRU)
-            self._evict_oldest()
-
-        cache_key = self._generate_cache_key(query, result_ids, filters)
-
-        self.cache[cache_key] = {
-            "answer": answer,
-            "query": query,
-            "result_count": len(result_ids),
-            "cached_at": datetime.utcnow(),
-            "last_accessed": datetime.utcnow(),
-            "access_count": 0
-        }
-
-        logger.info(f"Cached answer for query: {query[:50]}... (cache size: {len(self.cache)})")
+        self.set_by_key(
+            _generate_cache_key(query, result_ids, filters), query, answer, _dependencies(result_ids),
+            size=len(json.dumps(answer, default=str))
+        )
 
-    def _evict_oldest(self, count: int = 100) -> None:
+    def set_by_key(
+        self,
+        cache_key: str,
+        query: str,
+        answer: Dict[str, Any],
+        dependencies: Set[int],
+        size: int,
+        ttl_seconds: Optional[float] = None
+    ) -> None:
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl.total_seconds()
+        with self._lock:
+            if cache_key in self.cache:
+                self._remove(cache_key)
+            self.cache[cache_key] = {
+                "answer": answer,
+                "query": query,
+                "size": size,
+                "dependencies": dependencies,
+                "expires_at": time.monotonic() + ttl,
+                "access_count": 0
+            }
+            self._bytes += size
+            for document_id in dependencies:
+                self._by_document.setdefault(document_id, set()).add(cache_key)
+
+            # Least recently used entries go first
+            while len(self.cache) > self.max_size or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                self._remove(next(iter(self.cache)))
+                self.evictions += 1
+
+    def _remove(self, cache_key: str) -> None:
+        """Drop an entry and its dependency links (caller holds the lock)."""
+        entry = self.cache.pop(cache_key)
+        self._bytes -= entry["size"]
+        for document_id in entry["dependencies"]:
+            keys = self._by_document.get(document_id)
+            if keys is not None:
+                keys.discard(cache_key)
+                if not keys:
+                    del self._by_document[document_id]
+
+    def invalidate_documents(self, document_ids: Iterable[int]) -> int:
         """
-        Evict oldest entries when cache is full.
+        Drop answers generated from any of these documents (and corpus-wide answers).
 
-        Args:
-            count: Number of entries to evict (default: 10% of max_size)
+        Returns:
+            Number of entries removed
         """
-        if not self.cache:
-            return
-
-        # Sort by last_accessed timestamp
-        sorted_entries = sorted(
-            self.cache.items(),
-            key=lambda x: x[1]["last_accessed"]
-        )
-
-        # Remove oldest entries
-        for key, _ in sorted_entries[:count]:
-            del self.cache[key]
-
-        logger.info(f"Evicted {count} oldest cache entries (cache size: {len(self.cache)})")
+        with self._lock:
+            keys = set()
+            for document_id in {*document_ids, ALL_DOCUMENTS}:
+                keys |= self._by_document.get(document_id, set())
+            for cache_key in keys:
+                self._remove(cache_key)
+            self.invalidations += len(keys)
+        if keys:
+            logger.debug(f"Invalidated {len(keys)} cached answer(s)")
+        return len(keys)
 
     def clear(self) -> None:
         """Clear all cached entries."""
-        count = len(self.cache)
-        self.cache.clear()
+        with self._lock:
+            count = len(self.cache)
+            self.cache.clear()
+            self._by_document.clear()
+            self._bytes = 0
         logger.info(f"Cleared {count} cache entries")
 
     def get_stats(self) -> Dict[str, Any]:
@@ -165,16 +240,18 @@ class AnswerCache:
         Returns:
             Dict with hits, misses, hit_rate, size, etc.
         """
-        total_requests = self.hits + self.misses
-        hit_rate = (self.hits / total_requests * 100) if total_requests > 0 else 0
-
         return {
+            "backend": "memory",
             "hits": self.hits,
             "misses": self.misses,
-            "total_requests": total_requests,
-            "hit_rate": round(hit_rate, 2),
+            "total_requests": self.hits + self.misses,
+            "hit_rate": _hit_rate(self.hits, self.misses),
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
             "cache_size": len(self.cache),
+            "cache_bytes": self._bytes,
             "max_size": self.max_size,
+            "max_bytes": self.max_bytes,
             "ttl_seconds": self.ttl.total_seconds()
         }
 
@@ -185,38 +262,452 @@ class AnswerCache:
         Returns:
             Number of entries removed
         """
+        now = time.monotonic()
+        with self._lock:
+            expired_keys = [key for key, value in self.cache.items() if now >= value["expires_at"]]
+            for key in expired_keys:
+                self._remove(key)
+
+        if expired_keys:
+            logger.info(f"Removed {len(expired_keys)} expired cache entries")
+        return len(expired_keys)
+
+
+# Shared SQL tier (app database or a SQLite file)
+
+_metadata = MetaData()
+
+answer_cache_entries = Table(
+    "answer_cache_entries", _metadata,
+    Column("cache_key", String(32), primary_key=True),
+    Column("query", Text, nullable=False),
+    Column("answer", Text, nullable=False),  # JSON
+    Column("size_bytes", Integer, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("expires_at", DateTime, nullable=False, index=True),
+    Column("last_accessed_at", DateTime, nullable=False, index=True),
+)
+
+answer_cache_dependencies = Table(
+    "answer_cache_dependencies", _metadata,
+    Column("document_id", Integer, primary_key=True),
+    Column("cache_key", String(32), primary_key=True, index=True),
+)
+
+answer_cache_generation = Table(
+    "answer_cache_generation", _metadata,
+    Column("id", Integer, primary_key=True),
+    Column("generation", BigInteger, nullable=False),
+)
+
+
+class SQLAnswerCache:
+    """
+    Answer cache shared through answer_cache_* tables.
+
+    Hits refresh last_accessed_at; every ``trim_every`` writes, entries beyond
+    max_bytes (least recently used first) and expired entries are deleted.
+    Invalidations bump answer_cache_generation for per-process memory tiers.
+    """
+
+    def __init__(
+        self,
+        engine=None,
+        ttl_seconds: int = 3600,
+        max_bytes: Optional[int] = None,
+        trim_every: int = 50
+    ):
+        if engine is None:
+            from app.core.database import engine
+        self.engine = engine
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_bytes = max_bytes
+        self.trim_every = trim_every
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        if engine.dialect.name == "sqlite":
+            _metadata.create_all(engine)  # Private cache file; Postgres uses the migration
+
+    def _upsert(self, table, values: Dict[str, Any], index_elements: List[str], update_columns: List[str]):
+        dialect = self.engine.dialect.name
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = insert(table).values(**values)
+        if not update_columns:
+            return stmt.on_conflict_do_nothing(index_elements=index_elements)
+        return stmt.on_conflict_do_update(
+            index_elements=index_elements, set_={column: stmt.excluded[column] for column in update_columns}
+        )
+
+    def get_by_key(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        now = datetime.utcnow()
+        with self.engine.begin() as conn:
+            answer = conn.execute(
+                update(answer_cache_entries)
+                .where(answer_cache_entries.c.cache_key == cache_key, answer_cache_entries.c.expires_at > now)
+                .values(last_accessed_at=now)
+                .returning(answer_cache_entries.c.answer)
+            ).scalar()
+        if answer is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(answer)
+
+    def get_entry_ttl(self, cache_key: str) -> Optional[float]:
+        with self.engine.connect() as conn:
+            expires_at = conn.execute(
+                select(answer_cache_entries.c.expires_at).where(answer_cache_entries.c.cache_key == cache_key)
+            ).scalar()
+        return (expires_at - datetime.utcnow()).total_seconds() if expires_at else None
+
+    def set_by_key(self, cache_key: str, query: str, answer: Dict[str, Any], dependencies: Set[int], size: int) -> None:
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
         now = datetime.utcnow()
-        expired_keys = []
+        values = {
+            "cache_key": cache_key, "query": query, "answer": json.dumps(answer, default=str), "size_bytes": size,
+            "created_at": now, "expires_at": now + self.ttl, "last_accessed_at": now
+        }
+        with self.engine.begin() as conn:
+            conn.execute(self._upsert(
+                answer_cache_entries, values, ["cache_key"],
+                ["query", "answer", "size_bytes", "created_at", "expires_at", "last_accessed_at"]
+            ))
+            conn.execute(delete(answer_cache_dependencies).where(answer_cache_dependencies.c.cache_key == cache_key))
+            conn.execute(answer_cache_dependencies.insert(), [
+                {"document_id": document_id, "cache_key": cache_key} for document_id in sorted(dependencies)
+            ])
+
+        self._writes += 1
+        if self._writes % self.trim_every == 0:
+            self.trim()
+
+    def _delete_keys(self, conn, keys_select) -> int:
+        keys = list(conn.execute(keys_select).scalars())
+        if keys:
+            conn.execute(delete(answer_cache_dependencies).where(answer_cache_dependencies.c.cache_key.in_(keys)))
+            conn.execute(delete(answer_cache_entries).where(answer_cache_entries.c.cache_key.in_(keys)))
+        return len(keys)
+
+    def trim(self) -> int:
+        """Delete expired entries and, past max_bytes, the least recently used ones."""
+        with self.engine.begin() as conn:
+            removed = self._delete_keys(conn, select(answer_cache_entries.c.cache_key).where(
+                answer_cache_entries.c.expires_at <= datetime.utcnow()
+            ))
+            if self.max_bytes is not None:
+                running = select(
+                    answer_cache_entries.c.cache_key,
+                    func.sum(answer_cache_entries.c.size_bytes).over(
+                        order_by=(answer_cache_entries.c.last_accessed_at.desc(), answer_cache_entries.c.cache_key)
+                    ).label("running_bytes")
+                ).subquery()
+                removed += self._delete_keys(
+                    conn, select(running.c.cache_key).where(running.c.running_bytes > self.max_bytes)
+                )
+        return removed
+
+    def invalidate_documents(self, document_ids: Iterable[int]) -> int:
+        ids = sorted({*document_ids, ALL_DOCUMENTS})
+        with self.engine.begin() as conn:
+            removed = self._delete_keys(conn, select(answer_cache_dependencies.c.cache_key).where(
+                answer_cache_dependencies.c.document_id.in_(ids)
+            ).distinct())
+            if removed:
+                self._bump_generation(conn)
+        self.invalidations += removed
+        return removed
+
+    def _bump_generation(self, conn) -> None:
+        bumped = conn.execute(
+            update(answer_cache_generation).where(answer_cache_generation.c.id == 1)
+            .values(generation=answer_cache_generation.c.generation + 1)
+        )
+        if not bumped.rowcount:
+            conn.execute(self._upsert(answer_cache_generation, {"id": 1, "generation": 1}, ["id"], []))
 
-        for key, value in self.cache.items():
-            age = now - value["cached_at"]
-            if age > self.ttl:
-                expired_keys.append(key)
+    def generation(self) -> int:
+        with self.engine.connect() as conn:
+            return conn.execute(
+                select(answer_cache_generation.c.generation).where(answer_cache_generation.c.id == 1)
+            ).scalar() or 0
 
-        for key in expired_keys:
-            del self.cache[key]
+    def clear(self) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(delete(answer_cache_dependencies))
+            conn.execute(delete(answer_cache_entries))
+            self._bump_generation(conn)
 
-        if expired_keys:
-            logger.info(f"Removed {len(expired_keys)} expired cache entries")
+    def remove_expired(self) -> int:
+        with self.engine.begin() as conn:
+            return self._delete_keys(conn, select(answer_cache_entries.c.cache_key).where(
+                answer_cache_entries.c.expires_at <= datetime.utcnow()
+            ))
 
-        return len(expired_keys)
+    def get_stats(self) -> Dict[str, Any]:
+        with self.engine.connect() as conn:
+            size, size_bytes = conn.execute(
+                select(func.count(), func.coalesce(func.sum(answer_cache_entries.c.size_bytes), 0))
+            ).one()
+        return {
+            "backend": "sql",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": _hit_rate(self.hits, self.misses),
+            "invalidations": self.invalidations,
+            "cache_size": size,
+            "cache_bytes": size_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl.total_seconds()
+        }
 
 
-# Global cache instance (singleton pattern)
-_global_cache: Optional[AnswerCache] = None
+class RedisAnswerCache:
+    """
+    Answer cache shared through a Redis-compatible server.
+
+    Entries expire with the server's TTL and eviction follows its maxmemory
+    policy (use allkeys-lru for size-aware eviction).
+    """
 
+    PREFIX = "answer_cache"
 
-def get_answer_cache() -> AnswerCache:
+    def __init__(self, url: str, ttl_seconds: int = 3600, client=None):
+        if client is None:
+            if not HAS_REDIS:
+                raise ValueError("ANSWER_CACHE_BACKEND=redis requires the redis package")
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _entry(self, cache_key: str) -> str:
+        return f"{self.PREFIX}:entry:{cache_key}"
+
+    def _document(self, document_id: int) -> str:
+        return f"{self.PREFIX}:doc:{document_id}"
+
+    def get_by_key(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        raw = self.client.get(self._entry(cache_key))
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    def get_entry_ttl(self, cache_key: str) -> Optional[float]:
+        ttl = self.client.ttl(self._entry(cache_key))
+        return ttl if ttl and ttl > 0 else None
+
+    def set_by_key(self, cache_key: str, query: str, answer: Dict[str, Any], dependencies: Set[int], size: int) -> None:
+        pipe = self.client.pipeline()
+        pipe.set(self._entry(cache_key), json.dumps(answer, default=str), ex=self.ttl_seconds)
+        for document_id in dependencies:
+            pipe.sadd(self._document(document_id), cache_key)
+            pipe.expire(self._document(document_id), self.ttl_seconds)
+        pipe.execute()
+
+    def invalidate_documents(self, document_ids: Iterable[int]) -> int:
+        dependency_keys = [self._document(document_id) for document_id in {*document_ids, ALL_DOCUMENTS}]
+        cache_keys = set()
+        for key in dependency_keys:
+            cache_keys |= {member.decode() if isinstance(member, bytes) else member
+                           for member in self.client.smembers(key)}
+        removed = self.client.delete(*(self._entry(key) for key in cache_keys)) if cache_keys else 0
+        self.client.delete(*dependency_keys)
+        if removed:
+            self.client.incr(f"{self.PREFIX}:generation")
+        self.invalidations += removed
+        return removed
+
+    def generation(self) -> int:
+        return int(self.client.get(f"{self.PREFIX}:generation") or 0)
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(f"{self.PREFIX}:entry:*")) + list(self.client.scan_iter(f"{self.PREFIX}:doc:*"))
+        if keys:
+            self.client.delete(*keys)
+        self.client.incr(f"{self.PREFIX}:generation")
+
+    def remove_expired(self) -> int:
+        return 0  # The server expires entries itself
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "redis",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": _hit_rate(self.hits, self.misses),
+            "invalidations": self.invalidations,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+class TieredAnswerCache:
+    """Per-process memory LRU in front of a shared tier (SQLAnswerCache or RedisAnswerCache)."""
+
+    def __init__(self, local: AnswerCache, shared, version_check_seconds: float = 5.0):
+        self.local = local
+        self.shared = shared
+        self.version_check_seconds = version_check_seconds
+        self._generation: Optional[int] = None
+        self._generation_checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    _generate_cache_key = staticmethod(_generate_cache_key)
+
+    def _sync_generation(self) -> None:
+        """Drop the local tier when another process invalidated shared entries."""
+        now = time.monotonic()
+        if now - self._generation_checked_at < self.version_check_seconds:
+            return
+        self._generation_checked_at = now
+        try:
+            generation = self.shared.generation()
+        except Exception as e:
+            logger.warning(f"Answer cache generation check failed: {e}")
+            return
+        if self._generation is not None and generation != self._generation:
+            self.local.clear()
+        self._generation = generation
+
+    def get(self, query: str, result_ids: List[int], filters: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
+        self._sync_generation()
+        cache_key = _generate_cache_key(query, result_ids, filters)
+        answer = self.local.get_by_key(cache_key)
+        if answer is None:
+            try:
+                answer = self.shared.get_by_key(cache_key)
+            except Exception as e:
+                logger.warning(f"Shared answer cache read failed: {e}")
+                answer = None
+            if answer is not None:
+                ttl = self.shared.get_entry_ttl(cache_key)
+                if ttl:
+                    self.local.set_by_key(cache_key, query, answer, _dependencies(result_ids),
+                                          size=len(json.dumps(answer, default=str)), ttl_seconds=ttl)
+        if answer is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return answer
+
+    def set(self, query: str, result_ids: List[int], answer: Dict[str, Any], filters: Optional[Dict] = None) -> None:
+        cache_key = _generate_cache_key(query, result_ids, filters)
+        dependencies = _dependencies(result_ids)
+        size = len(json.dumps(answer, default=str))
+        self.local.set_by_key(cache_key, query, answer, dependencies, size)
+        try:
+            self.shared.set_by_key(cache_key, query, answer, dependencies, size)
+        except Exception as e:
+            logger.warning(f"Shared answer cache write failed: {e}")
+
+    def invalidate_documents(self, document_ids: Iterable[int]) -> int:
+        document_ids = list(document_ids)
+        self.local.invalidate_documents(document_ids)
+        return self.shared.invalidate_documents(document_ids)
+
+    def clear(self) -> None:
+        self.local.clear()
+        self.shared.clear()
+
+    def remove_expired(self) -> int:
+        return self.local.remove_expired() + self.shared.remove_expired()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": f"tiered:{self.shared.get_stats()['backend']}",
+            "hits": self.hits,
+            "misses": self.misses,
+            "total_requests": self.hits + self.misses,
+            "hit_rate": _hit_rate(self.hits, self.misses),
+            "local": self.local.get_stats(),
+            "shared": self.shared.get_stats()
+        }
+
+
+# Global cache instance (singleton pattern)
+_global_cache = None
+
+
+def create_answer_cache(backend: Optional[str] = None, url: Optional[str] = None):
+    """Build the cache configured by ANSWER_CACHE_* settings (or the given backend/url)."""
+    backend = backend or settings.ANSWER_CACHE_BACKEND
+    url = url if url is not None else settings.ANSWER_CACHE_URL
+    max_bytes = settings.ANSWER_CACHE_MAX_MB * 1024 * 1024 if settings.ANSWER_CACHE_MAX_MB else None
+    local = AnswerCache(
+        ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS,
+        max_size=settings.ANSWER_CACHE_MAX_ENTRIES,
+        max_bytes=max_bytes
+    )
+    if backend == "memory":
+        return local
+    if backend == "sql":
+        engine = create_engine(url, connect_args={"check_same_thread": False} if url.startswith("sqlite") else {}) \
+            if url else None
+        shared = SQLAnswerCache(engine, ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS, max_bytes=max_bytes)
+    elif backend == "redis":
+        shared = RedisAnswerCache(url or "redis://localhost:6379/0", ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS)
+    else:
+        raise ValueError(f"Unknown answer cache backend '{backend}' (expected memory, sql or redis)")
+    return TieredAnswerCache(local, shared, version_check_seconds=settings.ANSWER_CACHE_VERSION_CHECK_SECONDS)
+
+
+def get_answer_cache():
     """
     Get or create the global answer cache instance.
 
     Returns:
-        Global AnswerCache instance
+        Global answer cache (AnswerCache, or TieredAnswerCache for shared backends)
     """
     global _global_cache
     if _global_cache is None:
-        _global_cache = AnswerCache(
-            ttl_seconds=3600,  # 1 hour
-            max_size=1000  # 1000 entries
-        )
+        _global_cache = create_answer_cache()
     return _global_cache
+
+
+def invalidate_cached_answers(document_ids: Iterable[int]) -> None:
+    """Drop answers built from these documents; cache failures never fail the caller."""
+    document_ids = [document_id for document_id in document_ids if document_id is not None]
+    if not document_ids:
+        return
+    try:
+        get_answer_cache().invalidate_documents(document_ids)
+    except Exception as e:
+        logger.warning(f"Answer cache invalidation failed for {len(document_ids)} document(s): {e}")
+
+
+# Invalidate on commit of any change to the data answers are built from
+
+_ANSWER_SOURCE_TABLES = ("extracted_fields", "document_search_index", "documents")
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_changed_documents(session, flush_context, instances):
+    changed = session.info.setdefault("answer_cache_documents", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table not in _ANSWER_SOURCE_TABLES:
+            continue
+        if table == "documents":
+            if obj in session.deleted:
+                changed.add(obj.id)
+        elif obj in session.new or obj in session.deleted or session.is_modified(obj):
+            changed.add(obj.document_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_documents(session):
+    changed = session.info.pop("answer_cache_documents", None)
+    if changed:
+        invalidate_cached_answers(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_documents(session):
+    session.info.pop("answer_cache_documents", None)
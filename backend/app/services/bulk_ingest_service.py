@@ -0,0 +1,285 @@
+"""
+Pipelined ingest stage for bulk uploads.
+
+Reads and hashes uploads concurrently, deduplicates against existing
+PhysicalFiles with a single query, fans Reducto parses out under a
+concurrency limit and commits PhysicalFile/Document rows in batches as
+parses finish. A failed parse only marks that file's Documents as errored.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import UploadFile
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.document import Document
+from app.models.physical_file import PhysicalFile
+from app.services.reducto_service import ReductoService
+from app.utils.file_organization import get_template_folder
+from app.utils.hashing import calculate_content_hash
+
+logger = logging.getLogger(__name__)
+
+
+def _write_file(file_path: str, content: bytes) -> None:
+    with open(file_path, "wb") as f:
+        f.write(content)
+
+
+class BulkIngestService:
+    """
+    Upload -> dedup -> parse stage of the bulk upload flow.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        reducto_service: Optional[ReductoService] = None,
+        parse_concurrency: Optional[int] = None,
+        commit_batch_size: Optional[int] = None,
+        upload_dir: Optional[str] = None
+    ):
+        """
+        Initialize ingest service.
+
+        Args:
+            db: Database session
+            reducto_service: Parser (injectable for tests/benchmarks)
+            parse_concurrency: Max concurrent Reducto parses
+            commit_batch_size: Number of finished files per commit
+            upload_dir: Directory for new files (default: unmatched template folder)
+        """
+        self.db = db
+        self.reducto_service = reducto_service or ReductoService()
+        self.parse_concurrency = max(1, parse_concurrency or settings.BULK_PARSE_CONCURRENCY)
+        self.commit_batch_size = max(1, commit_batch_size or settings.BULK_COMMIT_BATCH_SIZE)
+        self.upload_dir = upload_dir
+
+    async def ingest(self, files: List[UploadFile]) -> Dict[str, Any]:
+        """
+        Ingest uploaded files.
+
+        Args:
+            files: Uploaded files
+
+        Returns:
+            {
+                "documents": [Document, ...],  # In upload order
+                "unique_files": int,
+                "exact_duplicates_in_batch": int,
+                "parse_calls_saved": int,
+                "parse_failures": [{"filename", "error"}, ...],
+                "timings": {stage: seconds}
+            }
+        """
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+
+        # Stage 1: read + hash concurrently (hashing runs in worker threads)
+        stage_start = time.perf_counter()
+        contents = await asyncio.gather(*(f.read() for f in files))
+        hashes = await asyncio.gather(
+            *(asyncio.to_thread(calculate_content_hash, content) for content in contents)
+        )
+        timings["read_hash_seconds"] = time.perf_counter() - stage_start
+
+        hash_groups: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        exact_duplicates_in_batch = 0
+        for file, content, file_hash in zip(files, contents, hashes):
+            if file_hash in hash_groups:
+                exact_duplicates_in_batch += 1
+                logger.info(f"Duplicate in batch: {file.filename} (hash: {file_hash[:8]}...)")
+            hash_groups.setdefault(file_hash, []).append({
+                "filename": file.filename,
+                "content": content,
+                "content_type": getattr(file, "content_type", None)
+            })
+
+        # Stage 2: one lookup for every hash already on disk
+        stage_start = time.perf_counter()
+        existing = self._existing_physical_files(list(hash_groups.keys()))
+        timings["dedup_lookup_seconds"] = time.perf_counter() - stage_start
+
+        parse_calls_saved = sum(
+            len(hash_groups[h]) for h, pf in existing.items() if pf.has_parse_result
+        )
+        logger.info(
+            f"Dedup analysis: {len(files)} files → {len(hash_groups)} unique hashes "
+            f"({exact_duplicates_in_batch} duplicates in batch, {parse_calls_saved} with cached parse)"
+        )
+
+        # Stage 3: write new files to disk concurrently and add PhysicalFile rows
+        stage_start = time.perf_counter()
+        physical_files, parse_failures = await self._store_new_files(hash_groups, existing)
+        timings["store_seconds"] = time.perf_counter() - stage_start
+
+        # Stage 4: parse what is not cached, persisting Documents as results arrive
+        stage_start = time.perf_counter()
+        documents_by_hash, parse_failures_from_parse, commit_seconds = await self._parse_and_persist(
+            hash_groups, physical_files
+        )
+        parse_failures.extend(parse_failures_from_parse)
+        timings["parse_seconds"] = time.perf_counter() - stage_start
+        timings["commit_seconds"] = commit_seconds
+        timings["total_seconds"] = time.perf_counter() - started
+
+        documents = [doc for file_hash in hash_groups for doc in documents_by_hash.get(file_hash, [])]
+        logger.info(
+            f"Created {len(documents)} Document records from {len(hash_groups)} unique files "
+            f"({len(parse_failures)} failed) in {timings['total_seconds']:.2f}s"
+        )
+
+        return {
+            "documents": documents,
+            "unique_files": len(hash_groups),
+            "exact_duplicates_in_batch": exact_duplicates_in_batch,
+            "parse_calls_saved": parse_calls_saved,
+            "parse_failures": parse_failures,
+            "timings": {stage: round(seconds, 4) for stage, seconds in timings.items()}
+        }
+
+    def _existing_physical_files(self, hashes: List[str]) -> Dict[str, PhysicalFile]:
+        if not hashes:
+            return {}
+        rows = self.db.query(PhysicalFile).filter(PhysicalFile.file_hash.in_(hashes)).all()
+        existing: Dict[str, PhysicalFile] = {}
+        for physical_file in rows:
+            # Prefer a copy that already carries a parse result
+            current = existing.get(physical_file.file_hash)
+            if current is None or (not current.has_parse_result and physical_file.has_parse_result):
+                existing[physical_file.file_hash] = physical_file
+        return existing
+
+    async def _store_new_files(
+        self,
+        hash_groups: "OrderedDict[str, List[Dict[str, Any]]]",
+        existing: Dict[str, PhysicalFile]
+    ) -> Tuple[Dict[str, PhysicalFile], List[Dict[str, str]]]:
+        upload_dir = self.upload_dir or get_template_folder(None)  # unmatched folder
+        os.makedirs(upload_dir, exist_ok=True)
+
+        new_hashes = [h for h in hash_groups if h not in existing]
+        paths = {
+            h: os.path.join(upload_dir, f"{h[:8]}_{hash_groups[h][0]['filename']}") for h in new_hashes
+        }
+        results = await asyncio.gather(
+            *(asyncio.to_thread(_write_file, paths[h], hash_groups[h][0]["content"]) for h in new_hashes),
+            return_exceptions=True
+        )
+
+        physical_files = dict(existing)
+        failures: List[Dict[str, str]] = []
+        for file_hash, result in zip(new_hashes, results):
+            representative = hash_groups[file_hash][0]
+            if isinstance(result, Exception):
+                logger.error(f"Failed to store {representative['filename']}: {result}")
+                failures.extend(
+                    {"filename": info["filename"], "error": f"Store failed: {result}"}
+                    for info in hash_groups[file_hash]
+                )
+                continue
+
+            physical_file = PhysicalFile(
+                filename=representative["filename"],
+                file_hash=file_hash,
+                file_path=paths[file_hash],
+                file_size=len(representative["content"]),
+                mime_type=representative["content_type"]
+            )
+            self.db.add(physical_file)
+            physical_files[file_hash] = physical_file
+
+        self.db.flush()
+        for file_hash in new_hashes:
+            if file_hash in physical_files:
+                logger.info(f"Created PhysicalFile #{physical_files[file_hash].id}: {paths[file_hash]}")
+
+        return physical_files, failures
+
+    async def _parse_and_persist(
+        self,
+        hash_groups: "OrderedDict[str, List[Dict[str, Any]]]",
+        physical_files: Dict[str, PhysicalFile]
+    ) -> Tuple[Dict[str, List[Document]], List[Dict[str, str]], float]:
+        semaphore = asyncio.Semaphore(self.parse_concurrency)
+        documents_by_hash: Dict[str, List[Document]] = {}
+        failures: List[Dict[str, str]] = []
+        commit_seconds = 0.0
+        pending_commit = 0
+
+        async def parse(file_hash: str, file_path: str) -> Tuple[str, Optional[Dict[str, Any]], Optional[Exception]]:
+            async with semaphore:
+                try:
+                    return file_hash, await self.reducto_service.parse_document(file_path), None
+                except Exception as e:
+                    return file_hash, None, e
+
+        def commit() -> float:
+            commit_start = time.perf_counter()
+            self.db.commit()
+            return time.perf_counter() - commit_start
+
+        tasks = []
+        for file_hash, physical_file in physical_files.items():
+            if physical_file.has_parse_result:
+                logger.info(
+                    f"Using cached parse for {physical_file.filename} "
+                    f"(job_id: {physical_file.reducto_job_id})"
+                )
+                documents_by_hash[file_hash] = self._add_documents(physical_file, hash_groups[file_hash])
+                pending_commit += 1
+            else:
+                tasks.append(asyncio.create_task(parse(file_hash, physical_file.file_path)))
+
+        if pending_commit:
+            commit_seconds += commit()
+            pending_commit = 0
+
+        for finished in asyncio.as_completed(tasks):
+            file_hash, parsed, error = await finished
+            physical_file = physical_files[file_hash]
+
+            if error is None:
+                # Cache parse results on PhysicalFile (shared across all Documents)
+                physical_file.reducto_job_id = parsed.get("job_id")
+                physical_file.reducto_parse_result = parsed.get("result")
+                logger.info(f"Parsed {physical_file.filename} → job_id: {parsed.get('job_id')}")
+            else:
+                logger.error(f"Failed to parse {physical_file.filename}: {error}")
+                failures.extend(
+                    {"filename": info["filename"], "error": f"Parse failed: {error}"}
+                    for info in hash_groups[file_hash]
+                )
+
+            documents_by_hash[file_hash] = self._add_documents(physical_file, hash_groups[file_hash])
+            pending_commit += 1
+            if pending_commit >= self.commit_batch_size:
+                commit_seconds += commit()
+                pending_commit = 0
+
+        if pending_commit:
+            commit_seconds += commit()
+
+        return documents_by_hash, failures, commit_seconds
+
+    def _add_documents(self, physical_file: PhysicalFile, file_group: List[Dict[str, Any]]) -> List[Document]:
+        """Create one Document per uploaded copy ("user uploaded invoice.pdf 3 times")."""
+        parsed = physical_file.has_parse_result
+        documents = [
+            Document(
+                physical_file=physical_file,
+                filename=info["filename"],
+                file_path=physical_file.file_path,  # Backwards compatibility with NOT NULL constraint
+                status="analyzing" if parsed else "error",
+                error_message=None if parsed else "Parse failed"
+            )
+            for info in file_group
+        ]
+        self.db.add_all(documents)
+        return documents
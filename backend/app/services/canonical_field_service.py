@@ -12,43 +12,36 @@ from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
 
 from app.models.canonical_mapping import CanonicalAlias, CanonicalFieldMapping
+from app.services.schema_registry import (
+    CanonicalMappingInfo,
+    get_registry_snapshot,
+    invalidate_registry_snapshots,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class CanonicalFieldService:
-    """Service for managing and resolving canonical field mappings."""
+    """
+    Service for managing and resolving canonical field mappings.
+
+    Lookups read the process-wide schema registry snapshot (active mappings as
+    CanonicalMappingInfo, aliases); writes commit through the session, which
+    marks the snapshot stale, and reload.
+    """
 
     def __init__(self, db: Session):
         self.db = db
-        self._cache: Dict[str, CanonicalFieldMapping] = {}
+        self._cache: Dict[str, CanonicalMappingInfo] = {}
         self._alias_cache: Dict[str, str] = {}
         self._load_cache()
 
     def _load_cache(self):
-        """Load canonical mappings and aliases into memory cache."""
+        """Point the lookup caches at the current registry snapshot (shared, read-only)."""
         try:
-            # Load active mappings
-            mappings = self.db.query(CanonicalFieldMapping).filter(
-                CanonicalFieldMapping.is_active == True
-            ).all()
-
-            for mapping in mappings:
-                self._cache[mapping.canonical_name] = mapping
-
-            # Load active aliases
-            aliases = self.db.query(CanonicalAlias).join(
-                CanonicalFieldMapping
-            ).filter(
-                CanonicalAlias.is_active == True,
-                CanonicalFieldMapping.is_active == True
-            ).all()
-
-            for alias in aliases:
-                self._alias_cache[alias.alias] = alias.canonical_field.canonical_name
-
-            logger.info(f"Loaded {len(self._cache)} canonical mappings and {len(self._alias_cache)} aliases")
-
+            snapshot = get_registry_snapshot(self.db)
+            self._cache = snapshot.canonical_mappings
+            self._alias_cache = snapshot.canonical_aliases
         except Exception as e:
             logger.warning(f"Failed to load canonical mappings cache: {e}")
             self._cache = {}
@@ -74,7 +67,7 @@ class CanonicalFieldService:
 
         return None
 
-    def get_mapping(self, canonical_name: str) -> Optional[CanonicalFieldMapping]:
+    def get_mapping(self, canonical_name: str) -> Optional[CanonicalMappingInfo]:
         """
         Get canonical field mapping by name.
 
@@ -82,7 +75,7 @@ class CanonicalFieldService:
             canonical_name: Canonical field name
 
         Returns:
-            CanonicalFieldMapping or None
+            CanonicalMappingInfo (snapshot of the active mapping) or None
         """
         return self._cache.get(canonical_name)
 
@@ -209,8 +202,7 @@ class CanonicalFieldService:
         self.db.commit()
         self.db.refresh(mapping)
 
-        # Update cache
-        self._cache[canonical_name] = mapping
+        self._load_cache()
 
         logger.info(f"Created canonical mapping: {canonical_name} → {len(field_mappings)} templates")
 
@@ -261,8 +253,7 @@ class CanonicalFieldService:
         self.db.commit()
         self.db.refresh(mapping)
 
-        # Update cache
-        self._cache[canonical_name] = mapping
+        self._load_cache()
 
         logger.info(f"Updated canonical mapping: {canonical_name}")
 
@@ -292,9 +283,7 @@ class CanonicalFieldService:
         mapping.is_active = False
         self.db.commit()
 
-        # Remove from cache
-        if canonical_name in self._cache:
-            del self._cache[canonical_name]
+        self._load_cache()
 
         logger.info(f"Deleted canonical mapping: {canonical_name}")
 
@@ -338,8 +327,7 @@ class CanonicalFieldService:
         self.db.commit()
         self.db.refresh(alias_obj)
 
-        # Update cache
-        self._alias_cache[alias] = canonical_name
+        self._load_cache()
 
         logger.info(f"Added alias: {alias} → {canonical_name}")
 
@@ -366,9 +354,7 @@ class CanonicalFieldService:
         alias_obj.is_active = False
         self.db.commit()
 
-        # Remove from cache
-        if alias in self._alias_cache:
-            del self._alias_cache[alias]
+        self._load_cache()
 
         logger.info(f"Removed alias: {alias}")
 
@@ -425,6 +411,5 @@ class CanonicalFieldService:
 
     def refresh_cache(self):
         """Refresh the in-memory cache from database."""
-        self._cache = {}
-        self._alias_cache = {}
+        invalidate_registry_snapshots()
         self._load_cache()
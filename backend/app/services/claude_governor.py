@@ -0,0 +1,212 @@
+"""
+Process-wide concurrency governor for Anthropic API calls.
+
+Every ClaudeService call goes through one shared governor so a burst of
+Ask-AI requests cannot open an unbounded number of LLM round trips. The
+governor caps in-flight calls, applies a per-call timeout, retries 429/529
+responses with jittered exponential backoff and keeps counters for
+monitoring (queue depth, in-flight calls, wait time).
+"""
+
+import asyncio
+import logging
+import random
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import anthropic
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Anthropic status codes worth retrying: rate limited / overloaded
+RETRYABLE_STATUS_CODES = {429, 529}
+
+
+class ClaudeGovernor:
+    """Bounded-concurrency runner with timeout and retry for Anthropic calls."""
+
+    def __init__(
+        self,
+        max_in_flight: int = 8,
+        timeout_seconds: float = 60.0,
+        max_retries: int = 3,
+        retry_base_delay: float = 1.0,
+        retry_max_delay: float = 20.0
+    ):
+        """
+        Initialize governor.
+
+        Args:
+            max_in_flight: Maximum concurrent Anthropic requests per process
+            timeout_seconds: Per-attempt timeout
+            max_retries: Retries after the first attempt on 429/529
+            retry_base_delay: Base delay for exponential backoff (seconds)
+            retry_max_delay: Upper bound for a single backoff sleep (seconds)
+        """
+        self.max_in_flight = max_in_flight
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+
+        # asyncio primitives are bound to one event loop; keep one semaphore per loop
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+        self.queue_depth = 0
+        self.in_flight = 0
+        self.total_calls = 0
+        self.failed_calls = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def run(self, call: Callable[[], Awaitable[Any]], operation: str = "messages.create") -> Any:
+        """
+        Run an Anthropic call under the concurrency cap.
+
+        Args:
+            call: Zero-argument callable returning a fresh awaitable per attempt
+            operation: Label used in log messages
+
+        Returns:
+            Result of the call
+
+        Raises:
+            asyncio.TimeoutError: If the last attempt timed out
+            anthropic.APIError: If the API error is not retryable or retries ran out
+        """
+        attempt = 0
+        while True:
+            try:
+                return await self._run_once(call)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                if attempt >= self.max_retries:
+                    self.failed_calls += 1
+                    logger.error(f"Claude {operation} timed out after {attempt + 1} attempts")
+                    raise
+                delay = self._backoff_delay(attempt)
+            except anthropic.APIStatusError as e:
+                if e.status_code not in RETRYABLE_STATUS_CODES or attempt >= self.max_retries:
+                    self.failed_calls += 1
+                    raise
+                delay = self._retry_after(e) or self._backoff_delay(attempt)
+
+            attempt += 1
+            self.retries += 1
+            logger.warning(
+                f"Claude {operation} throttled/timed out, retry {attempt}/{self.max_retries} in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+
+    async def _run_once(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        semaphore = self._semaphore()
+
+        self.queue_depth += 1
+        wait_started = time.monotonic()
+        try:
+            await semaphore.acquire()
+        finally:
+            self.queue_depth -= 1
+
+        waited = time.monotonic() - wait_started
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+        self.in_flight += 1
+        self.total_calls += 1
+        try:
+            return await asyncio.wait_for(call(), timeout=self.timeout_seconds)
+        finally:
+            self.in_flight -= 1
+            semaphore.release()
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        ceiling = min(self.retry_max_delay, self.retry_base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def _retry_after(self, error: anthropic.APIStatusError) -> Optional[float]:
+        """Honor a Retry-After header (seconds) when the API sends one."""
+        response = getattr(error, "response", None)
+        value = response.headers.get("retry-after") if response is not None else None
+        try:
+            return min(float(value), self.retry_max_delay) if value else None
+        except ValueError:
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get governor statistics.
+
+        Returns:
+            Dictionary with queue depth, in-flight calls, wait times and retry counters
+        """
+        return {
+            "max_in_flight": self.max_in_flight,
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "total_calls": self.total_calls,
+            "failed_calls": self.failed_calls,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "avg_wait_seconds": round(self.total_wait_seconds / self.total_calls, 4) if self.total_calls else 0.0,
+            "max_wait_seconds": round(self.max_wait_seconds, 4)
+        }
+
+
+# Global governor and client instances (singleton pattern)
+_global_governor: Optional[ClaudeGovernor] = None
+_global_client: Optional[anthropic.AsyncAnthropic] = None
+
+
+def get_claude_governor() -> ClaudeGovernor:
+    """
+    Get or create the global Claude governor instance.
+
+    Returns:
+        Global ClaudeGovernor instance
+    """
+    global _global_governor
+    if _global_governor is None:
+        _global_governor = ClaudeGovernor(
+            max_in_flight=settings.CLAUDE_MAX_IN_FLIGHT,
+            timeout_seconds=settings.CLAUDE_REQUEST_TIMEOUT,
+            max_retries=settings.CLAUDE_MAX_RETRIES,
+            retry_base_delay=settings.CLAUDE_RETRY_BASE_DELAY,
+            retry_max_delay=settings.CLAUDE_RETRY_MAX_DELAY
+        )
+    return _global_governor
+
+
+def get_async_anthropic_client() -> anthropic.AsyncAnthropic:
+    """
+    Get or create the shared AsyncAnthropic client.
+
+    SDK-level retries are disabled because the governor owns retry policy.
+
+    Returns:
+        Global AsyncAnthropic instance
+    """
+    global _global_client
+    if _global_client is None:
+        _global_client = anthropic.AsyncAnthropic(
+            api_key=settings.ANTHROPIC_API_KEY,
+            max_retries=0,
+            timeout=settings.CLAUDE_REQUEST_TIMEOUT
+        )
+    return _global_client
@@ -6,8 +6,8 @@ from typing import Any, Dict, List, Optional
 
 import anthropic
 
-from app.core.config import settings
 from app.core.exceptions import ClaudeError, SchemaError
+from app.services.claude_governor import get_async_anthropic_client, get_claude_governor
 
 logger = logging.getLogger(__name__)
 
@@ -370,11 +370,17 @@ class ClaudeService:
     """
 
     def __init__(self):
-        self.client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+        # Shared non-blocking client; every call is admitted through the process-wide governor
+        self.client = get_async_anthropic_client()
+        self.governor = get_claude_governor()
         self.model = "claude-sonnet-4-20250514"  # Claude Sonnet 4 (latest)
         logger.debug(f"ClaudeService initialized with model: {self.model}")
         logger.debug(f"Client type: {type(self.client)}, has messages: {hasattr(self.client, 'messages')}")
 
+    async def _create_message(self, **kwargs) -> Any:
+        """Send a messages.create request under the concurrency governor (cap, timeout, retry)."""
+        return await self.governor.run(lambda: self.client.messages.create(**kwargs))
+
     async def analyze_sample_documents(
         self,
         parsed_documents: List[Dict[str, Any]],
@@ -431,7 +437,7 @@ class ClaudeService:
         logger.info(f"Requesting schema generation from Claude for {len(parsed_documents)} documents")
 
         try:
-            message = self.client.messages.create(
+            message = await self._create_message(
                 model=self.model,
                 max_tokens=4096,
                 # Cached system prompt for 80-90% cost reduction
@@ -585,7 +591,7 @@ Return ONLY the JSON, no markdown formatting."""
         logger.info("Requesting quick document analysis from Claude")
 
         try:
-            message = self.client.messages.create(
+            message = await self._create_message(
                 model=self.model,
                 max_tokens=1024,  # Smaller response for quick analysis
                 messages=[
@@ -798,7 +804,7 @@ Return JSON:
 }}"""
 
         try:
-            message = self.client.messages.create(
+            message = await self._create_message(
                 model=self.model,
                 max_tokens=1024,
                 messages=[{"role": "user", "content": prompt}]
@@ -838,7 +844,7 @@ Return ONLY JSON:
 }}"""
 
         try:
-            message = self.client.messages.create(
+            message = await self._create_message(
                 model=self.model,
                 max_tokens=512,
                 messages=[{"role": "user", "content": prompt}]
@@ -894,7 +900,7 @@ User instruction:
 Return the complete modified fields array in JSON format."""
 
         try:
-            message = self.client.messages.create(
+            message = await self._create_message(
                 model=self.model,
                 max_tokens=4096,
                 system=system_prompt,
@@ -1007,7 +1013,7 @@ Sample documents:
         try:
             logger.info(f"Requesting field suggestion from Claude for: {user_description}")
 
-            message = self.client.messages.create(
+            message = await self._create_message(
                 model=self.model,
                 max_tokens=2048,
                 system=[{
@@ -1104,7 +1110,7 @@ Return ONLY JSON:
 }}"""
 
         try:
-            message = self.client.messages.create(
+            message = await self._create_message(
                 model=self.model,
                 max_tokens=512,
                 messages=[{"role": "user", "content": prompt}]
@@ -1130,15 +1136,17 @@ Return ONLY JSON:
 
     async def match_document_to_template(
         self,
-        parsed_document: Dict[str, Any],
-        available_templates: List[Dict[str, Any]]
+        parsed_document: Optional[Dict[str, Any]],
+        available_templates: List[Dict[str, Any]],
+        document_text: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Analyze a document and find the best matching template
 
         Args:
-            parsed_document: Reducto parsed document
+            parsed_document: Reducto parsed document (ignored when document_text is given)
             available_templates: List of available templates with their schemas
+            document_text: Precomputed head sample (MatchFeatures.sample_text)
 
         Returns:
             {
@@ -1158,20 +1166,10 @@ Return ONLY JSON:
 
         # Extract document text sample
         # NOTE: parsed_document IS the result dict (from document.reducto_parse_result)
-        chunks = parsed_document.get("chunks", [])
-        # Reducto v2 has nested structure: chunk['blocks'][i]['content']
-        doc_text_parts = []
-        for chunk in chunks[:10]:
-            # Try new format (blocks array)
-            if 'blocks' in chunk and isinstance(chunk['blocks'], list):
-                for block in chunk['blocks']:
-                    if 'content' in block and block['content']:
-                        doc_text_parts.append(block['content'])
-            # Fallback to old format (direct content field)
-            elif chunk.get("content") or chunk.get("text"):
-                doc_text_parts.append(chunk.get("content", chunk.get("text", "")))
-
-        doc_text = "\n".join(doc_text_parts)[:2000]
+        if document_text is None:
+            from app.services.match_feature_service import sample_text
+            document_text = sample_text(parsed_document or {})
+        doc_text = document_text[:2000]
 
         # DEBUG: Log what text we extracted
         logger.debug(f"Extracted text for template matching - length: {len(doc_text)}, first 200 chars: {doc_text[:200]}")
@@ -1210,7 +1208,7 @@ Return ONLY JSON:
 }}"""
 
         try:
-            message = self.client.messages.create(
+            message = await self._create_message(
                 model=self.model,
                 max_tokens=512,
                 # Cached system prompt for 80-90% cost reduction
@@ -1329,7 +1327,7 @@ Return ONLY JSON array:
 
         try:
             logger.info(f"Sending prompt to Claude (first 500 chars): {prompt[:500]}")
-            message = self.client.messages.create(
+            message = await self._create_message(
                 model=self.model,
                 max_tokens=2048,
                 # Cached system prompt for 80-90% cost reduction
@@ -1440,7 +1438,7 @@ Examples:
 - "show me all purchase orders" → match document type"""
 
         try:
-            message = self.client.messages.create(
+            message = await self._create_message(
                 model=self.model,
                 max_tokens=1024,
                 messages=[{"role": "user", "content": prompt}]
@@ -1517,14 +1515,18 @@ Examples:
                 if confidence_scores:
                     avg_conf = sum(confidence_scores.values()) / len(confidence_scores)
 
-                results_summary.append({
+                summary = {
                     "document_id": doc.get("id"),
                     "filename": doc_data.get("filename", "Unknown"),
                     "fields": {k: v for k, v in doc_data.items()
                               if k not in ["filename", "full_text", "confidence_scores", "document_id"]},
                     "confidence_scores": confidence_scores,
                     "avg_confidence": round(avg_conf, 2)
-                })
+                }
+                # Passages around the query terms (search results without full_text)
+                if doc.get("highlights", {}).get("full_text"):
+                    summary["snippets"] = doc["highlights"]["full_text"]
+                results_summary.append(summary)
             else:
                 # Legacy format (backward compatible)
                 results_summary.append({
@@ -1588,7 +1590,7 @@ Provide a natural language answer:
 Keep it concise (2-3 sentences)."""
 
         try:
-            message = self.client.messages.create(
+            message = await self._create_message(
                 model=self.model,
                 max_tokens=1024,  # Increased for structured output
                 # Cached system prompt for 80-90% cost reduction
@@ -1934,7 +1936,7 @@ Aggregation: {{"type": "sum", "field": "invoice_total", "group_by": "vendor_name
 Now parse the user query above and return ONLY the JSON response."""
 
         try:
-            message = self.client.messages.create(
+            message = await self._create_message(
                 model=self.model,
                 max_tokens=2048,
                 # Cached system prompt for 80-90% cost reduction on NL search
@@ -2398,7 +2400,7 @@ Examples:
 Keep it professional but conversational."""
 
         try:
-            message = self.client.messages.create(
+            message = await self._create_message(
                 model=self.model,
                 max_tokens=512,
                 messages=[{"role": "user", "content": prompt}]
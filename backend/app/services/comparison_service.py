@@ -8,10 +8,11 @@ Enables queries like:
 """
 import logging
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
+from app.services.metric_queries import METRIC_AGG_TYPES
 from app.services.postgres_service import PostgresService
 
 logger = logging.getLogger(__name__)
@@ -42,53 +43,26 @@ class ComparisonService:
             agg_type: Aggregation type (sum, avg, count, etc.)
             period1: First period {"from": "2024-10-01", "to": "2024-12-31"}
             period2: Second period {"from": "2024-07-01", "to": "2024-09-30"}
-            filters: Additional filters to apply to both periods
+            filters: Additional filters to apply to both periods; "date_field"
+                names the extracted date the periods apply to (default "date")
             period1_name: Human-readable name for period 1 (e.g., "Q4 2024")
             period2_name: Human-readable name for period 2 (e.g., "Q3 2024")
 
         Returns:
             Comparison results with change metrics
         """
-        # Build filters for each period
-        filters1 = self._merge_filters(filters, {"date_range": period1})
-        filters2 = self._merge_filters(filters, {"date_range": period2})
-
-        # Execute aggregations for both periods
-        result1 = await self.postgres.get_aggregations(
-            field=field,
-            agg_type=agg_type,
-            filters=filters1
-        )
-
-        result2 = await self.postgres.get_aggregations(
-            field=field,
-            agg_type=agg_type,
-            filters=filters2
-        )
-
-        # Extract values based on aggregation type
-        agg_name = f"{field}_{agg_type}"
-
-        if agg_type in ["sum", "avg", "min", "max"]:
-            value1 = result1.get(agg_name, {}).get(agg_type, 0)
-            value2 = result2.get(agg_name, {}).get(agg_type, 0)
-            count1 = result1.get(agg_name, {}).get("count", 0)
-            count2 = result2.get(agg_name, {}).get("count", 0)
-
-        elif agg_type == "count":
-            value1 = result1.get(agg_name, {}).get("count", 0)
-            value2 = result2.get(agg_name, {}).get("count", 0)
-            count1 = value1
-            count2 = value2
-
-        elif agg_type == "cardinality":
-            value1 = result1.get(agg_name, {}).get("value", 0)
-            value2 = result2.get(agg_name, {}).get("value", 0)
-            count1 = value1
-            count2 = value2
-
-        else:
+        if agg_type not in METRIC_AGG_TYPES:
             # For complex aggregations, return raw results
+            result1 = await self.postgres.get_aggregations(
+                field=field,
+                agg_type=agg_type,
+                filters=self._merge_filters(filters, {"date_range": period1})
+            )
+            result2 = await self.postgres.get_aggregations(
+                field=field,
+                agg_type=agg_type,
+                filters=self._merge_filters(filters, {"date_range": period2})
+            )
             return {
                 "period1": {
                     "name": period1_name or self._format_period_name(period1),
@@ -103,6 +77,18 @@ class ComparisonService:
                 "comparison_type": "complex"
             }
 
+        # Both periods in one scan: an aggregate FILTER (WHERE <period>) per period
+        date_field, base_filters = self._split_date_filters(filters)
+        metrics1, metrics2 = await self.postgres.get_period_metrics(
+            field=field,
+            agg_type=agg_type,
+            date_field=date_field,
+            periods=[period1, period2],
+            filters=base_filters
+        )
+        value1, count1 = metrics1["value"], metrics1["count"]
+        value2, count2 = metrics2["value"], metrics2["count"]
+
         # Calculate comparison metrics
         change = value1 - value2
         change_pct = (change / value2 * 100) if value2 != 0 else float('inf')
@@ -153,41 +139,26 @@ class ComparisonService:
         Returns:
             Comparison results across groups
         """
-        results = {}
-
-        for group_value in groups:
-            # Add group filter
-            group_filters = self._merge_filters(
-                filters,
-                {group_field: group_value}
-            )
-
-            # Execute aggregation
-            result = await self.postgres.get_aggregations(
+        if agg_type in METRIC_AGG_TYPES:
+            # Every group in one scan: an aggregate FILTER (WHERE <group>) per group
+            _, base_filters = self._split_date_filters(filters)
+            metrics = await self.postgres.get_group_metrics(
                 field=field,
                 agg_type=agg_type,
-                filters=group_filters
+                group_field=group_field,
+                groups=groups,
+                filters=base_filters
             )
-
-            agg_name = f"{field}_{agg_type}"
-
-            if agg_type in ["sum", "avg", "min", "max"]:
-                value = result.get(agg_name, {}).get(agg_type, 0)
-                count = result.get(agg_name, {}).get("count", 0)
-            elif agg_type == "count":
-                value = result.get(agg_name, {}).get("count", 0)
-                count = value
-            elif agg_type == "cardinality":
-                value = result.get(agg_name, {}).get("value", 0)
-                count = value
-            else:
-                value = result
-                count = 0
-
-            results[group_value] = {
-                "value": float(value) if isinstance(value, (int, float)) else value,
-                "count": count
-            }
+            results = dict(zip(groups, metrics))
+        else:
+            results = {}
+            for group_value in groups:
+                result = await self.postgres.get_aggregations(
+                    field=field,
+                    agg_type=agg_type,
+                    filters=self._merge_filters(filters, {group_field: group_value})
+                )
+                results[group_value] = {"value": result, "count": 0}
 
         # Calculate comparisons
         values = [r["value"] for r in results.values() if isinstance(r["value"], (int, float))]
@@ -248,6 +219,16 @@ class ComparisonService:
         merged.update(additional_filters)
         return merged
 
+    def _split_date_filters(
+        self,
+        filters: Optional[Dict[str, Any]]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """(date field, remaining field filters); date_range is superseded by explicit periods."""
+        base_filters = dict(filters or {})
+        date_field = base_filters.pop("date_field", "date")
+        base_filters.pop("date_range", None)
+        return date_field, base_filters
+
     def _format_period_name(self, period: Dict[str, str]) -> str:
         """Generate human-readable period name from date range."""
         from_date = period.get("from", "")
@@ -330,63 +311,28 @@ class ComparisonService:
             interval: Time interval (day, week, month, quarter, year)
             start_date: Start date (ISO format)
             end_date: End date (ISO format)
-            filters: Additional filters
+            filters: Additional filters; "date_field" names the extracted
+                date to bucket on (default "date")
 
         Returns:
             Time-series data with trend analysis
         """
-        # Use date_histogram aggregation
-        date_field = filters.get("date_field", "date") if filters else "date"
-
-        # Build filters with date range
-        agg_filters = filters.copy() if filters else {}
-        if start_date and end_date:
-            agg_filters["date_range"] = {"from": start_date, "to": end_date}
-
-        # Execute date_histogram aggregation
-        result = await self.postgres.get_aggregations(
-            field=date_field,
-            agg_type="date_histogram",
-            agg_config={"interval": interval},
-            filters=agg_filters
-        )
+        date_field, base_filters = self._split_date_filters(filters)
+        date_range = {"from": start_date, "to": end_date} if start_date or end_date else None
 
-        agg_name = f"{date_field}_date_histogram"
-        buckets = result.get(agg_name, {}).get("buckets", [])
-
-        # For each bucket, calculate the metric
-        trend_data = []
-
-        for bucket in buckets:
-            bucket_date = bucket["key"]
-            doc_count = bucket["doc_count"]
-
-            # Get aggregation for this specific time bucket
-            bucket_filters = agg_filters.copy()
-            bucket_filters["date_range"] = {"from": bucket_date, "to": bucket_date}
-
-            bucket_result = await self.postgres.get_aggregations(
-                field=field,
-                agg_type=agg_type,
-                filters=bucket_filters
-            )
-
-            metric_name = f"{field}_{agg_type}"
-
-            if agg_type in ["sum", "avg", "min", "max"]:
-                value = bucket_result.get(metric_name, {}).get(agg_type, 0)
-            elif agg_type == "count":
-                value = bucket_result.get(metric_name, {}).get("count", 0)
-            elif agg_type == "cardinality":
-                value = bucket_result.get(metric_name, {}).get("value", 0)
-            else:
-                value = 0
-
-            trend_data.append({
-                "date": bucket_date,
-                "value": float(value) if value else 0.0,
-                "count": doc_count
-            })
+        # One GROUP BY date_trunc(...) query returns every bucket's metric
+        buckets = await self.postgres.get_metric_trend(
+            field=field,
+            agg_type=agg_type,
+            date_field=date_field,
+            interval=interval,
+            date_range=date_range,
+            filters=base_filters
+        )
+        trend_data = [
+            {"date": bucket["key"], "value": bucket["value"], "count": bucket["doc_count"]}
+            for bucket in buckets
+        ]
 
         # Calculate trend statistics
         values = [d["value"] for d in trend_data]
@@ -0,0 +1,90 @@
+"""
+Passage chunks for the document_chunks index.
+
+A document's indexed full_text is its Reducto chunk contents joined with
+newlines; build_document_chunks walks the same chunks, so each row's
+start_char/end_char are offsets into that text. Chunks longer than
+MAX_CHUNK_CHARS are split at whitespace so one passage stays a reasonable
+LLM context slice; the pieces keep their chunk's page and box.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+MAX_CHUNK_CHARS = 4000
+
+
+def chunk_text(chunk: Dict[str, Any]) -> str:
+    """Text of a Reducto chunk, as joined into full_text at index time."""
+    return chunk.get("content", chunk.get("text", "")) or ""
+
+
+def _chunk_location(chunk: Dict[str, Any]) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
+    """(first page, bounding box of the chunk's blocks on that page)."""
+    boxes = [
+        block["bbox"] for block in chunk.get("blocks") or []
+        if isinstance(block.get("bbox"), dict) and isinstance(block["bbox"].get("page"), int)
+    ]
+    if not boxes:
+        return None, None
+
+    page = min(box["page"] for box in boxes)
+    on_page = [box for box in boxes if box["page"] == page]
+    try:
+        left = min(box["left"] for box in on_page)
+        top = min(box["top"] for box in on_page)
+        right = max(box["left"] + box["width"] for box in on_page)
+        bottom = max(box["top"] + box["height"] for box in on_page)
+    except (KeyError, TypeError):
+        return page, None
+    return page, {"page": page, "left": left, "top": top, "width": right - left, "height": bottom - top}
+
+
+def _split(text: str, max_chars: int) -> List[Tuple[int, int]]:
+    """(start, end) pieces of at most max_chars, broken at the last whitespace when there is one."""
+    pieces = []
+    start = 0
+    while len(text) - start > max_chars:
+        end = start + max_chars
+        cut = max(text.rfind(" ", start, end), text.rfind("\n", start, end))
+        if cut > start:
+            end = cut + 1
+        pieces.append((start, end))
+        start = end
+    pieces.append((start, len(text)))
+    return pieces
+
+
+def build_document_chunks(
+    document_id: int,
+    parse_chunks: List[Dict[str, Any]],
+    max_chars: int = MAX_CHUNK_CHARS
+) -> List[Dict[str, Any]]:
+    """
+    document_chunks rows for one document's Reducto chunks.
+
+    Args:
+        document_id: Document the rows belong to
+        parse_chunks: parse_result["chunks"]
+        max_chars: Longest passage; longer chunks are split
+
+    Returns:
+        [{"document_id", "chunk_number", "page", "start_char", "end_char", "bbox", "content"}, ...]
+    """
+    rows = []
+    offset = 0
+    for chunk in parse_chunks or []:
+        text = chunk_text(chunk)
+        page, bbox = _chunk_location(chunk)
+        for start, end in _split(text, max_chars):
+            if text[start:end].strip():
+                rows.append({
+                    "document_id": document_id,
+                    "chunk_number": len(rows) + 1,
+                    "page": page,
+                    "start_char": offset + start,
+                    "end_char": offset + end,
+                    "bbox": bbox,
+                    "content": text[start:end],
+                })
+        offset += len(text) + 1  # Newline between chunks in full_text
+    return rows
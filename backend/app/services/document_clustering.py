@@ -0,0 +1,175 @@
+"""
+Near-duplicate clustering of uploaded documents (MinHash + LSH banding).
+
+Bulk uploads are grouped by Jaccard similarity of each document's token set
+(MatchFeatures.tokens). Comparing every seed with every unclustered document
+is quadratic; instead each document gets a MinHash signature, signatures are
+split into bands, and only documents sharing at least one band bucket with
+the seed are checked with exact Jaccard. Clusters therefore never contain a
+pair below the threshold; LSH can only miss a pair, at a rate set by the
+band/row split (see lsh_params).
+
+Small batches skip LSH and compare exhaustively, which is cheaper there.
+"""
+
+import logging
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.services.match_feature_service import jaccard
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 128
+LSH_MIN_DOCUMENTS = 64  # Below this, exhaustive comparison beats building the index
+LSH_RECALL = 0.99  # Chance that a pair exactly at the threshold is compared
+
+_PRIME = (1 << 31) - 1  # Hash values are reduced mod a 31-bit prime, so a*x+b fits in uint64
+
+
+def lsh_params(threshold: float, num_perm: int = NUM_PERM, recall: float = LSH_RECALL) -> Tuple[int, int]:
+    """
+    Bands and rows per band for a Jaccard threshold.
+
+    A pair with similarity s becomes a candidate with probability
+    1 - (1 - s^rows)^bands. Picks the split that keeps that probability at
+    least ``recall`` at the threshold (a missed pair splits a cluster) while
+    minimizing the expected candidates below it (each costs one exact check).
+    """
+    def candidate_probability(s, bands, rows):
+        return 1 - (1 - s ** rows) ** bands
+
+    def false_positive_area(bands, rows, steps=100):
+        width = threshold / steps
+        return sum(candidate_probability((i + 0.5) * width, bands, rows) for i in range(steps)) * width
+
+    splits = [(bands, num_perm // bands) for bands in range(1, num_perm + 1)]  # Leftover values go unused
+    eligible = [split for split in splits if candidate_probability(threshold, *split) >= recall]
+    if not eligible:
+        return max(splits, key=lambda split: candidate_probability(threshold, *split))
+    return min(eligible, key=lambda split: false_positive_area(*split))
+
+
+class MinHasher:
+    """MinHash signatures of token sets (universal hashing, stable across processes)."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self._a = rng.randint(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, _PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, tokens: Iterable[str]) -> np.ndarray:
+        hashes = np.fromiter(
+            (zlib.crc32(t.encode("utf-8")) % _PRIME for t in tokens), dtype=np.uint64
+        )
+        if not hashes.size:
+            return np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        return ((np.outer(hashes, self._a) + self._b) % _PRIME).min(axis=0)
+
+
+class LSHIndex:
+    """Banded LSH buckets over MinHash signatures"""
+
+    def __init__(self, bands: int, rows: int):
+        self.bands = bands
+        self.rows = rows
+        self._buckets: List[Dict[bytes, List[Any]]] = [defaultdict(list) for _ in range(bands)]
+
+    def _keys(self, signature: np.ndarray) -> Iterable[Tuple[int, bytes]]:
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def insert(self, key: Any, signature: np.ndarray) -> None:
+        for band, bucket_key in self._keys(signature):
+            self._buckets[band][bucket_key].append(key)
+
+    def query(self, signature: np.ndarray) -> Set[Any]:
+        """Keys sharing at least one band with the signature."""
+        candidates = set()
+        for band, bucket_key in self._keys(signature):
+            candidates.update(self._buckets[band].get(bucket_key, ()))
+        return candidates
+
+
+def cluster_documents(
+    doc_data: List[Dict[str, Any]],
+    similarity_threshold: float = 0.75,
+    use_lsh: Optional[bool] = None,
+    num_perm: int = NUM_PERM
+) -> List[Dict[str, Any]]:
+    """
+    Greedy seed clustering by token-set Jaccard similarity.
+
+    Documents are taken as seeds in input order; every unclustered document
+    whose similarity to the seed reaches the threshold joins its cluster.
+
+    Args:
+        doc_data: [{"id", "filename", "tokens": set}, ...]
+        similarity_threshold: Minimum Jaccard similarity to the seed
+        use_lsh: Find candidates with MinHash/LSH (default: when the batch has
+            at least LSH_MIN_DOCUMENTS documents); False compares every pair
+        num_perm: MinHash signature length
+
+    Returns:
+        [{"representative_doc_id", "representative_filename", "document_ids",
+          "filenames", "cluster_size", "avg_similarity"}, ...]
+    """
+    if use_lsh is None:
+        use_lsh = len(doc_data) >= LSH_MIN_DOCUMENTS
+
+    position = {d["id"]: i for i, d in enumerate(doc_data)}
+    doc_lookup = {d["id"]: d for d in doc_data}
+    unclustered_ids = set(position)
+
+    index = signatures = None
+    if use_lsh:
+        hasher = MinHasher(num_perm)
+        index = LSHIndex(*lsh_params(similarity_threshold, num_perm))
+        signatures = {}
+        for d in doc_data:
+            signatures[d["id"]] = hasher.signature(d["tokens"])
+            index.insert(d["id"], signatures[d["id"]])
+
+    clusters = []
+    compared = 0
+    for seed_doc in doc_data:
+        seed_id = seed_doc["id"]
+        if seed_id not in unclustered_ids:
+            continue
+        unclustered_ids.remove(seed_id)
+
+        if use_lsh:
+            candidate_ids = index.query(signatures[seed_id]) & unclustered_ids
+        else:
+            candidate_ids = unclustered_ids
+
+        cluster_doc_ids = [seed_id]
+        total_similarity = 0.0
+        for candidate_id in sorted(candidate_ids, key=position.__getitem__):
+            compared += 1
+            similarity = jaccard(seed_doc["tokens"], doc_lookup[candidate_id]["tokens"])
+            if similarity >= similarity_threshold:
+                cluster_doc_ids.append(candidate_id)
+                total_similarity += similarity
+        unclustered_ids.difference_update(cluster_doc_ids)
+
+        avg_similarity = (total_similarity / len(cluster_doc_ids)) if len(cluster_doc_ids) > 1 else 1.0
+
+        clusters.append({
+            "representative_doc_id": seed_id,
+            "representative_filename": seed_doc["filename"],
+            "document_ids": cluster_doc_ids,
+            "filenames": [doc_lookup[doc_id]["filename"] for doc_id in cluster_doc_ids],
+            "cluster_size": len(cluster_doc_ids),
+            "avg_similarity": round(avg_similarity, 2)
+        })
+
+    logger.info(
+        f"Created {len(clusters)} clusters from {len(doc_data)} documents "
+        f"({compared} exact comparisons, {'LSH' if use_lsh else 'exhaustive'})"
+    )
+    return clusters
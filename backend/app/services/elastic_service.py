@@ -3,8 +3,11 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from elasticsearch import AsyncElasticsearch
+from sqlalchemy.orm import object_session
 
 from app.core.config import settings
+from app.services.document_clustering import cluster_documents
+from app.services.match_feature_service import MatchFeatureService
 
 logger = logging.getLogger(__name__)
 
@@ -1082,17 +1085,17 @@ class ElasticsearchService:
         similarity_threshold: float = 0.75
     ) -> List[Dict[str, Any]]:
         """
-        Cluster uploaded documents using More-Like-This for intra-batch similarity.
+        Cluster uploaded documents by token-set Jaccard similarity.
 
-        Algorithm:
+        Algorithm (see app.services.document_clustering):
         1. Start with all docs as unclustered
-        2. Pick first doc as seed for cluster 1
-        3. Find similar docs using MLT (min similarity threshold)
-        4. Remove clustered docs from pool
+        2. Take the next unclustered doc (upload order) as a cluster seed
+        3. Find candidates sharing a MinHash/LSH band with the seed
+        4. Add candidates whose exact Jaccard similarity meets the threshold
         5. Repeat until all docs clustered
 
         Args:
-            documents: List of Document objects with reducto_parse_result
+            documents: List of session-attached Document objects (match features are loaded through it)
             similarity_threshold: Minimum similarity score (0.0-1.0) to cluster together
 
         Returns:
@@ -1113,113 +1116,27 @@ class ElasticsearchService:
         if not documents:
             return []
 
-        # Extract document text and metadata
+        # Precomputed token sets (one query for the batch, no parse results loaded)
+        features_by_doc = MatchFeatureService(object_session(documents[0])).for_documents(documents)
         doc_data = []
         for doc in documents:
-            # Use actual_parse_result property (supports both PhysicalFile and legacy)
-            parse_result = doc.actual_parse_result
-            if not parse_result:
+            features = features_by_doc.get(doc.id)
+            if features is None:
                 logger.warning(f"Skipping document {doc.id} - no parse result")
                 continue
 
-            chunks = parse_result.get("chunks", [])
-            doc_text = "\n".join([c.get("content", "") for c in chunks[:10]])  # First 10 chunks
-
             doc_data.append({
                 "id": doc.id,
                 "filename": doc.filename,
-                "text": doc_text[:5000]  # Limit to 5k chars for performance
+                "tokens": set(features.tokens)
             })
 
         if not doc_data:
             logger.warning("No documents with parse results to cluster")
             return []
 
-        clusters = []
-        unclustered_ids = {d["id"] for d in doc_data}
-        doc_lookup = {d["id"]: d for d in doc_data}
-
         logger.info(f"Clustering {len(doc_data)} documents with threshold {similarity_threshold}")
-
-        # Iteratively build clusters
-        while unclustered_ids:
-            # Pick first unclustered doc as seed
-            seed_id = next(iter(unclustered_ids))
-            seed_doc = doc_lookup[seed_id]
-
-            cluster_doc_ids = [seed_id]
-            unclustered_ids.remove(seed_id)
-
-            # Find similar documents using text similarity
-            similar_ids = []
-            total_similarity = 0.0
-
-            for candidate_id in list(unclustered_ids):
-                candidate_doc = doc_lookup[candidate_id]
-
-                # Simple text similarity using common words (fast approximation)
-                # In production, could use ES MLT here, but this is faster for small batches
-                similarity = self._calculate_text_similarity(
-                    seed_doc["text"],
-                    candidate_doc["text"]
-                )
-
-                if similarity >= similarity_threshold:
-                    cluster_doc_ids.append(candidate_id)
-                    unclustered_ids.remove(candidate_id)
-                    total_similarity += similarity
-
-            # Calculate average similarity
-            avg_similarity = (total_similarity / len(cluster_doc_ids)) if len(cluster_doc_ids) > 1 else 1.0
-
-            clusters.append({
-                "representative_doc_id": seed_id,
-                "representative_filename": seed_doc["filename"],
-                "document_ids": cluster_doc_ids,
-                "filenames": [doc_lookup[doc_id]["filename"] for doc_id in cluster_doc_ids],
-                "cluster_size": len(cluster_doc_ids),
-                "avg_similarity": round(avg_similarity, 2)
-            })
-
-            logger.info(
-                f"Cluster {len(clusters)}: {len(cluster_doc_ids)} docs "
-                f"(seed: {seed_doc['filename']}, avg similarity: {avg_similarity:.2f})"
-            )
-
-        logger.info(f"Created {len(clusters)} clusters from {len(doc_data)} documents")
-        return clusters
-
-    def _calculate_text_similarity(self, text1: str, text2: str) -> float:
-        """
-        Calculate simple text similarity using Jaccard similarity on word sets.
-
-        Fast approximation for document clustering without ES query overhead.
-        For production scale, consider using ES MLT or embeddings.
-
-        Args:
-            text1: First text
-            text2: Second text
-
-        Returns:
-            Similarity score 0.0-1.0
-        """
-        # Tokenize and normalize
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
-
-        # Remove common stopwords (basic filter)
-        stopwords = {"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with"}
-        words1 = {w for w in words1 if w not in stopwords and len(w) > 2}
-        words2 = {w for w in words2 if w not in stopwords and len(w) > 2}
-
-        if not words1 or not words2:
-            return 0.0
-
-        # Jaccard similarity: intersection / union
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
-
-        return len(intersection) / len(union)
+        return cluster_documents(doc_data, similarity_threshold)
 
     async def find_similar_templates(
         self,
@@ -584,33 +584,27 @@ class ExportService:
         if not template:
             raise ValueError(f"Template {template_id} not found")
 
-        # Build query
-        query = ExportService.build_export_query(
-            db=db,
-            template_id=template_id,
-            date_from=date_from,
-            date_to=date_to,
-            **kwargs
-        )
-
-        documents = query.all()
+        # Stream documents in batches instead of loading records + DataFrame
+        from app.services.streaming_export_service import ExportFilters, StreamingExportService
 
-        # Convert to records (wide format by default)
-        records = ExportService.documents_to_records(documents)
+        exporter = StreamingExportService(
+            ExportFilters(template_id=template_id, date_from=date_from, date_to=date_to, **kwargs),
+            db=db
+        )
 
         # Export in requested format
         if format.lower() == "csv":
-            return ExportService.export_to_csv(records)
+            return b"".join(exporter.stream_csv())
         elif format.lower() == "excel":
-            return ExportService.export_to_excel(
-                records,
+            output = io.BytesIO()
+            exporter.write_excel(
+                output,
                 sheet_name=template.name[:31],  # Excel sheet name limit
-                documents=documents,  # Pass documents for complex field expansion
                 expand_complex_fields=expand_complex_fields
             )
+            return output.getvalue()
         elif format.lower() == "json":
-            json_str = ExportService.export_to_json(records, format_type="pretty")
-            return json_str.encode('utf-8')
+            return b"".join(exporter.stream_json_array(pretty=True))
         else:
             raise ValueError(f"Unsupported format: {format}")
 
@@ -118,7 +118,7 @@ class ExtractionService:
             template = extraction.template
 
             # Step 1: Parse document (use cached result if available)
-            if not physical_file.reducto_parse_result:
+            if not physical_file.has_parse_result:
                 logger.info(f"Parsing document for first time: {physical_file.filename}")
                 parsed = await self.reducto_service.parse_document(physical_file.file_path)
                 physical_file.reducto_job_id = parsed.get("job_id")
@@ -176,12 +176,11 @@ class ExtractionService:
 
             # Get review threshold from settings
             settings_service = SettingsService(db)
-            org = settings_service.get_or_create_default_org()
-            user = settings_service.get_or_create_default_user(org.id)
-            review_threshold = settings_service.get_setting(
+            org_id, user_id = await settings_service.get_default_scope()
+            review_threshold = await settings_service.get_setting(
                 key="review_threshold",
-                user_id=user.id,
-                org_id=org.id,
+                user_id=user_id,
+                org_id=org_id,
                 default=0.6
             )
 
@@ -1,9 +1,8 @@
 """Service for extracting new fields from existing documents"""
 
-import asyncio
 import logging
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict
 
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import flag_modified
@@ -13,6 +12,7 @@ from app.models.document import Document, ExtractedField
 from app.models.schema import Schema
 from app.models.verification import Verification
 from app.services.claude_service import ClaudeService
+from app.services.job_queue import JobQueue
 from app.services.postgres_service import PostgresService
 from app.services.reducto_service import ReductoService
 
@@ -42,7 +42,8 @@ class FieldExtractionService:
         """
         Extract a single field from all documents using a schema/template
 
-        Creates a background job and processes documents asynchronously.
+        Queues a background job; the worker (``python -m app.worker``)
+        processes the documents.
 
         Args:
             schema_id: Schema ID to extract from
@@ -52,55 +53,41 @@ class FieldExtractionService:
         Returns:
             BackgroundJob instance for tracking progress
         """
-        # Get all documents for this schema
-        documents = db.query(Document)\
+        document_count = db.query(Document)\
             .filter(Document.schema_id == schema_id)\
-            .all()
+            .count()
 
-        logger.info(f"Starting field extraction: {field_config['name']} "
-                   f"for {len(documents)} documents (schema {schema_id})")
+        logger.info(f"Queueing field extraction: {field_config['name']} "
+                   f"for {document_count} documents (schema {schema_id})")
 
-        # Create background job
-        job = BackgroundJob(
-            type="field_extraction",
-            status="running",
-            total_items=len(documents),
-            processed_items=0,
+        return await JobQueue(db).enqueue(
+            "field_extraction",
             job_data={
                 "schema_id": schema_id,
                 "field_name": field_config["name"],
-                "started_at": datetime.utcnow().isoformat()
-            }
-        )
-        db.add(job)
-        db.commit()
-        db.refresh(job)
-
-        # Run extraction in background
-        asyncio.create_task(
-            self._extract_field_background(
-                background_job_id=job.id,
-                documents=documents,
-                field_config=field_config
-            )
+                "field_config": field_config,
+                "queued_at": datetime.utcnow().isoformat()
+            },
+            lane="bulk",
+            total_items=document_count
         )
 
-        return job
-
     async def _extract_field_background(
         self,
         background_job_id: int,  # RENAMED to avoid collision
-        documents: List[Document],
+        schema_id: int,
         field_config: Dict[str, Any]
     ):
         """
-        Background task to extract field from documents
+        Job handler: extract a field from every document of a schema
 
-        This runs asynchronously without blocking the API response.
+        Runs in the background worker. Progress is written to the job row
+        after every document; a fatal error is re-raised so the queue can
+        retry the job.
 
         Args:
             background_job_id: Background job ID for progress tracking
-            documents: List of documents to process
+            schema_id: Schema whose documents get the new field
             field_config: Field configuration
         """
         from app.core.database import SessionLocal
@@ -110,12 +97,17 @@ class FieldExtractionService:
         failed = 0
         low_confidence_count = 0
 
-        # Get schema to determine ES index name
-        schema = None
-        if documents:
-            schema = db.query(Schema).filter(Schema.id == documents[0].schema_id).first()
-
         try:
+            documents = db.query(Document).filter(Document.schema_id == schema_id).all()
+            schema = db.query(Schema).filter(Schema.id == schema_id).first()
+
+            job = db.query(BackgroundJob).filter(BackgroundJob.id == background_job_id).first()
+            if job:
+                job.total_items = len(documents)
+                job.job_data["started_at"] = datetime.utcnow().isoformat()
+                flag_modified(job, "job_data")
+                db.commit()
+
             for i, doc in enumerate(documents):
                 try:
                     # Try to use Reducto extraction with jobid:// pipeline for bbox data
@@ -277,11 +269,9 @@ class FieldExtractionService:
                     flag_modified(job, "job_data")
                     db.commit()
 
-            # Mark job as completed
+            # Record summary (the worker marks the job completed)
             job = db.query(BackgroundJob).filter(BackgroundJob.id == background_job_id).first()
             if job:
-                job.status = "completed"
-                job.completed_at = datetime.utcnow()
                 # Update job_data and mark as modified for SQLAlchemy
                 job.job_data["completed_at"] = datetime.utcnow().isoformat()
                 job.job_data["success_rate"] = successful / len(documents) if documents else 0
@@ -294,12 +284,8 @@ class FieldExtractionService:
 
         except Exception as e:
             logger.error(f"Fatal error in field extraction job {background_job_id}: {e}")
-            job = db.query(BackgroundJob).filter(BackgroundJob.id == background_job_id).first()
-            if job:
-                job.status = "failed"
-                job.error_message = str(e)
-                job.completed_at = datetime.utcnow()
-                db.commit()
+            db.rollback()
+            raise
 
         finally:
             db.close()
@@ -1,20 +1,95 @@
 """
 Virtual folder organization service.
 Provides folder browsing and reorganization without physical file duplication.
+
+Folders are materialized in the folders table (path, parent, depth, direct
+and recursive extraction counts), maintained transactionally by
+apply_folder_deltas whenever extractions are created, moved or deleted.
 """
 
 import logging
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, joinedload
 
-from app.models.extraction import Extraction
+from app.models.extraction import Extraction, folder_of
+from app.models.folder import Folder
 from app.models.physical_file import PhysicalFile
 from app.models.template import SchemaTemplate
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PAGE_SIZE = 200
+MAX_PAGE_SIZE = 1000
+
+
+def _like_prefix(path: str) -> str:
+    """LIKE pattern matching everything below a folder (wildcards in the path escaped)."""
+    escaped = path.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}/%"
+
+
+def _ancestors(folder_path: str) -> List[str]:
+    """A folder and every folder above it: "A/B/C" -> ["A", "A/B", "A/B/C"]."""
+    parts = folder_path.split("/")
+    return ["/".join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+
+def apply_folder_deltas(db: Session, deltas: Dict[str, int]) -> None:
+    """
+    Adjust folder counts for extractions added to (+n) or removed from (-n) folders.
+
+    Runs inside before_flush, so it uses Core statements in the caller's
+    transaction. Rows are touched in path order so concurrent writers lock
+    them consistently. Folders whose recursive count drops to zero are removed.
+
+    Args:
+        db: Session whose transaction receives the changes
+        deltas: {folder_path: change in direct extraction count}; "" (root) has no row
+    """
+    direct: Dict[str, int] = {}
+    recursive: Dict[str, int] = {}
+    for folder_path, delta in deltas.items():
+        if not folder_path:
+            continue
+        direct[folder_path] = direct.get(folder_path, 0) + delta
+        for ancestor in _ancestors(folder_path):
+            recursive[ancestor] = recursive.get(ancestor, 0) + delta
+
+    dialect = db.get_bind().dialect.name
+    emptied = []
+    for path in sorted(recursive):
+        direct_delta, recursive_delta = direct.get(path, 0), recursive[path]
+        if recursive_delta < 0:
+            emptied.append(path)
+        parent_path, _, name = path.rpartition("/")
+        values = {
+            "path": path, "parent_path": parent_path, "name": name, "depth": path.count("/") + 1,
+            "direct_count": direct_delta, "recursive_count": recursive_delta
+        }
+        if dialect in ("postgresql", "sqlite"):
+            insert = pg_insert if dialect == "postgresql" else sqlite_insert
+            stmt = insert(Folder).values(**values)
+            stmt = stmt.on_conflict_do_update(index_elements=["path"], set_={
+                "direct_count": Folder.direct_count + stmt.excluded.direct_count,
+                "recursive_count": Folder.recursive_count + stmt.excluded.recursive_count,
+                "updated_at": func.now()
+            })
+            db.execute(stmt)
+        else:
+            updated = db.execute(update(Folder).where(Folder.path == path).values(
+                direct_count=Folder.direct_count + direct_delta,
+                recursive_count=Folder.recursive_count + recursive_delta
+            ))
+            if not updated.rowcount:
+                db.execute(Folder.__table__.insert().values(**values))
+
+    if emptied:
+        db.execute(delete(Folder).where(Folder.path.in_(emptied), Folder.recursive_count <= 0))
+
 
 class FolderService:
     """
@@ -22,68 +97,79 @@ class FolderService:
     No physical file duplication - everything is metadata-driven.
     """
 
-    def browse_folder(self, path: str, db: Session) -> Dict[str, Any]:
+    def browse_folder(
+        self,
+        path: str,
+        db: Session,
+        limit: int = DEFAULT_PAGE_SIZE,
+        offset: int = 0
+    ) -> Dict[str, Any]:
         """
         Browse virtual folder structure at the given path.
 
+        Child folders come from the folders table; files are one page of the
+        extractions directly in this folder, so cost scales with the level
+        being shown rather than everything below it.
+
         Args:
             path: Folder path (e.g., "Invoice/2025-10-11" or "" for root)
             db: Database session
+            limit: Files per page (capped at MAX_PAGE_SIZE)
+            offset: Files to skip
 
         Returns:
             Dict with folders and files at current level
         """
         # Normalize path
         path = path.strip("/")
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        offset = max(0, offset)
+
+        # Subfolders with their recursive extraction counts
+        child_folders = db.query(Folder).filter(Folder.parent_path == path).order_by(Folder.name).all()
+        folders = [
+            {"name": folder.name, "count": folder.recursive_count, "path": folder.path}
+            for folder in child_folders
+        ]
 
-        # Query extractions at or below this path
+        # One page of files at the current level
         if path:
-            query = db.query(Extraction).filter(
-                Extraction.organized_path.like(f"{path}/%")
-            )
+            current = db.query(Folder.direct_count).filter(Folder.path == path).scalar()
+            total_files = current or 0
         else:
-            query = db.query(Extraction)
+            total_files = db.query(func.count(Extraction.id)).filter(Extraction.folder_path == "").scalar()
 
-        extractions = query.all()
-
-        # Build folder tree
-        folders = {}
-        files = []
-
-        current_depth = len(path.split('/')) if path else 0
-
-        for ext in extractions:
-            parts = ext.organized_path.split('/')
-
-            if len(parts) > current_depth + 1:
-                # This is a subfolder
-                folder_name = parts[current_depth]
-                if folder_name not in folders:
-                    folders[folder_name] = {
-                        "name": folder_name,
-                        "count": 0,
-                        "path": f"{path}/{folder_name}" if path else folder_name
-                    }
-                folders[folder_name]["count"] += 1
-            elif len(parts) == current_depth + 1:
-                # This is a file at current level
-                files.append({
-                    "id": ext.id,
-                    "extraction_id": ext.id,
-                    "physical_file_id": ext.physical_file_id,
-                    "filename": ext.physical_file.filename,
-                    "template": ext.template.name if ext.template else "Unknown",
-                    "status": ext.status,
-                    "confidence": ext.template_confidence,
-                    "path": ext.organized_path,
-                    "created_at": ext.created_at.isoformat()
-                })
+        extractions = db.query(Extraction).options(
+            joinedload(Extraction.physical_file),
+            joinedload(Extraction.template)
+        ).filter(
+            Extraction.folder_path == path
+        ).order_by(Extraction.id).offset(offset).limit(limit).all()
+
+        files = [
+            {
+                "id": ext.id,
+                "extraction_id": ext.id,
+                "physical_file_id": ext.physical_file_id,
+                "filename": ext.physical_file.filename,
+                "template": ext.template.name if ext.template else "Unknown",
+                "status": ext.status,
+                "confidence": ext.template_confidence,
+                "path": ext.organized_path,
+                "created_at": ext.created_at.isoformat()
+            }
+            for ext in extractions
+        ]
 
         return {
             "current_path": path,
-            "folders": list(folders.values()),
+            "folders": folders,
             "files": files,
-            "total_items": len(folders) + len(files)
+            "total_items": len(folders) + total_files,
+            "total_files": total_files,
+            "limit": limit,
+            "offset": offset,
+            "has_more": offset + len(files) < total_files
         }
 
     def reorganize_extractions(
@@ -106,8 +192,15 @@ class FolderService:
         target_path = target_path.strip("/")
         moved_count = 0
 
+        # Folder counts are adjusted on flush (apply_folder_deltas), in this transaction
+        extractions = {
+            ext.id: ext for ext in db.query(Extraction).options(
+                joinedload(Extraction.physical_file)
+            ).filter(Extraction.id.in_(extraction_ids)).all()
+        }
+
         for ext_id in extraction_ids:
-            extraction = db.query(Extraction).get(ext_id)
+            extraction = extractions.get(ext_id)
             if not extraction:
                 logger.warning(f"Extraction #{ext_id} not found, skipping")
                 continue
@@ -144,13 +237,11 @@ class FolderService:
 
         # Count extractions in this folder and subfolders
         if path:
-            query = db.query(Extraction).filter(
-                Extraction.organized_path.like(f"{path}/%")
-            )
+            query = db.query(Extraction).filter(self._subtree_filter(path))
+            total_extractions = db.query(Folder.recursive_count).filter(Folder.path == path).scalar() or 0
         else:
             query = db.query(Extraction)
-
-        total_extractions = query.count()
+            total_extractions = query.count()
 
         # Count by status
         status_counts = query.with_entities(
@@ -222,9 +313,7 @@ class FolderService:
         db_query = db.query(Extraction).join(PhysicalFile)
 
         if path:
-            db_query = db_query.filter(
-                Extraction.organized_path.like(f"{path}/%")
-            )
+            db_query = db_query.filter(self._subtree_filter(path))
 
         if query:
             db_query = db_query.filter(
@@ -284,38 +373,57 @@ class FolderService:
         Returns:
             Nested folder tree structure
         """
-        # Get all unique organized paths
-        paths = db.query(Extraction.organized_path).distinct().all()
-        paths = [p[0] for p in paths if p[0]]
-
-        # Build tree structure
-        tree = {}
-
-        for path in paths:
-            parts = path.split('/')
-            current = tree
+        rows = db.query(Folder.path, Folder.name, Folder.parent_path, Folder.recursive_count).filter(
+            Folder.depth <= max_depth
+        ).order_by(Folder.depth, Folder.name).all()
+
+        nodes = {"": {"children": []}}
+        for row in rows:
+            parent = nodes.get(row.parent_path)
+            if parent is None:
+                continue
+            node = {"name": row.name, "path": row.path, "count": row.recursive_count, "children": []}
+            nodes[row.path] = node
+            parent["children"].append(node)
 
-            for i, part in enumerate(parts[:-1]):  # Exclude filename
-                if i >= max_depth:
-                    break
+        return nodes[""]["children"]
 
-                if part not in current:
-                    current[part] = {}
-                current = current[part]
+    def _subtree_filter(self, path: str):
+        """Extractions in a folder or any folder below it (prefix index on folder_path)."""
+        return or_(
+            Extraction.folder_path == path,
+            Extraction.folder_path.like(_like_prefix(path), escape="\\")
+        )
 
-        return self._tree_to_list(tree)
+    def rebuild_folders(self, db: Session) -> int:
+        """
+        Recompute folder_path and the folders table from organized_path.
 
-    def _tree_to_list(self, tree: Dict[str, Any], parent_path: str = "") -> List[Dict[str, Any]]:
-        """Convert tree dict to list format for frontend."""
-        result = []
+        For backfills and repair after bulk statements that bypass the ORM
+        (e.g. query(...).delete()). Commits.
 
-        for name, children in tree.items():
-            path = f"{parent_path}/{name}" if parent_path else name
-            item = {
-                "name": name,
-                "path": path,
-                "children": self._tree_to_list(children, path) if children else []
-            }
-            result.append(item)
+        Returns:
+            Number of folders
+        """
+        # Core statements only: ORM changes would also be counted by the flush hook
+        missing = db.execute(select(Extraction.id, Extraction.organized_path).where(
+            Extraction.organized_path.isnot(None),
+            Extraction.folder_path.is_(None)
+        )).all()
+        for extraction_id, organized_path in missing:
+            db.execute(update(Extraction).where(Extraction.id == extraction_id).values(
+                folder_path=folder_of(organized_path)
+            ))
+
+        db.execute(delete(Folder))
+        counts = db.execute(
+            select(Extraction.folder_path, func.count(Extraction.id))
+            .where(Extraction.folder_path.isnot(None))
+            .group_by(Extraction.folder_path)
+        ).all()
+        apply_folder_deltas(db, dict(counts))
+        db.commit()
 
-        return sorted(result, key=lambda x: x["name"])
+        total = db.query(func.count(Folder.id)).scalar()
+        logger.info(f"Rebuilt {total} folders from {sum(c for _, c in counts)} extractions")
+        return total
@@ -0,0 +1,142 @@
+"""
+Job handlers run by the background worker (``python -m app.worker``).
+
+Each handler is registered for a BackgroundJob.type and raises on failure
+so the queue can retry it. Handlers whose work is synchronous database I/O
+run it in a thread (see ``_run_in_session``) so the event loop shared by all
+workers keeps serving heartbeats while they run.
+"""
+
+import asyncio
+import logging
+from typing import Callable, TypeVar
+
+from sqlalchemy.orm import Session
+
+from app.models.background_job import BackgroundJob
+from app.services.job_queue import register_job_handler
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+async def _run_in_session(work: Callable[[Session], T]) -> T:
+    """Run ``work`` with a fresh sync Session in a worker thread, off the event loop."""
+    from app.core.database import SessionLocal
+
+    def run() -> T:
+        db = SessionLocal()
+        try:
+            return work(db)
+        finally:
+            db.close()
+
+    return await asyncio.to_thread(run)
+
+
+@register_job_handler("process_document")
+async def process_document_job(job: BackgroundJob) -> None:
+    """Reducto extraction + indexing for one document ({"document_id"})."""
+    from app.api.documents import process_single_document
+
+    await process_single_document(job.job_data["document_id"], raise_errors=True)
+
+
+@register_job_handler("field_extraction")
+async def field_extraction_job(job: BackgroundJob) -> None:
+    """Extract a newly added field from every document of a schema ({"schema_id", "field_config"})."""
+    from app.services.field_extraction_service import FieldExtractionService
+
+    await FieldExtractionService()._extract_field_background(
+        background_job_id=job.id,
+        schema_id=job.job_data["schema_id"],
+        field_config=job.job_data["field_config"]
+    )
+
+
+@register_job_handler("rematch_documents")
+async def rematch_documents_job(job: BackgroundJob) -> None:
+    """Hybrid template matching for unmatched documents ({"document_ids": [...] | None})."""
+    from app.api.rematch import rematch_documents
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        summary = await rematch_documents(db, job.job_data.get("document_ids"), background_job_id=job.id)
+        logger.info(f"Rematch job {job.id}: {summary['message']}")
+    finally:
+        db.close()
+
+
+@register_job_handler("match_features_backfill")
+async def match_features_backfill_job(job: BackgroundJob) -> None:
+    """Compute match features for stored parse results that lack them ({"batch_size"?, "limit"?})."""
+    from app.services.match_feature_service import MatchFeatureService
+
+    def backfill(db: Session) -> int:
+        return MatchFeatureService(db).backfill(
+            batch_size=job.job_data.get("batch_size", 200),
+            limit=job.job_data.get("limit")
+        )
+
+    processed = await _run_in_session(backfill)
+    logger.info(f"Match feature backfill job {job.id}: {processed} parse result(s) processed")
+
+
+@register_job_handler("typed_field_indexes")
+async def typed_field_indexes_job(job: BackgroundJob) -> None:
+    """Build one pending typed index ({"index_id"}) or sync recommended indexes from query history ({})."""
+    from app.models.search_index import TypedFieldIndex
+    from app.services.typed_field_index_service import TypedFieldIndexService
+
+    def build(db: Session) -> None:
+        service = TypedFieldIndexService(db)
+        index_id = job.job_data.get("index_id")
+        if index_id is None:
+            built = service.sync()
+            logger.info(f"Typed index sync job {job.id}: built {len(built)} index(es)")
+            return
+
+        index = db.query(TypedFieldIndex).filter(TypedFieldIndex.id == index_id).first()
+        if index is None or index.status == "active":
+            return
+        if service.build_index(index).status == "failed":
+            raise RuntimeError(f"Building typed index {index.index_name} failed: {index.error}")
+
+    await _run_in_session(build)
+
+
+@register_job_handler("search_reindex")
+async def search_reindex_job(job: BackgroundJob) -> None:
+    """Rebuild the search index for a template or every document ({"template_id"?, "batch_size"?, "use_copy"?})."""
+    from app.services.search_reindex import reindex_documents
+
+    def reindex(db: Session) -> dict:
+        # reindex_documents only awaits sync-session calls: drive it on the thread's own loop
+        return asyncio.run(reindex_documents(
+            db,
+            template_id=job.job_data.get("template_id"),
+            batch_size=job.job_data.get("batch_size", 500),
+            use_copy=job.job_data.get("use_copy", False)
+        ))
+
+    stats = await _run_in_session(reindex)
+    logger.info(f"Search reindex job {job.id}: {stats['indexed']} document(s), {stats['docs_per_second']} docs/s")
+
+
+@register_job_handler("analytics_rollups")
+async def analytics_rollups_job(job: BackgroundJob) -> None:
+    """Recompute dirty analytics rollup days ({}) or every rollup ({"rebuild": true})."""
+    from app.services.analytics_rollup_service import AnalyticsRollupService
+
+    def refresh(db: Session) -> None:
+        service = AnalyticsRollupService(db)
+        if job.job_data.get("rebuild"):
+            rows = service.rebuild()
+            logger.info(f"Analytics rollup job {job.id}: rebuilt {rows} rollup row(s)")
+        else:
+            days = service.refresh()
+            logger.info(f"Analytics rollup job {job.id}: refreshed {days} day(s)")
+
+    await _run_in_session(refresh)
@@ -0,0 +1,323 @@
+"""
+Durable DB-backed job queue on top of the background_jobs table.
+
+API requests enqueue rows; separate worker processes (``python -m app.worker``)
+claim them with ``SELECT ... FOR UPDATE SKIP LOCKED`` so concurrent workers
+never pick the same job. A claimed job carries a lease that the worker
+renews with heartbeats; if a worker dies, the lease expires and another
+worker reclaims the job. Failures are retried with jittered exponential
+backoff up to ``max_attempts``.
+
+Lanes give coarse priority: interactive work (a user waiting on one
+document) is claimed before default work, which is claimed before bulk
+backfills. Workers can also be pinned to a subset of lanes.
+"""
+
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+
+from app.core.config import settings
+from app.core.database import AnySession, db_commit, db_execute, db_refresh
+from app.models.background_job import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+# Lane -> default priority (lower runs first)
+JOB_LANES: Dict[str, int] = {
+    "interactive": 0,
+    "default": 50,
+    "bulk": 100,
+}
+
+JobHandler = Callable[[BackgroundJob], Awaitable[None]]
+_job_handlers: Dict[str, JobHandler] = {}
+
+
+def register_job_handler(job_type: str) -> Callable[[JobHandler], JobHandler]:
+    """
+    Register the coroutine that runs jobs of ``job_type``.
+
+    The handler receives the claimed BackgroundJob (detached snapshot) and
+    should raise to signal failure; the queue takes care of retries.
+    """
+    def decorator(handler: JobHandler) -> JobHandler:
+        _job_handlers[job_type] = handler
+        return handler
+    return decorator
+
+
+def get_job_handler(job_type: str) -> Optional[JobHandler]:
+    return _job_handlers.get(job_type)
+
+
+class JobQueue:
+    """Enqueue, claim, heartbeat and settle background jobs."""
+
+    def __init__(
+        self,
+        db: AnySession,
+        lease_seconds: Optional[int] = None,
+        retry_base_delay: Optional[float] = None,
+        retry_max_delay: Optional[float] = None
+    ):
+        """
+        Initialize job queue.
+
+        Args:
+            db: Database session (sync or async)
+            lease_seconds: How long a claim is valid without a heartbeat
+            retry_base_delay: Base delay before the first retry (seconds)
+            retry_max_delay: Upper bound for retry delay (seconds)
+        """
+        self.db = db
+        self.lease_seconds = lease_seconds or settings.JOB_LEASE_SECONDS
+        self.retry_base_delay = retry_base_delay if retry_base_delay is not None else settings.JOB_RETRY_BASE_DELAY
+        self.retry_max_delay = retry_max_delay if retry_max_delay is not None else settings.JOB_RETRY_MAX_DELAY
+
+    async def enqueue(
+        self,
+        job_type: str,
+        job_data: Optional[Dict[str, Any]] = None,
+        lane: str = "default",
+        priority: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        total_items: int = 0
+    ) -> BackgroundJob:
+        """
+        Add a single job to the queue and commit.
+
+        Returns:
+            The persisted BackgroundJob (status "queued")
+        """
+        return (await self.enqueue_many(
+            job_type,
+            [job_data or {}],
+            lane=lane,
+            priority=priority,
+            max_attempts=max_attempts,
+            total_items=total_items
+        ))[0]
+
+    async def enqueue_many(
+        self,
+        job_type: str,
+        payloads: List[Dict[str, Any]],
+        lane: str = "default",
+        priority: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        total_items: int = 0
+    ) -> List[BackgroundJob]:
+        """
+        Add one job per payload in a single commit.
+
+        Returns:
+            The persisted BackgroundJobs, in payload order
+        """
+        if lane not in JOB_LANES:
+            raise ValueError(f"Unknown job lane '{lane}' (expected one of {list(JOB_LANES)})")
+
+        now = datetime.utcnow()
+        jobs = [
+            BackgroundJob(
+                type=job_type,
+                status="queued",
+                lane=lane,
+                priority=JOB_LANES[lane] if priority is None else priority,
+                available_at=now,
+                attempts=0,
+                max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+                total_items=total_items,
+                processed_items=0,
+                job_data=payload
+            )
+            for payload in payloads
+        ]
+        self.db.add_all(jobs)
+        await db_commit(self.db)
+
+        logger.info(f"Enqueued {len(jobs)} '{job_type}' job(s) in lane '{lane}'")
+        return jobs
+
+    async def claim(self, worker_id: str, lanes: Optional[List[str]] = None) -> Optional[BackgroundJob]:
+        """
+        Claim the next runnable job for ``worker_id``.
+
+        Runnable means queued and past ``available_at``, or running with an
+        expired lease (its worker died). Rows locked by other workers are
+        skipped rather than waited on.
+
+        Returns:
+            The claimed job (status "running"), or None if the queue is empty
+        """
+        while True:
+            now = datetime.utcnow()
+            conditions = [
+                or_(
+                    and_(
+                        BackgroundJob.status == "queued",
+                        or_(BackgroundJob.available_at.is_(None), BackgroundJob.available_at <= now)
+                    ),
+                    and_(
+                        BackgroundJob.status == "running",
+                        BackgroundJob.lease_expires_at.isnot(None),
+                        BackgroundJob.lease_expires_at < now
+                    )
+                )
+            ]
+            if lanes:
+                conditions.append(BackgroundJob.lane.in_(lanes))
+
+            stmt = (
+                select(BackgroundJob)
+                .where(*conditions)
+                .order_by(BackgroundJob.priority, BackgroundJob.available_at, BackgroundJob.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+                .execution_options(populate_existing=True)
+            )
+            job = (await db_execute(self.db, stmt)).scalars().first()
+            if job is None:
+                await db_commit(self.db)  # Release the transaction
+                return None
+
+            if job.status == "running" and job.attempts >= job.max_attempts:
+                # Lease expired on the final attempt: give up instead of looping forever
+                logger.warning(f"Job {job.id} lease expired on final attempt (worker {job.locked_by})")
+                self._settle_failed(job, "Worker lease expired", now)
+                await db_commit(self.db)
+                continue
+
+            if job.status == "running":
+                logger.warning(f"Reclaiming job {job.id} from expired lease (worker {job.locked_by})")
+
+            job.status = "running"
+            job.attempts += 1
+            job.locked_by = worker_id
+            job.heartbeat_at = now
+            job.lease_expires_at = now + timedelta(seconds=self.lease_seconds)
+            await db_commit(self.db)
+            await db_refresh(self.db, job)
+            return job
+
+    async def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        """
+        Extend the lease on a running job.
+
+        Returns:
+            False if the worker no longer owns the job (lease lost or cancelled)
+        """
+        now = datetime.utcnow()
+        result = await db_execute(
+            self.db,
+            update(BackgroundJob)
+            .where(
+                BackgroundJob.id == job_id,
+                BackgroundJob.locked_by == worker_id,
+                BackgroundJob.status == "running"
+            )
+            .values(heartbeat_at=now, lease_expires_at=now + timedelta(seconds=self.lease_seconds))
+        )
+        await db_commit(self.db)
+        return result.rowcount == 1
+
+    async def complete(self, job_id: int, worker_id: str) -> None:
+        """Mark a running job completed and release its lease (a job cancelled meanwhile stays cancelled)."""
+        now = datetime.utcnow()
+        await db_execute(
+            self.db,
+            update(BackgroundJob)
+            .where(
+                BackgroundJob.id == job_id,
+                BackgroundJob.locked_by == worker_id,
+                BackgroundJob.status == "running"
+            )
+            .values(
+                status="completed",
+                completed_at=now,
+                locked_by=None,
+                lease_expires_at=None,
+                error_message=None
+            )
+        )
+        await db_commit(self.db)
+
+    async def fail(self, job_id: int, worker_id: str, error: str) -> str:
+        """
+        Record a failed attempt: requeue with backoff, or fail permanently.
+
+        Returns:
+            The job's new status ("queued" or "failed"); "cancelled" if it was cancelled meanwhile
+        """
+        job = (await db_execute(
+            self.db,
+            select(BackgroundJob)
+            .where(BackgroundJob.id == job_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )).scalars().first()
+        if job is None or job.locked_by != worker_id or job.status != "running":
+            await db_commit(self.db)
+            return job.status if job else "failed"
+
+        now = datetime.utcnow()
+        if job.attempts >= job.max_attempts:
+            self._settle_failed(job, error, now)
+            logger.error(f"Job {job_id} ({job.type}) failed permanently after {job.attempts} attempts: {error}")
+        else:
+            delay = self.retry_delay(job.attempts)
+            job.status = "queued"
+            job.available_at = now + timedelta(seconds=delay)
+            job.locked_by = None
+            job.lease_expires_at = None
+            job.error_message = error
+            logger.warning(
+                f"Job {job_id} ({job.type}) attempt {job.attempts}/{job.max_attempts} failed, "
+                f"retrying in {delay:.1f}s: {error}"
+            )
+
+        status = job.status
+        await db_commit(self.db)
+        return status
+
+    def retry_delay(self, attempts: int) -> float:
+        """Jittered exponential backoff: base * 2^(attempts-1), +/- 50%."""
+        delay = min(self.retry_max_delay, self.retry_base_delay * (2 ** max(0, attempts - 1)))
+        return delay * random.uniform(0.5, 1.5)
+
+    def _settle_failed(self, job: BackgroundJob, error: str, now: datetime) -> None:
+        job.status = "failed"
+        job.error_message = error
+        job.completed_at = now
+        job.locked_by = None
+        job.lease_expires_at = None
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue depth per lane/status.
+
+        Returns:
+            {"by_lane": {lane: {status: count}}, "oldest_queued_at": iso | None}
+        """
+        rows = (await db_execute(
+            self.db,
+            select(BackgroundJob.lane, BackgroundJob.status, func.count(BackgroundJob.id))
+            .where(BackgroundJob.status.in_(["queued", "running"]))
+            .group_by(BackgroundJob.lane, BackgroundJob.status)
+        )).all()
+        oldest = (await db_execute(
+            self.db,
+            select(func.min(BackgroundJob.available_at)).where(BackgroundJob.status == "queued")
+        )).scalar()
+
+        by_lane: Dict[str, Dict[str, int]] = {lane: {"queued": 0, "running": 0} for lane in JOB_LANES}
+        for lane, status, count in rows:
+            by_lane.setdefault(lane, {"queued": 0, "running": 0})[status] = count
+
+        return {
+            "by_lane": by_lane,
+            "oldest_queued_at": oldest.isoformat() if oldest else None
+        }
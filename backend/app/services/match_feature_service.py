@@ -0,0 +1,267 @@
+"""
+Precomputed match features for template matching and clustering.
+
+Template matching (hybrid_match_document), upload clustering and rematching
+only need a small slice of a parse result: the text of the first chunks, its
+normalized word set, "Label:" field names and a page count. These are
+computed once when a parse result is written (see the before_flush hook in
+app.models.parse_result) and stored in match_features, keyed by the parse
+result's content hash. Readers load features for a whole batch of documents
+in one query instead of decoding and re-tokenizing every parse result.
+"""
+
+import logging
+import re
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import and_, case, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.document import Document
+from app.models.parse_result import MatchFeatures
+from app.models.physical_file import PhysicalFile
+
+logger = logging.getLogger(__name__)
+
+# Bump when the feature definitions change; stale rows are recomputed by the backfill job
+FEATURE_VERSION = 1
+
+HEAD_CHUNKS = 10  # Chunks that make up head_text / sample_text
+HEAD_TEXT_CHARS = 5000
+SAMPLE_TEXT_CHARS = 2000
+SHINGLE_SIZE = 3
+MAX_FIELD_NAMES = 20
+
+STOPWORDS = {"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with"}
+FIELD_LABEL_PATTERN = re.compile(r'([A-Z][a-zA-Z\s]+):')
+
+
+def normalize_tokens(text: str) -> Set[str]:
+    """Lowercased words longer than two characters, minus stopwords (the Jaccard word set)."""
+    return {w for w in text.lower().split() if w not in STOPWORDS and len(w) > 2}
+
+
+def jaccard(tokens1: Iterable[str], tokens2: Iterable[str]) -> float:
+    """Jaccard similarity of two token collections (0.0 when either is empty)."""
+    set1 = tokens1 if isinstance(tokens1, (set, frozenset)) else set(tokens1)
+    set2 = tokens2 if isinstance(tokens2, (set, frozenset)) else set(tokens2)
+    if not set1 or not set2:
+        return 0.0
+    return len(set1 & set2) / len(set1 | set2)
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> List[int]:
+    """Sorted, de-duplicated crc32 hashes of word n-shingles (stable across processes)."""
+    words = [w for w in text.lower().split() if w not in STOPWORDS]
+    if len(words) < size:
+        shingles = [" ".join(words)] if words else []
+    else:
+        shingles = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return sorted({zlib.crc32(s.encode("utf-8")) for s in shingles})
+
+
+def extract_field_names(parse_result: Dict[str, Any]) -> List[str]:
+    """
+    Likely field names from "Label: Value" patterns across all chunks.
+
+    Args:
+        parse_result: Reducto parse result dictionary
+
+    Returns:
+        Up to 20 unique snake_case field names, in order of first appearance
+    """
+    field_names = []
+    for chunk in parse_result.get("chunks", []):
+        content = chunk.get("content", "")
+        field_names.extend(
+            m.strip().lower().replace(" ", "_")
+            for m in FIELD_LABEL_PATTERN.findall(content)
+        )
+    return list(dict.fromkeys(field_names))[:MAX_FIELD_NAMES]
+
+
+def sample_text(parse_result: Dict[str, Any]) -> str:
+    """Head text as the Claude matcher reads it (Reducto v2 blocks, else chunk content)."""
+    parts = []
+    for chunk in (parse_result.get("chunks") or [])[:HEAD_CHUNKS]:
+        if isinstance(chunk.get("blocks"), list):
+            parts.extend(block["content"] for block in chunk["blocks"] if block.get("content"))
+        elif chunk.get("content") or chunk.get("text"):
+            parts.append(chunk.get("content", chunk.get("text", "")))
+    return "\n".join(parts)[:SAMPLE_TEXT_CHARS]
+
+
+def _page_count(chunks: List[Dict[str, Any]]) -> Optional[int]:
+    pages = [
+        block["bbox"]["page"]
+        for chunk in chunks
+        for block in chunk.get("blocks") or []
+        if isinstance(block.get("bbox"), dict) and isinstance(block["bbox"].get("page"), int)
+    ]
+    return max(pages) if pages else None
+
+
+def compute_match_features(parse_result: Dict[str, Any], content_hash: Optional[str] = None) -> MatchFeatures:
+    """
+    Derive match features from a parse result (the dict stored as reducto_parse_result).
+
+    Returns a transient MatchFeatures; it is only persisted when added to a session.
+    """
+    chunks = parse_result.get("chunks", []) or []
+    head_text = "\n".join(c.get("content", "") for c in chunks[:HEAD_CHUNKS])[:HEAD_TEXT_CHARS]
+    return MatchFeatures(
+        content_hash=content_hash,
+        feature_version=FEATURE_VERSION,
+        head_text=head_text,
+        sample_text=sample_text(parse_result),
+        tokens=sorted(normalize_tokens(head_text)),
+        shingles=shingle_hashes(head_text),
+        field_names=extract_field_names(parse_result),
+        page_count=_page_count(chunks),
+        chunk_count=len(chunks)
+    )
+
+
+def _feature_values(features: MatchFeatures) -> Dict[str, Any]:
+    return {column.name: getattr(features, column.name) for column in MatchFeatures.__table__.columns
+            if column.name != "created_at"}
+
+
+def put_match_features(db: Session, content_hash: str, parse_result: Dict[str, Any]) -> None:
+    """
+    Write features for a parse result in the caller's transaction (upsert on content hash).
+
+    Runs inside before_flush, so it uses Core statements rather than the ORM.
+    """
+    values = _feature_values(compute_match_features(parse_result, content_hash))
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = insert(MatchFeatures).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["content_hash"],
+            set_={k: stmt.excluded[k] for k in values if k != "content_hash"},
+            where=MatchFeatures.feature_version < FEATURE_VERSION
+        )
+    else:
+        if db.execute(select(MatchFeatures.content_hash).where(MatchFeatures.content_hash == content_hash)).first():
+            return
+        stmt = MatchFeatures.__table__.insert().values(**values)
+    db.execute(stmt)
+
+
+class MatchFeatureService:
+    """Batch lookup and backfill of match features"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def for_documents(self, documents: Iterable[Document]) -> Dict[int, MatchFeatures]:
+        """
+        Match features per document id, loaded in one query.
+
+        Features missing for a stored parse result (rows written before
+        match_features existed) are computed and written in the caller's
+        transaction. Documents without a parse result are left out.
+        """
+        documents = list(documents)
+        hashes = self._parse_result_hashes([doc.id for doc in documents])
+        wanted = {h for h in hashes.values() if h}
+        found = {}
+        if wanted:
+            found = {
+                f.content_hash: f for f in self.db.execute(
+                    select(MatchFeatures).where(
+                        MatchFeatures.content_hash.in_(wanted),
+                        MatchFeatures.feature_version == FEATURE_VERSION
+                    )
+                ).scalars()
+            }
+
+        result = {}
+        computed = 0
+        for doc in documents:
+            content_hash = hashes.get(doc.id)
+            features = found.get(content_hash) if content_hash else None
+            if features is None:
+                parse_result = doc.actual_parse_result
+                if not parse_result:
+                    continue
+                features = compute_match_features(parse_result, content_hash)
+                if content_hash:
+                    put_match_features(self.db, content_hash, parse_result)
+                    found[content_hash] = features
+                    computed += 1
+            result[doc.id] = features
+
+        if computed:
+            logger.info(f"Computed match features for {computed} parse result(s) on read")
+        return result
+
+    def _parse_result_hashes(self, document_ids: List[int]) -> Dict[int, Optional[str]]:
+        """Content hash each document matches on (PhysicalFile first, like actual_parse_result)."""
+        if not document_ids:
+            return {}
+        file_has_result = and_(
+            PhysicalFile.id.isnot(None),
+            or_(PhysicalFile.parse_result_hash.isnot(None), PhysicalFile.legacy_parse_result.isnot(None))
+        )
+        rows = self.db.execute(
+            select(
+                Document.id,
+                case((file_has_result, PhysicalFile.parse_result_hash), else_=Document.parse_result_hash)
+            )
+            .outerjoin(PhysicalFile, Document.physical_file_id == PhysicalFile.id)
+            .where(Document.id.in_(document_ids))
+        ).all()
+        return dict(rows)
+
+    def get(self, document: Document) -> Optional[MatchFeatures]:
+        """Match features for one document (None if it has no parse result)."""
+        return self.for_documents([document]).get(document.id)
+
+    def backfill(self, batch_size: int = 200, limit: Optional[int] = None) -> int:
+        """
+        Compute features for stored parse results that have none (or an old feature_version).
+
+        Commits per batch so a retried job resumes where it stopped.
+
+        Returns:
+            Number of parse results processed
+        """
+        from app.services.parse_result_store import get_parse_result_store
+
+        store = get_parse_result_store()
+        current = select(MatchFeatures.content_hash).where(MatchFeatures.feature_version == FEATURE_VERSION)
+        referenced = select(PhysicalFile.parse_result_hash.label("content_hash")).where(
+            PhysicalFile.parse_result_hash.isnot(None)
+        ).union(
+            select(Document.parse_result_hash).where(Document.parse_result_hash.isnot(None))
+        ).subquery()
+
+        processed = 0
+        while limit is None or processed < limit:
+            size = batch_size if limit is None else min(batch_size, limit - processed)
+            hashes = self.db.execute(
+                select(referenced.c.content_hash)
+                .where(referenced.c.content_hash.not_in(current))
+                .order_by(referenced.c.content_hash)
+                .limit(size)
+            ).scalars().all()
+            if not hashes:
+                break
+
+            for content_hash in hashes:
+                parse_result = store.get(content_hash)
+                if parse_result is None:
+                    # Blob missing: record empty features so the row is not retried forever
+                    parse_result = {}
+                put_match_features(self.db, content_hash, parse_result)
+            self.db.commit()
+            processed += len(hashes)
+            logger.info(f"Match feature backfill: {processed} parse result(s) processed")
+
+        return processed
@@ -0,0 +1,119 @@
+"""
+Single-statement metric queries for trends and comparisons.
+
+A trend is one date_trunc GROUP BY returning the metric per bucket, and a
+period or group comparison is one SELECT with a FILTER (WHERE ...) aggregate
+pair per segment, instead of one get_aggregations scan per bucket, period
+or group:
+
+    SELECT sum(amount) FILTER (WHERE <period 0>) AS value_0,
+           count(amount) FILTER (WHERE <period 0>) AS count_0,
+           sum(amount) FILTER (WHERE <period 1>) AS value_1, ...
+    FROM document_search_index
+    WHERE <filters> AND (<period 0> OR <period 1>)
+
+Statements select from document_search_index; PostgresService applies the
+caller's filters and runs them.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_, select
+
+from app.models.search_index import DocumentSearchIndex
+from app.services.aggregation_planner import DATE_TRUNC_INTERVALS
+from app.services.typed_field_index_service import get_typed_field_registry
+
+NUMERIC_METRICS = ("sum", "avg", "min", "max")
+METRIC_AGG_TYPES = (*NUMERIC_METRICS, "count", "cardinality")
+
+# Group fields that live in query_context rather than extracted_fields
+QUERY_CONTEXT_FIELDS = ("template_name", "template_id")
+
+
+def metric_columns(field: str, agg_type: str, condition=None):
+    """
+    (value, count) aggregate expressions for a metric, FILTERed by condition.
+
+    count is the number of values behind the metric: non-null numbers for
+    sum/avg/min/max, matching documents for count, distinct values for
+    cardinality (the same numbers get_aggregations reports).
+    """
+    registry = get_typed_field_registry()
+    if agg_type in NUMERIC_METRICS:
+        numeric = registry.numeric(field)
+        value, count = getattr(func, agg_type)(numeric), func.count(numeric)
+    elif agg_type == "count":
+        value = count = func.count()
+    elif agg_type == "cardinality":
+        value = count = func.count(func.distinct(DocumentSearchIndex.extracted_fields[field].astext))
+    else:
+        raise ValueError(f"Unsupported metric aggregation: {agg_type}")
+
+    if condition is None:
+        return value, count
+    filtered = value.filter(condition)
+    return filtered, filtered if count is value else count.filter(condition)
+
+
+def _parse_datetime(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def period_condition(date_expr, period: Optional[Dict[str, str]]):
+    """
+    Rows whose date falls in {"from", "to"}.
+
+    A date-only "to" ("2024-12-31") includes that whole day; a timestamp
+    "to" is exclusive, so back-to-back periods sharing a boundary do not
+    count the boundary twice.
+    """
+    conditions = [date_expr.isnot(None)]
+    period = period or {}
+    if period.get("from"):
+        conditions.append(date_expr >= _parse_datetime(period["from"]))
+    if period.get("to"):
+        end = _parse_datetime(period["to"])
+        if len(period["to"]) == 10:
+            end += timedelta(days=1)
+        conditions.append(date_expr < end)
+    return and_(*conditions)
+
+
+def group_expr(group_field: str):
+    """Text value compared against group names."""
+    if group_field in QUERY_CONTEXT_FIELDS:
+        return DocumentSearchIndex.query_context[group_field].astext
+    return DocumentSearchIndex.extracted_fields[group_field].astext
+
+
+def trend_statement(
+    field: str,
+    agg_type: str,
+    date_field: str,
+    interval: str = "month",
+    date_range: Optional[Dict[str, str]] = None
+):
+    """SELECT bucket, doc_count, value ... GROUP BY date_trunc(interval, date) ORDER BY bucket."""
+    date_expr = get_typed_field_registry().timestamp(date_field)
+    bucket = func.date_trunc(interval if interval in DATE_TRUNC_INTERVALS else "month", date_expr)
+    value, _ = metric_columns(field, agg_type)
+    return (
+        select(bucket.label("bucket"), func.count().label("doc_count"), value.label("value"))
+        .select_from(DocumentSearchIndex)
+        .where(period_condition(date_expr, date_range))
+        .group_by(bucket)
+        .order_by(bucket)
+    )
+
+
+def segment_statement(field: str, agg_type: str, conditions: List[Any]):
+    """One row with value_i/count_i per condition; rows outside every segment are not scanned for."""
+    columns = []
+    for i, condition in enumerate(conditions):
+        value, count = metric_columns(field, agg_type, condition)
+        columns += [value.label(f"value_{i}"), count.label(f"count_{i}")]
+    return select(*columns).select_from(DocumentSearchIndex).where(or_(*conditions))
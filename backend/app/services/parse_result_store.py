@@ -0,0 +1,259 @@
+"""
+Out-of-row store for Reducto parse results.
+
+Parse output (every chunk, block and bbox) can run to megabytes per file.
+Instead of a JSON column on every Document/PhysicalFile row, the output is
+serialized canonically, hashed (sha256) and stored once, compressed, in the
+parse_results table or on local disk. Rows keep only the hash; see
+StoredParseResultMixin for the attribute that reads and writes through here.
+
+Decoded JSON bytes are kept in a size-bounded LRU so repeated reads of the
+same parse (template matching, reprocessing) skip the fetch and decompress.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.document import Document
+from app.models.parse_result import ParseResult
+from app.models.physical_file import PhysicalFile
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+logger = logging.getLogger(__name__)
+
+
+def _compress(codec: str, raw: bytes) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(raw)
+    return gzip.compress(raw, compresslevel=6)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        if not HAS_ZSTD:
+            raise RuntimeError("Parse result is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class ParseResultStore:
+    """Content-addressed, compressed parse-result blobs with an LRU of decoded JSON."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        storage: Optional[str] = None,
+        directory: Optional[str] = None,
+        codec: Optional[str] = None,
+        cache_max_bytes: Optional[int] = None,
+        parser_version: Optional[str] = None
+    ):
+        """
+        Initialize parse result store.
+
+        Args:
+            session_factory: Sessions used to fetch blobs on cache misses (default SessionLocal)
+            storage: "db" (parse_results.data) or "disk" (files under directory)
+            directory: Root directory for disk storage
+            codec: "zstd", "gzip" or "auto" (zstd when installed)
+            cache_max_bytes: Budget for decoded JSON kept in memory
+            parser_version: Recorded with new blobs so results can be reparsed per version
+        """
+        if session_factory is None:
+            from app.core.database import SessionLocal
+            session_factory = SessionLocal
+        self.session_factory = session_factory
+        self.storage = storage or settings.PARSE_RESULT_STORAGE
+        self.directory = directory or settings.PARSE_RESULT_DIR
+        codec = codec or settings.PARSE_RESULT_CODEC
+        self.codec = ("zstd" if HAS_ZSTD else "gzip") if codec == "auto" else codec
+        self.cache_max_bytes = (
+            cache_max_bytes if cache_max_bytes is not None else settings.PARSE_RESULT_CACHE_MB * 1024 * 1024
+        )
+        self.parser_version = parser_version or settings.PARSE_RESULT_PARSER_VERSION
+
+        if self.storage not in ("db", "disk"):
+            raise ValueError(f"Unknown parse result storage '{self.storage}' (expected db or disk)")
+        if self.codec == "zstd" and not HAS_ZSTD:
+            raise ValueError("PARSE_RESULT_CODEC=zstd requires the zstandard package")
+
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+
+    # Encoding
+
+    @staticmethod
+    def encode(value: Any) -> Tuple[str, bytes]:
+        """Canonical JSON bytes and their sha256 (the content address)."""
+        raw = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+        return hashlib.sha256(raw).hexdigest(), raw
+
+    def blob_path(self, content_hash: str, codec: Optional[str] = None) -> str:
+        return os.path.join(self.directory, content_hash[:2], f"{content_hash}.json.{codec or self.codec}")
+
+    # LRU of decoded JSON bytes
+
+    def _cache_get(self, content_hash: str) -> Optional[bytes]:
+        with self._lock:
+            raw = self._cache.get(content_hash)
+            if raw is not None:
+                self._cache.move_to_end(content_hash)
+            return raw
+
+    def cache_put(self, content_hash: str, raw: bytes) -> None:
+        if len(raw) > self.cache_max_bytes:
+            return
+        with self._lock:
+            if content_hash in self._cache:
+                self._cache.move_to_end(content_hash)
+                return
+            self._cache[content_hash] = raw
+            self._cache_bytes += len(raw)
+            while self._cache_bytes > self.cache_max_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= len(evicted)
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._cache_bytes = 0
+
+    # Read / write
+
+    def get(self, content_hash: str) -> Optional[Any]:
+        """Decoded parse result for a hash (None if the blob is missing)."""
+        raw = self._cache_get(content_hash)
+        if raw is None:
+            raw = self._load(content_hash)
+            if raw is None:
+                logger.error(f"Parse result {content_hash} not found in store")
+                return None
+            self.cache_put(content_hash, raw)
+        return json.loads(raw)
+
+    def _load(self, content_hash: str) -> Optional[bytes]:
+        db = self.session_factory()
+        try:
+            row = db.execute(
+                select(ParseResult.codec, ParseResult.storage, ParseResult.data).where(
+                    ParseResult.content_hash == content_hash
+                )
+            ).first()
+        finally:
+            db.close()
+        if row is None:
+            return None
+
+        if row.storage == "disk":
+            with open(self.blob_path(content_hash, row.codec), "rb") as f:
+                data = f.read()
+        else:
+            data = row.data
+        return _decompress(row.codec, data)
+
+    def stage(self, value: Any) -> Tuple[str, bytes]:
+        """Hash a new parse result and cache it; the blob is written by put() at flush."""
+        content_hash, raw = self.encode(value)
+        self.cache_put(content_hash, raw)
+        return content_hash, raw
+
+    def put(self, db: Session, content_hash: str, raw: bytes, file_hash: Optional[str] = None) -> None:
+        """
+        Write a blob in the caller's transaction (no-op if the content already exists).
+
+        Runs inside before_flush, so it uses Core statements rather than the ORM.
+        """
+        compressed = _compress(self.codec, raw)
+        if self.storage == "disk":
+            self._write_file(content_hash, compressed)
+
+        values = {
+            "content_hash": content_hash,
+            "file_hash": file_hash,
+            "parser_version": self.parser_version,
+            "codec": self.codec,
+            "storage": self.storage,
+            "data": compressed if self.storage == "db" else None,
+            "raw_size": len(raw),
+            "stored_size": len(compressed)
+        }
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            stmt = pg_insert(ParseResult).values(**values).on_conflict_do_nothing(index_elements=["content_hash"])
+        elif dialect == "sqlite":
+            stmt = sqlite_insert(ParseResult).values(**values).on_conflict_do_nothing(index_elements=["content_hash"])
+        else:
+            if db.execute(select(ParseResult.content_hash).where(ParseResult.content_hash == content_hash)).first():
+                return
+            stmt = ParseResult.__table__.insert().values(**values)
+        db.execute(stmt)
+
+    def _write_file(self, content_hash: str, compressed: bytes) -> None:
+        path = self.blob_path(content_hash)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename so concurrent writers never expose a partial blob
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp_path, path)
+
+    def find(self, db: Session, file_hash: str, parser_version: Optional[str] = None) -> Optional[str]:
+        """Content hash of an existing parse of this file by this parser version, if any."""
+        return db.execute(select(ParseResult.content_hash).where(
+            ParseResult.file_hash == file_hash,
+            ParseResult.parser_version == (parser_version or self.parser_version)
+        ).limit(1)).scalar()
+
+    def prune_unreferenced(self, db: Session) -> int:
+        """Delete blobs no Document or PhysicalFile points at (e.g. after reparsing)."""
+        referenced = select(PhysicalFile.parse_result_hash).where(
+            PhysicalFile.parse_result_hash.isnot(None)
+        ).union(
+            select(Document.parse_result_hash).where(Document.parse_result_hash.isnot(None))
+        )
+        orphans = db.execute(select(ParseResult.content_hash, ParseResult.storage, ParseResult.codec).where(
+            ParseResult.content_hash.not_in(referenced)
+        )).all()
+        if not orphans:
+            return 0
+
+        db.execute(delete(ParseResult).where(ParseResult.content_hash.in_([o.content_hash for o in orphans])))
+        db.commit()
+        for orphan in orphans:
+            if orphan.storage == "disk":
+                path = self.blob_path(orphan.content_hash, orphan.codec)
+                if os.path.exists(path):
+                    os.remove(path)
+        return len(orphans)
+
+
+_parse_result_store: Optional[ParseResultStore] = None
+
+
+def get_parse_result_store() -> ParseResultStore:
+    """Get the process-wide parse result store"""
+    global _parse_result_store
+    if _parse_result_store is None:
+        _parse_result_store = ParseResultStore()
+    return _parse_result_store
@@ -2,28 +2,105 @@
 PostgreSQL service replacing ElasticsearchService.
 Provides full-text search, aggregations, and similarity matching using PostgreSQL.
 """
+import csv
+import io
+import json
 import logging
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
-from sqlalchemy import and_, case as sql_case, cast, Float, func, or_, select, text, TIMESTAMP
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, case as sql_case, cast, delete, Float, func, insert, or_, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, defer, selectinload
 
+from app.core.config import settings
+from app.core.database import AnySession, db_close, db_commit, db_execute, db_refresh, db_rollback
 from app.models.document import Document
-from app.models.search_index import DocumentSearchIndex, TemplateSignature
+from app.models.physical_file import PhysicalFile
+from app.models.search_index import DocumentChunk, DocumentSearchIndex, TemplateSignature
+from app.services.aggregation_planner import plan_multi_aggregations
+from app.services.answer_cache import invalidate_cached_answers
+from app.services.document_chunks import build_document_chunks
+from app.services.document_clustering import cluster_documents
+from app.services.match_feature_service import MatchFeatureService
+from app.services.metric_queries import group_expr, period_condition, segment_statement, trend_statement
+from app.services.parse_result_store import get_parse_result_store
+from app.services.typed_field_index_service import get_typed_field_registry
+from app.utils.pagination import count_total, decode_cursor, encode_cursor, keyset_after, validate_total_mode
 
 logger = logging.getLogger(__name__)
 
+SNIPPET_DELIMITER = "|||"  # Separates ts_headline fragments; split back into a list per hit
+
+# document_search_index columns rewritten by a bulk upsert
+BULK_INDEX_COLUMNS = (
+    "full_text", "extracted_fields", "query_context", "all_text", "field_index",
+    "confidence_metrics", "citation_metadata", "field_metadata",
+)
+
+# COPY staging for bulk_index_documents(use_copy=True): rows are emptied at commit
+COPY_STAGE_TABLE = "search_index_stage"
+COPY_STAGE_COLUMNS = (
+    "document_id", "full_text", "extracted_fields", "query_context", "all_text", "field_index",
+    "confidence_metrics", "citation_metadata", "field_metadata", "indexed_at",
+)
+COPY_STAGE_DDL = f"""
+    CREATE TEMP TABLE IF NOT EXISTS {COPY_STAGE_TABLE} (
+        document_id INTEGER,
+        full_text TEXT,
+        extracted_fields JSONB,
+        query_context JSONB,
+        all_text TEXT,
+        field_index JSONB,
+        confidence_metrics JSONB,
+        citation_metadata JSONB,
+        field_metadata JSONB,
+        indexed_at TIMESTAMP
+    ) ON COMMIT DELETE ROWS
+"""
+COPY_UPSERT_SQL = f"""
+    INSERT INTO document_search_index (
+        document_id, full_text, extracted_fields, query_context, all_text, field_index,
+        confidence_metrics, citation_metadata, field_metadata, indexed_at, updated_at
+    )
+    SELECT
+        document_id, full_text, extracted_fields, query_context, all_text,
+        ARRAY(SELECT jsonb_array_elements_text(field_index)),
+        confidence_metrics, citation_metadata, field_metadata, indexed_at, indexed_at
+    FROM {COPY_STAGE_TABLE}
+    ON CONFLICT (document_id) DO UPDATE SET
+        {", ".join(f"{column} = EXCLUDED.{column}" for column in BULK_INDEX_COLUMNS)},
+        updated_at = EXCLUDED.updated_at
+"""
+
+
+def _batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
 
 class PostgresService:
     """
     PostgreSQL service for document search and indexing.
     Replaces ElasticsearchService with PostgreSQL full-text search.
+
+    Accepts either a sync Session or an AsyncSession (see get_async_db); with an
+    AsyncSession every query is awaited so concurrent searches overlap.
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AnySession):
         self.db = db
 
+    async def _execute(self, stmt, params: Optional[Dict[str, Any]] = None):
+        return await db_execute(self.db, stmt, params)
+
     async def create_index(self, schema: Dict[str, Any]) -> None:
         """
         Create/update search index for a schema.
@@ -40,7 +117,8 @@ class PostgresService:
         confidence_scores: Dict[str, float],
         full_text: str = "",
         schema: Optional[Dict[str, Any]] = None,
-        field_metadata: Optional[Dict[str, Any]] = None
+        field_metadata: Optional[Dict[str, Any]] = None,
+        chunks: Optional[List[Dict[str, Any]]] = None
     ) -> int:
         """
         Index a document with extracted fields and enriched metadata.
@@ -53,10 +131,51 @@ class PostgresService:
             full_text: Full document text
             schema: Schema definition (for enrichment)
             field_metadata: Field metadata from SchemaRegistry (for enrichment)
+            chunks: Reducto parse chunks full_text was joined from; replaces the
+                document's passage chunks (document_chunks) when given
         
         Returns:
             Document search index ID
         """
+        row = self._build_index_row(
+            document_id, filename, extracted_fields, confidence_scores, full_text, schema, field_metadata
+        )
+
+        existing = (await self._execute(
+            select(DocumentSearchIndex).where(DocumentSearchIndex.document_id == document_id)
+        )).scalars().first()
+
+        if chunks is not None:
+            await self._replace_document_chunks(document_id, chunks)
+
+        if existing:
+            for column, value in row.items():
+                setattr(existing, column, value)
+            existing.updated_at = datetime.utcnow()
+            await db_commit(self.db)
+            logger.info(f"Updated document search index: {document_id}")
+            return existing.id
+        else:
+            search_index = DocumentSearchIndex(**row)
+            self.db.add(search_index)
+            await db_commit(self.db)
+            await db_refresh(self.db, search_index)
+            logger.info(
+                f"Indexed document: {document_id} (avg confidence: {row['confidence_metrics']['avg_confidence']:.2f})"
+            )
+            return search_index.id
+
+    def _build_index_row(
+        self,
+        document_id: int,
+        filename: str,
+        extracted_fields: Dict[str, Any],
+        confidence_scores: Dict[str, float],
+        full_text: str = "",
+        schema: Optional[Dict[str, Any]] = None,
+        field_metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """document_search_index column values for one document (see index_document)."""
         all_text_parts = [full_text, filename]
         field_names = list(extracted_fields.keys())
 
@@ -118,40 +237,17 @@ class PostgresService:
             "audit_urls": {}
         }
 
-        existing = self.db.query(DocumentSearchIndex).filter(
-            DocumentSearchIndex.document_id == document_id
-        ).first()
-
-        if existing:
-            existing.full_text = full_text
-            existing.extracted_fields = extracted_fields
-            existing.query_context = query_context
-            existing.all_text = all_text
-            existing.field_index = field_names
-            existing.confidence_metrics = confidence_metrics
-            existing.citation_metadata = citation_metadata
-            existing.field_metadata = field_meta
-            existing.updated_at = datetime.utcnow()
-            self.db.commit()
-            logger.info(f"Updated document search index: {document_id}")
-            return existing.id
-        else:
-            search_index = DocumentSearchIndex(
-                document_id=document_id,
-                full_text=full_text,
-                extracted_fields=extracted_fields,
-                query_context=query_context,
-                all_text=all_text,
-                field_index=field_names,
-                confidence_metrics=confidence_metrics,
-                citation_metadata=citation_metadata,
-                field_metadata=field_meta
-            )
-            self.db.add(search_index)
-            self.db.commit()
-            self.db.refresh(search_index)
-            logger.info(f"Indexed document: {document_id} (avg confidence: {confidence_metrics['avg_confidence']:.2f})")
-            return search_index.id
+        return {
+            "document_id": document_id,
+            "full_text": full_text,
+            "extracted_fields": extracted_fields,
+            "query_context": query_context,
+            "all_text": all_text,
+            "field_index": field_names,
+            "confidence_metrics": confidence_metrics,
+            "citation_metadata": citation_metadata,
+            "field_metadata": field_meta
+        }
 
     def _build_canonical_fields(
         self,
@@ -201,7 +297,13 @@ class PostgresService:
         custom_query: Optional[Dict[str, Any]] = None,
         page: int = 1,
         size: int = 10,
-        use_weighted_tsv: bool = True  # Phase 1: Use weighted tsvector for better ranking
+        use_weighted_tsv: bool = True,  # Phase 1: Use weighted tsvector for better ranking
+        cursor: Optional[str] = None,
+        total_mode: str = "exact",
+        fields: Optional[List[str]] = None,
+        include_text: bool = True,
+        snippets: int = 0,
+        highlight_query: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Search documents with optional filters using PostgreSQL full-text search.
@@ -213,16 +315,35 @@ class PostgresService:
             filters: Field filters
             min_confidence: Minimum confidence threshold
             custom_query: Custom SQL conditions (for NL search compatibility)
-            page: Page number
+            page: Page number (ignored when a cursor is given)
             size: Results per page
             use_weighted_tsv: Use weighted tsvector for better ranking (default: True)
+            cursor: ``next_cursor`` from the previous page; continues after its
+                last (rank, document_id) instead of using OFFSET
+            total_mode: exact | capped | estimate | none (see app.utils.pagination)
+            fields: Extracted fields to return (default: all); the rest of the
+                field JSON is never read from the table
+            include_text: Return full_text and _all_text (False leaves both
+                columns unloaded; use snippets for context)
+            snippets: ts_headline fragments per hit, returned as
+                highlights["full_text"] (0: none)
+            highlight_query: Text to highlight (default: query; custom_query
+                callers pass the user's question)
 
         Returns:
-            Search results with total count and documents (now with real relevance scores!)
+            Search results with total count and documents (now with real relevance scores!),
+            plus ``total_relation`` ("eq", "gte" or "estimate") and ``next_cursor``
+
+        Raises:
+            ValueError: Invalid cursor or total_mode
         """
+        validate_total_mode(total_mode)
+        await get_typed_field_registry().refresh_if_stale(self.db)
+
         # Track if we're computing rank
         has_rank = False
         rank_column = None
+        rank_expr = None
 
         if custom_query:
             stmt, rank_column = self._apply_custom_query(select(DocumentSearchIndex).join(Document), custom_query)
@@ -247,7 +368,7 @@ class PostgresService:
                         ).add_columns(
                             rank_expr.label('rank')
                         ).order_by(
-                            text('rank DESC')
+                            text('rank DESC'), DocumentSearchIndex.document_id.desc()
                         )
 
                         has_rank = True
@@ -272,11 +393,13 @@ class PostgresService:
                     ).add_columns(
                         rank_expr.label('rank')
                     ).order_by(
-                        text('rank DESC')
+                        text('rank DESC'), DocumentSearchIndex.document_id.desc()
                     )
 
                     has_rank = True
                     rank_column = 'rank'
+            else:
+                stmt = stmt.order_by(DocumentSearchIndex.document_id.desc())
 
             # Field filters
             if filters:
@@ -291,56 +414,138 @@ class PostgresService:
                     cast(DocumentSearchIndex.confidence_metrics['avg_confidence'].astext, Float) >= min_confidence
                 )
 
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total = self.db.execute(count_stmt).scalar()
+        total, total_relation = await count_total(self.db, stmt, total_mode)
 
+        # Keyset continuation on (rank, document_id) / document_id; custom
+        # queries bring their own ordering, so their cursor carries an offset
         offset = (page - 1) * size
-        stmt = stmt.offset(offset).limit(size)
-
-        # Execute query
-        if has_rank:
-            results_with_rank = self.db.execute(stmt).all()
-            results = [(row[0], row[1] if len(row) > 1 else 1.0) for row in results_with_rank]
-        else:
-            results = [(row, 1.0) for row in self.db.execute(stmt).scalars().all()]
+        keyset = not custom_query
+        if cursor:
+            if not keyset:
+                offset = int(decode_cursor(cursor, ["o"])["o"])
+            elif rank_expr is not None:
+                after = decode_cursor(cursor, ["rank", "id"])
+                stmt = stmt.where(keyset_after(
+                    [rank_expr, DocumentSearchIndex.document_id], [float(after["rank"]), int(after["id"])]
+                ))
+                offset = 0
+            else:
+                after = decode_cursor(cursor, ["id"])
+                stmt = stmt.where(DocumentSearchIndex.document_id < int(after["id"]))
+                offset = 0
+
+        # Projection: heavy columns stay deferred (raiseload, so nothing below
+        # can fetch them row by row); selected fields are read as JSONB paths
+        projections = self._search_projections(fields, snippets, highlight_query or query)
+        stmt = stmt.add_columns(*[expr.label(label) for label, expr in projections])
+        deferred = []
+        if not include_text:
+            deferred += [DocumentSearchIndex.full_text, DocumentSearchIndex.all_text]
+        if fields is not None:
+            deferred += [DocumentSearchIndex.extracted_fields, DocumentSearchIndex.field_metadata]
+
+        # Populate result.document from the existing join (no lazy load per row);
+        # one extra row tells whether there is a next page
+        stmt = stmt.options(
+            contains_eager(DocumentSearchIndex.document).load_only(Document.id, Document.filename),
+            *[defer(column, raiseload=True) for column in deferred]
+        ).offset(offset).limit(size + 1)
+
+        # Execute query (JSON projections are unhashable, so dedupe on the entity)
+        rows = (await self._execute(stmt)).unique(lambda row: row[0].id).all()
+        results = [(row[0], row[1] if has_rank and len(row) > 1 else 1.0, row._mapping) for row in rows]
+
+        next_cursor = None
+        if len(results) > size:
+            results = results[:size]
+            last, last_score, _ = results[-1]
+            if not keyset:
+                next_cursor = encode_cursor({"o": offset + size})
+            elif rank_expr is not None:
+                next_cursor = encode_cursor({"rank": float(last_score), "id": last.document_id})
+            else:
+                next_cursor = encode_cursor({"id": last.document_id})
 
         # Format results
         documents = []
-        for result, score in results:
+        for result, score, columns in results:
+            if fields is None:
+                extracted = result.extracted_fields
+                confidence_scores = {
+                    field: meta.get("confidence", 0.0)
+                    for field, meta in result.field_metadata.items()
+                }
+            else:
+                extracted = {
+                    field: columns[f"_field_{i}"]
+                    for i, field in enumerate(fields) if columns[f"_field_{i}"] is not None
+                }
+                confidence_scores = {
+                    field: float(columns[f"_confidence_{i}"])
+                    for i, field in enumerate(fields) if columns[f"_confidence_{i}"] is not None
+                }
+
             doc_data = {
                 "document_id": result.document_id,
                 "filename": result.document.filename if result.document else "Unknown",
-                "full_text": result.full_text,
-                "confidence_scores": {
-                    field: meta.get("confidence", 0.0)
-                    for field, meta in result.field_metadata.items()
-                },
-                **result.extracted_fields,
+                "confidence_scores": confidence_scores,
+                **extracted,
                 "_query_context": result.query_context,
-                "_all_text": result.all_text,
                 "_field_index": " ".join(result.field_index) if result.field_index else "",
                 "_confidence_metrics": result.confidence_metrics,
                 "_citation_metadata": result.citation_metadata
             }
+            if include_text:
+                doc_data["full_text"] = result.full_text
+                doc_data["_all_text"] = result.all_text
+
+            highlights = {}
+            if columns.get("_snippet"):
+                highlights["full_text"] = self._split_snippet(columns["_snippet"])
 
             documents.append({
                 "id": str(result.document_id),
                 "score": float(score),  # Real relevance score!
                 "filename": doc_data["filename"],
                 "data": doc_data,
-                "highlights": {}
+                "highlights": highlights
             })
 
         logger.info(f"Search completed: {total} total, returning {len(documents)} documents (weighted_tsv={use_weighted_tsv})")
 
         return {
             "total": total,
+            "total_relation": total_relation,
             "page": page,
             "size": size,
+            "next_cursor": next_cursor,
             "documents": documents,
             "search_method": "weighted_bm25" if use_weighted_tsv else "basic_tsrank"
         }
 
+    def _search_projections(
+        self,
+        fields: Optional[List[str]],
+        snippets: int,
+        highlight_text: Optional[str]
+    ) -> List[tuple]:
+        """(label, expression) columns computed in SQL for the result page."""
+        projections = []
+        for i, field in enumerate(fields or []):
+            projections.append((f"_field_{i}", DocumentSearchIndex.extracted_fields[field]))
+            projections.append((f"_confidence_{i}", DocumentSearchIndex.field_metadata[field]["confidence"]))
+
+        if snippets > 0 and highlight_text:
+            options = (
+                f"MaxFragments={int(snippets)}, "
+                f"MaxWords={settings.SEARCH_SNIPPET_MAX_WORDS}, MinWords={settings.SEARCH_SNIPPET_MIN_WORDS}, "
+                f"StartSel=<mark>, StopSel=</mark>, FragmentDelimiter={SNIPPET_DELIMITER}"
+            )
+            projections.append(("_snippet", func.ts_headline(
+                'english', DocumentSearchIndex.full_text, func.plainto_tsquery('english', highlight_text), options
+            )))
+        return projections
+
     def _apply_custom_query(self, stmt, custom_query: Dict[str, Any]):
         """
         Apply custom query conditions from NL search.
@@ -496,10 +701,11 @@ class PostgresService:
         elif "range" in clause:
             for field, range_def in clause["range"].items():
                 field_clean = field.replace(".keyword", "")
-                field_expr = cast(
-                    DocumentSearchIndex.extracted_fields[field_clean].astext,
-                    Float
-                )
+                typed_fields = get_typed_field_registry()
+                if typed_fields.is_date(field_clean):
+                    field_expr = typed_fields.timestamp(field_clean)
+                else:
+                    field_expr = typed_fields.numeric(field_clean)
                 
                 if "gte" in range_def:
                     stmt = stmt.where(field_expr >= range_def["gte"])
@@ -518,12 +724,372 @@ class PostgresService:
 
         return stmt, rank_column
 
+    async def bulk_index_documents(
+        self,
+        documents: Iterable[Dict[str, Any]],
+        batch_size: int = 500,
+        use_copy: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Index many documents with batched upserts.
+
+        index_document costs a SELECT and a commit per document; here each
+        batch is one multi-row INSERT ... ON CONFLICT (document_id) DO UPDATE
+        (plus one delete/insert of the batch's passage chunks) and one commit.
+        The index is derived data, so batches commit without waiting for WAL
+        flush (synchronous_commit off); rerun the reindex after a crash.
+
+        Args:
+            documents: index_document keyword dicts (document_id, filename,
+                extracted_fields, confidence_scores, full_text, schema,
+                field_metadata, chunks); consumed lazily, a batch at a time
+            batch_size: Documents per statement and commit
+            use_copy: Stream each batch into a temp table with COPY, then
+                upsert from it (psycopg2 and asyncpg only; else multi-row INSERT)
+
+        Returns:
+            {"indexed", "chunks", "batches", "seconds", "docs_per_second", "method"}
+        """
+        method = "insert"
+        if use_copy:
+            if self.db.get_bind().dialect.driver in ("psycopg2", "asyncpg"):
+                method = "copy"
+            else:
+                logger.warning("COPY needs psycopg2 or asyncpg; bulk indexing with multi-row INSERT")
+
+        started = time.perf_counter()
+        stats = {"indexed": 0, "chunks": 0, "batches": 0}
+        for batch in _batched(documents, batch_size):
+            rows, chunk_rows = {}, {}
+            indexed_at = datetime.utcnow()
+            for document in batch:
+                document = dict(document)
+                parse_chunks = document.pop("chunks", None)
+                row = self._build_index_row(**document)
+                row["indexed_at"] = row["updated_at"] = indexed_at
+                # ON CONFLICT cannot update one row twice in a statement: last one wins
+                rows[row["document_id"]] = row
+                if parse_chunks is not None:
+                    chunk_rows[row["document_id"]] = build_document_chunks(row["document_id"], parse_chunks)
+
+            try:
+                await self._execute(text("SET LOCAL synchronous_commit = off"))
+                if method == "copy":
+                    await self._copy_upsert(list(rows.values()))
+                else:
+                    await self._execute(self._upsert_statement(list(rows.values())))
+
+                if chunk_rows:
+                    await self._execute(delete(DocumentChunk).where(DocumentChunk.document_id.in_(list(chunk_rows))))
+                    flat_chunks = [chunk for chunks in chunk_rows.values() for chunk in chunks]
+                    if flat_chunks:
+                        await self._execute(insert(DocumentChunk), flat_chunks)
+                    stats["chunks"] += len(flat_chunks)
+
+                await db_commit(self.db)
+            except Exception:
+                await db_rollback(self.db)
+                raise
+            invalidate_cached_answers(rows)  # Core upsert: the session hook does not see these rows
+
+            stats["indexed"] += len(rows)
+            stats["batches"] += 1
+            elapsed = time.perf_counter() - started
+            logger.info(
+                f"Bulk indexed {stats['indexed']} documents in {elapsed:.1f}s "
+                f"({stats['indexed'] / max(elapsed, 1e-6):.0f} docs/s, {method})"
+            )
+
+        seconds = time.perf_counter() - started
+        return {
+            **stats,
+            "seconds": round(seconds, 3),
+            "docs_per_second": round(stats["indexed"] / seconds, 1) if seconds > 0 else None,
+            "method": method
+        }
+
+    @staticmethod
+    def _upsert_statement(rows: List[Dict[str, Any]]):
+        """Multi-row INSERT ... ON CONFLICT (document_id) DO UPDATE for built index rows."""
+        stmt = pg_insert(DocumentSearchIndex).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=[DocumentSearchIndex.document_id],
+            set_={column: stmt.excluded[column] for column in (*BULK_INDEX_COLUMNS, "updated_at")}
+        )
+
+    async def _copy_upsert(self, rows: List[Dict[str, Any]]) -> None:
+        """COPY rows into a session temp table, then upsert them in one statement."""
+        await self._execute(text(COPY_STAGE_DDL))
+        records = [
+            (
+                row["document_id"],
+                row["full_text"],
+                json.dumps(row["extracted_fields"], default=str),
+                json.dumps(row["query_context"], default=str),
+                row["all_text"],
+                json.dumps(row["field_index"]),
+                json.dumps(row["confidence_metrics"]),
+                json.dumps(row["citation_metadata"]),
+                json.dumps(row["field_metadata"], default=str),
+                row["indexed_at"],
+            )
+            for row in rows
+        ]
+
+        if isinstance(self.db, AsyncSession):
+            connection = await (await self.db.connection()).get_raw_connection()
+            await connection.driver_connection.copy_records_to_table(
+                COPY_STAGE_TABLE, records=records, columns=list(COPY_STAGE_COLUMNS)
+            )
+        else:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(
+                tuple("" if value is None else value for value in record) for record in records
+            )
+            buffer.seek(0)
+            with self.db.connection().connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY {COPY_STAGE_TABLE} ({', '.join(COPY_STAGE_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                    buffer
+                )
+
+        await self._execute(text(COPY_UPSERT_SQL))
+
+    async def _replace_document_chunks(self, document_id: int, parse_chunks: List[Dict[str, Any]]) -> int:
+        """Rewrite a document's passage chunks (uncommitted)."""
+        rows = build_document_chunks(document_id, parse_chunks)
+        await self._execute(delete(DocumentChunk).where(DocumentChunk.document_id == document_id))
+        if rows:
+            await self._execute(insert(DocumentChunk), rows)
+        return len(rows)
+
+    async def _stored_parse_chunks(self, document_id: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Reducto chunks from the document's stored parse result.
+
+        Resolved as actual_parse_result does: the PhysicalFile's result before
+        the Document's, each out of row by hash or else legacy in-row JSON.
+        Only the legacy column actually needed is loaded.
+        """
+        row = (await self._execute(
+            select(
+                PhysicalFile.parse_result_hash,
+                PhysicalFile.legacy_parse_result.isnot(None),
+                Document.parse_result_hash,
+                Document.legacy_parse_result.isnot(None),
+            )
+            .select_from(Document)
+            .outerjoin(PhysicalFile, Document.physical_file_id == PhysicalFile.id)
+            .where(Document.id == document_id)
+        )).first()
+        if row is None:
+            return None
+
+        file_hash, file_legacy, document_hash, document_legacy = row
+        for content_hash, has_legacy, legacy_column in (
+            (file_hash, file_legacy, PhysicalFile.legacy_parse_result),
+            (document_hash, document_legacy, Document.legacy_parse_result),
+        ):
+            if content_hash:
+                parse_result = get_parse_result_store().get(content_hash)
+            elif has_legacy:
+                parse_result = (await self._execute(
+                    select(legacy_column)
+                    .select_from(Document)
+                    .outerjoin(PhysicalFile, Document.physical_file_id == PhysicalFile.id)
+                    .where(Document.id == document_id)
+                )).scalar()
+            else:
+                continue
+            return (parse_result or {}).get("chunks")
+        return None
+
+    async def index_document_chunks(self, document_id: int) -> int:
+        """
+        Build a document's passage chunks from its stored parse result.
+
+        Documents without parse chunks (no parse result, or one without
+        chunks) are chunked from their indexed full_text instead.
+
+        Returns:
+            Number of chunks written (0 when the document has no text)
+        """
+        parse_chunks = await self._stored_parse_chunks(document_id)
+        if not parse_chunks:
+            full_text = (await self._execute(
+                select(DocumentSearchIndex.full_text).where(DocumentSearchIndex.document_id == document_id)
+            )).scalar()
+            if not full_text:
+                return 0
+            parse_chunks = [{"content": full_text}]
+        written = await self._replace_document_chunks(document_id, parse_chunks)
+        await db_commit(self.db)
+        return written
+
+    async def backfill_document_chunks(self, batch_size: int = 100, limit: Optional[int] = None) -> int:
+        """
+        Chunk indexed documents that have no document_chunks rows yet.
+
+        Returns:
+            Number of documents processed
+        """
+        processed = 0
+        skipped = set()
+        while limit is None or processed < limit:
+            stmt = (
+                select(DocumentSearchIndex.document_id)
+                .where(~select(DocumentChunk.id).where(
+                    DocumentChunk.document_id == DocumentSearchIndex.document_id
+                ).exists())
+                .order_by(DocumentSearchIndex.document_id)
+                .limit(batch_size)
+            )
+            if skipped:
+                stmt = stmt.where(DocumentSearchIndex.document_id.notin_(skipped))
+            document_ids = (await self._execute(stmt)).scalars().all()
+            if not document_ids:
+                break
+            for document_id in document_ids:
+                if not await self.index_document_chunks(document_id):
+                    skipped.add(document_id)  # No parse result (or no text): nothing to chunk
+                processed += 1
+            logger.info(f"Chunked {processed} documents")
+        return processed
+
+    async def get_document_chunk(self, document_id: int, chunk_number: int) -> Optional[Dict[str, Any]]:
+        """
+        One passage chunk by position, without loading the document text.
+
+        Documents indexed before chunking existed are chunked on first request.
+
+        Returns:
+            {"chunk": {...} or None (out of range), "total_chunks", "filename",
+             "total_characters", "template"}, or None when the document has no chunks
+        """
+        total_chunks = (await self._execute(
+            select(func.count()).select_from(DocumentChunk).where(DocumentChunk.document_id == document_id)
+        )).scalar()
+        if not total_chunks:
+            total_chunks = await self.index_document_chunks(document_id)
+            if not total_chunks:
+                return None
+
+        row = (await self._execute(
+            select(DocumentChunk, Document.filename)
+            .join(Document, Document.id == DocumentChunk.document_id)
+            .where(DocumentChunk.document_id == document_id, DocumentChunk.chunk_number == chunk_number)
+        )).first()
+
+        filename = row[1] if row else (await self._execute(
+            select(Document.filename).where(Document.id == document_id)
+        )).scalar()
+        indexed = (await self._execute(
+            select(func.length(DocumentSearchIndex.full_text), DocumentSearchIndex.query_context)
+            .where(DocumentSearchIndex.document_id == document_id)
+        )).first()
+        return {
+            "chunk": self._format_chunk(row[0]) if row else None,
+            "total_chunks": total_chunks,
+            "filename": filename,
+            "total_characters": indexed[0] if indexed else None,
+            "template": (indexed[1] or {}).get("template_name") if indexed else None
+        }
+
+    async def search_passages(
+        self,
+        query: str,
+        limit: int = 10,
+        max_per_document: Optional[int] = 3,
+        document_ids: Optional[List[int]] = None,
+        snippets: int = 1
+    ) -> List[Dict[str, Any]]:
+        """
+        Top passages across documents, ranked per chunk rather than per document.
+
+        Args:
+            query: Text search query
+            limit: Passages to return
+            max_per_document: Cap on passages from one document (None: no cap)
+            document_ids: Restrict to these documents
+            snippets: ts_headline fragments per passage (0: none)
+
+        Returns:
+            [{"document_id", "filename", "chunk_number", "page", "start_char",
+              "end_char", "bbox", "content", "score", "highlights"}, ...]
+        """
+        ts_query = func.plainto_tsquery('english', query)
+        rank_expr = func.ts_rank(DocumentChunk.content_tsv, ts_query)
+
+        matches = select(
+            DocumentChunk.id.label("chunk_id"),
+            rank_expr.label("rank"),
+            func.row_number().over(
+                partition_by=DocumentChunk.document_id,
+                order_by=(rank_expr.desc(), DocumentChunk.chunk_number)
+            ).label("document_rank")
+        ).where(DocumentChunk.content_tsv.op('@@')(ts_query))
+        if document_ids is not None:
+            matches = matches.where(DocumentChunk.document_id.in_(document_ids))
+        matches = matches.subquery()
+
+        columns = [DocumentChunk, Document.filename, matches.c.rank]
+        if snippets > 0:
+            options = (
+                f"MaxFragments={int(snippets)}, "
+                f"MaxWords={settings.SEARCH_SNIPPET_MAX_WORDS}, MinWords={settings.SEARCH_SNIPPET_MIN_WORDS}, "
+                f"StartSel=<mark>, StopSel=</mark>, FragmentDelimiter={SNIPPET_DELIMITER}"
+            )
+            columns.append(func.ts_headline('english', DocumentChunk.content, ts_query, options).label("_snippet"))
+
+        stmt = (
+            select(*columns)
+            .join(matches, matches.c.chunk_id == DocumentChunk.id)
+            .join(Document, Document.id == DocumentChunk.document_id)
+            .order_by(matches.c.rank.desc(), DocumentChunk.id)
+            .limit(limit)
+        )
+        if max_per_document:
+            stmt = stmt.where(matches.c.document_rank <= max_per_document)
+
+        passages = []
+        for row in (await self._execute(stmt)).all():
+            passage = self._format_chunk(row[0])
+            passage.update({
+                "filename": row[1],
+                "score": float(row[2]),
+                "highlights": {"content": self._split_snippet(row._mapping.get("_snippet"))} if snippets > 0 else {}
+            })
+            passages.append(passage)
+        return passages
+
+    @staticmethod
+    def _format_chunk(chunk: DocumentChunk) -> Dict[str, Any]:
+        return {
+            "document_id": chunk.document_id,
+            "chunk_number": chunk.chunk_number,
+            "page": chunk.page,
+            "start_char": chunk.start_char,
+            "end_char": chunk.end_char,
+            "bbox": chunk.bbox,
+            "content": chunk.content,
+            "length": len(chunk.content)
+        }
+
+    @staticmethod
+    def _split_snippet(snippet: Optional[str]) -> List[str]:
+        """ts_headline output as a list of fragments."""
+        if not snippet:
+            return []
+        return [fragment.strip() for fragment in snippet.split(SNIPPET_DELIMITER) if fragment.strip()]
+
     async def get_document(self, document_id: int) -> Optional[Dict[str, Any]]:
         """Get document by ID"""
         try:
-            result = self.db.query(DocumentSearchIndex).filter(
-                DocumentSearchIndex.document_id == document_id
-            ).first()
+            result = (await self._execute(
+                select(DocumentSearchIndex)
+                .options(selectinload(DocumentSearchIndex.document))
+                .where(DocumentSearchIndex.document_id == document_id)
+            )).scalars().first()
 
             if not result:
                 return None
@@ -556,9 +1122,9 @@ class PostgresService:
         """Update document fields (e.g., after verification)"""
         logger.info(f"Updating document: {document_id}")
         
-        result = self.db.query(DocumentSearchIndex).filter(
-            DocumentSearchIndex.document_id == document_id
-        ).first()
+        result = (await self._execute(
+            select(DocumentSearchIndex).where(DocumentSearchIndex.document_id == document_id)
+        )).scalars().first()
 
         if result:
             if "extracted_fields" in updated_fields:
@@ -569,16 +1135,18 @@ class PostgresService:
                     setattr(result, key, value)
             
             result.updated_at = datetime.utcnow()
-            self.db.commit()
+            await db_commit(self.db)
 
     async def delete_document(self, document_id: int) -> None:
         """Delete a document from search index"""
         try:
             logger.info(f"Deleting document from search index: {document_id}")
-            self.db.query(DocumentSearchIndex).filter(
-                DocumentSearchIndex.document_id == document_id
-            ).delete()
-            self.db.commit()
+            await self._execute(
+                delete(DocumentSearchIndex).where(DocumentSearchIndex.document_id == document_id)
+            )
+            await self._execute(delete(DocumentChunk).where(DocumentChunk.document_id == document_id))
+            await db_commit(self.db)
+            invalidate_cached_answers([document_id])
         except Exception as e:
             logger.error(f"Failed to delete document {document_id}: {e}")
             raise
@@ -611,6 +1179,8 @@ class PostgresService:
         if not field:
             raise ValueError("field is required when custom_aggs is not provided")
 
+        await get_typed_field_registry().refresh_if_stale(self.db)
+
         stmt = select(DocumentSearchIndex)
 
         if filters:
@@ -627,8 +1197,8 @@ class PostgresService:
                 func.count().desc()
             ).limit(agg_config.get('size', 100) if agg_config else 100)
 
-            results = self.db.execute(agg_stmt).all()
-            
+            results = (await self._execute(agg_stmt)).all()
+
             return {
                 agg_name: {
                     "buckets": [
@@ -639,10 +1209,7 @@ class PostgresService:
             }
 
         elif agg_type == "stats":
-            field_expr = cast(
-                DocumentSearchIndex.extracted_fields[field].astext,
-                Float
-            )
+            field_expr = get_typed_field_registry().numeric(field)
             agg_stmt = select(
                 func.count(field_expr).label('count'),
                 func.sum(field_expr).label('sum'),
@@ -651,7 +1218,7 @@ class PostgresService:
                 func.max(field_expr).label('max')
             ).select_from(stmt.subquery())
 
-            result = self.db.execute(agg_stmt).first()
+            result = (await self._execute(agg_stmt)).first()
 
             return {
                 agg_name: {
@@ -669,7 +1236,7 @@ class PostgresService:
                 func.count(func.distinct(field_expr)).label('value')
             ).select_from(stmt.subquery())
 
-            result = self.db.execute(agg_stmt).scalar()
+            result = (await self._execute(agg_stmt)).scalar()
 
             return {
                 agg_name: {
@@ -695,17 +1262,14 @@ class PostgresService:
             pg_interval = interval_mapping.get(interval, "month")
 
             # Extract date field and truncate
-            field_expr = func.date_trunc(
-                pg_interval,
-                cast(DocumentSearchIndex.extracted_fields[field].astext, TIMESTAMP)
-            )
+            field_expr = func.date_trunc(pg_interval, get_typed_field_registry().timestamp(field))
 
             agg_stmt = select(
                 field_expr.label('key'),
                 func.count().label('doc_count')
             ).select_from(stmt.subquery()).group_by(field_expr).order_by(field_expr)
 
-            results = self.db.execute(agg_stmt).all()
+            results = (await self._execute(agg_stmt)).all()
 
             return {
                 agg_name: {
@@ -728,10 +1292,7 @@ class PostgresService:
                 logger.warning("Range aggregation requires 'ranges' in config")
                 return {agg_name: {"buckets": []}}
 
-            field_expr = cast(
-                DocumentSearchIndex.extracted_fields[field].astext,
-                Float
-            )
+            field_expr = get_typed_field_registry().numeric(field)
 
             # Build CASE WHEN for each range
             case_conditions = []
@@ -758,7 +1319,7 @@ class PostgresService:
                 func.count().label('doc_count')
             ).select_from(stmt.subquery()).group_by(range_case)
 
-            results = self.db.execute(agg_stmt).all()
+            results = (await self._execute(agg_stmt)).all()
 
             return {
                 agg_name: {
@@ -773,10 +1334,7 @@ class PostgresService:
             # Percentiles aggregation using percentile_cont
             percents = agg_config.get('percents', [25, 50, 75, 95, 99]) if agg_config else [25, 50, 75, 95, 99]
 
-            field_expr = cast(
-                DocumentSearchIndex.extracted_fields[field].astext,
-                Float
-            )
+            field_expr = get_typed_field_registry().numeric(field)
 
             # Build percentile expressions
             percentile_exprs = []
@@ -787,7 +1345,7 @@ class PostgresService:
 
             agg_stmt = select(*percentile_exprs).select_from(stmt.subquery())
 
-            result = self.db.execute(agg_stmt).first()
+            result = (await self._execute(agg_stmt)).first()
 
             values = {}
             if result:
@@ -812,13 +1370,9 @@ class PostgresService:
                 # Range or complex filter
                 for op, val in value.items():
                     if op == "gte":
-                        stmt = stmt.where(
-                            cast(DocumentSearchIndex.extracted_fields[field].astext, Float) >= val
-                        )
+                        stmt = stmt.where(get_typed_field_registry().numeric(field) >= val)
                     elif op == "lte":
-                        stmt = stmt.where(
-                            cast(DocumentSearchIndex.extracted_fields[field].astext, Float) <= val
-                        )
+                        stmt = stmt.where(get_typed_field_registry().numeric(field) <= val)
             else:
                 # Term filter
                 stmt = stmt.where(
@@ -826,6 +1380,102 @@ class PostgresService:
                 )
         return stmt
 
+    async def get_metric_trend(
+        self,
+        field: str,
+        agg_type: str,
+        date_field: str,
+        interval: str = "month",
+        date_range: Optional[Dict[str, str]] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        A metric per date bucket in one GROUP BY date_trunc(...) query.
+
+        Args:
+            field: Field to aggregate
+            agg_type: sum, avg, min, max, count or cardinality
+            date_field: Extracted date field to bucket on
+            interval: date_trunc interval (year, quarter, month, week, day, ...)
+            date_range: Optional {"from", "to"} on date_field
+            filters: Optional query filters
+
+        Returns:
+            [{"key", "key_as_string", "doc_count", "value"}, ...] in date order
+        """
+        await get_typed_field_registry().refresh_if_stale(self.db)
+        stmt = self._apply_filters(
+            trend_statement(field, agg_type, date_field, interval, date_range), filters or {}
+        )
+        rows = (await self._execute(stmt)).all()
+        return [
+            {
+                "key": r.bucket.isoformat(),
+                "key_as_string": r.bucket.strftime("%Y-%m-%d"),
+                "doc_count": r.doc_count,
+                "value": float(r.value) if r.value is not None else 0.0
+            }
+            for r in rows
+        ]
+
+    async def get_period_metrics(
+        self,
+        field: str,
+        agg_type: str,
+        date_field: str,
+        periods: List[Dict[str, str]],
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        A metric for each {"from", "to"} period in one FILTER (WHERE ...) query.
+
+        Returns:
+            [{"value", "count"}, ...] in period order
+        """
+        await get_typed_field_registry().refresh_if_stale(self.db)
+        date_expr = get_typed_field_registry().timestamp(date_field)
+        return await self._segment_metrics(
+            field, agg_type, [period_condition(date_expr, period) for period in periods], filters
+        )
+
+    async def get_group_metrics(
+        self,
+        field: str,
+        agg_type: str,
+        group_field: str,
+        groups: List[str],
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        A metric for each group value in one FILTER (WHERE ...) query.
+
+        Returns:
+            [{"value", "count"}, ...] in group order
+        """
+        await get_typed_field_registry().refresh_if_stale(self.db)
+        key = group_expr(group_field)
+        return await self._segment_metrics(field, agg_type, [key == str(group) for group in groups], filters)
+
+    async def _segment_metrics(
+        self,
+        field: str,
+        agg_type: str,
+        conditions: List[Any],
+        filters: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        if not conditions:
+            return []
+        stmt = self._apply_filters(segment_statement(field, agg_type, conditions), filters or {})
+        row = (await self._execute(stmt)).first()
+        values = row._mapping if row is not None else {}
+        return [
+            {
+                "value": float(values.get(f"value_{i}") or 0),
+                "count": values.get(f"count_{i}") or 0
+            }
+            for i in range(len(conditions))
+        ]
+
     async def get_multi_aggregations(
         self,
         aggregations: List[Dict[str, Any]],
@@ -833,16 +1483,44 @@ class PostgresService:
     ) -> Dict[str, Any]:
         """
         Execute multiple aggregations in a single query.
-        
+
+        The batch is planned into one statement (see aggregation_planner): the
+        filtered rows are scanned once, scalar aggregations share one SELECT
+        and terms/range/date_histogram share one GROUPING SETS query. If the
+        batched statement fails, each aggregation is retried on its own so
+        one bad field does not blank the rest.
+
         Args:
             aggregations: List of aggregation definitions
             filters: Optional query filters
-        
+
         Returns:
             Dictionary of aggregation results keyed by name
         """
+        plan = plan_multi_aggregations(aggregations)
+        if plan is None:
+            return {}
+
+        await get_typed_field_registry().refresh_if_stale(self.db)
+
+        stmt = plan.build(self._apply_filters(select(DocumentSearchIndex), filters or {}))
+        try:
+            rows = (await self._execute(stmt)).all()
+        except Exception as e:
+            logger.warning(f"Batched aggregation failed, running aggregations individually: {e}")
+            await db_rollback(self.db)
+            return await self._get_aggregations_individually(aggregations, filters)
+
+        return plan.parse(rows)
+
+    async def _get_aggregations_individually(
+        self,
+        aggregations: List[Dict[str, Any]],
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """One get_aggregations call (and table scan) per aggregation."""
         results = {}
-        
+
         for agg_def in aggregations:
             name = agg_def["name"]
             field = agg_def["field"]
@@ -856,13 +1534,14 @@ class PostgresService:
                     agg_config=config,
                     filters=filters
                 )
-                
+
                 agg_key = f"{field}_{agg_type}"
                 if agg_key in agg_result:
                     results[name] = agg_result[agg_key]
-                    
+
             except Exception as e:
                 logger.error(f"Error executing aggregation '{name}': {e}")
+                await db_rollback(self.db)
                 results[name] = {}
 
         return results
@@ -895,7 +1574,7 @@ class PostgresService:
     async def health_check(self) -> bool:
         """Check PostgreSQL connection"""
         try:
-            self.db.execute(text("SELECT 1"))
+            await self._execute(text("SELECT 1"))
             return True
         except Exception as e:
             logger.error(f"PostgreSQL health check failed: {e}")
@@ -903,17 +1582,22 @@ class PostgresService:
 
     async def close(self):
         """Close database connection"""
-        self.db.close()
+        await db_close(self.db)
 
     async def optimize_for_bulk_indexing(self, enable: bool = True):
         """
         Optimize for bulk indexing operations.
-        In PostgreSQL, this could disable triggers or constraints temporarily.
+
+        Turns synchronous_commit off for this session so per-document index
+        commits stop waiting on WAL flush; bulk_index_documents does the same
+        per batch on its own.
         """
         if enable:
             logger.info("Optimizing for bulk indexing (PostgreSQL)")
+            await self._execute(text("SET synchronous_commit TO OFF"))
         else:
             logger.info("Restoring normal indexing mode")
+            await self._execute(text("RESET synchronous_commit"))
 
     async def refresh_index(self):
         """
@@ -921,8 +1605,8 @@ class PostgresService:
         """
         logger.info("Refreshing search index (VACUUM ANALYZE)")
         try:
-            self.db.execute(text("VACUUM ANALYZE document_search_index"))
-            self.db.execute(text("VACUUM ANALYZE template_signatures"))
+            await self._execute(text("VACUUM ANALYZE document_search_index"))
+            await self._execute(text("VACUUM ANALYZE template_signatures"))
         except Exception as e:
             logger.warning(f"Failed to vacuum tables: {e}")
 
@@ -933,12 +1617,12 @@ class PostgresService:
         Returns:
             Dict with document count, storage size, field count, etc.
         """
-        doc_count = self.db.query(func.count(DocumentSearchIndex.id)).scalar()
+        doc_count = (await self._execute(select(func.count(DocumentSearchIndex.id)))).scalar()
 
         size_query = text("""
             SELECT pg_total_relation_size('document_search_index') as size_bytes
         """)
-        size_result = self.db.execute(size_query).first()
+        size_result = (await self._execute(size_query)).first()
         size_bytes = size_result.size_bytes if size_result else 0
 
         return {
@@ -978,9 +1662,9 @@ class PostgresService:
         Returns:
             Template signature ID
         """
-        existing = self.db.query(TemplateSignature).filter(
-            TemplateSignature.template_id == template_id
-        ).first()
+        existing = (await self._execute(
+            select(TemplateSignature).where(TemplateSignature.template_id == template_id)
+        )).scalars().first()
 
         field_names_text = " ".join(field_names)
 
@@ -990,7 +1674,7 @@ class PostgresService:
             existing.field_names_text = field_names_text
             existing.sample_text = sample_text[:5000] if sample_text else ""
             existing.category = category
-            self.db.commit()
+            await db_commit(self.db)
             logger.info(f"Updated template signature: {template_name} (ID: {template_id})")
             return existing.id
         else:
@@ -1003,8 +1687,8 @@ class PostgresService:
                 category=category
             )
             self.db.add(signature)
-            self.db.commit()
-            self.db.refresh(signature)
+            await db_commit(self.db)
+            await db_refresh(self.db, signature)
             logger.info(f"Indexed template signature: {template_name} (ID: {template_id})")
             return signature.id
 
@@ -1014,101 +1698,34 @@ class PostgresService:
         similarity_threshold: float = 0.75
     ) -> List[Dict[str, Any]]:
         """
-        Cluster uploaded documents using Jaccard similarity.
-        This uses the same Python implementation as Elasticsearch version.
+        Cluster uploaded documents using Jaccard similarity of their precomputed token sets.
+        MinHash/LSH narrows each seed's candidates (see app.services.document_clustering);
+        same implementation as the Elasticsearch version.
         """
         if not documents:
             return []
 
-        # Extract document text and metadata
+        # Precomputed token sets (one query for the batch, no parse results loaded)
+        features_by_doc = MatchFeatureService(self.db).for_documents(documents)
         doc_data = []
         for doc in documents:
-            parse_result = doc.actual_parse_result
-            if not parse_result:
+            features = features_by_doc.get(doc.id)
+            if features is None:
                 logger.warning(f"Skipping document {doc.id} - no parse result")
                 continue
 
-            chunks = parse_result.get("chunks", [])
-            doc_text = "\n".join([c.get("content", "") for c in chunks[:10]])
-
             doc_data.append({
                 "id": doc.id,
                 "filename": doc.filename,
-                "text": doc_text[:5000]
+                "tokens": set(features.tokens)
             })
 
         if not doc_data:
             logger.warning("No documents with parse results to cluster")
             return []
 
-        clusters = []
-        unclustered_ids = {d["id"] for d in doc_data}
-        doc_lookup = {d["id"]: d for d in doc_data}
-
         logger.info(f"Clustering {len(doc_data)} documents with threshold {similarity_threshold}")
-
-        # Iteratively build clusters
-        while unclustered_ids:
-            seed_id = next(iter(unclustered_ids))
-            seed_doc = doc_lookup[seed_id]
-
-            cluster_doc_ids = [seed_id]
-            unclustered_ids.remove(seed_id)
-
-            similar_ids = []
-            total_similarity = 0.0
-
-            for candidate_id in list(unclustered_ids):
-                candidate_doc = doc_lookup[candidate_id]
-
-                similarity = self._calculate_text_similarity(
-                    seed_doc["text"],
-                    candidate_doc["text"]
-                )
-
-                if similarity >= similarity_threshold:
-                    cluster_doc_ids.append(candidate_id)
-                    unclustered_ids.remove(candidate_id)
-                    total_similarity += similarity
-
-            avg_similarity = (total_similarity / len(cluster_doc_ids)) if len(cluster_doc_ids) > 1 else 1.0
-
-            clusters.append({
-                "representative_doc_id": seed_id,
-                "representative_filename": seed_doc["filename"],
-                "document_ids": cluster_doc_ids,
-                "filenames": [doc_lookup[doc_id]["filename"] for doc_id in cluster_doc_ids],
-                "cluster_size": len(cluster_doc_ids),
-                "avg_similarity": round(avg_similarity, 2)
-            })
-
-            logger.info(
-                f"Cluster {len(clusters)}: {len(cluster_doc_ids)} docs "
-                f"(seed: {seed_doc['filename']}, avg similarity: {avg_similarity:.2f})"
-            )
-
-        logger.info(f"Created {len(clusters)} clusters from {len(doc_data)} documents")
-        return clusters
-
-    def _calculate_text_similarity(self, text1: str, text2: str) -> float:
-        """
-        Calculate Jaccard similarity on word sets.
-        Same implementation as Elasticsearch version.
-        """
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
-
-        stopwords = {"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with"}
-        words1 = {w for w in words1 if w not in stopwords and len(w) > 2}
-        words2 = {w for w in words2 if w not in stopwords and len(w) > 2}
-
-        if not words1 or not words2:
-            return 0.0
-
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
-
-        return len(intersection) / len(union)
+        return cluster_documents(doc_data, similarity_threshold)
 
     async def find_similar_templates(
         self,
@@ -1140,7 +1757,7 @@ class PostgresService:
         ).limit(5)
 
         try:
-            results = self.db.execute(stmt).all()
+            results = (await self._execute(stmt)).all()
 
             output = []
             for r in results:
@@ -1185,20 +1802,26 @@ class PostgresService:
         """
         try:
             # Call PostgreSQL function fuzzy_search_fallback
-            result = self.db.execute(
+            result = (await self._execute(
                 text("""
                     SELECT document_id, similarity_score, matched_text
                     FROM fuzzy_search_fallback(:search_text, :min_similarity)
                 """),
                 {"search_text": search_text, "min_similarity": min_similarity}
-            ).fetchall()
+            )).fetchall()
+
+            # Fetch document details in one round trip
+            doc_ids = [row.document_id for row in result]
+            docs_by_id = {}
+            if doc_ids:
+                docs = (await self._execute(
+                    select(Document).where(Document.id.in_(doc_ids))
+                )).scalars().all()
+                docs_by_id = {doc.id: doc for doc in docs}
 
             fuzzy_results = []
             for row in result:
-                # Fetch document details
-                doc = self.db.query(Document).filter(
-                    Document.id == row.document_id
-                ).first()
+                doc = docs_by_id.get(row.document_id)
 
                 if doc:
                     fuzzy_results.append({
@@ -1234,13 +1857,13 @@ class PostgresService:
         """
         try:
             # Call PostgreSQL function suggest_spelling
-            result = self.db.execute(
+            result = (await self._execute(
                 text("""
                     SELECT suggested_term, similarity_score, frequency
                     FROM suggest_spelling(:query_term, :min_similarity)
                 """),
                 {"query_term": query_term, "min_similarity": min_similarity}
-            ).fetchall()
+            )).fetchall()
 
             suggestions = [
                 {
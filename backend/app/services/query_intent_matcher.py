@@ -0,0 +1,204 @@
+"""
+Compiled term matcher for QueryOptimizer.
+
+understand_query_intent used to scan the query once per keyword list (intent
+words, comparators, date phrases, statuses, sort words, aggregation words)
+and once per field alias. QueryIntentMatcher compiles every phrase into one
+Aho-Corasick automaton, so a single pass over the lowercased query reports
+every phrase it contains, with the same substring semantics as the
+``phrase in query_lower`` checks it replaces ("get" still matches "budget").
+
+A matcher depends only on the field aliases, so it is built once per schema
+registry snapshot (RegistrySnapshot.derived) and shared by every optimizer;
+optimizers without a registry (e.g. the MCP server's) share the one built
+from the default aliases.
+"""
+
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# Category -> [(label, phrases)]. Order matters where the optimizer takes the first label.
+INTENT_TERMS = {
+    "retrieve": ["show", "list", "get", "find", "retrieve", "display"],
+    "aggregate": ["how many", "count", "total", "sum", "average", "group by"],
+    "filter": ["filter", "where", "with", "having"],
+}
+COMPARATOR_TERMS = {
+    "gte": ["over", "greater than", "more than", "above"],
+    "lte": ["under", "less than", "below"],
+    "between": ["between"],
+}
+DATE_TERMS = {
+    "last_week": ["last week", "past week"],
+    "last_month": ["last month", "past month"],
+    "last_year": ["last year", "past year"],
+    "this_week": ["this week", "current week"],
+    "this_month": ["this month", "current month"],
+    "this_year": ["this year", "current year"],
+    "today": ["today"],
+    "yesterday": ["yesterday"],
+    "last_7_days": ["last 7 days"],
+    "last_30_days": ["last 30 days"],
+    "last_quarter": ["last quarter", "previous quarter"],
+    "this_quarter": ["this quarter", "current quarter"],
+}
+STATUS_TERMS = {status: [status] for status in
+                ["active", "inactive", "pending", "completed", "processing", "error", "uploaded"]}
+SORT_TERMS = {
+    "desc": ["recent", "latest", "newest"],
+    "asc": ["oldest", "earliest"],
+}
+AGGREGATION_TERMS = {
+    "sum": ["sum", "total"],
+    "avg": ["average", "avg"],
+    "count": ["count", "how many"],
+    "terms": ["group by"],
+}
+FLAG_TERMS = {
+    "exact": ["exact"],  # Also matches "exactly"
+    "and": [" and "],
+}
+
+TERM_CATEGORIES = {
+    "intent": INTENT_TERMS,
+    "comparator": COMPARATOR_TERMS,
+    "date": DATE_TERMS,
+    "status": STATUS_TERMS,
+    "sort": SORT_TERMS,
+    "aggregation": AGGREGATION_TERMS,
+    "flag": FLAG_TERMS,
+}
+
+RESOLVE_CACHE_SIZE = 256  # (canonical name, available fields) resolutions kept per matcher
+
+
+class AhoCorasick:
+    """Multi-phrase substring automaton: all (overlapping) occurrences in one pass."""
+
+    def __init__(self, phrases: Iterable[Tuple[str, Any]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Any]] = [[]]
+        for phrase, payload in phrases:
+            self._add(phrase, payload)
+        self._link()
+
+    def _add(self, phrase: str, payload: Any) -> None:
+        state = 0
+        for char in phrase:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append(payload)
+
+    def _link(self) -> None:
+        """Breadth-first failure links; outputs of suffix states are merged in."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def findall(self, text: str) -> List[Any]:
+        """Payloads of every phrase occurring in text (once per occurrence)."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = []
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.extend(out[state])
+        return found
+
+
+class TermMatches:
+    """Labels found in one query, per category."""
+
+    def __init__(self, found: Iterable[Tuple[str, str]]):
+        self._labels: Dict[str, Set[str]] = {}
+        for category, label in found:
+            self._labels.setdefault(category, set()).add(label)
+
+    def has(self, category: str, label: str) -> bool:
+        return label in self._labels.get(category, ())
+
+    def labels(self, category: str) -> Set[str]:
+        return self._labels.get(category, set())
+
+    def first(self, category: str, order: Sequence[str]) -> Optional[str]:
+        """First label of ``order`` that was found (the optimizer's precedence)."""
+        found = self._labels.get(category)
+        if found:
+            for label in order:
+                if label in found:
+                    return label
+        return None
+
+
+class QueryIntentMatcher:
+    """All intent phrases and field aliases of one registry version, compiled."""
+
+    def __init__(self, field_aliases: Dict[str, List[str]]):
+        self.field_aliases = field_aliases
+        phrases = [
+            (phrase, (category, label))
+            for category, terms in TERM_CATEGORIES.items()
+            for label, label_phrases in terms.items()
+            for phrase in label_phrases
+        ]
+        phrases.extend(
+            (alias.lower(), ("field", canonical_name))
+            for canonical_name, aliases in field_aliases.items()
+            for alias in aliases if alias
+        )
+        self.phrase_count = len(phrases)
+        self._automaton = AhoCorasick(phrases)
+        self._resolved: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+        self._lock = threading.Lock()
+
+    def scan(self, query_lower: str) -> TermMatches:
+        """Every intent phrase and field alias in the (lowercased) query, in one pass."""
+        return TermMatches(self._automaton.findall(query_lower))
+
+    def resolve_field(self, canonical_name: str, available_fields: List[str]) -> str:
+        """
+        Resolve canonical field name to actual field in index (memoized per field list).
+
+        Exact alias match first, then the first field containing an alias,
+        else the first alias.
+        """
+        key = (canonical_name, tuple(available_fields))
+        resolved = self._resolved.get(key)
+        if resolved is not None:
+            return resolved
+
+        aliases = self.field_aliases.get(canonical_name, [canonical_name])
+        available = set(available_fields)
+        resolved = next((alias for alias in aliases if alias in available), None)
+        if resolved is None:
+            lowered = [(field, field.lower()) for field in available_fields]
+            resolved = next(
+                (field for alias in aliases for field, field_lower in lowered if alias in field_lower),
+                aliases[0]
+            )
+
+        with self._lock:
+            if len(self._resolved) >= RESOLVE_CACHE_SIZE:
+                self._resolved.clear()
+            self._resolved[key] = resolved
+        return resolved
+
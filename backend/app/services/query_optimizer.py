@@ -16,8 +16,52 @@ import logging
 import re
 from typing import Any, Dict, List, Optional
 
+from app.services.query_intent_matcher import (
+    AGGREGATION_TERMS,
+    DATE_TERMS,
+    INTENT_TERMS,
+    STATUS_TERMS,
+    QueryIntentMatcher,
+    TermMatches,
+)
+from app.services.schema_registry import SchemaRegistry
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_FIELD_ALIASES = {
+    "amount": ["total", "total_amount", "amount", "price", "cost", "sum", "value"],
+    "date": ["date", "created_date", "invoice_date", "effective_date", "start_date", "contract_date"],
+    "vendor": ["vendor", "supplier", "customer", "company", "entity_name", "client"],
+    "status": ["status", "state", "condition"],
+    "number": ["number", "invoice_number", "id", "identifier", "reference", "po_number"],
+}
+
+
+def merge_field_aliases(canonical_mapping: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Default aliases extended with the registry's canonical field mapping."""
+    field_aliases = {name: list(aliases) for name, aliases in DEFAULT_FIELD_ALIASES.items()}
+    for canonical_name, field_names in canonical_mapping.items():
+        if canonical_name in field_aliases:
+            # Extend existing aliases (deduplicated)
+            field_aliases[canonical_name] = list(set(field_aliases[canonical_name] + field_names))
+        else:
+            # Add new canonical mapping
+            field_aliases[canonical_name] = list(field_names)
+    return field_aliases
+
+
+_NUMBER_RE = re.compile(r'\$?(\d+(?:,\d{3})*(?:\.\d+)?)')
+
+_default_intent_matcher: Optional[QueryIntentMatcher] = None
+
+
+def get_default_intent_matcher() -> QueryIntentMatcher:
+    """Matcher over DEFAULT_FIELD_ALIASES, shared by optimizers without a registry"""
+    global _default_intent_matcher
+    if _default_intent_matcher is None:
+        _default_intent_matcher = QueryIntentMatcher(DEFAULT_FIELD_ALIASES)
+    return _default_intent_matcher
+
 
 class QueryOptimizer:
     """
@@ -38,13 +82,8 @@ class QueryOptimizer:
 
         # Common field aliases for better query understanding
         # These will be enhanced by SchemaRegistry if available
-        self.field_aliases = {
-            "amount": ["total", "total_amount", "amount", "price", "cost", "sum", "value"],
-            "date": ["date", "created_date", "invoice_date", "effective_date", "start_date", "contract_date"],
-            "vendor": ["vendor", "supplier", "customer", "company", "entity_name", "client"],
-            "status": ["status", "state", "condition"],
-            "number": ["number", "invoice_number", "id", "identifier", "reference", "po_number"],
-        }
+        self.field_aliases = {name: list(aliases) for name, aliases in DEFAULT_FIELD_ALIASES.items()}
+        self.intent_matcher = get_default_intent_matcher()
 
         # Field type mappings for query construction
         self.field_types = {
@@ -63,19 +102,21 @@ class QueryOptimizer:
             return
 
         try:
-            # Get canonical field mapping from registry
-            canonical_mapping = await self.schema_registry.get_canonical_field_mapping()
-
-            # Merge with default aliases
-            for canonical_name, field_names in canonical_mapping.items():
-                if canonical_name in self.field_aliases:
-                    # Extend existing aliases
-                    self.field_aliases[canonical_name].extend(field_names)
-                    # Deduplicate
-                    self.field_aliases[canonical_name] = list(set(self.field_aliases[canonical_name]))
-                else:
-                    # Add new canonical mapping
-                    self.field_aliases[canonical_name] = field_names
+            if isinstance(self.schema_registry, SchemaRegistry):
+                # Built once per registry snapshot and shared by every optimizer (read-only)
+                snapshot = await self.schema_registry.snapshot()
+                field_aliases = snapshot.derived(
+                    "query_optimizer.field_aliases",
+                    lambda: merge_field_aliases(snapshot.canonical_field_mapping)
+                )
+                self.intent_matcher = snapshot.derived(
+                    "query_optimizer.intent_matcher", lambda: QueryIntentMatcher(field_aliases)
+                )
+                self.field_aliases = field_aliases
+            else:
+                canonical_mapping = await self.schema_registry.get_canonical_field_mapping()
+                self.field_aliases = merge_field_aliases(canonical_mapping)
+                self.intent_matcher = QueryIntentMatcher(self.field_aliases)
 
             logger.info(f"Initialized query optimizer with {len(self.field_aliases)} field aliases from registry")
 
@@ -106,11 +147,12 @@ class QueryOptimizer:
             }
         """
         query_lower = query.lower()
+        matches = self.intent_matcher.scan(query_lower)
 
         analysis = {
             "intent": "search",  # search, filter, aggregate, retrieve
             "query_type": "hybrid",  # keyword, semantic, hybrid, exact
-            "target_fields": [],
+            "target_fields": sorted(matches.labels("field")),  # Canonical fields mentioned via an alias
             "filters": [],
             "aggregations": [],
             "sort": None,
@@ -119,23 +161,24 @@ class QueryOptimizer:
         }
 
         # Detect intent
-        if any(word in query_lower for word in ["show", "list", "get", "find", "retrieve", "display"]):
+        intent = matches.first("intent", list(INTENT_TERMS))
+        if intent == "retrieve":
             analysis["intent"] = "retrieve"
             analysis["confidence"] += 0.1
-        elif any(word in query_lower for word in ["how many", "count", "total", "sum", "average", "group by"]):
+        elif intent == "aggregate":
             analysis["intent"] = "aggregate"
             analysis["confidence"] += 0.2
-        elif any(word in query_lower for word in ["filter", "where", "with", "having"]):
+        elif intent == "filter":
             analysis["intent"] = "filter"
             analysis["confidence"] += 0.1
 
         # Detect filters in natural language
-        self._extract_numeric_filters(query, query_lower, available_fields, analysis)
-        self._extract_date_filters(query_lower, analysis)
-        self._extract_text_filters(query, query_lower, available_fields, analysis)
+        self._extract_numeric_filters(query, matches, available_fields, analysis)
+        self._extract_date_filters(matches, analysis)
+        self._extract_text_filters(query, matches, available_fields, analysis)
 
         # Detect exact match requirements
-        if '"' in query or "exactly" in query_lower or "exact" in query_lower:
+        if '"' in query or matches.has("flag", "exact"):
             analysis["query_type"] = "exact"
             analysis["confidence"] += 0.1
 
@@ -144,23 +187,16 @@ class QueryOptimizer:
             analysis["requires_full_text"] = True
 
         # Detect sorting preferences
-        if "recent" in query_lower or "latest" in query_lower or "newest" in query_lower:
-            analysis["sort"] = {"field": "uploaded_at", "order": "desc"}
-            analysis["confidence"] += 0.05
-        elif "oldest" in query_lower or "earliest" in query_lower:
-            analysis["sort"] = {"field": "uploaded_at", "order": "asc"}
+        sort_order = matches.first("sort", ["desc", "asc"])
+        if sort_order:
+            analysis["sort"] = {"field": "uploaded_at", "order": sort_order}
             analysis["confidence"] += 0.05
 
         # Detect aggregation type
         if analysis["intent"] == "aggregate":
-            if "sum" in query_lower or "total" in query_lower:
-                analysis["aggregations"].append({"type": "sum"})
-            elif "average" in query_lower or "avg" in query_lower:
-                analysis["aggregations"].append({"type": "avg"})
-            elif "count" in query_lower or "how many" in query_lower:
-                analysis["aggregations"].append({"type": "count"})
-            elif "group by" in query_lower:
-                analysis["aggregations"].append({"type": "terms"})
+            aggregation = matches.first("aggregation", list(AGGREGATION_TERMS))
+            if aggregation:
+                analysis["aggregations"].append({"type": aggregation})
 
         # Cap confidence at 1.0
         analysis["confidence"] = min(analysis["confidence"], 1.0)
@@ -170,95 +206,60 @@ class QueryOptimizer:
     def _extract_numeric_filters(
         self,
         query: str,
-        query_lower: str,
+        matches: TermMatches,
         available_fields: List[str],
         analysis: Dict[str, Any]
     ):
         """Extract numeric range filters from query."""
+        comparators = matches.labels("comparator")
+        if not comparators:
+            return
+        numbers = [float(number.replace(',', '')) for number in _NUMBER_RE.findall(query)]
+        if not numbers:
+            return
+        field = self._find_target_field(query.lower(), available_fields, "amount")
+
         # "over X", "greater than X", "more than X"
-        if any(term in query_lower for term in ["over", "greater than", "more than", "above"]):
-            numbers = re.findall(r'\$?(\d+(?:,\d{3})*(?:\.\d+)?)', query)
-            if numbers:
-                value = float(numbers[0].replace(',', ''))
-                # Find which field this applies to
-                field = self._find_target_field(query_lower, available_fields, "amount")
-                if field:
-                    analysis["filters"].append({
-                        "type": "range",
-                        "field": field,
-                        "operator": "gte",
-                        "value": value
-                    })
-                    analysis["confidence"] += 0.15
+        if "gte" in comparators:
+            analysis["filters"].append({"type": "range", "field": field, "operator": "gte", "value": numbers[0]})
+            analysis["confidence"] += 0.15
 
         # "under X", "less than X", "below X"
-        if any(term in query_lower for term in ["under", "less than", "below"]):
-            numbers = re.findall(r'\$?(\d+(?:,\d{3})*(?:\.\d+)?)', query)
-            if numbers:
-                value = float(numbers[0].replace(',', ''))
-                field = self._find_target_field(query_lower, available_fields, "amount")
-                if field:
-                    analysis["filters"].append({
-                        "type": "range",
-                        "field": field,
-                        "operator": "lte",
-                        "value": value
-                    })
-                    analysis["confidence"] += 0.15
+        if "lte" in comparators:
+            analysis["filters"].append({"type": "range", "field": field, "operator": "lte", "value": numbers[0]})
+            analysis["confidence"] += 0.15
 
         # "between X and Y"
-        if "between" in query_lower and " and " in query_lower:
-            numbers = re.findall(r'\$?(\d+(?:,\d{3})*(?:\.\d+)?)', query)
-            if len(numbers) >= 2:
-                min_val = float(numbers[0].replace(',', ''))
-                max_val = float(numbers[1].replace(',', ''))
-                field = self._find_target_field(query_lower, available_fields, "amount")
-                if field:
-                    analysis["filters"].append({
-                        "type": "range",
-                        "field": field,
-                        "operator": "range",
-                        "value": {"gte": min_val, "lte": max_val}
-                    })
-                    analysis["confidence"] += 0.2
+        if "between" in comparators and matches.has("flag", "and") and len(numbers) >= 2:
+            analysis["filters"].append({
+                "type": "range",
+                "field": field,
+                "operator": "range",
+                "value": {"gte": numbers[0], "lte": numbers[1]}
+            })
+            analysis["confidence"] += 0.2
 
-    def _extract_date_filters(self, query_lower: str, analysis: Dict[str, Any]):
+    def _extract_date_filters(self, matches: TermMatches, analysis: Dict[str, Any]):
         """Extract date range filters from query."""
-        date_patterns = [
-            (["last week", "past week"], "last_week"),
-            (["last month", "past month"], "last_month"),
-            (["last year", "past year"], "last_year"),
-            (["this week", "current week"], "this_week"),
-            (["this month", "current month"], "this_month"),
-            (["this year", "current year"], "this_year"),
-            (["today"], "today"),
-            (["yesterday"], "yesterday"),
-            (["last 7 days"], "last_7_days"),
-            (["last 30 days"], "last_30_days"),
-            (["last quarter", "previous quarter"], "last_quarter"),
-            (["this quarter", "current quarter"], "this_quarter"),
-        ]
-
-        for patterns, range_name in date_patterns:
-            if any(pattern in query_lower for pattern in patterns):
-                analysis["filters"].append({
-                    "type": "date_range",
-                    "field": "uploaded_at",  # Default to uploaded_at
-                    "range": range_name
-                })
-                analysis["confidence"] += 0.1
-                break  # Only match first date pattern
+        range_name = matches.first("date", list(DATE_TERMS))  # Only the first date pattern counts
+        if range_name:
+            analysis["filters"].append({
+                "type": "date_range",
+                "field": "uploaded_at",  # Default to uploaded_at
+                "range": range_name
+            })
+            analysis["confidence"] += 0.1
 
     def _extract_text_filters(
         self,
         query: str,
-        query_lower: str,
+        matches: TermMatches,
         available_fields: List[str],
         analysis: Dict[str, Any]
     ):
         """Extract text-based filters from query."""
         # Extract quoted strings for exact matching
-        quoted_strings = re.findall(r'"([^"]+)"', query)
+        quoted_strings = re.findall(r'"([^"]+)"', query) if '"' in query else []
         for quoted in quoted_strings:
             analysis["filters"].append({
                 "type": "match_phrase",
@@ -268,9 +269,9 @@ class QueryOptimizer:
             analysis["confidence"] += 0.1
 
         # Status filters
-        status_values = ["active", "inactive", "pending", "completed", "processing", "error", "uploaded"]
-        for status in status_values:
-            if status in query_lower:
+        found_statuses = matches.labels("status")
+        for status in STATUS_TERMS:
+            if status in found_statuses:
                 analysis["filters"].append({
                     "type": "term",
                     "field": "status",
@@ -295,15 +296,7 @@ class QueryOptimizer:
         Returns:
             Resolved field name or None
         """
-        aliases = self.field_aliases.get(canonical_name, [canonical_name])
-
-        # Check if any alias is mentioned in query
-        for alias in aliases:
-            if alias in query_lower:
-                # Resolve to actual field
-                return self._resolve_field(canonical_name, available_fields)
-
-        # Default: return resolved canonical field
+        # An alias mentioned in the query resolves to the same field as the canonical name
         return self._resolve_field(canonical_name, available_fields)
 
     def _resolve_field(self, canonical_name: str, available_fields: List[str]) -> str:
@@ -315,23 +308,10 @@ class QueryOptimizer:
             available_fields: List of actual field names in index
 
         Returns:
-            Best matching field name
+            Best matching field name (exact alias, else first field containing
+            an alias, else the first alias); memoized by the intent matcher
         """
-        aliases = self.field_aliases.get(canonical_name, [canonical_name])
-
-        # Try exact match first
-        for alias in aliases:
-            if alias in available_fields:
-                return alias
-
-        # Try partial match
-        for alias in aliases:
-            for field in available_fields:
-                if alias in field.lower():
-                    return field
-
-        # Default to first alias
-        return aliases[0]
+        return self.intent_matcher.resolve_field(canonical_name, available_fields)
 
     def build_optimized_query(
         self,
@@ -0,0 +1,505 @@
+"""
+Query patterns: reuse Claude's parse of a question for later questions of the same shape.
+
+Learning: after Claude parses "show me invoices from Acme over $1,000", the
+literals of the question (numbers, years, ISO dates, quoted strings,
+capitalized names) that also appear as values in the parsed query (range bounds,
+term and match values) are replaced by typed placeholders, in both the question
+and the query:
+
+    pattern:   "show me invoices from {p0} over {p1}"
+    template:  {"bool": {"filter": [{"match": {"vendor": "{{p0}}"}},
+                                    {"range": {"total": {"gte": "{{p1}}"}}}]}}
+
+Literals that do not appear in the parsed query stay part of the pattern.
+Learning the same shape again checks the stored template against Claude's new
+parse and raises or lowers the pattern's confidence.
+
+Matching: the patterns of a scope (search template filter) are compiled into
+one anchored, case-insensitive regex alternation, most specific first, so a
+question is matched in a single regex pass. A match above
+QUERY_PATTERN_MIN_CONFIDENCE is instantiated with the captured values;
+otherwise the caller falls back to Claude.
+"""
+
+import copy
+import json
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.query_pattern import QueryPattern
+
+logger = logging.getLogger(__name__)
+
+# One word of an unquoted text capture: no punctuation, and never a clause word, so a
+# capture cannot swallow the rest of the question ("from Acme and over 500")
+_TEXT_WORD = (
+    r"(?!(?:and|or|but|over|under|above|below|from|to|with|in|on|for|since|before|after|between)\b)"
+    r"[^\s,;:!?\"]+"
+)
+
+# Capture regex per parameter type (matched against whitespace-normalized text)
+PARAM_REGEX = {
+    "number": r"-?\d[\d,]*(?:\.\d+)?",
+    "int": r"-?\d[\d,]*",
+    "year": r"(?:19|20)\d{2}",
+    "date": r"\d{4}-\d{2}-\d{2}",
+    "text": rf"{_TEXT_WORD}(?:\s+{_TEXT_WORD}){{0,3}}",
+}
+_CURRENCY_PREFIX = r"(?:\$\s?)?"  # Numbers may be written "$1,000"; the pattern drops the sign
+
+_LITERAL_RE = re.compile(r"""
+    (?P<quoted>"[^"]+"|'[^']+')
+  | (?P<date>\b\d{4}-\d{2}-\d{2}\b)
+  | (?P<number>(?:\$\s?)?-?\b\d[\d,]*(?:\.\d+)?\b)
+  | (?P<name>\b[A-Z][\w&'.-]*(?:\s+[A-Z][\w&'.-]*)*)
+""", re.VERBOSE)
+
+_PLACEHOLDER_RE = re.compile(r"\{\{(p\d+)(\|lower)?\}\}")
+
+# Parsed-query positions that hold a value the user typed (everything else is structure or options,
+# e.g. "size" or "minimum_should_match", and is never turned into a placeholder)
+FIELD_VALUE_CLAUSES = {"term", "terms", "match", "match_phrase", "match_phrase_prefix", "prefix", "wildcard", "range"}
+VALUE_KEYS = {"gt", "gte", "lt", "lte", "value", "query"}
+
+# Parsed-query keys a pattern stores and instantiates
+NL_RESULT_KEYS = ("elasticsearch_query", "aggregation", "comparison")
+
+# New patterns start below QUERY_PATTERN_MIN_CONFIDENCE (0.75): each agreeing re-parse halves the
+# distance to 1.0, so a pattern is served after one confirmation, or two when it captures free text
+NEW_PATTERN_CONFIDENCE = 0.6
+NEW_TEXT_PATTERN_CONFIDENCE = 0.3
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace and drop trailing punctuation (case is kept for names)."""
+    return " ".join(query.split()).rstrip("?.! ")
+
+
+@dataclass
+class _Literal:
+    start: int
+    end: int
+    kind: str  # number, int, year, date, text
+    raw: str
+    value: Any
+
+
+def _find_literals(text: str) -> List[_Literal]:
+    literals = []
+    for match in _LITERAL_RE.finditer(text):
+        raw = match.group(0)
+        if match.lastgroup == "quoted":
+            literals.append(_Literal(match.start(), match.end(), "text", raw, raw[1:-1]))
+        elif match.lastgroup == "date":
+            literals.append(_Literal(match.start(), match.end(), "date", raw, raw))
+        elif match.lastgroup == "number":
+            digits = raw.lstrip("$ ").replace(",", "")
+            if re.fullmatch(r"(19|20)\d{2}", digits) and not raw.startswith("$"):
+                literals.append(_Literal(match.start(), match.end(), "year", raw, digits))
+            else:
+                literals.append(_Literal(match.start(), match.end(), "number", raw, float(digits)))
+        elif match.start() > 0:  # A capitalized first word is just the start of the sentence
+            literals.append(_Literal(match.start(), match.end(), "text", raw, raw))
+    return literals
+
+
+def _parse_value(kind: str, raw: str) -> Any:
+    if kind in ("number", "int"):
+        number = float(raw.replace(",", ""))
+        return int(number) if kind == "int" else number
+    return raw
+
+
+def _substitute(
+    obj: Any,
+    literal: _Literal,
+    name: str,
+    role: Optional[str] = None
+) -> Tuple[Any, int, Optional[str]]:
+    """
+    Replace a literal's occurrences in the value leaves of a parsed query with a placeholder.
+
+    Value leaves are range bounds and term/match values (see FIELD_VALUE_CLAUSES
+    and VALUE_KEYS); ``role`` tracks where the recursion is: None for query
+    structure, "field" for the field map of a value clause, "value" for a value.
+
+    Returns:
+        (new object, occurrences replaced, narrowed kind: "int" when the query held an int)
+    """
+    if isinstance(obj, dict):
+        result, count, kind = {}, 0, None
+        for key, value in obj.items():
+            if role == "field":
+                child_role = None if isinstance(value, dict) else "value"
+            elif key in FIELD_VALUE_CLAUSES:
+                child_role = "field"
+            else:
+                child_role = "value" if key in VALUE_KEYS else None
+            result[key], n, k = _substitute(value, literal, name, child_role)
+            count, kind = count + n, kind or k
+        return result, count, kind
+    if isinstance(obj, list):
+        result, count, kind = [], 0, None
+        for value in obj:
+            item, n, k = _substitute(value, literal, name, role)
+            result.append(item)
+            count, kind = count + n, kind or k
+        return result, count, kind
+
+    if role != "value":
+        return obj, 0, None
+    if literal.kind == "number":
+        if isinstance(obj, (int, float)) and not isinstance(obj, bool) and obj == literal.value:
+            return f"{{{{{name}}}}}", 1, "int" if isinstance(obj, int) else None
+        return obj, 0, None
+    if not isinstance(obj, str):
+        return obj, 0, None
+    if literal.kind == "text":
+        if len(literal.value) < 2:
+            return obj, 0, None
+        pieces = re.split(f"({re.escape(literal.value)})", obj, flags=re.IGNORECASE)
+        if len(pieces) == 1:
+            return obj, 0, None
+        count = 0
+        for i in range(1, len(pieces), 2):
+            suffix = "|lower" if pieces[i] != literal.value and pieces[i] == literal.value.lower() else ""
+            if pieces[i] == literal.value or suffix:
+                pieces[i] = f"{{{{{name}{suffix}}}}}"
+                count += 1
+        return "".join(pieces), count, None
+    count = obj.count(literal.value)
+    return obj.replace(literal.value, f"{{{{{name}}}}}"), count, None
+
+
+def _fill(obj: Any, params: Dict[str, Any]) -> Any:
+    """Instantiate placeholders: whole-leaf placeholders keep the parameter's type."""
+    if isinstance(obj, dict):
+        return {key: _fill(value, params) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_fill(value, params) for value in obj]
+    if not isinstance(obj, str) or "{{" not in obj:
+        return obj
+
+    def render(match):
+        value = params[match.group(1)]
+        return str(value).lower() if match.group(2) else str(value)
+
+    whole = _PLACEHOLDER_RE.fullmatch(obj)
+    if whole and not whole.group(2):
+        return params[whole.group(1)]
+    return _PLACEHOLDER_RE.sub(render, obj)
+
+
+def _written_forms(literal: _Literal, kind: str, value: Any) -> set:
+    """Ways an explanation may spell a literal ("$1,000", "1,000", "1000")."""
+    forms = {literal.raw, literal.raw.lstrip("$ ")}
+    if kind in ("number", "int"):
+        forms.add(str(value))
+        if float(value).is_integer():
+            forms.add(str(int(value)))
+    return {form for form in forms if form}
+
+
+@dataclass
+class Abstraction:
+    """A question reduced to a pattern plus the parsed-query template it maps to."""
+    pattern: str
+    parameter_types: Dict[str, str]
+    template: Dict[str, Any]
+    explanation_template: str
+    params: Dict[str, Any]
+
+
+def abstract_query(query: str, nl_result: Dict[str, Any]) -> Optional[Abstraction]:
+    """
+    Abstract the literals of a question that Claude's parse depends on.
+
+    Args:
+        query: The question
+        nl_result: parse_natural_language_query result for it
+
+    Returns:
+        Abstraction, or None if no literal of the question appears in the parse
+    """
+    text = normalize_query(query)
+    if "{" in text or "}" in text:
+        return None
+
+    template = {key: copy.deepcopy(nl_result[key]) for key in NL_RESULT_KEYS if nl_result.get(key)}
+    explanation = nl_result.get("explanation") or ""
+    pieces, types, params, position = [], {}, {}, 0
+    for literal in _find_literals(text):
+        name = f"p{len(types)}"
+        template, count, narrowed = _substitute(template, literal, name)
+        if not count:
+            continue
+        kind = narrowed or literal.kind
+        types[name] = kind
+        params[name] = _parse_value(kind, literal.raw.lstrip("$ ")) if kind in ("number", "int") else literal.value
+        for written in sorted(_written_forms(literal, kind, params[name]), key=len, reverse=True):
+            explanation = explanation.replace(written, f"{{{{{name}}}}}")
+        pieces.append(text[position:literal.start].replace("{", "").replace("}", ""))
+        # Quoted literals keep their quotes in the pattern
+        quote = literal.raw[0] if literal.raw[0] in "\"'" else ""
+        pieces.append(f"{quote}{{{name}}}{quote}")
+        position = literal.end
+    if not types:
+        return None
+    pieces.append(text[position:])
+    return Abstraction("".join(pieces).lower(), types, template, explanation, params)
+
+
+def _pattern_regex(pattern: str, parameter_types: Dict[str, str], prefix: str) -> str:
+    """Regex source for a pattern; parameter groups are named {prefix}_{param}."""
+    parts = []
+    pieces = re.split(r"\{(p\d+)\}", pattern)
+    for i, piece in enumerate(pieces):
+        if i % 2:
+            kind = parameter_types[piece]
+            currency = _CURRENCY_PREFIX if kind in ("number", "int") else ""
+            quote = pieces[i - 1][-1:]
+            if kind == "text" and quote in ("\"", "'"):
+                # Quoted text runs to the closing quote and no further
+                parts.append(f"(?P<{prefix}_{piece}>[^{quote}]+)")
+            else:
+                parts.append(f"{currency}(?P<{prefix}_{piece}>{PARAM_REGEX[kind]})")
+        else:
+            parts.append(r"\s+".join(re.escape(word) for word in piece.split(" ")))
+    return "".join(parts)
+
+
+@dataclass
+class _CompiledPattern:
+    id: int
+    pattern: str
+    parameter_types: Dict[str, str]
+    template: Dict[str, Any]
+    explanation_template: Optional[str]
+    query_type: Optional[str]
+    confidence: float
+
+    @property
+    def specificity(self) -> Tuple[int, int]:
+        literal_chars = len(re.sub(r"\{p\d+\}", "", self.pattern))
+        free_text = sum(1 for kind in self.parameter_types.values() if kind == "text")
+        return (-free_text, literal_chars)
+
+
+@dataclass
+class PatternMatch:
+    """A question answered from a stored pattern."""
+    pattern_id: int
+    pattern: str
+    confidence: float
+    params: Dict[str, Any]
+    nl_result: Dict[str, Any] = field(default_factory=dict)
+
+
+class QueryPatternMatcher:
+    """
+    Process-wide matcher over stored query patterns.
+
+    Patterns are loaded per scope (template filter) into one compiled regex and
+    reloaded every reload_seconds, or right after this process learns one.
+    """
+
+    def __init__(
+        self,
+        min_confidence: float = 0.75,
+        reload_seconds: float = 60.0,
+        max_patterns: int = 2000
+    ):
+        self.min_confidence = min_confidence
+        self.reload_seconds = reload_seconds
+        self.max_patterns = max_patterns
+        self._scopes: Dict[Optional[str], Tuple[Optional["re.Pattern"], Dict[str, _CompiledPattern]]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.low_confidence = 0
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+    def _load(self, db: Session) -> None:
+        rows = db.query(QueryPattern).order_by(
+            QueryPattern.usage_count.desc(), QueryPattern.id
+        ).limit(self.max_patterns).all()
+
+        by_scope: Dict[Optional[str], List[_CompiledPattern]] = {}
+        for row in rows:
+            by_scope.setdefault(row.template_name, []).append(_CompiledPattern(
+                id=row.id,
+                pattern=row.pattern,
+                parameter_types=row.parameter_types or {},
+                template=row.es_query_template,
+                explanation_template=row.explanation_template,
+                query_type=row.query_type,
+                confidence=row.confidence_score or 0.0
+            ))
+
+        scopes = {}
+        for scope, patterns in by_scope.items():
+            patterns.sort(key=lambda p: p.specificity, reverse=True)
+            alternatives = [
+                f"(?P<q{p.id}>{_pattern_regex(p.pattern, p.parameter_types, f'q{p.id}')})" for p in patterns
+            ]
+            scopes[scope] = (
+                re.compile(f"^(?:{'|'.join(alternatives)})$", re.IGNORECASE),
+                {f"q{p.id}": p for p in patterns}
+            )
+        with self._lock:
+            self._scopes = scopes
+            self._loaded_at = time.monotonic()
+        logger.info(f"Loaded {len(rows)} query pattern(s) in {len(scopes)} scope(s)")
+
+    def _ensure_loaded(self, db: Session) -> None:
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self.reload_seconds:
+            self._load(db)
+
+    def match(self, db: Session, query: str, template_id: Optional[str] = None) -> Optional[PatternMatch]:
+        """
+        Instantiate the stored parse for a question of a known shape.
+
+        Args:
+            db: Database session (patterns are loaded from it when stale)
+            query: The question
+            template_id: Search template filter (patterns are scoped by it)
+
+        Returns:
+            PatternMatch, or None when no pattern matches confidently
+        """
+        self._ensure_loaded(db)
+        self.lookups += 1
+        regex, patterns = self._scopes.get(template_id, (None, {}))
+        match = regex.match(normalize_query(query)) if regex else None
+        if not match:
+            return None
+
+        compiled = patterns[match.lastgroup]
+        if compiled.confidence < self.min_confidence:
+            self.low_confidence += 1
+            logger.info(f"Query pattern {compiled.id} matched with low confidence ({compiled.confidence:.2f})")
+            return None
+
+        params = {
+            name: _parse_value(kind, match.group(f"{match.lastgroup}_{name}"))
+            for name, kind in compiled.parameter_types.items()
+        }
+        nl_result = _fill(compiled.template, params)
+        if compiled.query_type:
+            nl_result["query_type"] = compiled.query_type
+        nl_result["explanation"] = _fill(compiled.explanation_template or "", params)
+
+        self.hits += 1
+        db.query(QueryPattern).filter(QueryPattern.id == compiled.id).update(
+            {QueryPattern.usage_count: QueryPattern.usage_count + 1, QueryPattern.last_used: datetime.utcnow()},
+            synchronize_session=False
+        )
+        db.commit()
+        return PatternMatch(compiled.id, compiled.pattern, compiled.confidence, params, nl_result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "low_confidence": self.low_confidence,
+            "hit_rate": round(self.hits / self.lookups * 100, 2) if self.lookups else 0,
+            "patterns": sum(len(patterns) for _, patterns in self._scopes.values()),
+            "min_confidence": self.min_confidence
+        }
+
+
+def learn_query_pattern(
+    db: Session,
+    query: str,
+    nl_result: Dict[str, Any],
+    template_id: Optional[str] = None
+) -> Optional[QueryPattern]:
+    """
+    Learn (or re-check) the pattern of a question Claude parsed successfully.
+
+    A new shape is stored with NEW_PATTERN_CONFIDENCE (lower when it captures
+    free text), below the serving threshold until re-parses confirm it. A known shape is instantiated with this question's values and
+    compared to Claude's parse: agreement raises confidence, disagreement halves it.
+
+    Args:
+        db: Database session
+        query: The question
+        nl_result: parse_natural_language_query result (before folder/template filters)
+        template_id: Search template filter the question was asked under
+
+    Returns:
+        The stored pattern, or None if the question has no abstractable literal
+    """
+    abstraction = abstract_query(query, nl_result)
+    if abstraction is None:
+        return None
+
+    existing = db.query(QueryPattern).filter(
+        QueryPattern.pattern == abstraction.pattern,
+        QueryPattern.template_name.is_(None) if template_id is None else QueryPattern.template_name == template_id
+    ).first()
+
+    if existing is not None:
+        expected = {key: nl_result[key] for key in NL_RESULT_KEYS if nl_result.get(key)}
+        agrees = (
+            existing.parameter_types == abstraction.parameter_types
+            and existing.query_type == nl_result.get("query_type")
+            and json.dumps(_fill(existing.es_query_template, abstraction.params), sort_keys=True, default=str)
+            == json.dumps(expected, sort_keys=True, default=str)
+        )
+        confidence = existing.confidence_score or 0.0
+        existing.confidence_score = min(0.99, confidence + (1 - confidence) / 2) if agrees else confidence / 2
+        existing.success_rate = 0.8 * (existing.success_rate or 1.0) + 0.2 * (1.0 if agrees else 0.0)
+        if not agrees:
+            logger.info(f"Query pattern {existing.id} disagreed with Claude's parse of '{query[:50]}'")
+        db.commit()
+        get_query_pattern_matcher().invalidate()
+        return existing
+
+    free_text = "text" in abstraction.parameter_types.values()
+    pattern = QueryPattern(
+        pattern=abstraction.pattern,
+        template_name=template_id,
+        query_type=nl_result.get("query_type"),
+        es_query_template=abstraction.template,
+        explanation_template=abstraction.explanation_template,
+        parameter_names=list(abstraction.parameter_types),
+        parameter_types=abstraction.parameter_types,
+        usage_count=0,
+        success_rate=1.0,
+        confidence_score=NEW_TEXT_PATTERN_CONFIDENCE if free_text else NEW_PATTERN_CONFIDENCE
+    )
+    db.add(pattern)
+    db.commit()
+    get_query_pattern_matcher().invalidate()
+    logger.info(f"Learned query pattern: {abstraction.pattern}")
+    return pattern
+
+
+_query_pattern_matcher: Optional[QueryPatternMatcher] = None
+
+
+def get_query_pattern_matcher() -> QueryPatternMatcher:
+    """Get the process-wide query pattern matcher"""
+    global _query_pattern_matcher
+    if _query_pattern_matcher is None:
+        _query_pattern_matcher = QueryPatternMatcher(
+            min_confidence=settings.QUERY_PATTERN_MIN_CONFIDENCE,
+            reload_seconds=settings.QUERY_PATTERN_RELOAD_SECONDS,
+            max_patterns=settings.QUERY_PATTERN_MAX_PATTERNS
+        )
+    return _query_pattern_matcher
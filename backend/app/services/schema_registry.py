@@ -1,13 +1,253 @@
+"""
+Schema registry: field context for query generation.
+
+Contexts for every schema, the schema-derived canonical field map and the
+user-defined canonical mappings/aliases are built once into a process-wide
+RegistrySnapshot per database and shared by SchemaRegistry, QueryOptimizer
+and CanonicalFieldService (services derive their own structures from it once
+per snapshot via RegistrySnapshot.derived).
+
+A snapshot is rebuilt only when the registry changes:
+- commits in this process that touch schemas, templates or canonical
+  mappings/aliases mark it stale (session hooks below);
+- other processes' changes are noticed by comparing a fingerprint (row counts
+  and updated_at/id high-water marks of those tables, one query) every
+  SCHEMA_REGISTRY_VERSION_CHECK_SECONDS.
+
+Snapshots are shared between requests: treat their contents as read-only.
+"""
+
+import itertools
 import logging
-from typing import Any, Dict, List, Optional
-
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import case, event, func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.database import AnySession
+from app.models.canonical_mapping import CanonicalAlias, CanonicalFieldMapping
 from app.models.schema import Schema
+from app.models.template import SchemaTemplate
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class CanonicalMappingInfo:
+    """Read-only copy of an active CanonicalFieldMapping, safe to share across sessions."""
+    id: int
+    canonical_name: str
+    description: Optional[str]
+    field_mappings: Dict[str, str]
+    aggregation_type: str
+    is_system: bool
+
+    def get_field_for_template(self, template_name: str) -> Optional[str]:
+        return self.field_mappings.get(template_name)
+
+    def get_all_fields(self) -> List[str]:
+        return list(self.field_mappings.values())
+
+    def get_templates(self) -> List[str]:
+        return list(self.field_mappings.keys())
+
+
+class RegistrySnapshot:
+    """Everything the registry knows at one registry version."""
+
+    def __init__(
+        self,
+        version: int,
+        fingerprint: Tuple,
+        contexts: List[Dict[str, Any]],
+        schema_ids: List[int],
+        canonical_field_mapping: Dict[str, List[str]],
+        canonical_mappings: Dict[str, CanonicalMappingInfo],
+        canonical_aliases: Dict[str, str]
+    ):
+        self.version = version
+        self.fingerprint = fingerprint
+        self.contexts = contexts
+        self.contexts_by_id = dict(zip(schema_ids, contexts))
+        self.contexts_by_name: Dict[str, Dict[str, Any]] = {}
+        for context in contexts:
+            self.contexts_by_name.setdefault(context["template_name"], context)
+        self.canonical_field_mapping = canonical_field_mapping
+        self.canonical_mappings = canonical_mappings
+        self.canonical_aliases = canonical_aliases
+        self._derived: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def derived(self, key: str, build: Callable[[], Any]) -> Any:
+        """Build a structure from this snapshot once (per key) and share it."""
+        value = self._derived.get(key)
+        if value is None:
+            with self._lock:
+                value = self._derived.get(key)
+                if value is None:
+                    value = self._derived[key] = build()
+        return value
+
+
+class _RegistryState:
+    """Snapshot state for one database (engine)."""
+
+    def __init__(self):
+        self.snapshot: Optional[RegistrySnapshot] = None
+        self.checked_at = 0.0
+        self.stale = False
+        self.tables: Optional[set] = None  # Registry tables present in this database
+        self.lock = threading.Lock()
+
+
+_states: "weakref.WeakKeyDictionary[Any, _RegistryState]" = weakref.WeakKeyDictionary()
+_states_lock = threading.Lock()
+_versions = itertools.count(1)
+
+# Table -> (model, change marker); with row count and max id it fingerprints the table.
+# Aliases have no updated_at: soft deletes show in the active count.
+_REGISTRY_TABLES = {
+    Schema.__tablename__: (Schema, lambda: func.max(Schema.updated_at)),
+    SchemaTemplate.__tablename__: (
+        SchemaTemplate, lambda: func.max(func.coalesce(SchemaTemplate.updated_at, SchemaTemplate.created_at))
+    ),
+    CanonicalFieldMapping.__tablename__: (CanonicalFieldMapping, lambda: func.max(CanonicalFieldMapping.updated_at)),
+    CanonicalAlias.__tablename__: (
+        CanonicalAlias, lambda: func.sum(case((CanonicalAlias.is_active == True, 1), else_=0))
+    ),
+}
+
+
+def _state_for(db: Session) -> _RegistryState:
+    bind = db.get_bind()
+    engine = getattr(bind, "engine", bind)
+    with _states_lock:
+        state = _states.get(engine)
+        if state is None:
+            state = _states[engine] = _RegistryState()
+        return state
+
+
+def _fingerprint(db: Session, tables: set) -> Tuple:
+    """Row count, max id and change marker of each registry table, in one query."""
+    subqueries = []
+    for table in sorted(tables):
+        model, marker = _REGISTRY_TABLES[table]
+        subqueries.append(select(func.count(), func.max(model.id), marker()).select_from(model).subquery())
+    if not subqueries:
+        return ()
+    return tuple(db.execute(select(*(column for subquery in subqueries for column in subquery.c))).one())
+
+
+def invalidate_registry_snapshots() -> None:
+    """Mark every database's snapshot stale (after a registry write in this process)."""
+    with _states_lock:
+        states = list(_states.values())
+    for state in states:
+        state.stale = True
+
+
+def get_registry_snapshot(db: Session) -> RegistrySnapshot:
+    """
+    Current registry snapshot for the session's database.
+
+    Args:
+        db: Sync session (AsyncSession callers go through SchemaRegistry.snapshot)
+
+    Returns:
+        The shared snapshot, rebuilt first if the registry changed
+    """
+    state = _state_for(db)
+    snapshot = state.snapshot
+    if (
+        snapshot is not None and not state.stale
+        and time.monotonic() - state.checked_at < settings.SCHEMA_REGISTRY_VERSION_CHECK_SECONDS
+    ):
+        return snapshot
+
+    with state.lock:
+        if state.tables is None:
+            inspector = inspect(db.connection())
+            state.tables = {table for table in _REGISTRY_TABLES if inspector.has_table(table)}
+        stale = state.stale
+        state.stale = False  # A commit while we rebuild marks the new snapshot stale again
+        fingerprint = _fingerprint(db, state.tables)
+        state.checked_at = time.monotonic()
+        if state.snapshot is not None and not stale and fingerprint == state.snapshot.fingerprint:
+            return state.snapshot
+        state.snapshot = _build_snapshot(db, fingerprint, state.tables)
+        return state.snapshot
+
+
+def _build_snapshot(db: Session, fingerprint: Tuple, tables: set) -> RegistrySnapshot:
+    registry = SchemaRegistry(db)
+    schemas = list(db.execute(select(Schema).order_by(Schema.id)).scalars()) \
+        if Schema.__tablename__ in tables else []
+
+    canonical_mappings, canonical_aliases = {}, {}
+    if CanonicalFieldMapping.__tablename__ in tables:
+        for mapping in db.execute(
+            select(CanonicalFieldMapping).where(CanonicalFieldMapping.is_active == True)
+        ).scalars():
+            canonical_mappings[mapping.canonical_name] = CanonicalMappingInfo(
+                id=mapping.id,
+                canonical_name=mapping.canonical_name,
+                description=mapping.description,
+                field_mappings=dict(mapping.field_mappings or {}),
+                aggregation_type=mapping.aggregation_type,
+                is_system=bool(mapping.is_system)
+            )
+    if CanonicalAlias.__tablename__ in tables and canonical_mappings:
+        canonical_aliases = dict(db.execute(
+            select(CanonicalAlias.alias, CanonicalFieldMapping.canonical_name)
+            .join(CanonicalFieldMapping, CanonicalAlias.canonical_field_id == CanonicalFieldMapping.id)
+            .where(CanonicalAlias.is_active == True, CanonicalFieldMapping.is_active == True)
+        ).all())
+
+    snapshot = RegistrySnapshot(
+        version=next(_versions),
+        fingerprint=fingerprint,
+        contexts=[registry._build_field_context(schema) for schema in schemas],
+        schema_ids=[schema.id for schema in schemas],
+        canonical_field_mapping=registry._build_canonical_field_mapping(schemas),
+        canonical_mappings=canonical_mappings,
+        canonical_aliases=canonical_aliases
+    )
+    logger.info(
+        f"Built schema registry snapshot v{snapshot.version}: {len(schemas)} schemas, "
+        f"{len(canonical_mappings)} canonical mappings, {len(canonical_aliases)} aliases"
+    )
+    return snapshot
+
+
+@event.listens_for(Session, "before_flush")
+def _note_registry_changes(session, flush_context, instances):
+    if any(
+        getattr(obj, "__tablename__", None) in _REGISTRY_TABLES
+        for obj in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info["schema_registry_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_registry_commit(session):
+    if session.info.pop("schema_registry_changed", False):
+        invalidate_registry_snapshots()
+
+
+@event.listens_for(Session, "after_rollback")
+def _invalidate_after_registry_rollback(session):
+    # A snapshot built after the flush may hold the rolled-back rows
+    if session.info.pop("schema_registry_changed", False):
+        invalidate_registry_snapshots()
+
+
 class SchemaRegistry:
     """
     Central registry providing rich context for query generation.
@@ -17,9 +257,15 @@ class SchemaRegistry:
     Elasticsearch queries.
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AnySession):
         self.db = db
 
+    async def snapshot(self) -> RegistrySnapshot:
+        """The shared registry snapshot for this session's database."""
+        if isinstance(self.db, AsyncSession):
+            return await self.db.run_sync(get_registry_snapshot)
+        return get_registry_snapshot(self.db)
+
     async def get_field_context(
         self,
         template_name: Optional[str] = None,
@@ -50,17 +296,21 @@ class SchemaRegistry:
             }
         """
 
-        # Get schema
-        schema = None
+        snapshot = await self.snapshot()
+        context = None
         if schema_id:
-            schema = self.db.query(Schema).filter(Schema.id == schema_id).first()
+            context = snapshot.contexts_by_id.get(schema_id)
         elif template_name:
-            schema = self.db.query(Schema).filter(Schema.name == template_name).first()
+            context = snapshot.contexts_by_name.get(template_name)
 
-        if not schema:
+        if not context:
             logger.warning(f"Schema not found: template_name={template_name}, schema_id={schema_id}")
             return self._get_default_context()
 
+        return context
+
+    def _build_field_context(self, schema: Schema) -> Dict[str, Any]:
+        """Build the query-generation context for an already loaded schema."""
         # Build field context
         field_contexts = {}
         all_field_names = []
@@ -117,15 +367,10 @@ class SchemaRegistry:
         """
         Get field context for all available templates.
         Useful for cross-template queries.
-        """
-        schemas = self.db.query(Schema).all()
-        contexts = []
 
-        for schema in schemas:
-            context = await self.get_field_context(schema_id=schema.id)
-            contexts.append(context)
-
-        return contexts
+        The contexts are shared with other requests (read-only).
+        """
+        return list((await self.snapshot()).contexts)
 
     async def get_canonical_field_mapping(self) -> Dict[str, List[str]]:
         """
@@ -138,9 +383,12 @@ class SchemaRegistry:
                 ...
             }
         """
-        canonical_map = {}
-        schemas = self.db.query(Schema).all()
+        snapshot = await self.snapshot()
+        return {name: list(fields) for name, fields in snapshot.canonical_field_mapping.items()}
 
+    def _build_canonical_field_mapping(self, schemas: List[Schema]) -> Dict[str, List[str]]:
+        """Group the schemas' field names by canonical category."""
+        canonical_map = {}
         for schema in schemas:
             for field_def in schema.fields:
                 field_name = field_def.get("name")
@@ -0,0 +1,111 @@
+"""
+Rebuild document_search_index (and passage chunks) from the database.
+
+Documents are read in id order with keyset pages, their fields and parse
+results eager-loaded, and fed lazily to PostgresService.bulk_index_documents,
+so a full reindex holds one page of documents in memory and issues one upsert
+per batch instead of a SELECT and a commit per document.
+"""
+
+import logging
+from typing import Any, Dict, Iterator, Optional
+
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.models.document import Document
+from app.services.document_chunks import chunk_text
+from app.services.postgres_service import PostgresService
+
+logger = logging.getLogger(__name__)
+
+INDEXED_STATUSES = ("completed", "verified")
+
+
+def _field_value(field) -> Any:
+    if field.verified:
+        if field.verified_value_json is not None:
+            return field.verified_value_json
+        if field.verified_value is not None:
+            return field.verified_value
+    return field.field_value_json if field.field_value_json is not None else field.field_value
+
+
+def index_kwargs(document: Document) -> Dict[str, Any]:
+    """bulk_index_documents entry for a document, as processing would have indexed it."""
+    extracted_fields = {field.field_name: _field_value(field) for field in document.extracted_fields}
+    confidence_scores = {
+        field.field_name: field.confidence_score or 0.0 for field in document.extracted_fields
+    }
+    parse_chunks = (document.actual_parse_result or {}).get("chunks", [])
+    schema = document.schema
+    return {
+        "document_id": document.id,
+        "filename": document.filename,
+        "extracted_fields": extracted_fields,
+        "confidence_scores": confidence_scores,
+        "full_text": "\n".join(chunk_text(chunk) for chunk in parse_chunks),
+        "schema": {"id": schema.id, "name": schema.name, "fields": schema.fields} if schema else None,
+        "chunks": parse_chunks,
+    }
+
+
+def iter_index_documents(
+    db: Session,
+    template_id: Optional[int] = None,
+    batch_size: int = 500
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield index_kwargs for every processed document, a keyset page at a time.
+
+    Args:
+        db: Sync session
+        template_id: Only documents of this schema (query_context template_id)
+        batch_size: Documents loaded per page
+    """
+    last_id = 0
+    while True:
+        query = (
+            db.query(Document)
+            .options(
+                selectinload(Document.extracted_fields),
+                joinedload(Document.schema),
+                joinedload(Document.physical_file),
+            )
+            .filter(Document.status.in_(INDEXED_STATUSES), Document.id > last_id)
+        )
+        if template_id is not None:
+            query = query.filter(Document.schema_id == template_id)
+        documents = query.order_by(Document.id).limit(batch_size).all()
+        if not documents:
+            return
+
+        page = [index_kwargs(document) for document in documents]
+        last_id = documents[-1].id
+        db.expunge_all()  # Parse results are large; drop the ORM objects before indexing
+        yield from page
+
+
+async def reindex_documents(
+    db: Session,
+    template_id: Optional[int] = None,
+    batch_size: int = 500,
+    use_copy: bool = False
+) -> Dict[str, Any]:
+    """
+    Reindex one template's documents, or the whole corpus.
+
+    Returns:
+        bulk_index_documents stats ({"indexed", "chunks", "batches", "seconds", ...})
+    """
+    scope = f"template {template_id}" if template_id is not None else "all documents"
+    logger.info(f"Reindexing search for {scope} (batch size {batch_size})")
+    stats = await PostgresService(db).bulk_index_documents(
+        iter_index_documents(db, template_id=template_id, batch_size=batch_size),
+        batch_size=batch_size,
+        use_copy=use_copy
+    )
+    logger.info(
+        f"Reindexed {stats['indexed']} documents for {scope} in {stats['seconds']}s "
+        f"({stats['docs_per_second']} docs/s)"
+    )
+    return stats
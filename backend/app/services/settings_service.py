@@ -10,22 +10,123 @@ Resolution order:
 
 import json
 import logging
-from typing import Any, Dict, Optional
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import and_, insert, or_, select, update
+
+from app.core.config import settings as app_settings
+from app.core.database import (
+    AnySession,
+    db_commit,
+    db_delete,
+    db_execute,
+    db_refresh,
+    db_rollback,
+)
+from app.models.settings import DEFAULT_SETTINGS, Organization, Settings, SettingsVersion, User
 
-from sqlalchemy.orm import Session
+logger = logging.getLogger(__name__)
+
+# (org_id, user_id, key) -> (serialized value, value_type)
+SettingsRows = Dict[Tuple[Optional[int], Optional[int], str], Tuple[str, str]]
+
+
+class _DatabaseCache:
+    """Cached settings state for one database (engine)."""
+
+    def __init__(self):
+        self.orgs: Dict[Optional[int], Tuple[float, SettingsRows]] = {}
+        self.resolved: Dict[Tuple[str, Optional[int], Optional[int]], Optional[Tuple[str, str]]] = {}
+        self.default_scope: Optional[Tuple[int, int]] = None
+        self.version: Optional[int] = None
+        self.version_checked_at = 0.0
+        self.version_check_enabled = True
+
+
+class SettingsCache:
+    """
+    Process-level cache of settings rows and resolved lookups.
+
+    - All settings visible to an org (system + org + its users) are loaded in
+      one query and kept for ttl_seconds.
+    - Resolved values are memoized by (key, user_id, org_id).
+    - Writes through SettingsService invalidate the local cache immediately
+      and bump settings_version; other processes poll that counter every
+      version_check_seconds and drop their cache when it moves.
+
+    State is kept per database URL, so the sync and async engines of one
+    database share it (a write through either invalidates both). In-memory
+    SQLite databases are private to their engine and keyed by it, so separate
+    test databases never share entries.
+    """
+
+    def __init__(self, ttl_seconds: float, version_check_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.version_check_seconds = version_check_seconds
+        self._databases: Dict[str, _DatabaseCache] = {}
+        self._memory_databases: "weakref.WeakKeyDictionary[Any, _DatabaseCache]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def for_bind(self, bind) -> _DatabaseCache:
+        url = bind.url
+        if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+            databases, key = self._memory_databases, bind
+        else:
+            # Without the driver: postgresql+asyncpg and postgresql+psycopg2 are one database
+            databases, key = self._databases, str(url.set(drivername=url.get_backend_name()))
+        with self._lock:
+            state = databases.get(key)
+            if state is None:
+                state = databases[key] = _DatabaseCache()
+            return state
 
-from app.models.settings import DEFAULT_SETTINGS, Organization, Settings, User
+    def invalidate(self, bind) -> None:
+        """Drop cached settings for one database (default org/user ids are kept)"""
+        state = self.for_bind(bind)
+        with self._lock:
+            state.orgs.clear()
+            state.resolved.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._databases = {}
+            self._memory_databases = weakref.WeakKeyDictionary()
+
+
+_settings_cache: Optional[SettingsCache] = None
 
-logger = logging.getLogger(__name__)
+
+def get_settings_cache() -> SettingsCache:
+    """Get the process-wide settings cache"""
+    global _settings_cache
+    if _settings_cache is None:
+        _settings_cache = SettingsCache(
+            ttl_seconds=app_settings.SETTINGS_CACHE_TTL_SECONDS,
+            version_check_seconds=app_settings.SETTINGS_CACHE_VERSION_CHECK_SECONDS
+        )
+    return _settings_cache
 
 
 class SettingsService:
     """Service for managing and resolving hierarchical settings."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AnySession):
         self.db = db
 
-    def get_setting(
+    async def _first(self, stmt):
+        return (await db_execute(self.db, stmt)).scalars().first()
+
+    async def _all(self, stmt):
+        return (await db_execute(self.db, stmt)).scalars().all()
+
+    async def get_setting(
         self,
         key: str,
         user_id: Optional[int] = None,
@@ -35,6 +136,9 @@ class SettingsService:
         """
         Get setting value with hierarchical resolution.
 
+        Served from the process-level settings cache; on a miss every setting
+        visible to the org is loaded in a single query.
+
         Args:
             key: Setting key (e.g., "audit_confidence_threshold")
             user_id: User ID for user-level settings
@@ -44,38 +148,22 @@ class SettingsService:
         Returns:
             Setting value (typed according to value_type)
         """
+        cache = get_settings_cache()
+        cache_key = (key, user_id, org_id)
 
-        # 1. Try user-level setting
-        if user_id and org_id:
-            setting = self.db.query(Settings).filter(
-                Settings.key == key,
-                Settings.user_id == user_id,
-                Settings.org_id == org_id
-            ).first()
-
-            if setting:
-                return self._deserialize_value(setting.value, setting.value_type)
-
-        # 2. Try org-level setting
-        if org_id:
-            setting = self.db.query(Settings).filter(
-                Settings.key == key,
-                Settings.org_id == org_id,
-                Settings.user_id.is_(None)
-            ).first()
-
-            if setting:
-                return self._deserialize_value(setting.value, setting.value_type)
-
-        # 3. Try system default
-        setting = self.db.query(Settings).filter(
-            Settings.key == key,
-            Settings.org_id.is_(None),
-            Settings.user_id.is_(None)
-        ).first()
+        if cache.enabled:
+            state = await self._cache_state()
+            if cache_key in state.resolved:
+                setting = state.resolved[cache_key]
+            else:
+                setting = self._resolve(await self._org_rows(org_id, state), key, user_id, org_id)
+                state.resolved[cache_key] = setting
+        else:
+            setting = self._resolve(await self._load_org_rows(org_id), key, user_id, org_id)
 
+        # 1-3. User, org or system setting
         if setting:
-            return self._deserialize_value(setting.value, setting.value_type)
+            return self._deserialize_value(*setting)
 
         # 4. Try hardcoded default
         if key in DEFAULT_SETTINGS:
@@ -84,7 +172,105 @@ class SettingsService:
         # 5. Return provided default
         return default
 
-    def get_all_settings(
+    @staticmethod
+    def _resolve(
+        rows: SettingsRows,
+        key: str,
+        user_id: Optional[int],
+        org_id: Optional[int]
+    ) -> Optional[Tuple[str, str]]:
+        """Pick the most specific stored setting: user > org > system."""
+        if user_id and org_id and (org_id, user_id, key) in rows:
+            return rows[(org_id, user_id, key)]
+        if org_id and (org_id, None, key) in rows:
+            return rows[(org_id, None, key)]
+        return rows.get((None, None, key))
+
+    async def _load_org_rows(self, org_id: Optional[int]) -> SettingsRows:
+        """Load system settings plus every org/user setting of one org in one query."""
+        scope = and_(Settings.org_id.is_(None), Settings.user_id.is_(None))
+        if org_id:
+            scope = or_(scope, Settings.org_id == org_id)
+
+        result = await db_execute(self.db, select(
+            Settings.org_id, Settings.user_id, Settings.key, Settings.value, Settings.value_type
+        ).where(scope).order_by(Settings.id))
+
+        rows: SettingsRows = {}
+        for row_org_id, row_user_id, key, value, value_type in result:
+            rows.setdefault((row_org_id, row_user_id, key), (value, value_type))
+        return rows
+
+    async def _org_rows(self, org_id: Optional[int], state: _DatabaseCache) -> SettingsRows:
+        cached = state.orgs.get(org_id)
+        if cached and time.monotonic() - cached[0] < get_settings_cache().ttl_seconds:
+            return cached[1]
+
+        rows = await self._load_org_rows(org_id)
+        state.orgs[org_id] = (time.monotonic(), rows)
+        # Resolutions derived from the old snapshot may be stale
+        for cache_key in [k for k in state.resolved if k[2] == org_id]:
+            state.resolved.pop(cache_key, None)
+        return rows
+
+    async def _cache_state(self) -> _DatabaseCache:
+        """Cache state for this session's database, reset if another process changed settings."""
+        cache = get_settings_cache()
+        bind = self.db.get_bind()
+        state = cache.for_bind(bind)
+
+        now = time.monotonic()
+        if (
+            cache.version_check_seconds > 0
+            and state.version_check_enabled
+            and now - state.version_checked_at >= cache.version_check_seconds
+        ):
+            state.version_checked_at = now
+            try:
+                version = (await db_execute(
+                    self.db, select(SettingsVersion.version).where(SettingsVersion.id == 1)
+                )).scalar() or 0
+            except Exception as e:
+                logger.warning(f"settings_version unavailable, cross-process settings invalidation disabled: {e}")
+                state.version_check_enabled = False
+            else:
+                if state.version is not None and version != state.version:
+                    logger.debug(f"Settings changed elsewhere (version {state.version} -> {version}), reloading")
+                    cache.invalidate(bind)
+                state.version = version
+
+        return state
+
+    async def _settings_changed(self) -> None:
+        """Invalidate local cache and bump settings_version for other processes."""
+        cache = get_settings_cache()
+        bind = self.db.get_bind()
+        cache.invalidate(bind)
+
+        if cache.version_check_seconds <= 0:
+            return
+
+        try:
+            result = await db_execute(self.db, update(SettingsVersion).where(
+                SettingsVersion.id == 1
+            ).values(version=SettingsVersion.version + 1))
+            if result.rowcount == 0:
+                await db_execute(self.db, insert(SettingsVersion).values(id=1, version=1))
+            version = (await db_execute(
+                self.db, select(SettingsVersion.version).where(SettingsVersion.id == 1)
+            )).scalar()
+            await db_commit(self.db)
+        except Exception as e:
+            await db_rollback(self.db)
+            logger.warning(f"Could not bump settings_version; other processes see this change after their TTL: {e}")
+            return
+
+        # Our own bump is not a foreign change (anything else in between is)
+        state = cache.for_bind(bind)
+        if state.version is not None and version == state.version + 1:
+            state.version = version
+
+    async def get_all_settings(
         self,
         user_id: Optional[int] = None,
         org_id: Optional[int] = None,
@@ -110,10 +296,10 @@ class SettingsService:
             } if include_metadata else config["value"]
 
         # Override with system settings
-        system_settings = self.db.query(Settings).filter(
+        system_settings = await self._all(select(Settings).where(
             Settings.org_id.is_(None),
             Settings.user_id.is_(None)
-        ).all()
+        ))
 
         for setting in system_settings:
             value = self._deserialize_value(setting.value, setting.value_type)
@@ -134,10 +320,10 @@ class SettingsService:
 
         # Override with org settings
         if org_id:
-            org_settings = self.db.query(Settings).filter(
+            org_settings = await self._all(select(Settings).where(
                 Settings.org_id == org_id,
                 Settings.user_id.is_(None)
-            ).all()
+            ))
 
             for setting in org_settings:
                 value = self._deserialize_value(setting.value, setting.value_type)
@@ -158,10 +344,10 @@ class SettingsService:
 
         # Override with user settings
         if user_id and org_id:
-            user_settings = self.db.query(Settings).filter(
+            user_settings = await self._all(select(Settings).where(
                 Settings.user_id == user_id,
                 Settings.org_id == org_id
-            ).all()
+            ))
 
             for setting in user_settings:
                 value = self._deserialize_value(setting.value, setting.value_type)
@@ -182,7 +368,7 @@ class SettingsService:
 
         return result
 
-    def set_setting(
+    async def set_setting(
         self,
         key: str,
         value: Any,
@@ -208,19 +394,7 @@ class SettingsService:
             raise ValueError(f"Invalid value_type: {value_type}")
 
         # Check if setting exists
-        query = self.db.query(Settings).filter(Settings.key == key)
-
-        if user_id:
-            query = query.filter(Settings.user_id == user_id)
-        else:
-            query = query.filter(Settings.user_id.is_(None))
-
-        if org_id:
-            query = query.filter(Settings.org_id == org_id)
-        else:
-            query = query.filter(Settings.org_id.is_(None))
-
-        setting = query.first()
+        setting = await self._first(self._scoped_query(key, user_id, org_id))
 
         # Serialize value
         serialized_value = self._serialize_value(value, value_type)
@@ -243,11 +417,12 @@ class SettingsService:
             )
             self.db.add(setting)
 
-        self.db.commit()
-        self.db.refresh(setting)
+        await db_commit(self.db)
+        await self._settings_changed()
+        await db_refresh(self.db, setting)
         return setting
 
-    def delete_setting(
+    async def delete_setting(
         self,
         key: str,
         user_id: Optional[int] = None,
@@ -258,28 +433,33 @@ class SettingsService:
 
         Returns True if deleted, False if not found.
         """
-        query = self.db.query(Settings).filter(Settings.key == key)
+        setting = await self._first(self._scoped_query(key, user_id, org_id))
+
+        if setting:
+            await db_delete(self.db, setting)
+            await db_commit(self.db)
+            await self._settings_changed()
+            return True
+
+        return False
+
+    def _scoped_query(self, key: str, user_id: Optional[int], org_id: Optional[int]):
+        """Select the setting row stored at exactly this (user, org) level."""
+        stmt = select(Settings).where(Settings.key == key)
 
         if user_id:
-            query = query.filter(Settings.user_id == user_id)
+            stmt = stmt.where(Settings.user_id == user_id)
         else:
-            query = query.filter(Settings.user_id.is_(None))
+            stmt = stmt.where(Settings.user_id.is_(None))
 
         if org_id:
-            query = query.filter(Settings.org_id == org_id)
+            stmt = stmt.where(Settings.org_id == org_id)
         else:
-            query = query.filter(Settings.org_id.is_(None))
-
-        setting = query.first()
-
-        if setting:
-            self.db.delete(setting)
-            self.db.commit()
-            return True
+            stmt = stmt.where(Settings.org_id.is_(None))
 
-        return False
+        return stmt
 
-    def initialize_defaults(self) -> None:
+    async def initialize_defaults(self) -> None:
         """
         Initialize system default settings from DEFAULT_SETTINGS.
 
@@ -287,14 +467,10 @@ class SettingsService:
         """
         for key, config in DEFAULT_SETTINGS.items():
             # Check if system default exists
-            existing = self.db.query(Settings).filter(
-                Settings.key == key,
-                Settings.org_id.is_(None),
-                Settings.user_id.is_(None)
-            ).first()
+            existing = await self._first(self._scoped_query(key, None, None))
 
             if not existing:
-                self.set_setting(
+                await self.set_setting(
                     key=key,
                     value=config["value"],
                     value_type=config["type"],
@@ -302,9 +478,23 @@ class SettingsService:
                 )
                 logger.info(f"Initialized system default: {key} = {config['value']}")
 
-    def get_or_create_default_org(self) -> Organization:
+    async def get_default_scope(self) -> Tuple[int, int]:
+        """
+        Get (org_id, user_id) of the MVP default organization and user.
+
+        Cached per process after the first lookup, so callers resolving
+        settings for the default user skip both queries.
+        """
+        state = get_settings_cache().for_bind(self.db.get_bind())
+        if state.default_scope is None:
+            org = await self.get_or_create_default_org()
+            user = await self.get_or_create_default_user(org.id)
+            state.default_scope = (org.id, user.id)
+        return state.default_scope
+
+    async def get_or_create_default_org(self) -> Organization:
         """Get or create the default organization for MVP."""
-        org = self.db.query(Organization).filter(Organization.slug == "default").first()
+        org = await self._first(select(Organization).where(Organization.slug == "default"))
 
         if not org:
             org = Organization(
@@ -313,15 +503,15 @@ class SettingsService:
                 is_active=True
             )
             self.db.add(org)
-            self.db.commit()
-            self.db.refresh(org)
+            await db_commit(self.db)
+            await db_refresh(self.db, org)
             logger.info("Created default organization")
 
         return org
 
-    def get_or_create_default_user(self, org_id: int) -> User:
+    async def get_or_create_default_user(self, org_id: int) -> User:
         """Get or create the default user for MVP."""
-        user = self.db.query(User).filter(User.email == "default@paperbase.local").first()
+        user = await self._first(select(User).where(User.email == "default@paperbase.local"))
 
         if not user:
             user = User(
@@ -332,8 +522,8 @@ class SettingsService:
                 is_admin=True
             )
             self.db.add(user)
-            self.db.commit()
-            self.db.refresh(user)
+            await db_commit(self.db)
+            await db_refresh(self.db, user)
             logger.info("Created default user")
 
         return user
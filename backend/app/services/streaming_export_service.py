@@ -0,0 +1,446 @@
+"""
+Streaming Export Service - constant-memory CSV / NDJSON / JSON / Excel exports
+
+The in-memory ExportService path loads every document, builds a list of
+records, a pandas DataFrame and the full file before responding. This module
+walks documents in batches with a server-side cursor (``yield_per``) and
+emits output as it goes:
+
+- CSV / NDJSON / JSON arrays are yielded as text chunks per batch
+- Excel is written with openpyxl write-only mode into a temp file; complex
+  field sheets (tables, arrays of objects) are appended to row by row in the
+  same pass and the finished file is streamed back in chunks
+
+Column headers are resolved up front with small SQL queries (distinct field
+names, plus the keys used by complex fields) so no pass needs the whole
+result set in memory.
+"""
+import csv
+import io
+import json
+import logging
+import tempfile
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+from sqlalchemy import and_, exists, func, or_, select
+from sqlalchemy.orm import Session, load_only, selectinload
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.document import Document, ExtractedField
+
+logger = logging.getLogger(__name__)
+
+COMPLEX_FIELD_TYPES = ("array", "table", "array_of_objects")
+BASE_COLUMNS = ["document_id", "filename", "status", "uploaded_at", "processed_at"]
+LONG_FORMAT_COLUMNS = BASE_COLUMNS + [
+    "field_name", "field_type", "extracted_value", "verified_value", "final_value",
+    "confidence_score", "verified", "verified_at", "needs_verification"
+]
+EXCEL_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+class ExportFilters:
+    """Document filters shared by every streaming export (mirrors ExportService.build_export_query)."""
+
+    def __init__(
+        self,
+        template_id: Optional[int] = None,
+        schema_id: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        confidence_min: float = 0.0,
+        verified_only: bool = False,
+        status: Optional[str] = None,
+        document_ids: Optional[List[int]] = None
+    ):
+        self.template_id = template_id
+        self.schema_id = schema_id
+        self.date_from = date_from
+        self.date_to = date_to
+        self.confidence_min = confidence_min
+        self.verified_only = verified_only
+        self.status = status
+        self.document_ids = document_ids
+
+    def conditions(self) -> list:
+        """
+        WHERE conditions on Document.
+
+        Uses EXISTS instead of JOIN + DISTINCT: same rows, no de-duplication
+        sort, and no DISTINCT over Document's JSON columns.
+        """
+        conditions = []
+
+        if self.template_id:
+            conditions.append(or_(
+                Document.suggested_template_id == self.template_id,
+                Document.schema_id == self.template_id
+            ))
+        if self.schema_id:
+            conditions.append(Document.schema_id == self.schema_id)
+        if self.date_from:
+            conditions.append(Document.uploaded_at >= datetime.combine(self.date_from, datetime.min.time()))
+        if self.date_to:
+            conditions.append(Document.uploaded_at <= datetime.combine(self.date_to, datetime.max.time()))
+        if self.status:
+            conditions.append(Document.status == self.status)
+        if self.document_ids:
+            conditions.append(Document.id.in_(self.document_ids))
+
+        field_conditions = [ExtractedField.document_id == Document.id]
+        if self.confidence_min > 0:
+            field_conditions.append(ExtractedField.confidence_score >= self.confidence_min)
+        if self.verified_only:
+            field_conditions.append(ExtractedField.verified == True)  # noqa: E712
+        conditions.append(exists().where(and_(*field_conditions)))
+
+        return conditions
+
+    def document_ids_select(self):
+        return select(Document.id).where(*self.conditions())
+
+
+def _field_value(field: ExtractedField) -> Any:
+    """Final value of a field (verified value wins), as in documents_to_records."""
+    if field.field_type in COMPLEX_FIELD_TYPES:
+        if field.verified and field.verified_value_json:
+            return field.verified_value_json
+        return field.field_value_json
+    return field.verified_value if field.verified else field.field_value
+
+
+def _cell_value(value: Any) -> Any:
+    """Flatten lists/dicts to JSON strings for CSV/Excel cells."""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+class StreamingExportService:
+    """Batch-at-a-time exports that never hold the full result set in memory."""
+
+    def __init__(
+        self,
+        filters: ExportFilters,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: Optional[int] = None,
+        db: Optional[Session] = None
+    ):
+        """
+        Initialize streaming exporter.
+
+        Args:
+            filters: Which documents to export
+            session_factory: Creates the session used while streaming (the
+                request-scoped session may be closed before the body is sent)
+            batch_size: Documents fetched per round trip (default: EXPORT_BATCH_SIZE)
+            db: Existing session to use instead (owned by the caller, not closed)
+        """
+        self.filters = filters
+        self.session_factory = session_factory
+        self.db = db
+        self.batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+
+    # ------------------------------------------------------------------
+    # Query helpers
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _session(self) -> Iterator[Session]:
+        if self.db is not None:
+            yield self.db
+            return
+        db = self.session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def has_documents(self, db: Session) -> bool:
+        return db.execute(self.filters.document_ids_select().limit(1)).first() is not None
+
+    def iter_documents(self, db: Session) -> Iterator[List[Document]]:
+        """
+        Yield batches of documents with their extracted fields.
+
+        Uses a server-side cursor (``yield_per``) and loads only the columns
+        the export needs; parse results and other large JSON stay in the DB.
+        """
+        stmt = (
+            select(Document)
+            .where(*self.filters.conditions())
+            .options(
+                load_only(
+                    Document.id, Document.filename, Document.status,
+                    Document.uploaded_at, Document.processed_at
+                ),
+                selectinload(Document.extracted_fields)
+            )
+            .order_by(Document.id)
+            .execution_options(yield_per=self.batch_size)
+        )
+        for partition in db.execute(stmt).scalars().partitions():
+            yield partition
+            # Drop the batch from the identity map so memory stays flat
+            for document in partition:
+                db.expunge(document)
+
+    def field_columns(self, db: Session) -> List[str]:
+        """Distinct field names across the export, in first-extracted order."""
+        stmt = (
+            select(ExtractedField.field_name)
+            .where(ExtractedField.document_id.in_(self.filters.document_ids_select()))
+            .group_by(ExtractedField.field_name)
+            .order_by(func.min(ExtractedField.id))
+        )
+        return [row[0] for row in db.execute(stmt)]
+
+    def complex_field_columns(self, db: Session) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Sheet columns for table / array_of_objects fields.
+
+        Streams only the complex field values and keeps the key order seen,
+        so headers are known before any sheet row is written.
+
+        Returns:
+            {"table": {field_name: [columns]}, "array_of_objects": {field_name: [columns]}}
+        """
+        stmt = (
+            select(
+                ExtractedField.field_name, ExtractedField.field_type, ExtractedField.verified,
+                ExtractedField.verified_value_json, ExtractedField.field_value_json
+            )
+            .where(
+                ExtractedField.field_type.in_(["table", "array_of_objects"]),
+                ExtractedField.document_id.in_(self.filters.document_ids_select())
+            )
+            .order_by(ExtractedField.id)
+            .execution_options(yield_per=self.batch_size)
+        )
+        columns: Dict[str, Dict[str, "OrderedDict[str, None]"]] = {"table": {}, "array_of_objects": {}}
+        for name, field_type, verified, verified_json, value_json in db.execute(stmt):
+            value = verified_json if verified and verified_json else value_json
+            keys = columns[field_type].setdefault(name, OrderedDict())
+            for row in self._complex_rows(field_type, value):
+                for key in row:
+                    keys.setdefault(key, None)
+
+        return {
+            field_type: {name: list(keys) for name, keys in fields.items() if keys}
+            for field_type, fields in columns.items()
+        }
+
+    @staticmethod
+    def _complex_rows(field_type: str, value: Any) -> List[Dict[str, Any]]:
+        """Sheet rows for a complex value (same rules as _create_table_sheet/_create_array_of_objects_sheet)."""
+        if field_type == "table":
+            if not value or not isinstance(value, dict):
+                return []
+            rows = value.get("rows", [])
+            if not isinstance(rows, list):
+                return []
+        else:
+            if not value or not isinstance(value, list):
+                return []
+            rows = value
+        return [row for row in rows if isinstance(row, dict)]
+
+    # ------------------------------------------------------------------
+    # Record builders
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _base_record(doc: Document) -> Dict[str, Any]:
+        return {
+            "document_id": doc.id,
+            "filename": doc.filename,
+            "status": doc.status,
+            "uploaded_at": _isoformat(doc.uploaded_at),
+            "processed_at": _isoformat(doc.processed_at),
+        }
+
+    @staticmethod
+    def wide_record(doc: Document) -> Dict[str, Any]:
+        """One row per document (same shape as ExportService.documents_to_records)."""
+        record = StreamingExportService._base_record(doc)
+        for field in doc.extracted_fields:
+            record[field.field_name] = _field_value(field)
+            record[f"{field.field_name}_confidence"] = field.confidence_score
+            record[f"{field.field_name}_verified"] = field.verified
+        return record
+
+    @staticmethod
+    def long_records(doc: Document) -> Iterator[Dict[str, Any]]:
+        """One row per field (same shape as ExportService.documents_to_long_format)."""
+        base = StreamingExportService._base_record(doc)
+        for field in doc.extracted_fields:
+            if field.field_type in COMPLEX_FIELD_TYPES:
+                extracted_value, verified_value = field.field_value_json, field.verified_value_json
+            else:
+                extracted_value, verified_value = field.field_value, field.verified_value
+            yield {
+                **base,
+                "field_name": field.field_name,
+                "field_type": field.field_type or "text",
+                "extracted_value": extracted_value,
+                "verified_value": verified_value,
+                "final_value": verified_value if field.verified else extracted_value,
+                "confidence_score": field.confidence_score,
+                "verified": field.verified,
+                "verified_at": _isoformat(field.verified_at),
+                "needs_verification": field.needs_verification,
+            }
+
+    def _iter_records(self, db: Session, format_type: str) -> Iterator[List[Dict[str, Any]]]:
+        for batch in self.iter_documents(db):
+            if format_type == "long":
+                yield [record for doc in batch for record in self.long_records(doc)]
+            else:
+                yield [self.wide_record(doc) for doc in batch]
+
+    def _columns(self, db: Session, format_type: str, include_metadata: bool) -> List[str]:
+        if format_type == "long":
+            return list(LONG_FORMAT_COLUMNS)
+        columns = list(BASE_COLUMNS)
+        for name in self.field_columns(db):
+            columns.append(name)
+            if include_metadata:
+                columns += [f"{name}_confidence", f"{name}_verified"]
+        return columns
+
+    # ------------------------------------------------------------------
+    # Text formats
+    # ------------------------------------------------------------------
+
+    def stream_csv(self, include_metadata: bool = True, format_type: str = "wide") -> Iterator[bytes]:
+        """Yield CSV bytes, one chunk per document batch."""
+        with self._session() as db:
+            columns = self._columns(db, format_type, include_metadata)
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+            writer.writeheader()
+            yield buffer.getvalue().encode("utf-8")
+
+            for records in self._iter_records(db, format_type):
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows({key: _cell_value(value) for key, value in record.items()} for record in records)
+                yield buffer.getvalue().encode("utf-8")
+
+    def stream_ndjson(self, format_type: str = "wide") -> Iterator[bytes]:
+        """Yield JSON Lines (one record per line)."""
+        with self._session() as db:
+            for records in self._iter_records(db, format_type):
+                yield "".join(json.dumps(record, default=str) + "\n" for record in records).encode("utf-8")
+
+    def stream_json_array(self, pretty: bool = False, format_type: str = "wide") -> Iterator[bytes]:
+        """Yield a JSON array incrementally ("[", records separated by commas, "]")."""
+        indent = 2 if pretty else None
+        separator = ",\n" if pretty else ","
+        with self._session() as db:
+            yield b"[\n" if pretty else b"["
+            first = True
+            for records in self._iter_records(db, format_type):
+                chunk = separator.join(json.dumps(record, indent=indent, default=str) for record in records)
+                if not chunk:
+                    continue
+                yield ((separator if not first else "") + chunk).encode("utf-8")
+                first = False
+            yield b"\n]" if pretty else b"]"
+
+    # ------------------------------------------------------------------
+    # Excel
+    # ------------------------------------------------------------------
+
+    def write_excel(
+        self,
+        output,
+        include_metadata: bool = True,
+        sheet_name: str = "Extracted Data",
+        expand_complex_fields: bool = True,
+        format_type: str = "wide"
+    ) -> None:
+        """
+        Write an .xlsx workbook to ``output`` (path or binary file) in write-only mode.
+
+        The main sheet and every complex-field sheet are appended to as each
+        document batch arrives; openpyxl spools rows to temp files instead of
+        keeping cell objects in memory.
+        """
+        with self._session() as db:
+            workbook = Workbook(write_only=True)
+            columns = self._columns(db, format_type, include_metadata)
+            main_sheet = self._create_sheet(workbook, sheet_name, columns)
+
+            # (field_type, field_name) -> (sheet, columns)
+            complex_sheets: Dict[tuple, Any] = {}
+            if expand_complex_fields:
+                complex_columns = self.complex_field_columns(db)
+                for field_type, suffix in (("table", "table"), ("array_of_objects", "items")):
+                    for field_name, field_columns in complex_columns[field_type].items():
+                        # Sanitize sheet name (Excel limit: 31 chars including the suffix, no special chars)
+                        base_length = 31 - len(suffix) - 1
+                        sheet_name_clean = field_name[:base_length].replace('/', '_').replace('\\', '_')
+                        sheet_columns = ["document_id", "filename"] + [
+                            column for column in field_columns if column not in ("document_id", "filename")
+                        ]
+                        complex_sheets[(field_type, field_name)] = (
+                            self._create_sheet(workbook, f"{sheet_name_clean}_{suffix}", sheet_columns),
+                            sheet_columns
+                        )
+
+            for batch in self.iter_documents(db):
+                for doc in batch:
+                    records = self.long_records(doc) if format_type == "long" else [self.wide_record(doc)]
+                    for record in records:
+                        main_sheet.append([_cell_value(record.get(column)) for column in columns])
+
+                    for field in doc.extracted_fields:
+                        sheet_info = complex_sheets.get((field.field_type, field.field_name))
+                        if not sheet_info:
+                            continue
+                        sheet, sheet_columns = sheet_info
+                        for item in self._complex_rows(field.field_type, _field_value(field)):
+                            row = {"document_id": doc.id, "filename": doc.filename, **item}
+                            sheet.append([_cell_value(row.get(column)) for column in sheet_columns])
+
+            workbook.save(output)
+
+    @staticmethod
+    def _create_sheet(workbook: Workbook, title: str, columns: List[str]):
+        sheet = workbook.create_sheet(title=title)
+        # Column widths must be set before the first row in write-only mode;
+        # size from the header since data widths are unknown until the end.
+        for index, column in enumerate(columns, start=1):
+            sheet.column_dimensions[get_column_letter(index)].width = min(max(len(str(column)) + 2, 12), 50)
+        header = []
+        for column in columns:
+            cell = WriteOnlyCell(sheet, value=column)
+            cell.font = Font(bold=True)
+            header.append(cell)
+        sheet.append(header)
+        return sheet
+
+    def stream_excel(self, **kwargs) -> Iterator[bytes]:
+        """Build the workbook in a temp file, then yield it in chunks."""
+        with tempfile.TemporaryFile() as spool:
+            self.write_excel(spool, **kwargs)
+            spool.seek(0)
+            while True:
+                chunk = spool.read(FILE_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
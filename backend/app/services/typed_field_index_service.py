@@ -0,0 +1,398 @@
+"""
+Typed expression indexes for hot numeric/date fields in document_search_index.
+
+Range filters and numeric aggregations read extracted_fields->>'field' and
+cast it per row, which the GIN index on extracted_fields cannot serve. This
+module maintains B-tree indexes on
+
+    pb_try_numeric(extracted_fields ->> 'amount')
+    pb_try_timestamp(extracted_fields ->> 'invoice_date')
+
+for fields that are typed number/date in Schema.fields and show up in range
+filters and aggregations (QueryCache) or questions (QueryHistory). Query
+builders call numeric_field_expr()/timestamp_field_expr(), which emit the
+indexed expression for fields with an active index and a plain cast
+otherwise, so indexes are picked up without touching call sites.
+"""
+
+import hashlib
+import logging
+import re
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import TIMESTAMP, Float, String, Text, bindparam, cast, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import AnySession
+from app.models.query_history import QueryHistory
+from app.models.query_pattern import QueryCache
+from app.models.schema import Schema
+from app.models.search_index import DocumentSearchIndex, TypedFieldIndex
+
+logger = logging.getLogger(__name__)
+
+NUMERIC_FIELD_TYPES = {"number", "integer", "float", "decimal", "currency"}
+DATE_FIELD_TYPES = {"date", "datetime"}
+
+# ES aggregation types that read a field numerically / as a date
+NUMERIC_AGG_TYPES = {"stats", "extended_stats", "avg", "sum", "min", "max", "range", "percentiles", "histogram"}
+DATE_AGG_TYPES = {"date_histogram", "date_range"}
+
+HISTORY_WINDOW_DAYS = 30
+HISTORY_SAMPLE_SIZE = 2000
+
+# Casts that return NULL instead of failing on values that are not numbers/dates.
+# Plain SQL with a regex guard rather than plpgsql with an exception block: an
+# exception block opens a subtransaction per call, which is slow on full scans
+# and not allowed in parallel workers. Dates are checked down to the day of the
+# month so the cast cannot raise. Declared IMMUTABLE so they can back an index
+# (timestamp input parsing depends on DateStyle; extracted dates are normalized
+# to ISO 8601).
+NUMERIC_TEXT_REGEX = r"^\s*[-+]?(\d{1,200}(\.\d{0,200})?|\.\d{1,200})([eE][-+]?\d{1,2})?\s*$"
+TIMESTAMP_TEXT_REGEX = (
+    r"^ *[1-9]\d{3}-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])"
+    r"([ T]([01]\d|2[0-3]):[0-5]\d(:[0-5]\d(\.\d{1,6})?)?(Z|[+-](0\d|1[0-5])(:?[0-5]\d)?)?)? *$"
+)
+
+TYPED_FUNCTIONS_SQL = [
+    f"""
+    CREATE OR REPLACE FUNCTION pb_try_numeric(value text) RETURNS double precision
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+        SELECT CASE WHEN value ~ '{NUMERIC_TEXT_REGEX}' THEN value::double precision END
+    $$
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION pb_try_timestamp(value text) RETURNS timestamp
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+        SELECT CASE WHEN value ~ '{TIMESTAMP_TEXT_REGEX}' THEN
+            CASE WHEN substr(btrim(value), 9, 2)::int <= extract(day FROM
+                make_date(substr(btrim(value), 1, 4)::int, substr(btrim(value), 6, 2)::int, 1)
+                + interval '1 month' - interval '1 day'
+            ) THEN value::timestamp END
+        END
+    $$
+    """,
+]
+
+TYPED_FUNCTIONS = {"numeric": "pb_try_numeric", "date": "pb_try_timestamp"}
+
+
+def _field_text(field: str):
+    """
+    extracted_fields ->> 'field' with the key rendered inline.
+
+    The key must be a literal (not a server-side parameter) for the planner
+    to match the expression against an index definition.
+    """
+    return DocumentSearchIndex.extracted_fields.op("->>", return_type=Text)(
+        bindparam(None, field, type_=String, literal_execute=True)
+    )
+
+
+class TypedFieldRegistry:
+    """
+    Process-level snapshot of fields with an active typed index.
+
+    Reloaded by query builders at most every ttl_seconds, and immediately in
+    the process that creates or drops an index.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.fields: Set[Tuple[str, str]] = set()
+        self.loaded_at: Optional[float] = None
+
+    def is_stale(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at >= self.ttl_seconds
+
+    def set_fields(self, fields: Set[Tuple[str, str]]) -> None:
+        self.fields = set(fields)
+        self.loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        self.loaded_at = None
+
+    async def refresh_if_stale(self, db: AnySession) -> None:
+        """
+        Reload active indexes when the snapshot is older than the TTL.
+
+        Runs in a savepoint so a missing typed_field_indexes table (migration
+        not applied) cannot abort the caller's transaction.
+        """
+        if not self.is_stale():
+            return
+
+        stmt = select(TypedFieldIndex.field_name, TypedFieldIndex.value_type).where(
+            TypedFieldIndex.status == "active"
+        )
+        try:
+            if isinstance(db, AsyncSession):
+                async with db.begin_nested():
+                    rows = (await db.execute(stmt)).all()
+            else:
+                with db.begin_nested():
+                    rows = db.execute(stmt).all()
+        except Exception as e:
+            logger.warning(f"Could not load typed field indexes, using plain casts: {e}")
+            rows = []
+
+        self.set_fields(set(rows))
+
+    def numeric(self, field: str):
+        """Numeric value of an extracted field (indexed expression when available)."""
+        if (field, "numeric") in self.fields:
+            return func.pb_try_numeric(_field_text(field))
+        return cast(DocumentSearchIndex.extracted_fields[field].astext, Float)
+
+    def timestamp(self, field: str):
+        """Timestamp value of an extracted field (indexed expression when available)."""
+        if (field, "date") in self.fields:
+            return func.pb_try_timestamp(_field_text(field))
+        return cast(DocumentSearchIndex.extracted_fields[field].astext, TIMESTAMP)
+
+    def is_date(self, field: str) -> bool:
+        return (field, "date") in self.fields
+
+
+_typed_field_registry: Optional[TypedFieldRegistry] = None
+
+
+def get_typed_field_registry() -> TypedFieldRegistry:
+    """Get the process-wide typed field registry"""
+    global _typed_field_registry
+    if _typed_field_registry is None:
+        _typed_field_registry = TypedFieldRegistry(ttl_seconds=settings.TYPED_FIELD_REGISTRY_TTL_SECONDS)
+    return _typed_field_registry
+
+
+def numeric_field_expr(field: str):
+    return get_typed_field_registry().numeric(field)
+
+
+def timestamp_field_expr(field: str):
+    return get_typed_field_registry().timestamp(field)
+
+
+def typed_index_name(field: str, value_type: str) -> str:
+    """Deterministic, Postgres-safe (<= 63 chars) index name for a field."""
+    slug = re.sub(r"[^a-z0-9]+", "_", field.lower()).strip("_")[:36] or "field"
+    digest = hashlib.sha1(f"{field}:{value_type}".encode()).hexdigest()[:8]
+    prefix = "num" if value_type == "numeric" else "date"
+    return f"ix_dsi_{prefix}_{slug}_{digest}"
+
+
+def typed_index_ddl(field: str, value_type: str, index_name: str) -> str:
+    literal = field.replace("'", "''")
+    function = TYPED_FUNCTIONS[value_type]
+    return (
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} "
+        f"ON document_search_index ({function}(extracted_fields ->> '{literal}'))"
+    )
+
+
+def iter_typed_field_usage(es_query: Any) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Yield (field, value_type) for range clauses and numeric/date aggregations in an ES query.
+
+    value_type is "date" for date aggregations, None when only the query
+    shape is known (range filters work on both numbers and dates).
+    """
+    if isinstance(es_query, list):
+        for item in es_query:
+            yield from iter_typed_field_usage(item)
+        return
+    if not isinstance(es_query, dict):
+        return
+
+    for key, value in es_query.items():
+        if key in NUMERIC_AGG_TYPES | DATE_AGG_TYPES and isinstance(value, dict) and "field" in value:
+            yield value["field"].replace(".keyword", ""), "date" if key in DATE_AGG_TYPES else "numeric"
+        elif key == "range" and isinstance(value, dict):
+            for field, bounds in value.items():
+                if isinstance(bounds, dict):
+                    yield field.replace(".keyword", ""), None
+        else:
+            yield from iter_typed_field_usage(value)
+
+
+class TypedFieldIndexService:
+    """
+    Recommend, create and drop typed expression indexes.
+
+    Index DDL runs with CREATE/DROP INDEX CONCURRENTLY on an autocommit
+    connection so document writes are never blocked; use a sync Session.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def list_indexes(self) -> List[TypedFieldIndex]:
+        return self.db.query(TypedFieldIndex).order_by(
+            TypedFieldIndex.field_name, TypedFieldIndex.value_type
+        ).all()
+
+    def schema_field_types(self) -> Dict[str, str]:
+        """field name -> "numeric" | "date" for every typed field in any template."""
+        field_types: Dict[str, str] = {}
+        for (fields,) in self.db.query(Schema.fields).all():
+            for field_def in fields or []:
+                field_type = (field_def.get("type") or "").lower()
+                if field_type in NUMERIC_FIELD_TYPES:
+                    field_types.setdefault(field_def["name"], "numeric")
+                elif field_type in DATE_FIELD_TYPES:
+                    field_types.setdefault(field_def["name"], "date")
+        return field_types
+
+    def usage_scores(self, field_types: Dict[str, str]) -> Counter:
+        """
+        Score typed fields by how often queries filter or aggregate on them.
+
+        QueryCache entries count once per hit (range/aggregation on the field);
+        recent QueryHistory questions count once per mention of the field name.
+        """
+        scores: Counter = Counter()
+
+        for es_query, hit_count in self.db.query(QueryCache.es_query, QueryCache.hit_count).all():
+            for field, _ in set(iter_typed_field_usage(es_query)):
+                if field in field_types:
+                    scores[field] += 1 + (hit_count or 0)
+
+        since = datetime.utcnow() - timedelta(days=HISTORY_WINDOW_DAYS)
+        questions = [
+            query_text.lower()
+            for (query_text,) in self.db.query(QueryHistory.query_text).filter(
+                QueryHistory.created_at >= since
+            ).order_by(QueryHistory.created_at.desc()).limit(HISTORY_SAMPLE_SIZE)
+        ]
+        patterns = {
+            field: re.compile(r"\b" + re.escape(field.lower()).replace("_", "[ _]") + r"\b")
+            for field in field_types
+        }
+        for question in questions:
+            for field, pattern in patterns.items():
+                if pattern.search(question):
+                    scores[field] += 1
+
+        return scores
+
+    def recommend(self, min_score: Optional[int] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Typed fields worth indexing, highest usage first.
+
+        Returns:
+            [{"field_name", "value_type", "score", "index_name", "exists"}]
+        """
+        min_score = settings.TYPED_FIELD_INDEX_MIN_SCORE if min_score is None else min_score
+        limit = settings.TYPED_FIELD_INDEX_MAX if limit is None else limit
+
+        field_types = self.schema_field_types()
+        scores = self.usage_scores(field_types)
+        existing = {(i.field_name, i.value_type) for i in self.list_indexes() if i.status != "failed"}
+
+        ranked = sorted(
+            (field for field, score in scores.items() if score >= min_score),
+            key=lambda field: (-scores[field], field)
+        )[:limit]
+        return [
+            {
+                "field_name": field,
+                "value_type": field_types[field],
+                "score": scores[field],
+                "index_name": typed_index_name(field, field_types[field]),
+                "exists": (field, field_types[field]) in existing,
+            }
+            for field in ranked
+        ]
+
+    def register_index(self, field: str, value_type: str, source: str = "manual", usage_score: int = 0) -> TypedFieldIndex:
+        """Record a pending index (built by build_index, usually from a background job)."""
+        if value_type not in TYPED_FUNCTIONS:
+            raise ValueError(f"Unknown value type '{value_type}' (expected one of {list(TYPED_FUNCTIONS)})")
+
+        index = self.db.query(TypedFieldIndex).filter(
+            TypedFieldIndex.field_name == field,
+            TypedFieldIndex.value_type == value_type
+        ).first()
+        if index is None:
+            index = TypedFieldIndex(
+                field_name=field,
+                value_type=value_type,
+                index_name=typed_index_name(field, value_type),
+                status="pending",
+                source=source,
+                usage_score=usage_score
+            )
+            self.db.add(index)
+        elif index.status == "failed":
+            index.status = "pending"
+            index.error = None
+        index.usage_score = max(index.usage_score or 0, usage_score)
+        self.db.commit()
+        self.db.refresh(index)
+        return index
+
+    def _run_ddl(self, statements: List[str]) -> None:
+        with self.db.get_bind().connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for statement in statements:
+                conn.execute(text(statement))
+
+    def build_index(self, index: TypedFieldIndex) -> TypedFieldIndex:
+        """Create the expression index concurrently and mark it active (or failed)."""
+        try:
+            self._run_ddl(TYPED_FUNCTIONS_SQL + [typed_index_ddl(index.field_name, index.value_type, index.index_name)])
+        except Exception as e:
+            logger.error(f"Failed to build typed index {index.index_name}: {e}")
+            # A failed CONCURRENTLY build leaves an INVALID index behind
+            try:
+                self._run_ddl([f"DROP INDEX CONCURRENTLY IF EXISTS {index.index_name}"])
+            except Exception:
+                pass
+            index.status = "failed"
+            index.error = str(e)[:2000]
+        else:
+            index.status = "active"
+            index.error = None
+            index.built_at = datetime.utcnow()
+            logger.info(f"✅ Typed index {index.index_name} ready ({index.value_type} {index.field_name})")
+        self.db.commit()
+        get_typed_field_registry().invalidate()
+        return index
+
+    def drop_index(self, field: str, value_type: str) -> bool:
+        index = self.db.query(TypedFieldIndex).filter(
+            TypedFieldIndex.field_name == field,
+            TypedFieldIndex.value_type == value_type
+        ).first()
+        if index is None:
+            return False
+
+        # Stop emitting the indexed expression before the index disappears
+        index.status = "pending"
+        self.db.commit()
+        get_typed_field_registry().invalidate()
+
+        self._run_ddl([f"DROP INDEX CONCURRENTLY IF EXISTS {index.index_name}"])
+        self.db.delete(index)
+        self.db.commit()
+        return True
+
+    def sync(self) -> List[TypedFieldIndex]:
+        """Register and build indexes for recommended fields that do not have one yet."""
+        built = []
+        for recommendation in self.recommend():
+            if recommendation["exists"]:
+                continue
+            index = self.register_index(
+                recommendation["field_name"],
+                recommendation["value_type"],
+                source="auto",
+                usage_score=recommendation["score"]
+            )
+            built.append(self.build_index(index))
+        return built
+
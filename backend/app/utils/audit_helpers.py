@@ -8,10 +8,13 @@ audit URLs for use in AI answer citations and MCP responses.
 import logging
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import and_
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, false, func, select
+from sqlalchemy.orm import contains_eager, joinedload, load_only
 
-from app.models.document import Document, ExtractedField
+from app.core.database import AnySession, db_execute
+from app.models.document import AUDIT_PRIORITY_LABELS, Document, ExtractedField
+from app.models.physical_file import PhysicalFile
+from app.models.schema import Schema
 from app.services.settings_service import SettingsService
 
 logger = logging.getLogger(__name__)
@@ -19,7 +22,7 @@ logger = logging.getLogger(__name__)
 
 async def get_low_confidence_fields_for_documents(
     document_ids: List[int],
-    db: Session,
+    db: AnySession,
     confidence_threshold: Optional[float] = None,
     include_verified: bool = False,
     field_names: Optional[List[str]] = None
@@ -71,17 +74,19 @@ async def get_low_confidence_fields_for_documents(
     # Get confidence threshold from settings if not provided
     if confidence_threshold is None:
         settings_service = SettingsService(db)
-        org = settings_service.get_or_create_default_org()
-        user = settings_service.get_or_create_default_user(org.id)
-        confidence_threshold = settings_service.get_setting(
+        org_id, user_id = await settings_service.get_default_scope()
+        confidence_threshold = await settings_service.get_setting(
             key="review_threshold",
-            user_id=user.id,
-            org_id=org.id,
+            user_id=user_id,
+            org_id=org_id,
             default=0.6
         )
 
-    # Build query for low-confidence fields
-    query = db.query(ExtractedField).join(Document).filter(
+    # Build query for low-confidence fields (document + physical file eager-loaded
+    # so the loop below never lazy-loads, which an AsyncSession cannot do)
+    query = select(ExtractedField).join(Document).options(
+        contains_eager(ExtractedField.document).selectinload(Document.physical_file)
+    ).where(
         and_(
             ExtractedField.document_id.in_(document_ids),
             ExtractedField.confidence_score < confidence_threshold
@@ -90,15 +95,15 @@ async def get_low_confidence_fields_for_documents(
 
     # Filter out verified fields unless explicitly requested
     if not include_verified:
-        query = query.filter(ExtractedField.verified == False)
+        query = query.where(ExtractedField.verified == False)
 
     # Filter by specific field names if provided (OPTIMIZATION: filter in SQL, not Python)
     if field_names:
-        query = query.filter(ExtractedField.field_name.in_(field_names))
+        query = query.where(ExtractedField.field_name.in_(field_names))
         logger.info(f"Filtering audit fields to {len(field_names)} query-relevant fields: {field_names}")
 
     # Execute query
-    low_confidence_fields = query.all()
+    low_confidence_fields = (await db_execute(db, query)).scalars().all()
 
     logger.info(
         f"Found {len(low_confidence_fields)} low-confidence fields "
@@ -148,7 +153,7 @@ async def get_low_confidence_fields_for_documents(
 
 async def get_confidence_summary(
     document_ids: List[int],
-    db: Session,
+    db: AnySession,
     high_threshold: float = 0.8,
     medium_threshold: float = 0.6
 ) -> Dict[str, Any]:
@@ -185,12 +190,21 @@ async def get_confidence_summary(
             "audit_recommended": False
         }
 
-    # Get all fields for these documents
-    fields = db.query(ExtractedField).filter(
-        ExtractedField.document_id.in_(document_ids)
-    ).all()
-
-    if not fields:
+    # Aggregate in SQL instead of loading every field row
+    confidence = ExtractedField.confidence_score
+    stats = (await db_execute(db, select(
+        func.count(ExtractedField.id).label("total"),
+        func.count(ExtractedField.id).filter(confidence >= high_threshold).label("high"),
+        func.count(ExtractedField.id).filter(
+            and_(confidence >= medium_threshold, confidence < high_threshold)
+        ).label("medium"),
+        func.count(ExtractedField.id).filter(confidence < medium_threshold).label("low"),
+        func.sum(func.coalesce(confidence, 0.0)).label("confidence_sum"),
+    ).where(ExtractedField.document_id.in_(document_ids)))).one()
+
+    total = stats.total or 0
+
+    if not total:
         return {
             "high_confidence_count": 0,
             "medium_confidence_count": 0,
@@ -200,16 +214,10 @@ async def get_confidence_summary(
             "audit_recommended": False
         }
 
-    # Calculate statistics
-    high_count = sum(1 for f in fields if f.confidence_score >= high_threshold)
-    medium_count = sum(
-        1 for f in fields
-        if medium_threshold <= f.confidence_score < high_threshold
-    )
-    low_count = sum(1 for f in fields if f.confidence_score < medium_threshold)
-
-    total = len(fields)
-    avg_confidence = sum(f.confidence_score or 0.0 for f in fields) / total if total > 0 else 0.0
+    high_count = stats.high or 0
+    medium_count = stats.medium or 0
+    low_count = stats.low or 0
+    avg_confidence = float(stats.confidence_sum or 0.0) / total
 
     return {
         "high_confidence_count": high_count,
@@ -221,6 +229,132 @@ async def get_confidence_summary(
     }
 
 
+def audit_queue_conditions(
+    template_id: Optional[int] = None,
+    priority: Optional[str] = None,
+    min_confidence: float = 0.0,
+    max_confidence: float = 1.0,
+    include_validation_errors: bool = True
+) -> list:
+    """
+    Build WHERE conditions for the audit queue (unverified fields joined to Document).
+
+    Priority is matched on the stored audit_priority_level column so the
+    partial index ix_extracted_fields_audit_queue serves the filter and sort.
+
+    Args:
+        template_id: Only fields of documents with this schema
+        priority: critical, high, medium or low (unknown labels match nothing)
+        min_confidence: Lower confidence bound (inclusive)
+        max_confidence: Upper confidence bound (inclusive)
+        include_validation_errors: If False, drop fields with validation errors/warnings
+
+    Returns:
+        List of SQLAlchemy conditions
+    """
+    conditions = [
+        ExtractedField.verified == False,
+        ExtractedField.confidence_score >= min_confidence,
+        ExtractedField.confidence_score <= max_confidence,
+    ]
+
+    if template_id:
+        conditions.append(Document.schema_id == template_id)
+
+    if priority:
+        levels = {label: level for level, label in AUDIT_PRIORITY_LABELS.items()}
+        level = levels.get(priority)
+        conditions.append(ExtractedField.audit_priority_level == level if level is not None else false())
+
+    if not include_validation_errors:
+        conditions.append(ExtractedField.validation_status.notin_(["error", "warning"]))
+
+    return conditions
+
+
+async def get_audit_queue_counts(db: AnySession, conditions: list) -> Dict[str, Any]:
+    """
+    Count audit queue fields per priority with a single GROUP BY.
+
+    Args:
+        db: Database session
+        conditions: Output of audit_queue_conditions()
+
+    Returns:
+        {
+            "total": 42,
+            "priority_counts": {"critical": 3, "high": 10, "medium": 20, "low": 9},
+            "total_with_validation_errors": 5,
+            "total_low_confidence": 13
+        }
+    """
+    rows = (await db_execute(db, select(
+        ExtractedField.audit_priority_level,
+        func.count(ExtractedField.id),
+        func.count(ExtractedField.id).filter(ExtractedField.validation_status.in_(["error", "warning"])),
+        func.count(ExtractedField.id).filter(ExtractedField.confidence_score < 0.6),
+    ).join(Document, ExtractedField.document_id == Document.id).where(
+        *conditions
+    ).group_by(ExtractedField.audit_priority_level))).all()
+
+    priority_counts = {label: 0 for label in AUDIT_PRIORITY_LABELS.values()}
+    with_validation_errors = 0
+    low_confidence = 0
+    for level, count, validation_count, low_count in rows:
+        priority_counts[AUDIT_PRIORITY_LABELS[level]] += count
+        with_validation_errors += validation_count
+        low_confidence += low_count
+
+    return {
+        "total": sum(priority_counts.values()),
+        "priority_counts": priority_counts,
+        "total_with_validation_errors": with_validation_errors,
+        "total_low_confidence": low_confidence
+    }
+
+
+async def get_audit_queue_page(
+    db: AnySession,
+    conditions: list,
+    offset: int,
+    limit: int
+) -> List[ExtractedField]:
+    """
+    Fetch one page of the audit queue, most urgent first.
+
+    Sorted by priority, then confidence (id breaks ties so pages are stable).
+    Document, schema and physical file are loaded in the same query with only
+    the columns the queue displays, so rendering never lazy-loads.
+
+    Args:
+        db: Database session
+        conditions: Output of audit_queue_conditions()
+        offset: Rows to skip
+        limit: Page size
+
+    Returns:
+        List of ExtractedField with document relationships populated
+    """
+    query = select(ExtractedField).join(
+        ExtractedField.document
+    ).options(
+        contains_eager(ExtractedField.document).options(
+            load_only(Document.id, Document.filename, Document.file_path, Document.schema_id,
+                      Document.physical_file_id),
+            joinedload(Document.schema).load_only(Schema.id, Schema.name),
+            joinedload(Document.physical_file).load_only(PhysicalFile.id, PhysicalFile.file_path),
+        )
+    ).where(
+        *conditions
+    ).order_by(
+        ExtractedField.audit_priority_level,
+        ExtractedField.confidence_score,
+        ExtractedField.id
+    ).offset(offset).limit(limit)
+
+    return (await db_execute(db, query)).scalars().all()
+
+
 def build_audit_url(
     field_id: int,
     document_id: int,
@@ -268,7 +402,7 @@ async def prepare_citation_metadata(
     document_id: int,
     extracted_fields: Dict[str, Any],
     confidence_scores: Dict[str, float],
-    db: Session,
+    db: AnySession,
     confidence_threshold: Optional[float] = None,
     query_id: Optional[str] = None
 ) -> Dict[str, Any]:
@@ -311,12 +445,11 @@ async def prepare_citation_metadata(
     # Get threshold from settings if not provided
     if confidence_threshold is None:
         settings_service = SettingsService(db)
-        org = settings_service.get_or_create_default_org()
-        user = settings_service.get_or_create_default_user(org.id)
-        confidence_threshold = settings_service.get_setting(
+        org_id, user_id = await settings_service.get_default_scope()
+        confidence_threshold = await settings_service.get_setting(
             key="review_threshold",
-            user_id=user.id,
-            org_id=org.id,
+            user_id=user_id,
+            org_id=org_id,
             default=0.6
         )
 
@@ -330,12 +463,12 @@ async def prepare_citation_metadata(
     audit_urls = {}
     if low_confidence_fields:
         # Query extracted fields for this document
-        fields = db.query(ExtractedField).filter(
+        fields = (await db_execute(db, select(ExtractedField).where(
             and_(
                 ExtractedField.document_id == document_id,
                 ExtractedField.field_name.in_(low_confidence_fields)
             )
-        ).all()
+        ))).scalars().all()
 
         # Build audit URL for each low-confidence field
         for field in fields:
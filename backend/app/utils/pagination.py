@@ -0,0 +1,146 @@
+"""
+Keyset cursors and cheap totals for paginated listings and search.
+
+OFFSET pagination re-reads every skipped row, so deep pages cost as much as
+the whole match. Listings here page by an opaque cursor holding the sort key
+of the last row returned ("rank"/"id" for ranked search, "t"/"id" for upload
+time), and the next page starts strictly after it.
+
+The total is the other full scan. ``count_total`` supports:
+
+    exact     select count(*) over the whole match (previous behaviour)
+    capped    count at most SEARCH_TOTAL_COUNT_CAP + 1 rows; above that the total
+              is reported as "at least" the cap
+    estimate  the planner's row estimate (PostgreSQL), counted exactly when
+              the estimate is under the cap; other databases use capped
+    none      no count
+"""
+
+import base64
+import binascii
+import json
+import logging
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.core.config import settings
+from app.core.database import AnySession, db_execute
+
+logger = logging.getLogger(__name__)
+
+TOTAL_MODES = ("exact", "capped", "estimate", "none")
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Opaque, URL-safe cursor for the sort key of the last row on a page."""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, keys: Sequence[str]) -> Dict[str, Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor from a previous page's ``next_cursor``
+        keys: Keys the caller's ordering needs
+
+    Raises:
+        ValueError: Malformed cursor, or one issued for a different ordering
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+    if not isinstance(values, dict) or any(key not in values for key in keys):
+        raise ValueError("Invalid pagination cursor")
+    return values
+
+
+def keyset_after(columns: Sequence[Any], values: Sequence[Any]):
+    """
+    WHERE clause for rows after ``values`` in ``ORDER BY columns DESC``.
+
+    Expanded to (c1 < v1) OR (c1 = v1 AND c2 < v2) ... rather than a row
+    comparison, so expressions such as a rank function work on every dialect.
+    """
+    clauses = []
+    for i, (column, value) in enumerate(zip(columns, values)):
+        equal_prefix = [columns[j] == values[j] for j in range(i)]
+        clauses.append(and_(*equal_prefix, column < value))
+    return or_(*clauses)
+
+
+def validate_total_mode(total_mode: str) -> str:
+    if total_mode not in TOTAL_MODES:
+        raise ValueError(f"total_mode must be one of: {', '.join(TOTAL_MODES)}")
+    return total_mode
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) <statement>, keeping the statement's bound parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def estimate_rows(db: AnySession, stmt) -> Optional[int]:
+    """Planner row estimate for a select (PostgreSQL only, else None)."""
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    plan = (await db_execute(db, _Explain(stmt.order_by(None)))).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_total(
+    db: AnySession,
+    stmt,
+    total_mode: str = "exact",
+    cap: Optional[int] = None
+) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Total rows matched by ``stmt`` in the requested mode.
+
+    Args:
+        db: Sync Session or AsyncSession
+        stmt: Select for the full (unpaginated) match
+        total_mode: exact | capped | estimate | none
+        cap: Row cap for capped/estimate (default: settings.SEARCH_TOTAL_COUNT_CAP)
+
+    Returns:
+        (total, relation): relation is "eq" for an exact total, "gte" when the
+        cap was reached, "estimate" for a planner estimate, (None, None) for none
+    """
+    validate_total_mode(total_mode)
+    if total_mode == "none":
+        return None, None
+
+    stmt = stmt.order_by(None)
+    if total_mode == "exact":
+        total = (await db_execute(db, select(func.count()).select_from(stmt.subquery()))).scalar()
+        return total, "eq"
+
+    cap = settings.SEARCH_TOTAL_COUNT_CAP if cap is None else cap
+    if total_mode == "estimate":
+        estimate = await estimate_rows(db, stmt)
+        if estimate is not None and estimate > cap:
+            return estimate, "estimate"
+
+    capped_stmt = select(func.count()).select_from(stmt.limit(cap + 1).subquery())
+    total = (await db_execute(db, capped_stmt)).scalar()
+    if total > cap:
+        return cap, "gte"
+    return total, "eq"
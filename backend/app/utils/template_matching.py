@@ -2,13 +2,18 @@
 Template matching utilities for hybrid Elasticsearch + Claude matching
 """
 import logging
-import re
 from typing import Any, Dict, List, Optional
 
 from sqlalchemy.orm import Session
 
 from app.models.document import Document
+from app.models.parse_result import MatchFeatures
 from app.services.claude_service import ClaudeService
+from app.services.match_feature_service import (
+    MatchFeatureService,
+    compute_match_features,
+    extract_field_names,
+)
 from app.services.postgres_service import PostgresService
 from app.services.settings_service import SettingsService
 
@@ -20,7 +25,8 @@ async def hybrid_match_document(
     postgres_service: PostgresService,
     claude_service: ClaudeService,
     available_templates: List[Dict[str, Any]],
-    db: Optional[Session] = None
+    db: Optional[Session] = None,
+    features: Optional[MatchFeatures] = None
 ) -> Dict[str, Any]:
     """
     Simple hybrid template matching: Try ES first, fall back to Claude if confidence too low
@@ -30,6 +36,9 @@ async def hybrid_match_document(
         postgres_service: Elasticsearch service instance
         claude_service: Claude service instance
         available_templates: List of available templates with fields
+        db: Database session (settings lookup and match features)
+        features: Precomputed match features (loaded here when omitted; batch
+            callers should pass them from MatchFeatureService.for_documents)
 
     Returns:
         {
@@ -44,7 +53,12 @@ async def hybrid_match_document(
     """
 
     # Validate document has parse results
-    if not document.actual_parse_result:
+    if features is None:
+        if db:
+            features = MatchFeatureService(db).get(document)
+        elif document.actual_parse_result:
+            features = compute_match_features(document.actual_parse_result)
+    if features is None:
         return _no_match_result("No parse result available")
 
     # Get settings (with fallbacks for when db is not available)
@@ -53,25 +67,23 @@ async def hybrid_match_document(
 
     if db:
         settings_service = SettingsService(db)
-        org = settings_service.get_or_create_default_org()
-        user = settings_service.get_or_create_default_user(org.id)
-        auto_match_threshold = settings_service.get_setting(
+        org_id, user_id = await settings_service.get_default_scope()
+        auto_match_threshold = await settings_service.get_setting(
             key="auto_match_threshold",
-            user_id=user.id,
-            org_id=org.id,
+            user_id=user_id,
+            org_id=org_id,
             default=0.70
         )
-        enable_claude_fallback = settings_service.get_setting(
+        enable_claude_fallback = await settings_service.get_setting(
             key="enable_claude_fallback",
-            user_id=user.id,
-            org_id=org.id,
+            user_id=user_id,
+            org_id=org_id,
             default=True
         )
 
-    # Extract document characteristics
-    chunks = document.actual_parse_result.get("chunks", [])
-    doc_text = "\n".join([c.get("content", "") for c in chunks[:10]])
-    doc_fields = extract_field_names_from_parse(document.actual_parse_result)
+    # Document characteristics (precomputed at parse time)
+    doc_text = features.head_text
+    doc_fields = features.field_names
 
     logger.info(f"Matching document {document.filename} with {len(doc_fields)} fields")
 
@@ -108,8 +120,9 @@ async def hybrid_match_document(
 
         try:
             claude_result = await claude_service.match_document_to_template(
-                parsed_document=document.actual_parse_result,
-                available_templates=available_templates
+                parsed_document=None,
+                available_templates=available_templates,
+                document_text=features.sample_text
             )
 
             # Enrich Claude result
@@ -167,9 +180,10 @@ async def auto_match_documents(
         List of potential matches with document info
     """
     matches = []
+    features_by_doc = MatchFeatureService(db).for_documents(documents)
 
     for doc in documents:
-        if not doc.actual_parse_result:
+        if doc.id not in features_by_doc:
             continue
 
         # Use hybrid matching
@@ -178,7 +192,8 @@ async def auto_match_documents(
             postgres_service=postgres_service,
             claude_service=claude_service,
             available_templates=available_templates,
-            db=db
+            db=db,
+            features=features_by_doc[doc.id]
         )
 
         # Only return matches above threshold
@@ -211,27 +226,16 @@ def extract_field_names_from_parse(parse_result: Dict[str, Any]) -> List[str]:
     Extract likely field names from Reducto parse result
     Uses common patterns like "Label: Value" or bold text
 
+    Matching reads these from MatchFeatures.field_names; this is for callers
+    holding a parse result that was never stored.
+
     Args:
         parse_result: Reducto parse result dictionary
 
     Returns:
         List of extracted field names
     """
-    field_names = []
-
-    for chunk in parse_result.get("chunks", []):
-        content = chunk.get("content", "")
-
-        # Match patterns like "Invoice Number:", "Total Amount:", etc.
-        # Looks for capitalized words followed by colon
-        matches = re.findall(r'([A-Z][a-zA-Z\s]+):', content)
-        field_names.extend([
-            m.strip().lower().replace(" ", "_")
-            for m in matches
-        ])
-
-    # Return unique field names, limited to 20
-    unique_fields = list(set(field_names))[:20]
+    unique_fields = extract_field_names(parse_result)
     logger.debug(f"Extracted {len(unique_fields)} field names from parse result")
     return unique_fields
 
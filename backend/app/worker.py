@@ -0,0 +1,174 @@
+"""
+Background job worker.
+
+Runs N async workers that claim jobs from the background_jobs table and
+execute the registered handlers (see app/services/job_handlers.py). Run it
+as a separate process next to the API:
+
+    python -m app.worker --concurrency 4
+    python -m app.worker --lanes interactive,default   # keep bulk work off this process
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+from typing import List, Optional
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+import app.models  # noqa: F401  (register all mappers)
+import app.services.job_handlers  # noqa: F401  (register job handlers)
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.background_job import BackgroundJob
+from app.services.job_queue import JOB_LANES, JobQueue, get_job_handler
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """Claims and runs jobs one at a time, renewing the lease while a job runs."""
+
+    def __init__(
+        self,
+        worker_id: str,
+        lanes: Optional[List[str]] = None,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        poll_interval: Optional[float] = None,
+        heartbeat_interval: Optional[float] = None,
+        lease_seconds: Optional[int] = None,
+        retry_base_delay: Optional[float] = None
+    ):
+        self.worker_id = worker_id
+        self.lanes = lanes
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval if poll_interval is not None else settings.JOB_POLL_INTERVAL
+        self.heartbeat_interval = heartbeat_interval or settings.JOB_HEARTBEAT_SECONDS
+        self.lease_seconds = lease_seconds
+        self.retry_base_delay = retry_base_delay
+        self.jobs_run = 0
+
+    def _queue(self, db) -> JobQueue:
+        return JobQueue(db, lease_seconds=self.lease_seconds, retry_base_delay=self.retry_base_delay)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Claim and run jobs until ``stop`` is set."""
+        logger.info(f"Worker {self.worker_id} started (lanes: {self.lanes or 'all'})")
+        while not stop.is_set():
+            try:
+                ran = await self.run_once()
+            except Exception as e:
+                logger.error(f"Worker {self.worker_id} loop error: {e}", exc_info=True)
+                ran = False
+
+            if not ran:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        logger.info(f"Worker {self.worker_id} stopped after {self.jobs_run} jobs")
+
+    async def run_once(self) -> bool:
+        """
+        Claim and run a single job.
+
+        Returns:
+            True if a job was claimed, False if the queue was empty
+        """
+        async with self.session_factory() as db:
+            job = await self._queue(db).claim(self.worker_id, self.lanes)
+        if job is None:
+            return False
+
+        await self._execute(job)
+        self.jobs_run += 1
+        return True
+
+    async def _execute(self, job: BackgroundJob) -> None:
+        handler = get_job_handler(job.type)
+        if handler is None:
+            await self._fail(job, f"No handler registered for job type '{job.type}'")
+            return
+
+        logger.info(f"Worker {self.worker_id} running job {job.id} ({job.type}, attempt {job.attempts})")
+        task = asyncio.create_task(handler(job))
+        heartbeat = asyncio.create_task(self._heartbeat(job, task))
+        try:
+            await task
+        except asyncio.CancelledError:
+            if not (heartbeat.done() and task.cancelled()):
+                raise  # The worker itself is shutting down
+            # Lease lost or job cancelled: another worker owns it (or nobody should).
+            # Work a handler handed to a thread finishes there, but is never completed.
+            logger.warning(f"Job {job.id} aborted: lease lost or job cancelled")
+            return
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.type}) failed: {e}", exc_info=True)
+            await self._fail(job, str(e))
+            return
+        finally:
+            heartbeat.cancel()
+
+        async with self.session_factory() as db:
+            await self._queue(db).complete(job.id, self.worker_id)
+        logger.info(f"Job {job.id} ({job.type}) completed")
+
+    async def _fail(self, job: BackgroundJob, error: str) -> None:
+        async with self.session_factory() as db:
+            await self._queue(db).fail(job.id, self.worker_id, error)
+
+    async def _heartbeat(self, job: BackgroundJob, task: asyncio.Task) -> None:
+        while not task.done():
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                async with self.session_factory() as db:
+                    owned = await self._queue(db).heartbeat(job.id, self.worker_id)
+            except Exception as e:
+                # Transient DB error: keep running, the lease has slack until it expires
+                logger.warning(f"Heartbeat for job {job.id} failed: {e}")
+                continue
+            if not owned:
+                task.cancel()
+                return
+
+
+async def run_workers(concurrency: int, lanes: Optional[List[str]] = None) -> None:
+    """Run ``concurrency`` workers in this process until SIGINT/SIGTERM."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # pragma: no cover - Windows
+            pass
+
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+    workers = [JobWorker(f"{prefix}:{i}", lanes) for i in range(concurrency)]
+    await asyncio.gather(*(worker.run(stop) for worker in workers))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paperbase background job worker")
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY,
+        help="Number of async workers in this process"
+    )
+    parser.add_argument(
+        "--lanes", type=str, default=None,
+        help=f"Comma-separated lanes to serve (default: all of {','.join(JOB_LANES)})"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=getattr(logging, settings.LOG_LEVEL),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    lanes = [lane.strip() for lane in args.lanes.split(",")] if args.lanes else None
+    asyncio.run(run_workers(args.concurrency, lanes))
+
+
+if __name__ == "__main__":
+    main()
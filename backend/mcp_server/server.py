@@ -106,7 +106,8 @@ async def search_documents(
     template_name: Optional[str] = None,
     status: Optional[str] = None,
     min_confidence: Optional[float] = None,
-    limit: int = 20
+    limit: int = 20,
+    cursor: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Find documents by keywords or filters - for LISTING documents, not answering questions.
@@ -126,6 +127,7 @@ async def search_documents(
         status: Filter by document status
         min_confidence: Minimum average confidence score (0.0-1.0)
         limit: Maximum number of results (max: 100)
+        cursor: next_cursor from a previous result, to fetch the following page
 
     Returns:
         List of matching documents with metadata (NOT answers to questions)
@@ -136,7 +138,8 @@ async def search_documents(
         template_name=template_name,
         status=status,
         min_confidence=min_confidence,
-        limit=limit
+        limit=limit,
+        cursor=cursor
     )
 
 
@@ -16,6 +16,13 @@ from app.core.database import Base
 from app.models.document import Document, ExtractedField
 from app.models.schema import Schema
 from app.models.verification import Verification
+from app.utils.pagination import (
+    count_total,
+    decode_cursor,
+    encode_cursor,
+    keyset_after,
+    validate_total_mode,
+)
 from mcp_server.config import config
 from mcp_server.services.cache_service import cached, cache_service
 
@@ -164,6 +171,58 @@ class DatabaseService:
         Returns:
             Tuple of (results, total_count)
         """
+        page = await self.search_documents_page(
+            query=query,
+            template_id=template_id,
+            status=status,
+            min_confidence=min_confidence,
+            date_from=date_from,
+            date_to=date_to,
+            limit=limit,
+            offset=offset
+        )
+        return page["documents"], page["total"]
+
+    async def search_documents_page(
+        self,
+        query: Optional[str] = None,
+        template_id: Optional[int] = None,
+        status: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        limit: int = 20,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        total_mode: str = "exact"
+    ) -> Dict[str, Any]:
+        """
+        Search documents with filters, paging by cursor
+
+        Args:
+            query: Text search in filename
+            template_id: Filter by template
+            status: Filter by status
+            min_confidence: Minimum confidence threshold
+            date_from: Start date filter
+            date_to: End date filter
+            limit: Max results
+            offset: Pagination offset (ignored when a cursor is given)
+            cursor: next_cursor from the previous page (keyset on uploaded_at, id)
+            total_mode: exact | capped | estimate | none (see app.utils.pagination)
+
+        Returns:
+            {"documents", "total", "total_relation", "next_cursor"}
+
+        Raises:
+            ValueError: Invalid cursor or total_mode
+        """
+        validate_total_mode(total_mode)
+        after = None
+        if cursor:
+            values = decode_cursor(cursor, ["t", "id"])
+            after = [datetime.fromisoformat(values["t"]), int(values["id"])]
+
         async with self.async_session() as session:
             # Build query
             stmt = select(Document).options(
@@ -189,21 +248,29 @@ class DatabaseService:
             if date_to:
                 conditions.append(Document.uploaded_at <= date_to)
 
+            # Get total count (before the cursor, so every page reports the same total)
+            count_stmt = select(Document.id)
             if conditions:
-                stmt = stmt.where(and_(*conditions))
+                count_stmt = count_stmt.where(and_(*conditions))
+            total_count, total_relation = await count_total(session, count_stmt, total_mode)
+
+            if after:
+                conditions.append(keyset_after([Document.uploaded_at, Document.id], after))
+                offset = 0
 
-            # Get total count
-            count_stmt = select(func.count()).select_from(Document)
             if conditions:
-                count_stmt = count_stmt.where(and_(*conditions))
-            total_result = await session.execute(count_stmt)
-            total_count = total_result.scalar()
+                stmt = stmt.where(and_(*conditions))
 
-            # Apply pagination
-            stmt = stmt.order_by(desc(Document.uploaded_at)).limit(limit).offset(offset)
+            # Apply pagination (one extra row tells whether there is a next page)
+            stmt = stmt.order_by(desc(Document.uploaded_at), desc(Document.id)).limit(limit + 1).offset(offset)
 
             result = await session.execute(stmt)
-            docs = result.scalars().all()
+            docs = result.unique().scalars().all()
+
+            next_cursor = None
+            if len(docs) > limit:
+                docs = docs[:limit]
+                next_cursor = encode_cursor({"t": docs[-1].uploaded_at.isoformat(), "id": docs[-1].id})
 
             # Format results (optimized for MCP)
             formatted_docs = []
@@ -229,7 +296,12 @@ class DatabaseService:
                     "field_count": len(doc.extracted_fields)
                 })
 
-            return formatted_docs, total_count
+            return {
+                "documents": formatted_docs,
+                "total": total_count,
+                "total_relation": total_relation,
+                "next_cursor": next_cursor
+            }
 
     @cached(category="templates", key_prefix="templates_list")
     async def get_all_templates(self) -> List[Dict[str, Any]]:
@@ -20,7 +20,8 @@ async def search_documents(
     template_name: Optional[str] = None,
     status: Optional[str] = None,
     min_confidence: Optional[float] = None,
-    limit: int = 20
+    limit: int = 20,
+    cursor: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Search documents using natural language or keywords.
@@ -35,9 +36,11 @@ async def search_documents(
         status: Filter by document status (uploaded, processing, completed, etc.)
         min_confidence: Minimum average confidence score (0.0-1.0)
         limit: Maximum number of results (default: 20, max: 100)
+        cursor: next_cursor from a previous filtered (template/status/confidence) search
 
     Returns:
         Search results with documents, total count, and query analysis
+        (filtered searches also return next_cursor while more pages remain)
 
     Examples:
         >>> search_documents("contracts signed last month")
@@ -67,18 +70,21 @@ async def search_documents(
                     template_id = matching_template["id"]
 
             # Search in database with filters
-            db_results, total = await db_service.search_documents(
+            db_page = await db_service.search_documents_page(
                 query=None,  # Already filtered by ES
                 template_id=template_id,
                 status=status,
                 min_confidence=min_confidence,
                 limit=limit,
-                offset=0
+                cursor=cursor,
+                total_mode="capped"
             )
 
             return {
-                "documents": db_results,
-                "total": total,
+                "documents": db_page["documents"],
+                "total": db_page["total"],
+                "total_relation": db_page["total_relation"],
+                "next_cursor": db_page["next_cursor"],
                 "query": query,
                 "filters_applied": {
                     "folder_path": folder_path,
@@ -0,0 +1,113 @@
+"""
+Migration: Add analytics rollup tables
+
+The analytics endpoints read analytics_rollups (per organization, template
+and day: status counts, field confidence sums, review queue, verification
+tallies, processing-time histogram) instead of scanning documents,
+extracted_fields and verifications on every dashboard poll. Writes mark
+their days in analytics_dirty_days and a refresh recomputes only those days,
+so the source timestamp columns get indexes for the per-day range scans.
+
+This migration creates the tables and builds rollups for existing data.
+Restart API and worker processes afterwards: each process checks once
+whether analytics_dirty_days exists before it starts marking days.
+
+Usage:
+    python migrations/add_analytics_rollups.py
+    python migrations/add_analytics_rollups.py --rollback
+"""
+
+import logging
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+import app.models  # noqa: F401  (register all mappers)
+from app.core.database import SessionLocal, engine
+from app.services.analytics_rollup_service import AnalyticsRollupService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+UPGRADE_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS analytics_rollups (
+        id SERIAL PRIMARY KEY,
+        organization_id INTEGER,
+        schema_id INTEGER,
+        day DATE NOT NULL,
+        metric VARCHAR NOT NULL,
+        dimension VARCHAR NOT NULL DEFAULT '',
+        count INTEGER NOT NULL DEFAULT 0,
+        total DOUBLE PRECISION NOT NULL DEFAULT 0
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_analytics_rollups_id ON analytics_rollups (id)",
+    "CREATE INDEX IF NOT EXISTS ix_analytics_rollups_metric_day ON analytics_rollups (metric, day)",
+    "CREATE INDEX IF NOT EXISTS ix_analytics_rollups_day ON analytics_rollups (day)",
+    """
+    CREATE TABLE IF NOT EXISTS analytics_dirty_days (
+        day DATE PRIMARY KEY,
+        marked_at TIMESTAMP NOT NULL DEFAULT NOW()
+    )
+    """,
+    # Per-day range scans when dirty days are recomputed
+    "CREATE INDEX IF NOT EXISTS ix_documents_uploaded_at ON documents (uploaded_at)",
+    "CREATE INDEX IF NOT EXISTS ix_documents_processed_at ON documents (processed_at)",
+    "CREATE INDEX IF NOT EXISTS ix_extracted_fields_extracted_at ON extracted_fields (extracted_at)",
+    "CREATE INDEX IF NOT EXISTS ix_verifications_verified_at ON verifications (verified_at)",
+]
+
+ROLLBACK_STATEMENTS = [
+    "DROP INDEX IF EXISTS ix_verifications_verified_at",
+    "DROP INDEX IF EXISTS ix_extracted_fields_extracted_at",
+    "DROP INDEX IF EXISTS ix_documents_processed_at",
+    "DROP INDEX IF EXISTS ix_documents_uploaded_at",
+    "DROP TABLE IF EXISTS analytics_dirty_days",
+    "DROP TABLE IF EXISTS analytics_rollups",
+]
+
+
+def run_migration():
+    """Create rollup tables and build rollups from existing data"""
+    logger.info("Starting migration: add_analytics_rollups")
+    with engine.begin() as conn:
+        for statement in UPGRADE_STATEMENTS:
+            conn.execute(text(statement))
+
+    db = SessionLocal()
+    try:
+        rollup_rows = AnalyticsRollupService(db).rebuild()
+    finally:
+        db.close()
+    logger.info(f"✅ Migration completed: {rollup_rows} rollup rows built")
+
+
+def rollback_migration():
+    """Drop rollup tables"""
+    logger.warning("Rolling back migration: add_analytics_rollups")
+    with engine.begin() as conn:
+        for statement in ROLLBACK_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("✅ Rollback completed: analytics rollup tables dropped")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Add analytics rollup tables")
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Rollback the migration (drop tables)"
+    )
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback_migration()
+    else:
+        run_migration()
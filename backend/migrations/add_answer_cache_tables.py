@@ -0,0 +1,103 @@
+"""
+Migration: Add shared answer cache tables
+
+ANSWER_CACHE_BACKEND=sql keeps generated answers in answer_cache_entries so
+every API process reuses them. answer_cache_dependencies maps each answer to
+the documents it was generated from (document_id 0 = whole corpus), so a
+change to a document drops only the answers built from it;
+answer_cache_generation is bumped on invalidation so per-process memory
+tiers know to drop their copies.
+
+Not needed for the default memory backend, or when ANSWER_CACHE_URL points
+at a SQLite file (the tables are created on first use there).
+
+Usage:
+    python migrations/add_answer_cache_tables.py
+    python migrations/add_answer_cache_tables.py --rollback
+"""
+
+import logging
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.database import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+UPGRADE_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS answer_cache_entries (
+        cache_key VARCHAR(32) PRIMARY KEY,
+        query TEXT NOT NULL,
+        answer TEXT NOT NULL,
+        size_bytes INTEGER NOT NULL,
+        created_at TIMESTAMP NOT NULL,
+        expires_at TIMESTAMP NOT NULL,
+        last_accessed_at TIMESTAMP NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_answer_cache_entries_expires_at ON answer_cache_entries (expires_at)",
+    "CREATE INDEX IF NOT EXISTS ix_answer_cache_entries_last_accessed_at ON answer_cache_entries (last_accessed_at)",
+    """
+    CREATE TABLE IF NOT EXISTS answer_cache_dependencies (
+        document_id INTEGER NOT NULL,
+        cache_key VARCHAR(32) NOT NULL,
+        PRIMARY KEY (document_id, cache_key)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_answer_cache_dependencies_cache_key ON answer_cache_dependencies (cache_key)",
+    """
+    CREATE TABLE IF NOT EXISTS answer_cache_generation (
+        id INTEGER PRIMARY KEY,
+        generation BIGINT NOT NULL
+    )
+    """,
+    "INSERT INTO answer_cache_generation (id, generation) VALUES (1, 0) ON CONFLICT (id) DO NOTHING",
+]
+
+ROLLBACK_STATEMENTS = [
+    "DROP TABLE IF EXISTS answer_cache_generation",
+    "DROP TABLE IF EXISTS answer_cache_dependencies",
+    "DROP TABLE IF EXISTS answer_cache_entries",
+]
+
+
+def run_migration():
+    """Create shared answer cache tables"""
+    logger.info("Starting migration: add_answer_cache_tables")
+    with engine.begin() as conn:
+        for statement in UPGRADE_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("✅ Migration completed: answer cache tables created")
+
+
+def rollback_migration():
+    """Drop shared answer cache tables"""
+    logger.warning("Rolling back migration: add_answer_cache_tables")
+    with engine.begin() as conn:
+        for statement in ROLLBACK_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("✅ Rollback completed: answer cache tables dropped")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Add shared answer cache tables")
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Rollback the migration (drop tables)"
+    )
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback_migration()
+    else:
+        run_migration()
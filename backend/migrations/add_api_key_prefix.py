@@ -0,0 +1,73 @@
+"""
+Migration: Add lookup prefix to api_keys
+
+New API keys look like "pb_<lookup>_<secret>". The lookup ID is stored in
+api_keys.key_prefix (unique index) so verification fetches one row and
+checks one bcrypt hash instead of hashing against every active key.
+
+Existing keys keep key_prefix = NULL and still verify through the legacy
+path; rotate them to move them onto the indexed lookup.
+
+Usage:
+    python migrations/add_api_key_prefix.py
+    python migrations/add_api_key_prefix.py --rollback
+"""
+
+import logging
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.database import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+UPGRADE_STATEMENTS = [
+    "ALTER TABLE api_keys ADD COLUMN IF NOT EXISTS key_prefix VARCHAR",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_api_keys_key_prefix ON api_keys (key_prefix)",
+]
+
+ROLLBACK_STATEMENTS = [
+    "DROP INDEX IF EXISTS ix_api_keys_key_prefix",
+    "ALTER TABLE api_keys DROP COLUMN IF EXISTS key_prefix",
+]
+
+
+def run_migration():
+    """Add key_prefix column and unique index"""
+    logger.info("Starting migration: add_api_key_prefix")
+    with engine.begin() as conn:
+        for statement in UPGRADE_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("✅ Migration completed: api_keys.key_prefix added")
+
+
+def rollback_migration():
+    """Drop key_prefix column and index"""
+    logger.warning("Rolling back migration: add_api_key_prefix")
+    with engine.begin() as conn:
+        for statement in ROLLBACK_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("✅ Rollback completed: api_keys.key_prefix dropped")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Add lookup prefix to api_keys")
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Rollback the migration (drop column)"
+    )
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback_migration()
+    else:
+        run_migration()
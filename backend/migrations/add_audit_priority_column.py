@@ -0,0 +1,82 @@
+"""
+Migration: Add stored audit priority to extracted_fields
+
+Adds audit_priority_level, a generated column holding the same CASE as
+ExtractedField.audit_priority (0=critical .. 3=low), and a partial index
+on unverified fields so the audit queue filters, sorts, paginates and
+counts per priority in SQL.
+
+Requires PostgreSQL 12+ (generated columns). Adding a STORED column
+rewrites extracted_fields; run it in a maintenance window on large tables.
+
+Usage:
+    python migrations/add_audit_priority_column.py
+    python migrations/add_audit_priority_column.py --rollback
+"""
+
+import logging
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.models.document import AUDIT_PRIORITY_SQL
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+UPGRADE_STATEMENTS = [
+    f"""
+    ALTER TABLE extracted_fields ADD COLUMN IF NOT EXISTS audit_priority_level INTEGER
+    GENERATED ALWAYS AS ({AUDIT_PRIORITY_SQL}) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_extracted_fields_audit_queue
+    ON extracted_fields (audit_priority_level, confidence_score)
+    WHERE verified = false
+    """,
+]
+
+ROLLBACK_STATEMENTS = [
+    "DROP INDEX IF EXISTS ix_extracted_fields_audit_queue",
+    "ALTER TABLE extracted_fields DROP COLUMN IF EXISTS audit_priority_level",
+]
+
+
+def run_migration():
+    """Add the generated priority column and audit queue index"""
+    logger.info("Starting migration: add_audit_priority_column")
+    with engine.begin() as conn:
+        for statement in UPGRADE_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("✅ Migration completed: extracted_fields.audit_priority_level added")
+
+
+def rollback_migration():
+    """Drop the priority column and index"""
+    logger.warning("Rolling back migration: add_audit_priority_column")
+    with engine.begin() as conn:
+        for statement in ROLLBACK_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("✅ Rollback completed: audit priority column dropped")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Add stored audit priority to extracted_fields")
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Rollback the migration (drop column and index)"
+    )
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback_migration()
+    else:
+        run_migration()
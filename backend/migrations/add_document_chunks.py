@@ -0,0 +1,106 @@
+"""
+Migration: Add document_chunks table
+
+Passage-level index of each document's text: one row per Reducto parse
+chunk with page, character offsets into the indexed full_text, bounding
+box and a generated tsvector (GIN indexed) for passage search. MCP chunk
+fetches read one row by (document_id, chunk_number).
+
+New and reindexed documents get chunks at index time, and documents
+without chunks are chunked on their first chunk fetch; run with
+--backfill to chunk every indexed document now.
+
+Usage:
+    python migrations/add_document_chunks.py
+    python migrations/add_document_chunks.py --backfill
+    python migrations/add_document_chunks.py --rollback
+"""
+
+import asyncio
+import logging
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+import app.models  # noqa: F401  (register all mappers)
+from app.core.database import SessionLocal, engine
+from app.services.postgres_service import PostgresService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+UPGRADE_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS document_chunks (
+        id SERIAL PRIMARY KEY,
+        document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+        chunk_number INTEGER NOT NULL,
+        page INTEGER,
+        start_char INTEGER NOT NULL,
+        end_char INTEGER NOT NULL,
+        bbox JSONB,
+        content TEXT NOT NULL,
+        content_tsv tsvector GENERATED ALWAYS AS (to_tsvector('english', COALESCE(content, ''))) STORED,
+        CONSTRAINT uq_document_chunks_document_chunk UNIQUE (document_id, chunk_number)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_document_chunks_content ON document_chunks USING gin (content_tsv)",
+]
+
+ROLLBACK_STATEMENTS = [
+    "DROP TABLE IF EXISTS document_chunks",
+]
+
+
+async def _backfill(batch_size: int) -> int:
+    db = SessionLocal()
+    try:
+        return await PostgresService(db).backfill_document_chunks(batch_size=batch_size)
+    finally:
+        db.close()
+
+
+def run_migration(backfill: bool = False, batch_size: int = 100):
+    """Create document_chunks table"""
+    logger.info("Starting migration: add_document_chunks")
+    with engine.begin() as conn:
+        for statement in UPGRADE_STATEMENTS:
+            conn.execute(text(statement))
+
+    if backfill:
+        processed = asyncio.run(_backfill(batch_size))
+        logger.info(f"Chunked {processed} indexed documents")
+
+    logger.info("✅ Migration completed: document_chunks table created")
+
+
+def rollback_migration():
+    """Drop document_chunks table"""
+    logger.warning("Rolling back migration: add_document_chunks")
+    with engine.begin() as conn:
+        for statement in ROLLBACK_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("✅ Rollback completed: document_chunks table dropped")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Add document_chunks table")
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Rollback the migration (drop table)"
+    )
+    parser.add_argument("--backfill", action="store_true", help="Chunk documents already in the search index")
+    parser.add_argument("--batch-size", type=int, default=100, help="Documents per backfill batch")
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback_migration()
+    else:
+        run_migration(backfill=args.backfill, batch_size=args.batch_size)
@@ -0,0 +1,85 @@
+"""
+Migration: Index documents by (uploaded_at, id)
+
+Document listings (GET /api/documents, MCP search_documents) page newest
+first with a keyset on (uploaded_at, id). Without an index on that pair every
+page, including the first, sorts the whole documents table.
+
+Legacy rows without an upload time are backfilled first (processing time if
+known, otherwise the oldest upload time, so they keep paging last) and the
+column is made NOT NULL, so the keyset needs no NULL handling.
+
+Usage:
+    python migrations/add_documents_uploaded_at_index.py
+    python migrations/add_documents_uploaded_at_index.py --rollback
+"""
+
+import logging
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.database import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+UPGRADE_STATEMENTS = [
+    """
+    UPDATE documents
+    SET uploaded_at = COALESCE(
+        processed_at,
+        (SELECT MIN(uploaded_at) FROM documents),
+        NOW()
+    )
+    WHERE uploaded_at IS NULL
+    """,
+    "ALTER TABLE documents ALTER COLUMN uploaded_at SET DEFAULT NOW()",
+    "ALTER TABLE documents ALTER COLUMN uploaded_at SET NOT NULL",
+    "CREATE INDEX IF NOT EXISTS ix_documents_uploaded_at_id ON documents (uploaded_at DESC, id DESC)",
+]
+
+ROLLBACK_STATEMENTS = [
+    "DROP INDEX IF EXISTS ix_documents_uploaded_at_id",
+    "ALTER TABLE documents ALTER COLUMN uploaded_at DROP NOT NULL",
+    "ALTER TABLE documents ALTER COLUMN uploaded_at DROP DEFAULT",
+]
+
+
+def run_migration():
+    """Backfill upload times, make them NOT NULL and index the listing keyset"""
+    logger.info("Starting migration: add_documents_uploaded_at_index")
+    with engine.begin() as conn:
+        for statement in UPGRADE_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("✅ Migration completed: documents.uploaded_at NOT NULL and indexed with id")
+
+
+def rollback_migration():
+    """Drop the listing index and allow NULL upload times again"""
+    logger.warning("Rolling back migration: add_documents_uploaded_at_index")
+    with engine.begin() as conn:
+        for statement in ROLLBACK_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("✅ Rollback completed: index dropped")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Index documents by (uploaded_at, id)")
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Rollback the migration (drop index and NOT NULL)"
+    )
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback_migration()
+    else:
+        run_migration()
@@ -0,0 +1,99 @@
+"""
+Migration: Add effective_permissions table
+
+Document and folder grants (document_permissions, folder_permissions) are
+mirrored into one flattened effective_permissions table, kept current on
+every grant/revoke/share flush. PermissionService.filter_accessible checks
+access for a whole result page against it in one query. This migration
+creates the table and fills it from existing grants.
+
+Usage:
+    python migrations/add_effective_permissions_table.py
+    python migrations/add_effective_permissions_table.py --rollback
+"""
+
+import logging
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+import app.models  # noqa: F401  (register all mappers)
+from app.core.database import SessionLocal, engine
+from app.services.permission_service import rebuild_effective_permissions
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+UPGRADE_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS effective_permissions (
+        id SERIAL PRIMARY KEY,
+        source_type VARCHAR NOT NULL,
+        source_id INTEGER NOT NULL,
+        user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+        role_id INTEGER REFERENCES roles(id) ON DELETE CASCADE,
+        document_id INTEGER REFERENCES documents(id) ON DELETE CASCADE,
+        folder_prefix VARCHAR,
+        include_subfolders BOOLEAN DEFAULT TRUE,
+        org_id INTEGER REFERENCES organizations(id) ON DELETE CASCADE,
+        can_read BOOLEAN DEFAULT FALSE,
+        can_write BOOLEAN DEFAULT FALSE,
+        can_delete BOOLEAN DEFAULT FALSE,
+        can_share BOOLEAN DEFAULT FALSE,
+        expires_at TIMESTAMP,
+        CONSTRAINT uix_effective_permission_source UNIQUE (source_type, source_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_effective_permissions_id ON effective_permissions (id)",
+    "CREATE INDEX IF NOT EXISTS ix_effective_permissions_user_document ON effective_permissions (user_id, document_id)",
+    "CREATE INDEX IF NOT EXISTS ix_effective_permissions_role_document ON effective_permissions (role_id, document_id)",
+]
+
+ROLLBACK_STATEMENTS = [
+    "DROP TABLE IF EXISTS effective_permissions",
+]
+
+
+def run_migration():
+    """Create effective_permissions table and fill it from existing grants"""
+    logger.info("Starting migration: add_effective_permissions_table")
+    with engine.begin() as conn:
+        for statement in UPGRADE_STATEMENTS:
+            conn.execute(text(statement))
+
+    db = SessionLocal()
+    try:
+        row_count = rebuild_effective_permissions(db)
+    finally:
+        db.close()
+    logger.info(f"✅ Migration completed: {row_count} effective permissions")
+
+
+def rollback_migration():
+    """Drop effective_permissions table"""
+    logger.warning("Rolling back migration: add_effective_permissions_table")
+    with engine.begin() as conn:
+        for statement in ROLLBACK_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("✅ Rollback completed: effective_permissions table dropped")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Add effective_permissions table")
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Rollback the migration (drop table)"
+    )
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback_migration()
+    else:
+        run_migration()
@@ -0,0 +1,61 @@
+"""
+Migration: Index extracted_fields.document_id
+
+Streaming exports filter documents with EXISTS (... extracted_fields
+WHERE document_id = documents.id) and batch-load fields with
+selectinload (document_id IN (...)). Both need this index to avoid a
+full scan of extracted_fields per batch.
+
+Usage:
+    python migrations/add_extracted_fields_document_index.py
+    python migrations/add_extracted_fields_document_index.py --rollback
+"""
+
+import logging
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.database import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def run_migration():
+    """Create the document_id index"""
+    logger.info("Starting migration: add_extracted_fields_document_index")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_extracted_fields_document_id ON extracted_fields (document_id)"
+        ))
+    logger.info("✅ Migration completed: extracted_fields.document_id indexed")
+
+
+def rollback_migration():
+    """Drop the document_id index"""
+    logger.warning("Rolling back migration: add_extracted_fields_document_index")
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS ix_extracted_fields_document_id"))
+    logger.info("✅ Rollback completed: index dropped")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Index extracted_fields.document_id")
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Rollback the migration (drop index)"
+    )
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback_migration()
+    else:
+        run_migration()
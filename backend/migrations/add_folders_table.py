@@ -0,0 +1,108 @@
+"""
+Migration: Add materialized folders table
+
+Virtual folders (derived from extractions.organized_path) are materialized
+in a folders table with direct and recursive extraction counts, and each
+extraction stores its folder_path. Both are kept current on every
+extraction insert/move/delete; this migration creates them and fills them
+from existing extractions.
+
+Usage:
+    python migrations/add_folders_table.py
+    python migrations/add_folders_table.py --rollback
+"""
+
+import logging
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+import app.models  # noqa: F401  (register all mappers)
+from app.core.database import SessionLocal, engine
+from app.services.folder_service import FolderService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+UPGRADE_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS folders (
+        id SERIAL PRIMARY KEY,
+        path VARCHAR NOT NULL UNIQUE,
+        parent_path VARCHAR NOT NULL,
+        name VARCHAR NOT NULL,
+        depth INTEGER NOT NULL,
+        direct_count INTEGER NOT NULL DEFAULT 0,
+        recursive_count INTEGER NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_folders_id ON folders (id)",
+    "CREATE INDEX IF NOT EXISTS ix_folders_parent_path ON folders (parent_path)",
+    "CREATE INDEX IF NOT EXISTS ix_folders_path_prefix ON folders (path text_pattern_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_folders_depth_path ON folders (depth, path)",
+    "ALTER TABLE extractions ADD COLUMN IF NOT EXISTS folder_path VARCHAR",
+    # Backfill in SQL: strip the last path segment ("" for files at the root)
+    """
+    UPDATE extractions
+    SET folder_path = CASE
+        WHEN position('/' in trim(both '/' from organized_path)) = 0 THEN ''
+        ELSE regexp_replace(trim(both '/' from organized_path), '/[^/]*$', '')
+    END
+    WHERE organized_path IS NOT NULL AND folder_path IS NULL
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_extractions_folder_path_id ON extractions (folder_path, id)",
+    "CREATE INDEX IF NOT EXISTS ix_extractions_folder_path_prefix ON extractions (folder_path text_pattern_ops)",
+]
+
+ROLLBACK_STATEMENTS = [
+    "DROP INDEX IF EXISTS ix_extractions_folder_path_prefix",
+    "DROP INDEX IF EXISTS ix_extractions_folder_path_id",
+    "ALTER TABLE extractions DROP COLUMN IF EXISTS folder_path",
+    "DROP TABLE IF EXISTS folders",
+]
+
+
+def run_migration():
+    """Create folders table and fill it from existing extractions"""
+    logger.info("Starting migration: add_folders_table")
+    with engine.begin() as conn:
+        for statement in UPGRADE_STATEMENTS:
+            conn.execute(text(statement))
+
+    db = SessionLocal()
+    try:
+        folder_count = FolderService().rebuild_folders(db)
+    finally:
+        db.close()
+    logger.info(f"✅ Migration completed: {folder_count} folders materialized")
+
+
+def rollback_migration():
+    """Drop folders table and extractions.folder_path"""
+    logger.warning("Rolling back migration: add_folders_table")
+    with engine.begin() as conn:
+        for statement in ROLLBACK_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("✅ Rollback completed: folders table dropped")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Add materialized folders table")
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Rollback the migration (drop table and column)"
+    )
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback_migration()
+    else:
+        run_migration()
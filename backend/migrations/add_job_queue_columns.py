@@ -0,0 +1,102 @@
+"""
+Migration: Add job queue columns to background_jobs
+
+Turns background_jobs into a durable work queue claimed with
+SELECT ... FOR UPDATE SKIP LOCKED by `python -m app.worker`:
+lane/priority, retry bookkeeping, worker leases and a partial index
+that covers the claim query.
+
+Usage:
+    python migrations/add_job_queue_columns.py
+    python migrations/add_job_queue_columns.py --rollback
+"""
+
+import logging
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.database import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+UPGRADE_STATEMENTS = [
+    "ALTER TABLE background_jobs ADD COLUMN IF NOT EXISTS lane VARCHAR NOT NULL DEFAULT 'default'",
+    "ALTER TABLE background_jobs ADD COLUMN IF NOT EXISTS priority INTEGER NOT NULL DEFAULT 50",
+    "ALTER TABLE background_jobs ADD COLUMN IF NOT EXISTS available_at TIMESTAMP DEFAULT now()",
+    "ALTER TABLE background_jobs ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE background_jobs ADD COLUMN IF NOT EXISTS max_attempts INTEGER NOT NULL DEFAULT 3",
+    "ALTER TABLE background_jobs ADD COLUMN IF NOT EXISTS locked_by VARCHAR",
+    "ALTER TABLE background_jobs ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP",
+    "ALTER TABLE background_jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP",
+    # Model-level composite index (also used by create_all)
+    """
+    CREATE INDEX IF NOT EXISTS ix_background_jobs_claim
+    ON background_jobs (status, priority, available_at, id)
+    """,
+    # Partial indexes keep the hot claim scans tiny regardless of job history size
+    """
+    CREATE INDEX IF NOT EXISTS ix_background_jobs_queued
+    ON background_jobs (priority, available_at, id)
+    WHERE status = 'queued'
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_background_jobs_leases
+    ON background_jobs (lease_expires_at)
+    WHERE status = 'running'
+    """,
+]
+
+ROLLBACK_STATEMENTS = [
+    "DROP INDEX IF EXISTS ix_background_jobs_leases",
+    "DROP INDEX IF EXISTS ix_background_jobs_queued",
+    "DROP INDEX IF EXISTS ix_background_jobs_claim",
+    "ALTER TABLE background_jobs DROP COLUMN IF EXISTS heartbeat_at",
+    "ALTER TABLE background_jobs DROP COLUMN IF EXISTS lease_expires_at",
+    "ALTER TABLE background_jobs DROP COLUMN IF EXISTS locked_by",
+    "ALTER TABLE background_jobs DROP COLUMN IF EXISTS max_attempts",
+    "ALTER TABLE background_jobs DROP COLUMN IF EXISTS attempts",
+    "ALTER TABLE background_jobs DROP COLUMN IF EXISTS available_at",
+    "ALTER TABLE background_jobs DROP COLUMN IF EXISTS priority",
+    "ALTER TABLE background_jobs DROP COLUMN IF EXISTS lane",
+]
+
+
+def run_migration():
+    """Add queue columns and claim indexes"""
+    logger.info("Starting migration: add_job_queue_columns")
+    with engine.begin() as conn:
+        for statement in UPGRADE_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("✅ Migration completed: background_jobs is now a job queue")
+
+
+def rollback_migration():
+    """Drop queue columns and indexes"""
+    logger.warning("Rolling back migration: add_job_queue_columns")
+    with engine.begin() as conn:
+        for statement in ROLLBACK_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("✅ Rollback completed: job queue columns dropped")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Add job queue columns to background_jobs")
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Rollback the migration (drop columns)"
+    )
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback_migration()
+    else:
+        run_migration()
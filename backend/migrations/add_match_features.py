@@ -0,0 +1,96 @@
+"""
+Migration: Add match_features table
+
+Template matching and clustering read compact per-parse features (head
+text, token set, shingle hashes, field names, page count) instead of the
+full parse result. New parse results get features when written; run with
+--backfill to compute them for existing parse results now rather than on
+first match.
+
+Usage:
+    python migrations/add_match_features.py
+    python migrations/add_match_features.py --backfill
+    python migrations/add_match_features.py --rollback
+"""
+
+import logging
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+import app.models  # noqa: F401  (register all mappers)
+from app.core.database import SessionLocal, engine
+from app.services.match_feature_service import MatchFeatureService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+UPGRADE_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS match_features (
+        content_hash VARCHAR(64) PRIMARY KEY,
+        feature_version INTEGER NOT NULL,
+        head_text TEXT NOT NULL,
+        sample_text TEXT NOT NULL,
+        tokens JSON NOT NULL,
+        shingles JSON NOT NULL,
+        field_names JSON NOT NULL,
+        page_count INTEGER,
+        chunk_count INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+]
+
+ROLLBACK_STATEMENTS = [
+    "DROP TABLE IF EXISTS match_features",
+]
+
+
+def run_migration(backfill: bool = False):
+    """Create match_features table"""
+    logger.info("Starting migration: add_match_features")
+    with engine.begin() as conn:
+        for statement in UPGRADE_STATEMENTS:
+            conn.execute(text(statement))
+
+    if backfill:
+        db = SessionLocal()
+        try:
+            processed = MatchFeatureService(db).backfill()
+            logger.info(f"Computed match features for {processed} parse results")
+        finally:
+            db.close()
+
+    logger.info("✅ Migration completed: match_features table created")
+
+
+def rollback_migration():
+    """Drop match_features table"""
+    logger.warning("Rolling back migration: add_match_features")
+    with engine.begin() as conn:
+        for statement in ROLLBACK_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("✅ Rollback completed: match_features table dropped")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Add match_features table")
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Rollback the migration (drop table)"
+    )
+    parser.add_argument("--backfill", action="store_true", help="Compute features for existing parse results")
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback_migration()
+    else:
+        run_migration(backfill=args.backfill)
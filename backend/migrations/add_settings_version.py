@@ -0,0 +1,75 @@
+"""
+Migration: Add settings_version table
+
+Settings are cached per process. Every settings write bumps the single
+settings_version row; other processes poll it and drop their cached
+settings when it changes.
+
+Usage:
+    python migrations/add_settings_version.py
+    python migrations/add_settings_version.py --rollback
+"""
+
+import logging
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.database import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+UPGRADE_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS settings_version (
+        id INTEGER PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP
+    )
+    """,
+    "INSERT INTO settings_version (id, version, updated_at) VALUES (1, 0, NOW()) ON CONFLICT (id) DO NOTHING",
+]
+
+ROLLBACK_STATEMENTS = [
+    "DROP TABLE IF EXISTS settings_version",
+]
+
+
+def run_migration():
+    """Create settings_version table with its single row"""
+    logger.info("Starting migration: add_settings_version")
+    with engine.begin() as conn:
+        for statement in UPGRADE_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("✅ Migration completed: settings_version table created")
+
+
+def rollback_migration():
+    """Drop settings_version table"""
+    logger.warning("Rolling back migration: add_settings_version")
+    with engine.begin() as conn:
+        for statement in ROLLBACK_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("✅ Rollback completed: settings_version table dropped")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Add settings_version table")
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Rollback the migration (drop table)"
+    )
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback_migration()
+    else:
+        run_migration()
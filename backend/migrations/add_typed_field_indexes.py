@@ -0,0 +1,88 @@
+"""
+Migration: Add typed field index registry
+
+Creates the pb_try_numeric()/pb_try_timestamp() helpers used by typed
+expression indexes on document_search_index, and the typed_field_indexes
+table that tracks them. Indexes themselves are built on demand
+(POST /api/aggregations/field-indexes or the typed_field_indexes job).
+
+Usage:
+    python migrations/add_typed_field_indexes.py
+    python migrations/add_typed_field_indexes.py --rollback
+"""
+
+import logging
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.services.typed_field_index_service import TYPED_FUNCTIONS_SQL
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+UPGRADE_STATEMENTS = TYPED_FUNCTIONS_SQL + [
+    """
+    CREATE TABLE IF NOT EXISTS typed_field_indexes (
+        id SERIAL PRIMARY KEY,
+        field_name VARCHAR NOT NULL,
+        value_type VARCHAR(20) NOT NULL,
+        index_name VARCHAR(63) NOT NULL UNIQUE,
+        status VARCHAR(20) NOT NULL DEFAULT 'pending',
+        source VARCHAR(20) NOT NULL DEFAULT 'manual',
+        usage_score INTEGER NOT NULL DEFAULT 0,
+        error TEXT,
+        created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        built_at TIMESTAMP,
+        CONSTRAINT uq_typed_field_index_field_type UNIQUE (field_name, value_type)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_typed_field_indexes_id ON typed_field_indexes (id)",
+]
+
+# Drops the registry only; drop individual indexes first via the admin endpoint
+ROLLBACK_STATEMENTS = [
+    "DROP TABLE IF EXISTS typed_field_indexes",
+    "DROP FUNCTION IF EXISTS pb_try_numeric(text)",
+    "DROP FUNCTION IF EXISTS pb_try_timestamp(text)",
+]
+
+
+def run_migration():
+    """Create typed index helpers and registry table"""
+    logger.info("Starting migration: add_typed_field_indexes")
+    with engine.begin() as conn:
+        for statement in UPGRADE_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("✅ Migration completed: typed_field_indexes table and helper functions created")
+
+
+def rollback_migration():
+    """Drop typed index registry and helper functions"""
+    logger.warning("Rolling back migration: add_typed_field_indexes")
+    with engine.begin() as conn:
+        for statement in ROLLBACK_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("✅ Rollback completed: typed_field_indexes dropped")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Add typed field index registry")
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Rollback the migration (drop table)"
+    )
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback_migration()
+    else:
+        run_migration()
@@ -59,6 +59,7 @@ async def migrate_documents(batch_size: int = 100):
             
             print(f"Processing {len(documents)} documents...")
             
+            batch = []
             for doc in documents:
                 try:
                     doc_data = doc.get("data", {})
@@ -74,25 +75,29 @@ async def migrate_documents(batch_size: int = 100):
                         ]:
                             extracted_fields[key] = value
                     
-                    await pg_service.index_document(
-                        document_id=document_id,
-                        filename=doc_data.get("filename", "Unknown"),
-                        extracted_fields=extracted_fields,
-                        confidence_scores=confidence_scores,
-                        full_text=doc_data.get("full_text", ""),
-                        schema=None,  # Will be loaded from DB if needed
-                        field_metadata=None
-                    )
-                    
-                    total_migrated += 1
-                    
-                    if total_migrated % 10 == 0:
-                        print(f"  Migrated {total_migrated} documents...")
+                    batch.append({
+                        "document_id": document_id,
+                        "filename": doc_data.get("filename", "Unknown"),
+                        "extracted_fields": extracted_fields,
+                        "confidence_scores": confidence_scores,
+                        "full_text": doc_data.get("full_text", ""),
+                        "schema": None,  # Will be loaded from DB if needed
+                        "field_metadata": None
+                    })
                     
                 except Exception as e:
                     print(f"  Error migrating document {doc.get('id')}: {e}")
                     errors += 1
             
+            try:
+                # One multi-row upsert and commit per Elasticsearch page
+                stats = await pg_service.bulk_index_documents(batch, batch_size=batch_size)
+                total_migrated += stats["indexed"]
+                print(f"  Migrated {total_migrated} documents ({stats['docs_per_second']} docs/s)")
+            except Exception as e:
+                print(f"  Error indexing batch {page}: {e}")
+                errors += len(batch)
+            
             page += 1
         
         print(f"\n{'=' * 60}")
@@ -0,0 +1,151 @@
+"""
+Migration: Move Reducto parse results out of row
+
+Creates the content-addressed parse_results table and a parse_result_hash
+column on physical_files and documents, then moves existing
+reducto_parse_result JSON into the store (compressed, deduplicated by
+content) in batches. The legacy column is cleared as rows are moved but not
+dropped, so the rollback can restore it.
+
+Usage:
+    python migrations/move_parse_results_out_of_row.py
+    python migrations/move_parse_results_out_of_row.py --batch-size 200 --prune
+    python migrations/move_parse_results_out_of_row.py --rollback
+"""
+
+import logging
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, text
+
+import app.models  # noqa: F401  (register all mappers)
+from app.core.database import SessionLocal, engine
+from app.models.document import Document
+from app.models.physical_file import PhysicalFile
+from app.services.parse_result_store import get_parse_result_store
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+UPGRADE_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS parse_results (
+        content_hash VARCHAR(64) PRIMARY KEY,
+        file_hash VARCHAR,
+        parser_version VARCHAR(50),
+        codec VARCHAR(10) NOT NULL,
+        storage VARCHAR(10) NOT NULL,
+        data BYTEA,
+        raw_size INTEGER NOT NULL,
+        stored_size INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_parse_results_file_parser ON parse_results (file_hash, parser_version)",
+    # Blobs are already compressed; skip TOAST's own pglz pass
+    "ALTER TABLE parse_results ALTER COLUMN data SET STORAGE EXTERNAL",
+    "ALTER TABLE physical_files ADD COLUMN IF NOT EXISTS parse_result_hash VARCHAR(64)",
+    "CREATE INDEX IF NOT EXISTS ix_physical_files_parse_result_hash ON physical_files (parse_result_hash)",
+    "ALTER TABLE documents ADD COLUMN IF NOT EXISTS parse_result_hash VARCHAR(64)",
+    "CREATE INDEX IF NOT EXISTS ix_documents_parse_result_hash ON documents (parse_result_hash)",
+]
+
+ROLLBACK_STATEMENTS = [
+    "DROP INDEX IF EXISTS ix_documents_parse_result_hash",
+    "ALTER TABLE documents DROP COLUMN IF EXISTS parse_result_hash",
+    "DROP INDEX IF EXISTS ix_physical_files_parse_result_hash",
+    "ALTER TABLE physical_files DROP COLUMN IF EXISTS parse_result_hash",
+    "DROP TABLE IF EXISTS parse_results",
+]
+
+
+def move_rows(model, batch_size: int) -> int:
+    """Rewrite legacy in-row parse results through the store, one batch per transaction"""
+    moved = 0
+    last_id = 0
+    while True:
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(model)
+                .where(model.id > last_id, model.legacy_parse_result.isnot(None), model.parse_result_hash.is_(None))
+                .order_by(model.id)
+                .limit(batch_size)
+            ).scalars().all()
+            if not rows:
+                return moved
+            for row in rows:
+                # Setter hashes the JSON, clears the legacy column and writes the blob at flush
+                row.reducto_parse_result = row.legacy_parse_result
+            db.commit()
+            moved += len(rows)
+            last_id = rows[-1].id
+            logger.info(f"  {model.__tablename__}: moved {moved} parse results")
+        finally:
+            db.close()
+
+
+def run_migration(batch_size: int = 100, prune: bool = False):
+    """Create parse_results and move existing parse output out of row"""
+    logger.info("Starting migration: move_parse_results_out_of_row")
+    with engine.begin() as conn:
+        for statement in UPGRADE_STATEMENTS:
+            conn.execute(text(statement))
+
+    for model in (PhysicalFile, Document):
+        moved = move_rows(model, batch_size)
+        logger.info(f"Moved {moved} parse results from {model.__tablename__}")
+
+    if prune:
+        db = SessionLocal()
+        try:
+            pruned = get_parse_result_store().prune_unreferenced(db)
+            logger.info(f"Pruned {pruned} unreferenced parse results")
+        finally:
+            db.close()
+
+    logger.info("✅ Migration completed: parse results stored out of row")
+
+
+def rollback_migration():
+    """Copy parse results back into the JSON columns and drop the store"""
+    logger.warning("Rolling back migration: move_parse_results_out_of_row")
+    store = get_parse_result_store()
+    for model in (PhysicalFile, Document):
+        db = SessionLocal()
+        try:
+            rows = db.execute(select(model).where(model.parse_result_hash.isnot(None))).scalars().all()
+            for row in rows:
+                row.legacy_parse_result = store.get(row.parse_result_hash)
+            db.commit()
+            logger.info(f"Restored {len(rows)} parse results into {model.__tablename__}")
+        finally:
+            db.close()
+
+    with engine.begin() as conn:
+        for statement in ROLLBACK_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("✅ Rollback completed: parse_results table dropped")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Move Reducto parse results out of row")
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Rollback the migration (restore JSON columns, drop table)"
+    )
+    parser.add_argument("--batch-size", type=int, default=100, help="Rows moved per transaction")
+    parser.add_argument("--prune", action="store_true", help="Delete blobs no row references afterwards")
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback_migration()
+    else:
+        run_migration(batch_size=args.batch_size, prune=args.prune)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark the bulk upload ingest stage with a fake Reducto parser.
+
+Runs the same batch at different parse concurrency limits against an
+in-memory SQLite database and prints per-stage timings.
+
+Usage:
+    python scripts/benchmark_bulk_ingest.py --files 200 --latency 0.05
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from io import BytesIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("REDUCTO_API_KEY", "benchmark")
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+
+from fastapi import UploadFile  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+import app.models  # noqa: E402,F401  (register all mappers)
+from app.core.database import Base  # noqa: E402
+from app.models.document import Document  # noqa: E402
+from app.models.physical_file import PhysicalFile  # noqa: E402
+from app.services.bulk_ingest_service import BulkIngestService  # noqa: E402
+
+
+class FakeReductoService:
+    """Simulates Reducto parse latency without network calls."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def parse_document(self, file_path: str):
+        await asyncio.sleep(self.latency)
+        return {"job_id": os.path.basename(file_path), "result": {"chunks": [{"content": "x" * 500}]}}
+
+
+async def run(files: int, latency: float, concurrency: int, batch_size: int) -> dict:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine, tables=[PhysicalFile.__table__, Document.__table__])
+    db = sessionmaker(bind=engine, autoflush=False)()
+    uploads = [
+        UploadFile(file=BytesIO(os.urandom(64 * 1024)), filename=f"file_{i}.pdf") for i in range(files)
+    ]
+    try:
+        with tempfile.TemporaryDirectory() as upload_dir:
+            service = BulkIngestService(
+                db,
+                FakeReductoService(latency),
+                parse_concurrency=concurrency,
+                commit_batch_size=batch_size,
+                upload_dir=upload_dir
+            )
+            result = await service.ingest(uploads)
+        return result["timings"]
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake parse latency (seconds)")
+    parser.add_argument("--batch-size", type=int, default=25)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    print(f"{args.files} files, {args.latency * 1000:.0f}ms fake parse latency")
+    print(f"{'concurrency':>12} {'read_hash':>10} {'store':>8} {'parse':>8} {'commit':>8} {'total':>8}")
+    for concurrency in args.concurrency:
+        t = asyncio.run(run(args.files, args.latency, concurrency, args.batch_size))
+        print(
+            f"{concurrency:>12} {t['read_hash_seconds']:>10.3f} {t['store_seconds']:>8.3f} "
+            f"{t['parse_seconds']:>8.3f} {t['commit_seconds']:>8.3f} {t['total_seconds']:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
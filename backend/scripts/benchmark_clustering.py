@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark upload clustering: quadratic Jaccard vs MinHash/LSH candidates.
+
+Generates synthetic bulk uploads (documents drawn from a set of templates
+with per-document noise, plus unrelated one-offs) and clusters them three ways:
+
+    legacy      the previous implementation: word sets rebuilt from text on
+                every seed/candidate comparison
+    exhaustive  precomputed token sets, every unclustered doc compared
+    lsh         precomputed token sets, MinHash/LSH candidates only
+
+Quality is reported against "exhaustive" (same seed order, so any difference
+is a pair LSH failed to propose): pair precision/recall and cluster counts.
+
+Usage:
+    python scripts/benchmark_clustering.py
+    python scripts/benchmark_clustering.py --sizes 100 1000 10000 --legacy-max 1000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from itertools import combinations
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("REDUCTO_API_KEY", "benchmark")
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+
+from app.services.document_clustering import cluster_documents, lsh_params  # noqa: E402
+from app.services.match_feature_service import jaccard, normalize_tokens  # noqa: E402
+
+VOCABULARY_SIZE = 20000
+TEMPLATE_WORDS = 150
+
+
+def synthetic_upload(count: int, seed: int = 7, one_off_fraction: float = 0.2):
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(VOCABULARY_SIZE)]
+    templates = [rng.sample(vocabulary, TEMPLATE_WORDS) for _ in range(max(5, count // 25))]
+
+    docs = []
+    for i in range(count):
+        if rng.random() < one_off_fraction:
+            words = rng.sample(vocabulary, TEMPLATE_WORDS)
+        else:
+            noise = rng.uniform(0.0, 0.1)
+            words = [rng.choice(vocabulary) if rng.random() < noise else w for w in rng.choice(templates)]
+        words += [f"ref{i}x{j}" for j in range(5)]  # Invoice numbers, dates, ...
+        text = " ".join(words)
+        docs.append({"id": i, "filename": f"doc{i}.pdf", "text": text, "tokens": normalize_tokens(text)})
+    return docs
+
+
+def legacy_cluster(docs, threshold: float):
+    """Previous algorithm: every comparison re-tokenizes both texts."""
+    unclustered = [d["id"] for d in docs]
+    lookup = {d["id"]: d for d in docs}
+    clusters = []
+    while unclustered:
+        seed_id = unclustered.pop(0)
+        members = [seed_id]
+        for candidate_id in list(unclustered):
+            similarity = jaccard(normalize_tokens(lookup[seed_id]["text"]), normalize_tokens(lookup[candidate_id]["text"]))
+            if similarity >= threshold:
+                members.append(candidate_id)
+                unclustered.remove(candidate_id)
+        clusters.append({"document_ids": members})
+    return clusters
+
+
+def same_cluster_pairs(clusters):
+    return {pair for c in clusters for pair in combinations(sorted(c["document_ids"]), 2)}
+
+
+def timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--threshold", type=float, default=0.75)
+    parser.add_argument("--legacy-max", type=int, default=1000, help="Skip the legacy run above this size")
+    args = parser.parse_args()
+
+    bands, rows = lsh_params(args.threshold)
+    print(f"threshold {args.threshold}: {bands} bands x {rows} rows")
+    print(f"{'docs':>6} {'legacy s':>9} {'exhaust s':>10} {'lsh s':>7} {'speedup':>8} "
+          f"{'clusters ex/lsh':>16} {'pair recall':>12} {'pair prec':>10}")
+
+    for size in args.sizes:
+        docs = synthetic_upload(size)
+        legacy_seconds = None
+        if size <= args.legacy_max:
+            _, legacy_seconds = timed(legacy_cluster, docs, args.threshold)
+        exhaustive, exhaustive_seconds = timed(cluster_documents, docs, args.threshold, use_lsh=False)
+        lsh, lsh_seconds = timed(cluster_documents, docs, args.threshold, use_lsh=True)
+
+        expected, found = same_cluster_pairs(exhaustive), same_cluster_pairs(lsh)
+        recall = len(expected & found) / len(expected) if expected else 1.0
+        precision = len(expected & found) / len(found) if found else 1.0
+        baseline = legacy_seconds if legacy_seconds is not None else exhaustive_seconds
+        print(
+            f"{size:>6} {legacy_seconds if legacy_seconds is not None else float('nan'):>9.2f} "
+            f"{exhaustive_seconds:>10.2f} {lsh_seconds:>7.2f} {baseline / max(lsh_seconds, 1e-6):>7.1f}x "
+            f"{len(exhaustive):>7}/{len(lsh):<8} {recall:>12.4f} {precision:>10.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
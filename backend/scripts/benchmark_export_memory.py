@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark export memory: in-memory ExportService vs streaming exports.
+
+Seeds a SQLite file per document count, then runs each export in a fresh
+subprocess so peak RSS (ru_maxrss) belongs to that export alone. The
+in-memory path should grow linearly with document count; the streaming
+path should stay roughly flat.
+
+Usage:
+    python scripts/benchmark_export_memory.py --counts 1000,10000,50000
+    python scripts/benchmark_export_memory.py --counts 20000 --formats excel --fields 20
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("REDUCTO_API_KEY", "benchmark")
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+import app.models  # noqa: E402,F401  (register all mappers)
+from app.core.database import Base  # noqa: E402
+from app.models.document import Document, ExtractedField  # noqa: E402
+from app.services.export_service import ExportService  # noqa: E402
+from app.services.streaming_export_service import (  # noqa: E402
+    ExportFilters,
+    StreamingExportService,
+)
+
+SEED_CHUNK = 2000
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def seed(path: str, count: int, fields: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[Document.__table__, ExtractedField.__table__])
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        for start in range(0, count, SEED_CHUNK):
+            ids = range(start + 1, min(start + SEED_CHUNK, count) + 1)
+            conn.execute(insert(Document), [
+                {"id": i, "filename": f"doc_{i}.pdf", "status": "completed", "uploaded_at": now, "processed_at": now}
+                for i in ids
+            ])
+            rows = []
+            for i in ids:
+                for f in range(fields):
+                    rows.append({
+                        "document_id": i, "field_name": f"field_{f}", "field_type": "text",
+                        "field_value": f"value {i}-{f} " * 3, "field_value_json": None,
+                        "confidence_score": 0.9, "verified": False
+                    })
+                rows.append({
+                    "document_id": i, "field_name": "line_items", "field_type": "array_of_objects", "field_value": None,
+                    "field_value_json": [{"sku": f"SKU-{i}-{n}", "qty": n, "price": 9.99} for n in range(5)],
+                    "confidence_score": 0.8, "verified": False
+                })
+            conn.execute(insert(ExtractedField), rows)
+    engine.dispose()
+
+
+def run_child(path: str, mode: str, format: str) -> dict:
+    """Run one export in this process and report timings and peak RSS."""
+    engine = create_engine(f"sqlite:///{path}")
+    factory = sessionmaker(bind=engine)
+    baseline = peak_rss_mb()
+    started = time.perf_counter()
+    output_bytes = 0
+
+    if mode == "in-memory":
+        db = factory()
+        try:
+            documents = ExportService.build_export_query(db).all()
+            records = ExportService.documents_to_records(documents)
+            if format == "csv":
+                data = ExportService.export_to_csv(records)
+            else:
+                data = ExportService.export_to_excel(records, documents=documents)
+            output_bytes = len(data)
+        finally:
+            db.close()
+    else:
+        exporter = StreamingExportService(ExportFilters(), session_factory=factory)
+        chunks = exporter.stream_csv() if format == "csv" else exporter.stream_excel()
+        for chunk in chunks:
+            output_bytes += len(chunk)
+
+    engine.dispose()
+    return {
+        "seconds": round(time.perf_counter() - started, 2),
+        "baseline_rss_mb": round(baseline, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "output_mb": round(output_bytes / (1024 * 1024), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak RSS of exports vs document count")
+    parser.add_argument("--counts", default="1000,5000,20000", help="Comma-separated document counts")
+    parser.add_argument("--formats", default="csv,excel", help="Comma-separated formats (csv, excel)")
+    parser.add_argument("--modes", default="in-memory,streaming", help="Comma-separated export paths")
+    parser.add_argument("--fields", type=int, default=12, help="Simple fields per document")
+    parser.add_argument("--child", nargs=3, metavar=("DB", "MODE", "FORMAT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(*args.child)))
+        return
+
+    print(f"{'docs':>8} {'format':>6} {'mode':>10} {'seconds':>8} {'peak MB':>8} {'delta MB':>9} {'output MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in [int(c) for c in args.counts.split(",")]:
+            path = os.path.join(tmp, f"export_{count}.db")
+            seed(path, count, args.fields)
+            for format in args.formats.split(","):
+                for mode in args.modes.split(","):
+                    result = subprocess.run(
+                        [sys.executable, os.path.abspath(__file__), "--child", path, mode, format],
+                        capture_output=True, text=True, check=True
+                    )
+                    stats = json.loads(result.stdout.strip().splitlines()[-1])
+                    delta = stats["peak_rss_mb"] - stats["baseline_rss_mb"]
+                    print(
+                        f"{count:>8} {format:>6} {mode:>10} {stats['seconds']:>8} "
+                        f"{stats['peak_rss_mb']:>8} {delta:>9.1f} {stats['output_mb']:>10}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
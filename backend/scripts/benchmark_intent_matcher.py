@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark QueryIntentMatcher: one substring check per phrase vs one automaton pass.
+
+Builds a field-alias catalogue the size of a large registry (--templates x
+--fields canonical fields, a few aliases each, on top of the default aliases)
+and a query corpus, then for each query finds every intent phrase and field
+alias two ways and prints the per-query latency:
+
+    per-phrase  the previous shape: ``phrase in query_lower`` for every
+                keyword list and every alias
+    compiled    QueryIntentMatcher.scan: one Aho-Corasick pass
+
+Both must report the same labels for every query; the script exits non-zero
+otherwise. Also times a full understand_query_intent with the compiled matcher.
+
+Usage:
+    python scripts/benchmark_intent_matcher.py
+    python scripts/benchmark_intent_matcher.py --templates 500 --fields 20 --repeat 5
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("REDUCTO_API_KEY", "benchmark")
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+
+from app.services.query_intent_matcher import TERM_CATEGORIES, QueryIntentMatcher  # noqa: E402
+from app.services.query_optimizer import DEFAULT_FIELD_ALIASES, QueryOptimizer  # noqa: E402
+
+QUERIES = [
+    "show me invoices over $5,000 from last month",
+    "how many contracts are pending",
+    "total amount by vendor this year",
+    "list the latest completed purchase orders",
+    "find documents with \"net 30\" payment terms",
+    "average invoice total between 1,000 and 2,500",
+    "which receipts were uploaded yesterday",
+    "contracts expiring this quarter with renewal value above 10000",
+    "oldest unpaid bills from acme",
+    "group by category for the past week",
+]
+
+WORDS = ["invoice", "contract", "vendor", "customer", "shipping", "tax", "discount", "renewal",
+         "payment", "policy", "claim", "premium", "deductible", "carrier", "warehouse", "sku"]
+
+
+def build_catalogue(templates: int, fields: int) -> dict:
+    rng = random.Random(42)
+    aliases = {name: list(values) for name, values in DEFAULT_FIELD_ALIASES.items()}
+    for t in range(templates):
+        for f in range(fields):
+            first, second = rng.sample(WORDS, 2)
+            aliases[f"t{t}_{first}_{second}_{f}"] = [
+                f"{first}_{second}_{f}", f"{first} {second} {t}", f"{second}{f}"
+            ]
+    return aliases
+
+
+def per_phrase_scan(query_lower: str, field_aliases: dict) -> dict:
+    """Every label whose phrases occur in the query, one substring check at a time."""
+    found = {}
+    for category, terms in TERM_CATEGORIES.items():
+        for label, phrases in terms.items():
+            if any(phrase in query_lower for phrase in phrases):
+                found.setdefault(category, set()).add(label)
+    for canonical_name, aliases in field_aliases.items():
+        if any(alias.lower() in query_lower for alias in aliases if alias):
+            found.setdefault("field", set()).add(canonical_name)
+    return found
+
+
+def timed(fn, queries, repeat: int) -> float:
+    """Best per-query latency in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for query in queries:
+            fn(query)
+        best = min(best, time.perf_counter() - start)
+    return best / len(queries) * 1e6
+
+
+def main(templates: int, fields: int, repeat: int) -> int:
+    field_aliases = build_catalogue(templates, fields)
+    start = time.perf_counter()
+    matcher = QueryIntentMatcher(field_aliases)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    # Mix in alias mentions so field matches are exercised too
+    rng = random.Random(7)
+    alias_pool = [alias for aliases in field_aliases.values() for alias in aliases]
+    queries = [query.lower() for query in QUERIES]
+    queries += [f"{query} {rng.choice(alias_pool)}".lower() for query in QUERIES]
+
+    mismatches = 0
+    for query in queries:
+        compiled = matcher.scan(query)
+        expected = per_phrase_scan(query, field_aliases)
+        actual = {category: compiled.labels(category) for category in [*TERM_CATEGORIES, "field"]
+                  if compiled.labels(category)}
+        if actual != expected:
+            mismatches += 1
+            print(f"MISMATCH: {query!r}\n  per-phrase: {expected}\n  compiled:   {actual}")
+
+    per_phrase_us = timed(lambda q: per_phrase_scan(q, field_aliases), queries, repeat)
+    compiled_us = timed(matcher.scan, queries, repeat)
+
+    optimizer = QueryOptimizer()
+    optimizer.field_aliases = field_aliases
+    optimizer.intent_matcher = matcher
+    available_fields = ["invoice_total", "vendor_name", "invoice_date", "status"]
+    analysis_us = timed(lambda q: optimizer.understand_query_intent(q, available_fields), queries, repeat)
+
+    print(f"Catalogue:  {len(field_aliases)} canonical fields, {matcher.phrase_count} phrases "
+          f"(automaton built in {build_ms:.1f} ms)")
+    print(f"Queries:    {len(queries)}, best of {repeat}")
+    print(f"per-phrase  {per_phrase_us:10.1f} us/query")
+    print(f"compiled    {compiled_us:10.1f} us/query  ({per_phrase_us / compiled_us:.1f}x)")
+    print(f"analysis    {analysis_us:10.1f} us/query  (understand_query_intent, compiled)")
+    print(f"Mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the compiled query intent matcher")
+    parser.add_argument("--templates", type=int, default=200, help="Templates in the synthetic catalogue")
+    parser.add_argument("--fields", type=int, default=15, help="Canonical fields per template")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    sys.exit(main(args.templates, args.fields, args.repeat))
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark get_multi_aggregations: one query per aggregation vs one batched query.
+
+Needs PostgreSQL (document_search_index uses JSONB). Seeds synthetic rows
+tagged with a filename prefix, runs a dashboard-sized batch of aggregations
+both ways, prints statement counts and timings, then deletes the seeded rows.
+
+Usage:
+    python scripts/benchmark_multi_aggregations.py --database-url postgresql://... --docs 50000
+    python scripts/benchmark_multi_aggregations.py --docs 0 --repeat 20   # existing data only
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("REDUCTO_API_KEY", "benchmark")
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+
+from sqlalchemy import create_engine, delete, event, insert, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+import app.models  # noqa: E402,F401  (register all mappers)
+from app.core.config import settings  # noqa: E402
+from app.models.document import Document  # noqa: E402
+from app.models.search_index import DocumentSearchIndex  # noqa: E402
+from app.services.postgres_service import PostgresService  # noqa: E402
+
+SEED_PREFIX = "benchmark_multi_agg_"
+SEED_CHUNK = 2000
+
+DASHBOARD_AGGREGATIONS = [
+    {"name": "total_docs", "field": "vendor", "type": "cardinality"},
+    {"name": "status_breakdown", "field": "status", "type": "terms", "config": {"size": 20}},
+    {"name": "vendors", "field": "vendor", "type": "terms", "config": {"size": 10}},
+    {"name": "amount_stats", "field": "amount", "type": "stats"},
+    {"name": "amount_percentiles", "field": "amount", "type": "percentiles"},
+    {"name": "amount_ranges", "field": "amount", "type": "range", "config": {"ranges": [
+        {"to": 100}, {"from": 100, "to": 1000}, {"from": 1000}
+    ]}},
+    {"name": "monthly", "field": "invoice_date", "type": "date_histogram", "config": {"interval": "month"}},
+    {"name": "currencies", "field": "currency", "type": "terms", "config": {"size": 5}},
+]
+
+
+def seed(factory, count: int) -> None:
+    rng = random.Random(42)
+    start_date = datetime(2023, 1, 1)
+    with factory() as db:
+        for start in range(0, count, SEED_CHUNK):
+            ids = db.execute(insert(Document).returning(Document.id), [
+                {"filename": f"{SEED_PREFIX}{i}.pdf", "status": "completed"}
+                for i in range(start, min(start + SEED_CHUNK, count))
+            ]).scalars().all()
+            db.execute(insert(DocumentSearchIndex), [
+                {
+                    "document_id": document_id,
+                    "extracted_fields": {
+                        "status": rng.choice(["paid", "open", "overdue", "void"]),
+                        "vendor": f"Vendor {rng.randint(1, 500)}",
+                        "amount": str(round(rng.lognormvariate(5, 1.2), 2)),
+                        "currency": rng.choice(["USD", "EUR", "GBP"]),
+                        "invoice_date": (start_date + timedelta(days=rng.randint(0, 700))).isoformat(),
+                    },
+                    "query_context": {}, "confidence_metrics": {}, "citation_metadata": {}, "field_metadata": {},
+                }
+                for document_id in ids
+            ])
+            db.commit()
+
+
+def cleanup(factory) -> None:
+    with factory() as db:
+        db.execute(delete(Document).where(Document.filename.like(f"{SEED_PREFIX}%")))
+        db.commit()
+
+
+def normalized(results: dict) -> dict:
+    """Bucket order among equal counts is unspecified in the per-aggregation path."""
+    return {
+        name: sorted(map(repr, value["buckets"])) if "buckets" in value else value
+        for name, value in results.items()
+    }
+
+
+async def timed(factory, engine, batched: bool, repeat: int) -> dict:
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+    timings = []
+    try:
+        with factory() as db:
+            service = PostgresService(db)
+            for _ in range(repeat):
+                started = time.perf_counter()
+                if batched:
+                    result = await service.get_multi_aggregations(DASHBOARD_AGGREGATIONS)
+                else:
+                    result = await service._get_aggregations_individually(DASHBOARD_AGGREGATIONS)
+                timings.append(time.perf_counter() - started)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    timings.sort()
+    return {
+        "statements": len(statements) // repeat,
+        "median_ms": round(timings[len(timings) // 2] * 1000, 1),
+        "min_ms": round(timings[0] * 1000, 1),
+        "result": result,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--docs", type=int, default=20000, help="Synthetic rows to seed (0 = use existing data)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    factory = sessionmaker(bind=engine, autoflush=False)
+
+    if args.docs:
+        print(f"Seeding {args.docs} rows...")
+        seed(factory, args.docs)
+    try:
+        with factory() as db:
+            rows = db.execute(select(DocumentSearchIndex.id).limit(1)).first()
+        if rows is None:
+            print("document_search_index is empty; pass --docs to seed rows")
+            return
+
+        separate = await timed(factory, engine, batched=False, repeat=args.repeat)
+        batched = await timed(factory, engine, batched=True, repeat=args.repeat)
+
+        print(f"{len(DASHBOARD_AGGREGATIONS)} aggregations, median of {args.repeat} runs")
+        print(f"{'mode':>10} {'statements':>11} {'median ms':>10} {'min ms':>8}")
+        for mode, stats in (("separate", separate), ("batched", batched)):
+            print(f"{mode:>10} {stats['statements']:>11} {stats['median_ms']:>10} {stats['min_ms']:>8}")
+        print(f"speedup: {separate['median_ms'] / max(batched['median_ms'], 0.1):.1f}x")
+        print(f"same results: {normalized(separate['result']) == normalized(batched['result'])}")
+    finally:
+        if args.docs:
+            cleanup(factory)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark ComparisonService.get_trend: one scan per bucket vs one GROUP BY.
+
+Needs PostgreSQL (document_search_index uses JSONB). Seeds synthetic invoices
+spread over ~100 weeks, then for each bucket count runs a weekly sum trend
+two ways and prints statement counts and latency:
+
+    per-bucket  the previous shape: list the buckets, then one filtered
+                aggregate query per bucket
+    grouped     get_trend: one date_trunc GROUP BY returning every bucket
+
+Seeded rows are deleted afterwards.
+
+Usage:
+    python scripts/benchmark_trends.py --database-url postgresql://... --docs 50000
+    python scripts/benchmark_trends.py --buckets 4 26 100 --repeat 10
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("REDUCTO_API_KEY", "benchmark")
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+
+from sqlalchemy import create_engine, delete, event, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+import app.models  # noqa: E402,F401  (register all mappers)
+from app.core.config import settings  # noqa: E402
+from app.models.document import Document  # noqa: E402
+from app.models.search_index import DocumentSearchIndex  # noqa: E402
+from app.services.comparison_service import ComparisonService  # noqa: E402
+
+SEED_PREFIX = "benchmark_trends_"
+SEED_CHUNK = 2000
+START = datetime(2023, 1, 2)  # A Monday, so weekly buckets line up with the ranges
+
+
+def seed(factory, count: int) -> None:
+    rng = random.Random(42)
+    with factory() as db:
+        for start in range(0, count, SEED_CHUNK):
+            ids = db.execute(insert(Document).returning(Document.id), [
+                {"filename": f"{SEED_PREFIX}{i}.pdf", "status": "completed"}
+                for i in range(start, min(start + SEED_CHUNK, count))
+            ]).scalars().all()
+            db.execute(insert(DocumentSearchIndex), [
+                {
+                    "document_id": document_id,
+                    "extracted_fields": {
+                        "amount": str(round(rng.lognormvariate(5, 1.2), 2)),
+                        "invoice_date": (START + timedelta(days=rng.randint(0, 700))).isoformat(),
+                    },
+                    "query_context": {}, "confidence_metrics": {}, "citation_metadata": {}, "field_metadata": {},
+                }
+                for document_id in ids
+            ])
+            db.commit()
+
+
+def cleanup(factory) -> None:
+    with factory() as db:
+        db.execute(delete(Document).where(Document.filename.like(f"{SEED_PREFIX}%")))
+        db.commit()
+
+
+async def per_bucket_trend(service: ComparisonService, end: datetime):
+    """One aggregate query per weekly bucket, as get_trend used to run."""
+    buckets = await service.postgres.get_metric_trend(
+        "amount", "count", date_field="invoice_date", interval="week",
+        date_range={"from": START.isoformat(), "to": end.isoformat()}
+    )
+    values = []
+    for bucket in buckets:
+        bucket_start = datetime.fromisoformat(bucket["key"])
+        [metrics] = await service.postgres.get_period_metrics(
+            "amount", "sum", date_field="invoice_date",
+            periods=[{"from": bucket_start.isoformat(), "to": (bucket_start + timedelta(weeks=1)).isoformat()}]
+        )
+        values.append(metrics["value"])
+    return values
+
+
+async def grouped_trend(service: ComparisonService, end: datetime):
+    result = await service.get_trend(
+        "amount", "sum", interval="week", start_date=START.isoformat(), end_date=end.isoformat(),
+        filters={"date_field": "invoice_date"}
+    )
+    return [point["value"] for point in result["data"]]
+
+
+async def timed(factory, engine, trend, buckets: int, repeat: int) -> dict:
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    end = START + timedelta(weeks=buckets)
+    event.listen(engine, "before_cursor_execute", count_statement)
+    timings = []
+    try:
+        with factory() as db:
+            service = ComparisonService(db)
+            for _ in range(repeat):
+                started = time.perf_counter()
+                values = await trend(service, end)
+                timings.append(time.perf_counter() - started)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    timings.sort()
+    return {
+        "statements": len(statements) // repeat,
+        "median_ms": round(timings[len(timings) // 2] * 1000, 1),
+        "values": [round(v, 2) for v in values],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--docs", type=int, default=20000, help="Synthetic rows to seed")
+    parser.add_argument("--buckets", type=int, nargs="+", default=[4, 12, 26, 52, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    factory = sessionmaker(bind=engine, autoflush=False)
+
+    print(f"Seeding {args.docs} rows...")
+    seed(factory, args.docs)
+    try:
+        print(f"Weekly sum trend, median of {args.repeat} runs")
+        print(f"{'buckets':>8} {'per-bucket stmts':>17} {'ms':>8} {'grouped stmts':>14} {'ms':>8} "
+              f"{'speedup':>8} {'same':>5}")
+        for buckets in args.buckets:
+            legacy = await timed(factory, engine, per_bucket_trend, buckets, args.repeat)
+            grouped = await timed(factory, engine, grouped_trend, buckets, args.repeat)
+            print(
+                f"{buckets:>8} {legacy['statements']:>17} {legacy['median_ms']:>8} "
+                f"{grouped['statements']:>14} {grouped['median_ms']:>8} "
+                f"{legacy['median_ms'] / max(grouped['median_ms'], 0.1):>7.1f}x "
+                f"{str(legacy['values'] == grouped['values']):>5}"
+            )
+    finally:
+        cleanup(factory)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
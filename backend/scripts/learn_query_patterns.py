@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Learn query patterns from the existing query cache.
+
+Every cached search query Claude parsed is abstracted into a pattern (see
+app.services.query_pattern_service), so questions of the same shape skip the
+Claude parse from the first request after deploy. Aggregation and comparison
+entries are skipped: the query cache does not keep their specs.
+
+Usage:
+    python scripts/learn_query_patterns.py
+    python scripts/learn_query_patterns.py --limit 5000
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("REDUCTO_API_KEY", "learn-patterns")
+os.environ.setdefault("ANTHROPIC_API_KEY", "learn-patterns")
+
+import app.models  # noqa: E402,F401  (register all mappers)
+from app.core.database import SessionLocal  # noqa: E402
+from app.models.query_pattern import QueryCache, QueryPattern  # noqa: E402
+from app.services.query_pattern_service import learn_query_pattern  # noqa: E402
+
+
+def main(limit: int):
+    db = SessionLocal()
+    learned, skipped = set(), 0
+    try:
+        entries = db.query(QueryCache).order_by(QueryCache.hit_count.desc()).limit(limit).all()
+        for entry in entries:
+            # Entries cached with a folder filter baked in are not reusable shapes
+            if entry.query_type in ("aggregation", "comparison") or "folder_path" in json.dumps(entry.es_query):
+                skipped += 1
+                continue
+            nl_result = {
+                "elasticsearch_query": entry.es_query,
+                "query_type": entry.query_type,
+                "explanation": entry.explanation
+            }
+            pattern = learn_query_pattern(db, entry.original_query, nl_result)
+            if pattern is None:
+                skipped += 1
+            else:
+                learned.add(pattern.id)
+        total = db.query(QueryPattern).count()
+    finally:
+        db.close()
+
+    print(f"Cached queries: {len(entries)}")
+    print(f"Patterns:       {len(learned)} learned or confirmed, {total} stored")
+    print(f"Skipped:        {skipped} (no abstractable literal, aggregation/comparison, or folder-scoped)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Learn query patterns from the query cache")
+    parser.add_argument("--limit", type=int, default=10000, help="Most-hit cached queries to learn from")
+    args = parser.parse_args()
+    main(args.limit)
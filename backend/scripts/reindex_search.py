@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Rebuild the PostgreSQL search index from the database.
+
+Reindexes one template's documents (--template-id) or the whole corpus with
+batched upserts, and prints the throughput. Same work as the admin
+POST /api/search/reindex job, run in the foreground.
+
+Usage:
+    python scripts/reindex_search.py
+    python scripts/reindex_search.py --template-id 3 --batch-size 1000
+    python scripts/reindex_search.py --copy
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("REDUCTO_API_KEY", "reindex")
+os.environ.setdefault("ANTHROPIC_API_KEY", "reindex")
+
+import app.models  # noqa: E402,F401  (register all mappers)
+from app.core.database import SessionLocal  # noqa: E402
+from app.services.search_reindex import reindex_documents  # noqa: E402
+
+
+async def main(template_id, batch_size: int, use_copy: bool):
+    db = SessionLocal()
+    try:
+        stats = await reindex_documents(db, template_id=template_id, batch_size=batch_size, use_copy=use_copy)
+    finally:
+        db.close()
+
+    print(f"Indexed:    {stats['indexed']} documents ({stats['chunks']} chunks)")
+    print(f"Batches:    {stats['batches']} x {batch_size} via {stats['method']}")
+    print(f"Elapsed:    {stats['seconds']}s")
+    print(f"Throughput: {stats['docs_per_second']} docs/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the search index")
+    parser.add_argument("--template-id", type=int, default=None, help="Only documents of this template (schema id)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Documents per upsert and commit")
+    parser.add_argument("--copy", action="store_true", help="Load batches with COPY (psycopg2/asyncpg)")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.template_id, args.batch_size, args.copy))
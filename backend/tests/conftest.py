@@ -2,11 +2,17 @@
 Pytest configuration and fixtures for Paperbase tests.
 """
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from app.core.database import Base, get_db
+from sqlalchemy.pool import NullPool, StaticPool
+from app.core.database import Base, get_async_db, get_db
 from app.main import app
+from app.services import parse_result_store
+from app.services.parse_result_store import ParseResultStore
+from app.services.settings_service import get_settings_cache
 
 
 # Test database
@@ -18,6 +24,35 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine on the same file (NullPool: each TestClient portal runs its own event loop)
+async_engine = create_async_engine(
+    SQLALCHEMY_TEST_DATABASE_URL.replace("sqlite:///", "sqlite+aiosqlite:///"),
+    poolclass=NullPool
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_settings_cache():
+    """
+    Tests recreate tables on the same engine, so cached settings must not leak between them.
+    """
+    get_settings_cache().clear()
+    yield
+    get_settings_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def isolated_parse_result_store(monkeypatch):
+    """
+    Parse results read through the test database, with an empty cache per test.
+    """
+    monkeypatch.setattr(
+        parse_result_store, "_parse_result_store", ParseResultStore(session_factory=TestingSessionLocal, storage="db")
+    )
+
 
 @pytest.fixture(scope="function")
 def db_session():
@@ -33,6 +68,47 @@ def db_session():
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture
+def memory_engine():
+    """
+    Factory for in-memory SQLite engines holding only the given tables.
+
+    ``engine = memory_engine(Document.__table__, ...)`` (every table when none
+    are given). Sessions on one engine share its single connection, so they
+    see the same database. Engines are disposed when the test ends.
+    """
+    engines = []
+
+    def create(*tables):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine, tables=list(tables) or None)
+        engines.append(engine)
+        return engine
+
+    yield create
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def async_memory_engine():
+    """
+    memory_engine for AsyncSession tests (aiosqlite): ``engine = await async_memory_engine(...)``.
+    """
+    engines = []
+
+    async def create(*tables):
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=list(tables) or None))
+        engines.append(engine)
+        return engine
+
+    yield create
+    for engine in engines:
+        await engine.dispose()
+
+
 @pytest.fixture(scope="function")
 def client(db_session):
     """
@@ -44,7 +120,12 @@ def client(db_session):
         finally:
             pass
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -0,0 +1,130 @@
+"""
+Unit tests for the batched multi-aggregation planner.
+
+document_search_index is Postgres-only (JSONB), so statements are compiled
+with the PostgreSQL dialect and results are fed back as canned rows.
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.models.search_index import DocumentSearchIndex
+from app.services import typed_field_index_service
+from app.services.aggregation_planner import plan_multi_aggregations
+from app.services.postgres_service import PostgresService
+from app.services.typed_field_index_service import TypedFieldRegistry
+
+AGGREGATIONS = [
+    {"name": "by_status", "field": "status", "type": "terms", "config": {"size": 2}},
+    {"name": "top_status", "field": "status", "type": "terms", "config": {"size": 1}},
+    {"name": "amount_stats", "field": "amount", "type": "stats"},
+    {"name": "vendors", "field": "vendor", "type": "cardinality"},
+    {"name": "amount_pct", "field": "amount", "type": "percentiles", "config": {"percents": [50, 90]}},
+    {"name": "amount_ranges", "field": "amount", "type": "range", "config": {"ranges": [{"to": 100}, {"from": 100}]}},
+    {"name": "monthly", "field": "invoice_date", "type": "date_histogram", "config": {"interval": "month"}},
+    {"name": "no_ranges", "field": "amount", "type": "range"},
+    {"name": "unsupported", "field": "amount", "type": "geo_bounds"},
+]
+
+
+@pytest.fixture(autouse=True)
+def typed_fields(monkeypatch):
+    """No typed indexes; loaded so the registry never queries RecordingSession."""
+    registry = TypedFieldRegistry(ttl_seconds=3600)
+    registry.set_fields(set())
+    monkeypatch.setattr(typed_field_index_service, "_typed_field_registry", registry)
+    return registry
+
+
+class RecordingSession:
+    """Sync-session stand-in that records statements and returns canned rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        return SimpleNamespace(all=lambda: self.rows)
+
+    def rollback(self):
+        pass
+
+
+def _row(**values):
+    return SimpleNamespace(_mapping=values)
+
+
+def _scalar(**values):
+    base = {
+        "total": 5, "a2_count": 4, "a2_sum": 450.0, "a2_avg": 112.5, "a2_min": 50.0, "a2_max": 200.0,
+        "a3_value": 3, "a4_p0": 100.0, "a4_p1": 180.0,
+    }
+    base.update(values)
+    return base
+
+
+@pytest.mark.unit
+def test_batch_compiles_to_one_scan():
+    plan = plan_multi_aggregations(AGGREGATIONS)
+    source = PostgresService(None)._apply_filters(select(DocumentSearchIndex), {"status": "completed"})
+    sql = str(plan.build(source).compile(dialect=postgresql.dialect()))
+
+    assert sql.count("FROM document_search_index") == 1
+    assert "GROUPING SETS" in sql
+    assert "percentile_cont" in sql
+    # status, amount (float), vendor, amount range bucket, invoice month: each projected once
+    assert len(plan._projections) == 5
+    # Both terms aggregations on status share one grouping set
+    assert len(plan._grouping_sets) == 3
+    assert plan_multi_aggregations([{"name": "x", "field": "a", "type": "geo_bounds"}]) is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_results_match_get_aggregations_shape():
+    # Key columns: k0 = status terms, k1 = amount ranges, k2 = monthly histogram
+    rows = [
+        _row(**_scalar(), k0="paid", k1=None, k2=None, grouping_id=3, doc_count=3, bucket_rank=1),
+        _row(**_scalar(), k0="open", k1=None, k2=None, grouping_id=3, doc_count=2, bucket_rank=2),
+        _row(**_scalar(), k0=None, k1="range_1", k2=None, grouping_id=5, doc_count=2, bucket_rank=1),
+        _row(**_scalar(), k0=None, k1="range_0", k2=None, grouping_id=5, doc_count=1, bucket_rank=2),
+        _row(**_scalar(), k0=None, k1=None, k2=datetime(2024, 2, 1), grouping_id=6, doc_count=1, bucket_rank=2),
+        _row(**_scalar(), k0=None, k1=None, k2=datetime(2024, 1, 1), grouping_id=6, doc_count=4, bucket_rank=1),
+        _row(**_scalar(), k0=None, k1=None, k2=None, grouping_id=6, doc_count=1, bucket_rank=3),
+    ]
+    db = RecordingSession(rows)
+
+    results = await PostgresService(db).get_multi_aggregations(AGGREGATIONS)
+
+    assert len(db.statements) == 1
+    assert results["by_status"] == {"buckets": [{"key": "paid", "doc_count": 3}, {"key": "open", "doc_count": 2}]}
+    assert results["top_status"] == {"buckets": [{"key": "paid", "doc_count": 3}]}
+    assert results["amount_stats"] == {"count": 4, "sum": 450.0, "avg": 112.5, "min": 50.0, "max": 200.0}
+    assert results["vendors"] == {"value": 3}
+    assert results["amount_pct"] == {"values": {"50.0": 100.0, "90.0": 180.0}}
+    assert results["amount_ranges"]["buckets"][0] == {"key": "range_1", "doc_count": 2}
+    assert results["monthly"]["buckets"] == [
+        {"key": "2024-01-01T00:00:00", "key_as_string": "2024-01-01", "doc_count": 4},
+        {"key": "2024-02-01T00:00:00", "key_as_string": "2024-02-01", "doc_count": 1},
+    ]
+    assert results["no_ranges"] == {"buckets": []}
+    assert "unsupported" not in results
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_empty_result_set():
+    db = RecordingSession([_row(**_scalar(total=0, a2_count=0, a2_sum=None, a2_avg=None, a2_min=None,
+                                          a2_max=None, a3_value=0, a4_p0=None, a4_p1=None),
+                                k0=None, k1=None, k2=None, grouping_id=None, doc_count=None, bucket_rank=None)])
+
+    results = await PostgresService(db).get_multi_aggregations(AGGREGATIONS)
+
+    assert results["by_status"] == {"buckets": []}
+    assert results["amount_stats"] == {"count": 0, "sum": 0.0, "avg": 0.0, "min": 0.0, "max": 0.0}
+    assert results["amount_pct"] == {"values": {"50.0": None, "90.0": None}}
@@ -0,0 +1,110 @@
+"""
+Unit tests for analytics rollups: dirty-day marking, incremental refresh and
+the dashboard endpoints reading rollups.
+"""
+
+from datetime import datetime, time, timedelta
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.orm import sessionmaker
+
+from app.api.analytics import get_dashboard_metrics, get_schema_stats, get_trends
+from app.models.analytics import AnalyticsDirtyDay, AnalyticsRollup
+from app.models.document import Document, ExtractedField
+from app.models.physical_file import PhysicalFile
+from app.models.schema import Schema
+from app.models.template import SchemaTemplate
+from app.models.verification import Verification
+from app.services.analytics_rollup_service import AnalyticsRollupService
+
+
+@pytest.fixture
+def engine(memory_engine):
+    return memory_engine(
+        SchemaTemplate.__table__, Schema.__table__, PhysicalFile.__table__, Document.__table__,
+        ExtractedField.__table__, Verification.__table__, AnalyticsRollup.__table__, AnalyticsDirtyDay.__table__
+    )
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine, autoflush=False)()
+    now = datetime.combine(datetime.utcnow().date(), time(12))  # Fixed offsets stay on today
+    schema = Schema(name="Invoice", fields=[{"name": "total"}, {"name": "vendor"}])
+    session.add(schema)
+    session.flush()
+
+    done = Document(filename="a.pdf", schema_id=schema.id, status="completed",
+                    uploaded_at=now - timedelta(minutes=30), processed_at=now - timedelta(minutes=28))
+    old = Document(filename="b.pdf", schema_id=schema.id, status="completed",
+                   uploaded_at=now - timedelta(days=10), processed_at=now - timedelta(days=10, minutes=-90))
+    failed = Document(filename="c.pdf", schema_id=schema.id, status="error", uploaded_at=now)
+    session.add_all([done, old, failed])
+    session.flush()
+
+    total = ExtractedField(document_id=done.id, field_name="total", confidence_score=0.9)
+    vendor = ExtractedField(document_id=done.id, field_name="vendor", confidence_score=0.5,
+                            needs_verification=True, verified=False)
+    session.add_all([total, vendor, ExtractedField(document_id=old.id, field_name="total", confidence_score=0.7,
+                                                   extracted_at=now - timedelta(days=10))])
+    session.flush()
+    session.add(Verification(extracted_field_id=total.id, verified_value="10", verification_type="correct"))
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_dashboard_reads_rollups(db):
+    dirty = set(db.execute(select(AnalyticsDirtyDay.day)).scalars())
+    today = datetime.utcnow().date()
+    assert dirty == {today, today - timedelta(days=10)}
+
+    data = await get_dashboard_metrics(db=db)
+
+    assert db.execute(select(AnalyticsDirtyDay.day)).first() is None  # Refreshed before reading
+    assert data["documents"] == {"total": 3, "completed": 2, "processing": 0, "errors": 1}
+    assert {f["field"]: f["average"] for f in data["confidence"]["by_field"]} == {"total": 0.8, "vendor": 0.5}
+    assert data["verification"] == {"queue_size": 1, "total_verified": 1, "accuracy": 100.0}
+    assert data["processing"]["avg_time_seconds"] == pytest.approx(120, abs=1)  # Old document outside window
+    assert {b["bucket"]: b["count"] for b in data["processing"]["time_histogram"]}["1-5m"] == 1
+
+    schemas = await get_schema_stats(db=db)
+    assert schemas["schemas"][0]["document_count"] == 3 and schemas["schemas"][0]["completed_count"] == 2
+    assert schemas["schemas"][0]["average_confidence"] == 0.7
+
+    trends = await get_trends(days=30, db=db)
+    assert [t["count"] for t in trends["documents_processed"]] == [1, 1]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_refresh_recomputes_only_dirty_days(db, engine):
+    await get_dashboard_metrics(db=db)
+
+    document = db.query(Document).filter(Document.status == "error").one()
+    document.status = "completed"
+    field = db.query(ExtractedField).filter(ExtractedField.field_name == "vendor").one()
+    field.verified = True
+    db.commit()
+    assert list(db.execute(select(AnalyticsDirtyDay.day)).scalars()) == [datetime.utcnow().date()]
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert AnalyticsRollupService(db).refresh() == 1
+    deletes = [s for s in statements if s.startswith("DELETE FROM analytics_rollups")]
+    assert deletes and all("WHERE analytics_rollups.day IN" in s for s in deletes)  # Other days untouched
+
+    data = await get_dashboard_metrics(db=db)
+    assert data["documents"]["completed"] == 3 and data["documents"]["errors"] == 0
+    assert data["verification"]["queue_size"] == 0
+
+    # A full rebuild yields the same rollups
+    before = sorted(db.execute(select(AnalyticsRollup.day, AnalyticsRollup.metric, AnalyticsRollup.dimension,
+                                      AnalyticsRollup.count)).all())
+    AnalyticsRollupService(db).rebuild()
+    after = sorted(db.execute(select(AnalyticsRollup.day, AnalyticsRollup.metric, AnalyticsRollup.dimension,
+                                     AnalyticsRollup.count)).all())
+    assert before == after
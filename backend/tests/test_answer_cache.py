@@ -0,0 +1,91 @@
+"""
+Unit tests for the answer cache: LRU bounds, document-dependency
+invalidation, the shared SQL tier and commit-time invalidation hooks.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.document import Document, ExtractedField
+from app.models.physical_file import PhysicalFile
+from app.models.schema import Schema
+from app.models.template import SchemaTemplate
+from app.services import answer_cache
+from app.services.answer_cache import AnswerCache, SQLAnswerCache, TieredAnswerCache
+
+
+@pytest.mark.unit
+def test_memory_cache_lru_bounds_and_invalidation():
+    cache = AnswerCache(ttl_seconds=60, max_size=3, max_bytes=150)
+    cache.set("q1", [1], {"answer": "a" * 50})
+    cache.set("q2", [2], {"answer": "b" * 50})
+    assert cache.get("q1", [1]) == {"answer": "a" * 50}  # q2 is now least recently used
+
+    cache.set("q3", [3], {"answer": "c" * 50})  # Over the byte budget
+    assert cache.get("q2", [2]) is None
+    assert cache.get("q1", [1]) is not None and cache.get("q3", [3]) is not None
+    assert cache.get_stats()["evictions"] == 1
+
+    cache.set("total spend", [], {"answer": "42"})  # Aggregation over every document
+    assert cache.invalidate_documents([3]) == 2
+    assert cache.get("q3", [3]) is None and cache.get("total spend", []) is None
+    assert cache.get("q1", [1]) is not None
+    assert cache.get_stats()["cache_size"] == 1
+
+
+@pytest.mark.unit
+def test_sql_tier_shared_between_processes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'answers.db'}")
+    shared = SQLAnswerCache(engine, ttl_seconds=60, max_bytes=10_000)
+    first = TieredAnswerCache(AnswerCache(ttl_seconds=60), shared, version_check_seconds=0)
+    second = TieredAnswerCache(AnswerCache(ttl_seconds=60), SQLAnswerCache(engine, ttl_seconds=60),
+                               version_check_seconds=0)
+
+    first.set("invoices over 100", [1, 2], {"answer": "two"})
+    assert second.get("invoices over 100", [2, 1]) == {"answer": "two"}  # Served from the shared tier
+    assert second.local.get_stats()["cache_size"] == 1
+
+    first.invalidate_documents([2])
+    assert second.get("invoices over 100", [1, 2]) is None  # Generation moved: local copy dropped
+    assert second.local.get_stats()["cache_size"] == 0
+
+    shared.max_bytes = 20
+    first.set("a", [1], {"answer": "x"})
+    first.set("b", [1], {"answer": "y"})
+    assert shared.trim() == 1  # Least recently used entry past the byte budget
+    assert shared.get_stats()["cache_size"] == 1
+
+
+@pytest.mark.unit
+def test_commit_invalidates_answers_for_changed_documents(memory_engine, monkeypatch):
+    engine = memory_engine(
+        SchemaTemplate.__table__, Schema.__table__, PhysicalFile.__table__, Document.__table__,
+        ExtractedField.__table__
+    )
+    session = sessionmaker(bind=engine)()
+    first, second = Document(filename="a.pdf"), Document(filename="b.pdf")
+    session.add_all([first, second])
+    session.flush()
+    field = ExtractedField(document_id=first.id, field_name="total", field_value="10")
+    session.add(field)
+    session.commit()
+
+    cache = AnswerCache(ttl_seconds=60)
+    monkeypatch.setattr(answer_cache, "_global_cache", cache)
+    cache.set("total of a", [first.id], {"answer": "10"})
+    cache.set("total of b", [second.id], {"answer": "0"})
+
+    field.field_value = "12"
+    session.flush()
+    assert cache.get("total of a", [first.id]) is not None  # Not until commit
+
+    session.rollback()
+    session.commit()
+    assert cache.get("total of a", [first.id]) is not None  # Rolled back: nothing changed
+
+    field.verified = True
+    session.commit()
+    assert cache.get("total of a", [first.id]) is None
+    assert cache.get("total of b", [second.id]) == {"answer": "0"}
+    session.close()
@@ -0,0 +1,148 @@
+"""
+Unit tests for API key verification (lookup prefix, verified-key cache, batched last_used_at).
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core import auth
+from app.core.auth import (
+    APIKeyCache,
+    create_api_key,
+    flush_api_key_usage,
+    get_api_key_prefix,
+    verify_api_key,
+)
+from app.models.permissions import APIKey
+from app.models.settings import User
+
+
+class CountingHasher:
+    """Stands in for bcrypt so tests can count hash checks."""
+
+    def __init__(self):
+        self.verify_calls = 0
+
+    def hash(self, value: str) -> str:
+        return hashlib.sha256(value.encode()).hexdigest()
+
+    def verify(self, plain: str, hashed: str) -> bool:
+        self.verify_calls += 1
+        return self.hash(plain) == hashed
+
+
+@pytest.fixture
+def hasher():
+    hasher = CountingHasher()
+    cache = APIKeyCache(ttl_seconds=60, flush_interval_seconds=3600)
+    with patch.object(auth, "hash_password", hasher.hash), \
+            patch.object(auth, "verify_password", hasher.verify), \
+            patch.object(auth, "_api_key_cache", cache):
+        yield hasher
+
+
+@pytest.fixture
+def db(memory_engine):
+    engine = memory_engine(User.__table__, APIKey.__table__)
+    session = sessionmaker(bind=engine)()
+    session.add(User(id=1, email="owner@example.com", is_active=True))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _add_key(db, legacy: bool = False, **kwargs) -> str:
+    if legacy:
+        plain_key = f"pb_legacy{len(db.query(APIKey).all())}xxxxxxxxxxxxxxxxxxxxxxxxxxxx"
+        hashed_key, prefix = auth.hash_password(plain_key), None
+    else:
+        plain_key, hashed_key = create_api_key(1)
+        prefix = get_api_key_prefix(plain_key)
+    db.add(APIKey(user_id=1, name="k", key_hash=hashed_key, key_prefix=prefix, **kwargs))
+    db.commit()
+    return plain_key
+
+
+@pytest.mark.unit
+def test_key_format_and_prefix_parsing(hasher):
+    plain_key, _ = create_api_key(1)
+    prefix = get_api_key_prefix(plain_key)
+    assert plain_key.startswith(f"pb_{prefix}_")
+    assert len(prefix) == 12
+    assert len(plain_key.encode()) <= 72  # bcrypt input limit
+    assert get_api_key_prefix("pb_legacySecretWithoutLookupId") is None
+    assert get_api_key_prefix("pb_ABCDEF123456_secret") is None
+
+
+@pytest.mark.unit
+def test_prefix_lookup_checks_one_hash_and_caches(hasher, db):
+    keys = [_add_key(db) for _ in range(20)]
+
+    user = verify_api_key(db, keys[7])
+    assert user.id == 1
+    assert hasher.verify_calls == 1
+
+    # Cached: no further hash checks
+    assert verify_api_key(db, keys[7]).id == 1
+    assert hasher.verify_calls == 1
+
+    # Wrong secret with a real lookup ID still costs one check and fails
+    assert verify_api_key(db, keys[3][:-4] + "nope") is None
+    assert hasher.verify_calls == 2
+
+
+@pytest.mark.unit
+def test_legacy_keys_still_verify(hasher, db):
+    [_add_key(db) for _ in range(5)]
+    legacy = _add_key(db, legacy=True)
+
+    assert verify_api_key(db, legacy).id == 1
+    # Only legacy rows (key_prefix IS NULL) are scanned
+    assert hasher.verify_calls == 1
+
+
+@pytest.mark.unit
+def test_legacy_key_shaped_like_a_lookup_id_still_verifies(hasher, db):
+    [_add_key(db) for _ in range(3)]
+    legacy = "pb_0123456789ab_legacySecretFromBeforeLookupIds"
+    db.add(APIKey(user_id=1, name="k", key_hash=auth.hash_password(legacy), key_prefix=None))
+    db.commit()
+    assert get_api_key_prefix(legacy) == "0123456789ab"
+
+    assert verify_api_key(db, legacy).id == 1
+    assert hasher.verify_calls == 1
+
+
+@pytest.mark.unit
+def test_revoked_and_expired_keys(hasher, db):
+    key = _add_key(db)
+    expired = _add_key(db, expires_at=datetime.utcnow() - timedelta(minutes=1))
+    assert verify_api_key(db, expired) is None
+
+    assert verify_api_key(db, key) is not None
+    api_key = db.query(APIKey).filter(APIKey.key_prefix == get_api_key_prefix(key)).one()
+    api_key.is_active = False
+    db.commit()
+    auth.get_api_key_cache().invalidate(api_key.id)
+
+    assert verify_api_key(db, key) is None
+
+
+@pytest.mark.unit
+def test_last_used_at_is_flushed_in_batches(hasher, db):
+    first, second = _add_key(db), _add_key(db)
+    verify_api_key(db, first)
+    verify_api_key(db, second)
+    verify_api_key(db, first)
+
+    # Flush interval not reached: nothing written yet
+    assert all(k.last_used_at is None for k in db.query(APIKey).all())
+
+    assert flush_api_key_usage(db, force=True) == 2
+    db.expire_all()
+    assert all(k.last_used_at is not None for k in db.query(APIKey).all())
+    assert flush_api_key_usage(db, force=True) == 0
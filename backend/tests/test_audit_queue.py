@@ -0,0 +1,127 @@
+"""
+Unit tests for the SQL-backed audit queue (priority column, filters, counts, paging).
+"""
+
+import itertools
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.api.audit import get_audit_queue
+from app.models.document import Document, ExtractedField
+from app.models.physical_file import PhysicalFile
+from app.models.schema import Schema
+from app.utils.audit_helpers import (
+    audit_queue_conditions,
+    get_audit_queue_counts,
+    get_audit_queue_page,
+)
+
+CONFIDENCES = [None, 0.1, 0.59, 0.6, 0.7, 0.79, 0.8, 0.95]
+VALIDATION_STATUSES = ["valid", "warning", "error"]
+
+
+@pytest.fixture
+def db(memory_engine):
+    engine = memory_engine(
+        Schema.__table__, PhysicalFile.__table__, Document.__table__, ExtractedField.__table__
+    )
+    session = sessionmaker(bind=engine, autoflush=False)()
+
+    invoices = Schema(name="Invoices", fields=[])
+    contracts = Schema(name="Contracts", fields=[])
+    session.add_all([invoices, contracts])
+    session.flush()
+
+    physical = PhysicalFile(filename="a.pdf", file_hash="abc", file_path="/uploads/a.pdf", file_size=1)
+    session.add(physical)
+    session.flush()
+
+    doc_a = Document(filename="a.pdf", schema_id=invoices.id, physical_file_id=physical.id)
+    doc_b = Document(filename="b.pdf", schema_id=contracts.id, file_path="/uploads/b.pdf")
+    session.add_all([doc_a, doc_b])
+    session.flush()
+
+    for i, (confidence, status) in enumerate(itertools.product(CONFIDENCES, VALIDATION_STATUSES)):
+        session.add(ExtractedField(
+            document_id=(doc_a if i % 2 else doc_b).id,
+            field_name=f"field_{i}",
+            field_value=str(i),
+            confidence_score=confidence,
+            validation_status=status,
+        ))
+    session.add(ExtractedField(document_id=doc_a.id, field_name="done", confidence_score=0.1, verified=True))
+    session.commit()
+
+    yield session
+    session.close()
+
+
+def _python_queue(db, **filters):
+    """Reference implementation: the previous in-Python filtering and sort."""
+    fields = db.query(ExtractedField).filter(ExtractedField.verified == False).all()  # noqa: E712
+    result = [
+        f for f in fields
+        if f.confidence_score is not None
+        and filters.get("min_confidence", 0.0) <= f.confidence_score <= filters.get("max_confidence", 1.0)
+        and (not filters.get("priority") or f.priority_label == filters["priority"])
+    ]
+    return sorted(result, key=lambda f: (f.audit_priority, f.confidence_score, f.id))
+
+
+@pytest.mark.unit
+def test_stored_priority_matches_model_property(db):
+    fields = db.query(ExtractedField).all()
+    assert len(fields) == len(CONFIDENCES) * len(VALIDATION_STATUSES) + 1
+    for field in fields:
+        assert field.audit_priority_level == field.audit_priority, (field.confidence_score, field.validation_status)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_page_and_counts_match_python_reference(db):
+    for filters in [{}, {"max_confidence": 0.7}, {"priority": "medium"}, {"min_confidence": 0.6, "priority": "high"}]:
+        conditions = audit_queue_conditions(**filters)
+        expected = _python_queue(db, **filters)
+
+        counts = await get_audit_queue_counts(db, conditions)
+        assert counts["total"] == len(expected)
+        for label, count in counts["priority_counts"].items():
+            assert count == sum(1 for f in expected if f.priority_label == label)
+
+        first = await get_audit_queue_page(db, conditions, offset=0, limit=5)
+        second = await get_audit_queue_page(db, conditions, offset=5, limit=5)
+        assert [f.id for f in first + second] == [f.id for f in expected[:10]]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_queue_endpoint_filters_and_eager_loads(db):
+    queries = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: queries.append(args[2]))
+
+    response = await get_audit_queue(
+        template_id=None, priority="critical", min_confidence=0.0, max_confidence=1.0,
+        include_validation_errors=True, page=1, size=20, count_only=False, db=db
+    )
+    # One GROUP BY for counts, one page query with documents/schemas/files joined
+    assert len(queries) == 2
+    assert response["total"] == 2
+    assert {item["priority_label"] for item in response["items"]} == {"critical"}
+    assert {(item["filename"], item["template_name"], item["file_path"]) for item in response["items"]} == {
+        ("a.pdf", "Invoices", "/uploads/a.pdf"), ("b.pdf", "Contracts", "/uploads/b.pdf")
+    }
+
+    badge = await get_audit_queue(
+        template_id=None, priority=None, min_confidence=0.0, max_confidence=1.0,
+        include_validation_errors=False, page=1, size=20, count_only=True, db=db
+    )
+    # Without validation issues only confidence drives priority (None confidence is never queued)
+    assert badge == {"count": 7, "priority_counts": {"critical": 0, "high": 2, "medium": 3, "low": 2}}
+
+    unknown = await get_audit_queue(
+        template_id=None, priority="urgent", min_confidence=0.0, max_confidence=1.0,
+        include_validation_errors=True, page=1, size=20, count_only=True, db=db
+    )
+    assert unknown["count"] == 0
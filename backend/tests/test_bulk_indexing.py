@@ -0,0 +1,114 @@
+"""
+Unit tests for batched search indexing and the reindex document feed.
+
+document_search_index is Postgres-only (JSONB, tsvector), so upserts are
+compiled with the PostgreSQL dialect; the reindex feed reads SQLite.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from app.models.document import Document, ExtractedField
+from app.models.physical_file import PhysicalFile
+from app.models.schema import Schema
+from app.models.template import SchemaTemplate
+from app.services.postgres_service import PostgresService
+from app.services.search_reindex import iter_index_documents
+
+
+class RecordingSession:
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    def execute(self, statement, params=None):
+        compiled = statement.compile(dialect=postgresql.dialect())
+        self.statements.append((str(compiled), params if params is not None else compiled.params))
+        return SimpleNamespace()
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+def _doc(document_id, vendor="Acme"):
+    return {
+        "document_id": document_id,
+        "filename": f"doc{document_id}.pdf",
+        "extracted_fields": {"vendor": vendor},
+        "confidence_scores": {"vendor": 0.9},
+        "full_text": f"Invoice {document_id}",
+        "chunks": [{"content": f"Invoice {document_id}"}],
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_one_upsert_and_commit_per_batch():
+    session = RecordingSession()
+    documents = (_doc(i) for i in range(1, 6))  # Consumed lazily
+
+    stats = await PostgresService(session).bulk_index_documents(documents, batch_size=2)
+
+    assert stats["indexed"] == 5 and stats["batches"] == 3 and stats["chunks"] == 5
+    assert stats["method"] == "insert" and session.commits == 3
+    upserts = [(sql, params) for sql, params in session.statements if sql.startswith("INSERT INTO document_search_index")]
+    assert len(upserts) == 3
+    sql, params = upserts[0]
+    assert "ON CONFLICT (document_id) DO UPDATE SET" in sql
+    assert "extracted_fields = excluded.extracted_fields" in sql and "updated_at = excluded.updated_at" in sql
+    assert params["document_id_m0"] == 1 and params["document_id_m1"] == 2  # Multi-row VALUES
+    assert sum(sql.startswith("SET LOCAL synchronous_commit") for sql, _ in session.statements) == 3
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_duplicate_documents_in_a_batch_keep_the_last():
+    session = RecordingSession()
+
+    stats = await PostgresService(session).bulk_index_documents(
+        [_doc(1, "Old"), _doc(2), _doc(1, "New")], batch_size=10
+    )
+
+    assert stats["indexed"] == 2
+    _, params = next(s for s in session.statements if s[0].startswith("INSERT INTO document_search_index"))
+    assert "document_id_m2" not in params  # ON CONFLICT cannot touch one row twice
+    vendors = {params[f"document_id_m{i}"]: params[f"extracted_fields_m{i}"]["vendor"] for i in range(2)}
+    assert vendors == {1: "New", 2: "Acme"}
+
+
+@pytest.mark.unit
+def test_reindex_feed_uses_verified_values_and_template_filter(memory_engine):
+    engine = memory_engine(
+        SchemaTemplate.__table__, Schema.__table__, PhysicalFile.__table__, Document.__table__,
+        ExtractedField.__table__
+    )
+    db = sessionmaker(bind=engine, autoflush=False)()
+    invoice = Schema(name="Invoice", fields=[{"name": "vendor"}])
+    other = Schema(name="Receipt", fields=[])
+    db.add_all([invoice, other])
+    db.flush()
+    for i in range(5):
+        document = Document(filename=f"doc{i}.pdf", status="completed" if i < 4 else "processing",
+                            schema_id=invoice.id if i % 2 == 0 else other.id)
+        document.extracted_fields.append(ExtractedField(
+            field_name="vendor", field_value="Acme", confidence_score=0.7,
+            verified=i == 0, verified_value="Acme Corp" if i == 0 else None
+        ))
+        db.add(document)
+    db.commit()
+
+    everything = list(iter_index_documents(db, batch_size=2))
+    assert [d["document_id"] for d in everything] == [1, 2, 3, 4]  # Unprocessed document skipped
+
+    invoices = list(iter_index_documents(db, template_id=invoice.id, batch_size=1))
+    assert [d["document_id"] for d in invoices] == [1, 3]
+    assert invoices[0]["extracted_fields"] == {"vendor": "Acme Corp"}
+    assert invoices[1]["extracted_fields"] == {"vendor": "Acme"}
+    assert invoices[0]["schema"]["name"] == "Invoice" and invoices[0]["chunks"] == []
+    db.close()
@@ -0,0 +1,104 @@
+"""
+Unit tests for the bulk upload ingest stage.
+"""
+
+import asyncio
+from io import BytesIO
+
+import pytest
+from fastapi import UploadFile
+from sqlalchemy.orm import sessionmaker
+
+from app.models.document import Document
+from app.models.parse_result import MatchFeatures, ParseResult
+from app.models.physical_file import PhysicalFile
+from app.services import parse_result_store
+from app.services.bulk_ingest_service import BulkIngestService
+from app.services.parse_result_store import ParseResultStore
+
+
+class FakeReductoService:
+    """Parses after a short delay; fails for filenames containing 'broken'."""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+
+    async def parse_document(self, file_path: str):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if "broken" in file_path:
+                raise RuntimeError("Reducto exploded")
+            return {"job_id": f"job-{self.calls}", "result": {"chunks": [{"content": file_path}]}}
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def db(memory_engine, monkeypatch):
+    engine = memory_engine(
+        ParseResult.__table__, MatchFeatures.__table__, PhysicalFile.__table__, Document.__table__
+    )
+    factory = sessionmaker(bind=engine, autoflush=False)
+    monkeypatch.setattr(parse_result_store, "_parse_result_store", ParseResultStore(session_factory=factory))
+    session = factory()
+    yield session
+    session.close()
+
+
+def _upload(filename: str, content: bytes) -> UploadFile:
+    return UploadFile(file=BytesIO(content), filename=filename)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_ingest_parses_concurrently_and_dedups(db, tmp_path):
+    reducto = FakeReductoService()
+    files = [_upload(f"doc_{i}.pdf", f"content {i}".encode()) for i in range(10)]
+    files.append(_upload("copy_of_doc_0.pdf", b"content 0"))
+
+    service = BulkIngestService(db, reducto, parse_concurrency=4, commit_batch_size=3, upload_dir=str(tmp_path))
+    result = await service.ingest(files)
+
+    assert result["unique_files"] == 10
+    assert result["exact_duplicates_in_batch"] == 1
+    assert reducto.calls == 10
+    assert reducto.peak == 4
+    assert [d.filename for d in result["documents"]][:2] == ["doc_0.pdf", "copy_of_doc_0.pdf"]
+    assert all(d.status == "analyzing" for d in result["documents"])
+    assert db.query(Document).count() == 11
+    assert db.query(PhysicalFile).count() == 10
+    assert {"read_hash_seconds", "parse_seconds", "commit_seconds", "total_seconds"} <= set(result["timings"])
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_ingest_isolates_parse_failures(db, tmp_path):
+    reducto = FakeReductoService()
+    files = [_upload("good.pdf", b"good"), _upload("broken.pdf", b"broken"), _upload("fine.pdf", b"fine")]
+
+    result = await BulkIngestService(db, reducto, upload_dir=str(tmp_path)).ingest(files)
+
+    statuses = {d.filename: d.status for d in result["documents"]}
+    assert statuses == {"good.pdf": "analyzing", "broken.pdf": "error", "fine.pdf": "analyzing"}
+    assert [f["filename"] for f in result["parse_failures"]] == ["broken.pdf"]
+    assert db.query(Document).filter(Document.status == "error").count() == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_ingest_reuses_cached_parse(db, tmp_path):
+    reducto = FakeReductoService()
+    first = await BulkIngestService(db, reducto, upload_dir=str(tmp_path)).ingest([_upload("a.pdf", b"same")])
+    assert reducto.calls == 1
+
+    second = await BulkIngestService(db, reducto, upload_dir=str(tmp_path)).ingest([_upload("b.pdf", b"same")])
+
+    assert reducto.calls == 1
+    assert second["parse_calls_saved"] == 1
+    assert second["documents"][0].physical_file_id == first["documents"][0].physical_file_id
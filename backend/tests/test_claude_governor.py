@@ -0,0 +1,119 @@
+"""
+Unit tests for the Claude concurrency governor.
+
+Uses a local fake transport in place of the Anthropic API so retries, the
+in-flight cap and timeouts are exercised without network access.
+"""
+
+import asyncio
+
+import anthropic
+import httpx
+import pytest
+
+from app.services.claude_governor import ClaudeGovernor
+
+
+def _api_error(status: int, retry_after: str = None) -> anthropic.APIStatusError:
+    headers = {"retry-after": retry_after} if retry_after is not None else {}
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    response = httpx.Response(status, headers=headers, request=request)
+    error_class = {429: anthropic.RateLimitError, 400: anthropic.BadRequestError}.get(
+        status, anthropic.APIStatusError
+    )
+    return error_class(f"HTTP {status}", response=response, body=None)
+
+
+class FakeTransport:
+    """Stands in for client.messages.create: replays scripted errors, then succeeds."""
+
+    def __init__(self, *errors: anthropic.APIStatusError):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0)
+        if self.errors:
+            raise self.errors.pop(0)
+        return {"content": [{"type": "text", "text": "done"}], **kwargs}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_retries_rate_limit_then_succeeds():
+    transport = FakeTransport(_api_error(429, retry_after="0"), _api_error(529))
+    governor = ClaudeGovernor(max_retries=3, retry_base_delay=0.001, retry_max_delay=0.01)
+
+    message = await governor.run(lambda: transport.create(model="claude-test"))
+
+    assert message["content"][0]["text"] == "done"
+    assert transport.calls == 3
+    stats = governor.get_stats()
+    assert stats["retries"] == 2
+    assert stats["failed_calls"] == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_retries_exhausted_raises_last_error():
+    transport = FakeTransport(*[_api_error(429) for _ in range(5)])
+    governor = ClaudeGovernor(max_retries=2, retry_base_delay=0.001)
+
+    with pytest.raises(anthropic.RateLimitError):
+        await governor.run(transport.create)
+
+    assert transport.calls == 3
+    assert governor.get_stats()["failed_calls"] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_non_retryable_error_is_raised_immediately():
+    transport = FakeTransport(_api_error(400))
+    governor = ClaudeGovernor(max_retries=3, retry_base_delay=0.001)
+
+    with pytest.raises(anthropic.BadRequestError):
+        await governor.run(transport.create)
+
+    assert transport.calls == 1
+    assert governor.get_stats()["failed_calls"] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_in_flight_cap_is_respected():
+    active = {"now": 0, "peak": 0}
+
+    async def slow_create():
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        return "ok"
+
+    governor = ClaudeGovernor(max_in_flight=3)
+    results = await asyncio.gather(*[governor.run(slow_create) for _ in range(12)])
+
+    assert len(results) == 12
+    assert active["peak"] == 3
+    stats = governor.get_stats()
+    assert stats["total_calls"] == 12
+    assert stats["in_flight"] == 0
+    assert stats["queue_depth"] == 0
+    assert stats["max_wait_seconds"] > 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_timeout_is_retried_then_raised():
+    async def hang():
+        await asyncio.sleep(1)
+
+    governor = ClaudeGovernor(timeout_seconds=0.01, max_retries=1, retry_base_delay=0.001)
+    with pytest.raises(asyncio.TimeoutError):
+        await governor.run(hang)
+
+    stats = governor.get_stats()
+    assert stats["timeouts"] == 2
+    assert stats["in_flight"] == 0
@@ -3,7 +3,7 @@ Unit tests for Claude service.
 """
 import pytest
 import json
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from app.services.claude_service import ClaudeService
 from app.core.exceptions import ClaudeError, SchemaError
 
@@ -27,7 +27,7 @@ async def test_analyze_sample_documents_success(sample_schema):
     mock_response = Mock()
     mock_response.content = [Mock(text=json.dumps(sample_schema))]
 
-    with patch.object(service.client.messages, 'create', return_value=mock_response):
+    with patch.object(service.client.messages, 'create', new_callable=AsyncMock, return_value=mock_response):
         result = await service.analyze_sample_documents(parsed_docs)
 
     assert result["name"] == sample_schema["name"]
@@ -63,7 +63,7 @@ async def test_analyze_sample_documents_invalid_json():
     mock_response = Mock()
     mock_response.content = [Mock(text="This is not JSON")]
 
-    with patch.object(service.client.messages, 'create', return_value=mock_response):
+    with patch.object(service.client.messages, 'create', new_callable=AsyncMock, return_value=mock_response):
         with pytest.raises(ClaudeError) as exc_info:
             await service.analyze_sample_documents(parsed_docs)
 
@@ -89,7 +89,7 @@ async def test_analyze_sample_documents_missing_fields():
     mock_response = Mock()
     mock_response.content = [Mock(text=json.dumps(invalid_schema))]
 
-    with patch.object(service.client.messages, 'create', return_value=mock_response):
+    with patch.object(service.client.messages, 'create', new_callable=AsyncMock, return_value=mock_response):
         with pytest.raises(SchemaError) as exc_info:
             await service.analyze_sample_documents(parsed_docs)
 
@@ -128,7 +128,7 @@ async def test_improve_extraction_rules():
     mock_response = Mock()
     mock_response.content = [Mock(text=json.dumps(improvements))]
 
-    with patch.object(service.client.messages, 'create', return_value=mock_response):
+    with patch.object(service.client.messages, 'create', new_callable=AsyncMock, return_value=mock_response):
         result = await service.improve_extraction_rules("test_field", failed, successful)
 
     assert "extraction_hints" in result
@@ -154,7 +154,7 @@ async def test_suggest_field_from_description():
     mock_response = Mock()
     mock_response.content = [Mock(text=json.dumps(field_config))]
 
-    with patch.object(service.client.messages, 'create', return_value=mock_response):
+    with patch.object(service.client.messages, 'create', new_callable=AsyncMock, return_value=mock_response):
         result = await service.suggest_field_from_description(
             "Add a field for invoice total"
         )
@@ -268,7 +268,7 @@ async def test_schema_generation_includes_search_metadata():
     mock_response = Mock()
     mock_response.content = [Mock(text=json.dumps(enhanced_schema))]
 
-    with patch.object(service.client.messages, 'create', return_value=mock_response):
+    with patch.object(service.client.messages, 'create', new_callable=AsyncMock, return_value=mock_response):
         result = await service.analyze_sample_documents(parsed_docs)
 
     # Verify search_metadata is present
@@ -334,7 +334,7 @@ async def test_schema_generation_includes_aggregation_metadata():
     mock_response = Mock()
     mock_response.content = [Mock(text=json.dumps(enhanced_schema))]
 
-    with patch.object(service.client.messages, 'create', return_value=mock_response):
+    with patch.object(service.client.messages, 'create', new_callable=AsyncMock, return_value=mock_response):
         result = await service.analyze_sample_documents(parsed_docs)
 
     # Verify aggregation_metadata is present
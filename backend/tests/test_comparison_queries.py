@@ -0,0 +1,107 @@
+"""
+Unit tests for single-statement trends and period/group comparisons.
+
+document_search_index is Postgres-only (JSONB), so statements are compiled
+with the PostgreSQL dialect and fed back canned rows.
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services import typed_field_index_service
+from app.services.comparison_service import ComparisonService
+from app.services.typed_field_index_service import TypedFieldRegistry
+
+
+@pytest.fixture(autouse=True)
+def typed_fields(monkeypatch):
+    registry = TypedFieldRegistry(ttl_seconds=3600)
+    registry.set_fields(set())
+    monkeypatch.setattr(typed_field_index_service, "_typed_field_registry", registry)
+    return registry
+
+
+class RecordingSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        compiled = statement.compile(dialect=postgresql.dialect())
+        self.statements.append((str(compiled), compiled.params))
+        return SimpleNamespace(all=lambda: self.rows, first=lambda: self.rows[0] if self.rows else None)
+
+
+class Row(tuple):
+    """Result row: positional access plus a label mapping."""
+
+    def __new__(cls, mapping):
+        row = super().__new__(cls, mapping.values())
+        row._mapping = mapping
+        return row
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_trend_is_one_grouped_query():
+    rows = [
+        SimpleNamespace(bucket=datetime(2024, month, 1), doc_count=month, value=100.0 * month)
+        for month in (1, 2, 3)
+    ]
+    session = RecordingSession(rows)
+
+    result = await ComparisonService(session).get_trend(
+        "amount", "sum", interval="month", start_date="2024-01-01", end_date="2024-03-31",
+        filters={"date_field": "invoice_date", "currency": "USD"}
+    )
+
+    assert len(session.statements) == 1
+    sql, params = session.statements[0]
+    assert "date_trunc(" in sql and "GROUP BY date_trunc(" in sql and "sum(" in sql
+    assert "month" in params.values() and "USD" in params.values()
+    assert datetime(2024, 4, 1) in params.values()  # Date-only end includes the whole day
+    assert "date_field" not in params.values()  # Not applied as a field filter
+    assert [d["value"] for d in result["data"]] == [100.0, 200.0, 300.0]
+    assert result["data"][0] == {"date": "2024-01-01T00:00:00", "value": 100.0, "count": 1}
+    assert result["trend_stats"]["direction"] == "up"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_compare_periods_filters_each_period_in_one_scan():
+    session = RecordingSession([Row({"value_0": 250.0, "count_0": 5, "value_1": 200.0, "count_1": 4})])
+
+    result = await ComparisonService(session).compare_periods(
+        "amount", "sum",
+        period1={"from": "2024-10-01", "to": "2024-12-31"},
+        period2={"from": "2024-07-01T00:00:00", "to": "2024-10-01T00:00:00"},
+    )
+
+    assert len(session.statements) == 1
+    sql, params = session.statements[0]
+    assert sql.count("FILTER (WHERE") == 4  # value and count per period
+    assert datetime(2024, 10, 1) in params.values()  # Timestamp end stays exclusive
+    assert result["period1"] == {"name": "Q4 2024", "range": {"from": "2024-10-01", "to": "2024-12-31"},
+                                 "value": 250.0, "count": 5}
+    assert result["change"] == {"absolute": 50.0, "percentage": 25.0, "trend": "up"}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_compare_groups_in_one_statement():
+    session = RecordingSession([Row({"value_0": 3, "count_0": 3, "value_1": 7, "count_1": 7, "value_2": 0,
+                                     "count_2": 0})])
+
+    result = await ComparisonService(session).compare_groups(
+        "amount", "count", group_field="template_name", groups=["Invoice", "Receipt", "Contract"]
+    )
+
+    assert len(session.statements) == 1
+    sql, _ = session.statements[0]
+    assert "document_search_index.query_context ->>" in sql and "count(*) FILTER (WHERE" in sql
+    assert result["groups"]["Receipt"] == {"value": 7.0, "count": 7}
+    assert result["comparison_stats"]["top_group"]["name"] == "Receipt"
+    assert result["comparison_stats"]["bottom_group"]["name"] == "Contract"
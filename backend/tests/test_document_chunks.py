@@ -0,0 +1,124 @@
+"""
+Unit tests for the passage chunk index.
+
+document_chunks is Postgres-only (JSONB, tsvector), so queries are compiled
+with the PostgreSQL dialect and fed back canned rows.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.search_index import DocumentChunk
+from app.services.document_chunks import build_document_chunks, chunk_text
+from app.services.postgres_service import SNIPPET_DELIMITER, PostgresService
+
+PARSE_CHUNKS = [
+    {
+        "content": "Invoice INV-1001\nAcme Corp",
+        "blocks": [
+            {"content": "Invoice INV-1001", "bbox": {"page": 1, "left": 0.1, "top": 0.1, "width": 0.3, "height": 0.05}},
+            {"content": "Acme Corp", "bbox": {"page": 1, "left": 0.2, "top": 0.2, "width": 0.4, "height": 0.05}},
+        ],
+    },
+    {"content": "   "},
+    {"text": "Terms: net 30. " * 20, "blocks": [{"bbox": {"page": 3, "left": 0, "top": 0, "width": 1, "height": 1}}]},
+]
+
+
+@pytest.mark.unit
+def test_offsets_point_into_indexed_full_text():
+    full_text = "\n".join(chunk_text(chunk) for chunk in PARSE_CHUNKS)  # As index_document stores it
+    rows = build_document_chunks(7, PARSE_CHUNKS, max_chars=120)
+
+    assert [row["chunk_number"] for row in rows] == list(range(1, len(rows) + 1))
+    for row in rows:
+        assert full_text[row["start_char"]:row["end_char"]] == row["content"]
+        assert len(row["content"]) <= 120
+
+    first = rows[0]
+    assert first["page"] == 1
+    assert first["bbox"] == pytest.approx({"page": 1, "left": 0.1, "top": 0.1, "width": 0.5, "height": 0.15})
+    # Blank chunk skipped; long chunk split at spaces, pieces keep its page
+    assert len(rows) == 4 and all(row["page"] == 3 for row in rows[1:])
+    assert all(row["content"].endswith(" ") for row in rows[1:-1])
+
+
+class RecordingSession:
+    def __init__(self, results):
+        self.results = list(results)
+        self.statements = []
+        self.params = []
+
+    def execute(self, statement, params=None):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        self.params.append(params)
+        rows = self.results.pop(0)
+        return SimpleNamespace(all=lambda: rows, first=lambda: rows[0] if rows else None,
+                               scalar=lambda: rows[0] if rows else None)
+
+    def commit(self):
+        pass
+
+
+class Row(tuple):
+    """Result row: positional access plus a label mapping."""
+
+    def __new__(cls, values, mapping):
+        row = super().__new__(cls, values)
+        row._mapping = mapping
+        return row
+
+
+def _chunk(chunk_number, content):
+    return DocumentChunk(document_id=7, chunk_number=chunk_number, page=2, start_char=0,
+                         end_char=len(content), bbox=None, content=content)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_chunk_fetch_reads_one_row():
+    session = RecordingSession([
+        [12], [(_chunk(5, "Section 5"), "contract.pdf")], [(48000, {"template_name": "Contracts"})]
+    ])
+    result = await PostgresService(session).get_document_chunk(7, 5)
+
+    assert result["total_chunks"] == 12 and result["filename"] == "contract.pdf"
+    assert result["chunk"]["content"] == "Section 5" and result["chunk"]["page"] == 2
+    assert result["total_characters"] == 48000 and result["template"] == "Contracts"
+    fetch = session.statements[1]
+    assert "document_chunks.chunk_number = " in fetch
+    assert "document_search_index" not in fetch  # Never touches the full text
+    assert "length(document_search_index.full_text)" in session.statements[2]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_chunking_falls_back_to_legacy_parse_result_then_full_text():
+    # Parse result still in row on the document: only that column is loaded
+    session = RecordingSession([[(None, False, None, True)], [{"chunks": PARSE_CHUNKS}], [], []])
+    assert await PostgresService(session).index_document_chunks(7) == len(build_document_chunks(7, PARSE_CHUNKS))
+    assert "SELECT documents.reducto_parse_result" in session.statements[1]
+
+    # No parse result at all: chunk the indexed full text
+    session = RecordingSession([[(None, False, None, False)], ["Indexed text only"], [], []])
+    assert await PostgresService(session).index_document_chunks(7) == 1
+    assert "document_search_index.full_text" in session.statements[1]
+    assert session.params[3][0]["content"] == "Indexed text only"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_passage_search_ranks_chunks_with_per_document_cap():
+    snippet = f"<mark>termination</mark> fee{SNIPPET_DELIMITER}<mark>fee</mark> of 5%"
+    row = Row((_chunk(3, "termination fee of 5%"), "contract.pdf", 0.42, snippet), {"_snippet": snippet})
+    session = RecordingSession([[row]])
+
+    passages = await PostgresService(session).search_passages("termination fee", limit=5, max_per_document=2)
+
+    sql = session.statements[0]
+    assert "row_number() OVER (PARTITION BY document_chunks.document_id" in sql
+    assert "ts_headline" in sql and "document_chunks.content_tsv @@" in sql
+    assert passages[0]["chunk_number"] == 3 and passages[0]["score"] == 0.42
+    assert passages[0]["highlights"]["content"] == ["<mark>termination</mark> fee", "<mark>fee</mark> of 5%"]
@@ -0,0 +1,83 @@
+"""
+Unit tests for MinHash/LSH upload clustering.
+"""
+
+import random
+
+import pytest
+
+from app.services.document_clustering import LSHIndex, MinHasher, cluster_documents, lsh_params
+from app.services.match_feature_service import jaccard
+
+
+def make_docs(templates: int = 8, per_template: int = 12, one_offs: int = 20, seed: int = 3):
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(5000)]
+    docs = []
+    for t in range(templates):
+        base = rng.sample(vocabulary, 120)
+        for _ in range(per_template):
+            tokens = {rng.choice(vocabulary) if rng.random() < 0.03 else w for w in base}
+            docs.append({"id": len(docs), "filename": f"t{t}_{len(docs)}.pdf", "tokens": tokens})
+    for _ in range(one_offs):
+        docs.append({"id": len(docs), "filename": f"one_off_{len(docs)}.pdf", "tokens": set(rng.sample(vocabulary, 120))})
+    rng.shuffle(docs)
+    return docs
+
+
+@pytest.mark.unit
+def test_lsh_params_keep_recall_at_threshold():
+    for threshold in (0.5, 0.75, 0.9):
+        bands, rows = lsh_params(threshold)
+        assert bands * rows <= 128
+        assert 1 - (1 - threshold ** rows) ** bands >= 0.99
+
+
+@pytest.mark.unit
+def test_minhash_estimates_jaccard():
+    hasher = MinHasher(num_perm=256)
+    a = {f"w{i}" for i in range(200)}
+    b = {f"w{i}" for i in range(50, 250)}
+    estimate = (hasher.signature(a) == hasher.signature(b)).mean()
+    assert estimate == pytest.approx(jaccard(a, b), abs=0.08)
+
+    # Deterministic across hasher instances (crc32 + fixed seed)
+    assert (MinHasher(num_perm=256).signature(a) == hasher.signature(a)).all()
+
+
+@pytest.mark.unit
+def test_lsh_index_returns_near_duplicates():
+    hasher = MinHasher()
+    index = LSHIndex(*lsh_params(0.75))
+    base = {f"w{i}" for i in range(100)}
+    index.insert("near", hasher.signature(base | {"extra"}))
+    index.insert("far", hasher.signature({f"x{i}" for i in range(100)}))
+
+    assert index.query(hasher.signature(base)) == {"near"}
+
+
+@pytest.mark.unit
+def test_lsh_clusters_match_exhaustive():
+    docs = make_docs()
+
+    exhaustive = cluster_documents(docs, 0.75, use_lsh=False)
+    lsh = cluster_documents(docs, 0.75, use_lsh=True)
+
+    assert [sorted(c["document_ids"]) for c in lsh] == [sorted(c["document_ids"]) for c in exhaustive]
+    assert len(lsh) == 8 + 20
+    cluster = next(c for c in lsh if c["cluster_size"] > 1)
+    assert set(cluster) == {
+        "representative_doc_id", "representative_filename", "document_ids", "filenames", "cluster_size", "avg_similarity"
+    }
+    assert cluster["representative_doc_id"] == cluster["document_ids"][0]
+    assert len(cluster["filenames"]) == cluster["cluster_size"]
+
+
+@pytest.mark.unit
+def test_small_batches_compare_exhaustively():
+    docs = make_docs(templates=2, per_template=3, one_offs=2)
+    clusters = cluster_documents(docs, 0.75)
+
+    assert sorted(c["cluster_size"] for c in clusters) == [1, 1, 3, 3]
+    # Seeds follow upload order
+    assert clusters[0]["representative_doc_id"] == docs[0]["id"]
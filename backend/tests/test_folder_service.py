@@ -0,0 +1,126 @@
+"""
+Unit tests for the materialized virtual folder tree.
+"""
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.batch import Batch, batch_extractions
+from app.models.document import Document, ExtractedField
+from app.models.extraction import Extraction
+from app.models.folder import Folder
+from app.models.physical_file import PhysicalFile
+from app.models.schema import Schema
+from app.models.template import SchemaTemplate
+from app.services.folder_service import FolderService
+
+
+@pytest.fixture
+def engine(memory_engine):
+    return memory_engine(
+        SchemaTemplate.__table__, Schema.__table__, PhysicalFile.__table__, Document.__table__,
+        ExtractedField.__table__, Extraction.__table__, Folder.__table__, Batch.__table__, batch_extractions
+    )
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine, autoflush=False)()
+    session.add(SchemaTemplate(id=1, name="Invoice", category="invoice", description="Invoices", fields=[]))
+    session.commit()
+    yield session
+    session.close()
+
+
+def add_extraction(db, organized_path: str) -> Extraction:
+    name = organized_path.rsplit("/", 1)[-1]
+    physical_file = PhysicalFile(filename=name, file_hash=name, file_path=f"uploads/{organized_path}")
+    extraction = Extraction(physical_file=physical_file, template_id=1, organized_path=organized_path)
+    db.add(extraction)
+    db.commit()
+    return extraction
+
+
+def folder_counts(db):
+    return {f.path: (f.direct_count, f.recursive_count) for f in db.query(Folder).all()}
+
+
+@pytest.mark.unit
+def test_counts_follow_create_move_delete(db):
+    a = add_extraction(db, "Invoice/2025-10-11/a.pdf")
+    add_extraction(db, "Invoice/2025-10-11/b.pdf")
+    add_extraction(db, "Invoice/2025-10-12/c.pdf")
+    add_extraction(db, "root.pdf")
+
+    assert a.folder_path == "Invoice/2025-10-11"
+    assert folder_counts(db) == {
+        "Invoice": (0, 3),
+        "Invoice/2025-10-11": (2, 2),
+        "Invoice/2025-10-12": (1, 1),
+    }
+
+    FolderService().reorganize_extractions([a.id], "Archive/2025", db)
+    assert a.folder_path == "Archive/2025"
+    assert folder_counts(db) == {
+        "Invoice": (0, 2),
+        "Invoice/2025-10-11": (1, 1),
+        "Invoice/2025-10-12": (1, 1),
+        "Archive": (0, 1),
+        "Archive/2025": (1, 1),
+    }
+
+    db.delete(a.physical_file)  # Cascades to the extraction
+    db.commit()
+    assert "Archive" not in folder_counts(db)
+    assert "Archive/2025" not in folder_counts(db)
+
+
+@pytest.mark.unit
+def test_browse_reads_one_level_with_pagination(engine, db):
+    for i in range(5):
+        add_extraction(db, f"Invoice/2025-10-11/{i}.pdf")
+    for i in range(3):
+        add_extraction(db, f"Invoice/2025-10-11/deep/{i}.pdf")
+    add_extraction(db, "Contract/x.pdf")
+    add_extraction(db, "root.pdf")
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, sql, *args: statements.append(sql))
+    page = FolderService().browse_folder("Invoice/2025-10-11", db, limit=2, offset=2)
+
+    assert page["folders"] == [{"name": "deep", "count": 3, "path": "Invoice/2025-10-11/deep"}]
+    assert [f["filename"] for f in page["files"]] == ["2.pdf", "3.pdf"]
+    assert page["files"][0]["template"] == "Invoice"
+    assert page["total_files"] == 5 and page["total_items"] == 6
+    assert page["has_more"] is True
+    # Folders, folder count and one joined page of files; no per-row lazy loads
+    assert len(statements) == 3
+
+    root = FolderService().browse_folder("", db)
+    assert [(f["name"], f["count"]) for f in root["folders"]] == [("Contract", 1), ("Invoice", 8)]
+    assert [f["filename"] for f in root["files"]] == ["root.pdf"]
+    assert root["has_more"] is False
+
+
+@pytest.mark.unit
+def test_tree_stats_and_rebuild(db):
+    add_extraction(db, "Invoice/2025-10-11/a.pdf")
+    add_extraction(db, "Invoice/2025-10-11/deep/b.pdf")
+    add_extraction(db, "Invoice_X/c.pdf")  # "_" must not match as a LIKE wildcard
+
+    service = FolderService()
+    tree = service.get_folder_tree(db, max_depth=2)
+    assert [(n["path"], n["count"]) for n in tree] == [("Invoice", 2), ("Invoice_X", 1)]
+    assert tree[0]["children"] == [{"name": "2025-10-11", "path": "Invoice/2025-10-11", "count": 2, "children": []}]
+
+    stats = service.get_folder_stats("Invoice", db)
+    assert stats["total_extractions"] == 2
+    assert stats["by_template"] == {"Invoice": 2}
+
+    before = folder_counts(db)
+    db.query(Folder).delete()
+    db.query(Extraction).update({"folder_path": None})
+    db.commit()
+    assert service.rebuild_folders(db) == len(before)
+    assert folder_counts(db) == before
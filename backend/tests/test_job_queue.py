@@ -0,0 +1,170 @@
+"""
+Unit tests for the DB-backed job queue and worker.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.models.background_job import BackgroundJob
+from app.services.job_handlers import _run_in_session
+from app.services.job_queue import JobQueue, register_job_handler
+from app.worker import JobWorker
+
+
+@pytest_asyncio.fixture
+async def session_factory(async_memory_engine):
+    engine = await async_memory_engine(BackgroundJob.__table__)
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+def _queue(db: AsyncSession) -> JobQueue:
+    return JobQueue(db, lease_seconds=60, retry_base_delay=30, retry_max_delay=60)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_claim_order_follows_lanes(session_factory):
+    async with session_factory() as db:
+        queue = _queue(db)
+        await queue.enqueue("t", {"n": "bulk"}, lane="bulk")
+        await queue.enqueue("t", {"n": "default"})
+        await queue.enqueue("t", {"n": "interactive"}, lane="interactive")
+
+        assert (await queue.claim("w1", lanes=["bulk"])).job_data["n"] == "bulk"
+        assert (await queue.claim("w1")).job_data["n"] == "interactive"
+        claimed = await queue.claim("w1")
+        assert claimed.job_data["n"] == "default"
+        assert claimed.status == "running" and claimed.attempts == 1 and claimed.locked_by == "w1"
+        assert await queue.claim("w1") is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_failed_attempts_back_off_then_fail(session_factory):
+    async with session_factory() as db:
+        queue = _queue(db)
+        job = await queue.enqueue("t", max_attempts=2)
+
+        await queue.claim("w1")
+        assert await queue.fail(job.id, "w1", "boom") == "queued"
+        # Backoff: not claimable until available_at passes
+        assert await queue.claim("w1") is None
+
+        await db.execute(update(BackgroundJob).values(available_at=datetime.utcnow() - timedelta(seconds=1)))
+        await db.commit()
+        assert (await queue.claim("w1")).attempts == 2
+        assert await queue.fail(job.id, "w1", "boom again") == "failed"
+
+        await db.refresh(job)
+        assert job.status == "failed"
+        assert job.error_message == "boom again"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_expired_lease_is_reclaimed(session_factory):
+    async with session_factory() as db:
+        queue = _queue(db)
+        job = await queue.enqueue("t")
+        await queue.claim("dead-worker")
+
+        # Lease still valid: nobody else can take it
+        assert await queue.claim("w2") is None
+
+        await db.execute(update(BackgroundJob).values(lease_expires_at=datetime.utcnow() - timedelta(seconds=1)))
+        await db.commit()
+        reclaimed = await queue.claim("w2")
+        assert reclaimed.id == job.id
+        assert reclaimed.locked_by == "w2"
+        assert reclaimed.attempts == 2
+
+        # The dead worker lost ownership
+        assert await queue.heartbeat(job.id, "dead-worker") is False
+        assert await queue.heartbeat(job.id, "w2") is True
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_complete_leaves_cancelled_job_cancelled(session_factory):
+    async with session_factory() as db:
+        queue = _queue(db)
+        job = await queue.enqueue("t")
+        await queue.claim("w1")
+
+        # Cancellation flips the status but leaves the lease holder in place
+        await db.execute(update(BackgroundJob).values(status="cancelled"))
+        await db.commit()
+        await queue.complete(job.id, "w1")
+
+        await db.refresh(job)
+        assert job.status == "cancelled"
+        assert job.completed_at is None
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_worker_runs_handlers_and_retries_failures(session_factory):
+    calls = []
+
+    @register_job_handler("test_flaky")
+    async def flaky(job):
+        calls.append(job.attempts)
+        if job.attempts == 1:
+            raise RuntimeError("transient")
+
+    async with session_factory() as db:
+        job = await _queue(db).enqueue("test_flaky")
+
+    worker = JobWorker("w1", session_factory=session_factory, lease_seconds=60, retry_base_delay=0)
+    assert await worker.run_once() is True
+
+    async with session_factory() as db:
+        refreshed = await db.get(BackgroundJob, job.id)
+        assert refreshed.status == "queued"
+        assert refreshed.error_message == "transient"
+
+    assert await worker.run_once() is True
+    assert await worker.run_once() is False
+    assert calls == [1, 2]
+
+    async with session_factory() as db:
+        refreshed = await db.get(BackgroundJob, job.id)
+        assert refreshed.status == "completed"
+        assert refreshed.locked_by is None
+        stats = await _queue(db).get_stats()
+        assert stats["by_lane"]["default"] == {"queued": 0, "running": 0}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_sync_handler_work_keeps_heartbeats_running(session_factory, monkeypatch):
+    monkeypatch.setattr("app.core.database.SessionLocal", sessionmaker())
+    heartbeats = []
+    original_heartbeat = JobQueue.heartbeat
+
+    async def counting_heartbeat(self, job_id, worker_id):
+        heartbeats.append(job_id)
+        return await original_heartbeat(self, job_id, worker_id)
+
+    monkeypatch.setattr(JobQueue, "heartbeat", counting_heartbeat)
+
+    @register_job_handler("test_blocking")
+    async def blocking(job):
+        await _run_in_session(lambda db: time.sleep(0.3))
+
+    async with session_factory() as db:
+        job = await _queue(db).enqueue("test_blocking")
+
+    worker = JobWorker("w1", session_factory=session_factory, heartbeat_interval=0.05, lease_seconds=60)
+    assert await worker.run_once() is True
+
+    async with session_factory() as db:
+        refreshed = await db.get(BackgroundJob, job.id)
+        assert refreshed.status == "completed"
+    # The sleep ran off the event loop, so the lease was renewed meanwhile
+    assert len(heartbeats) >= 2
@@ -0,0 +1,141 @@
+"""
+Unit tests for precomputed template-matching features.
+"""
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.document import Document
+from app.models.parse_result import MatchFeatures, ParseResult
+from app.models.physical_file import PhysicalFile
+from app.services import parse_result_store
+from app.services.match_feature_service import (
+    FEATURE_VERSION,
+    MatchFeatureService,
+    compute_match_features,
+    jaccard,
+    shingle_hashes,
+)
+from app.services.parse_result_store import ParseResultStore
+from app.services.postgres_service import PostgresService
+
+
+def invoice_parse(number: int, vendor: str = "acme-7"):
+    return {"chunks": [
+        {"content": f"Invoice Number: {number}\nVendor Name: {vendor}\nTotal Amount: 1200.00 payable within thirty days",
+         "blocks": [{"content": f"Invoice Number: {number}", "bbox": {"page": 1}},
+                    {"content": "Total Amount: 1200.00", "bbox": {"page": 2}}]},
+    ]}
+
+
+RECEIPT = {"chunks": [{"content": "Grocery receipt thank you for shopping bananas apples milk bread"}]}
+
+
+@pytest.fixture
+def engine(memory_engine):
+    return memory_engine(
+        ParseResult.__table__, MatchFeatures.__table__, PhysicalFile.__table__, Document.__table__
+    )
+
+
+@pytest.fixture
+def db(engine, monkeypatch):
+    factory = sessionmaker(bind=engine, autoflush=False)
+    store = ParseResultStore(session_factory=factory, storage="db", codec="gzip")
+    monkeypatch.setattr(parse_result_store, "_parse_result_store", store)
+    session = factory()
+    yield session
+    session.close()
+
+
+def add_document(db, name: str, parse) -> Document:
+    physical_file = PhysicalFile(filename=name, file_hash=f"hash-{name}", file_path=f"uploads/{name}")
+    physical_file.reducto_parse_result = parse
+    document = Document(filename=name, physical_file=physical_file)
+    db.add(document)
+    db.commit()
+    return document
+
+
+@pytest.mark.unit
+def test_compute_match_features():
+    features = compute_match_features(invoice_parse(42))
+
+    assert features.feature_version == FEATURE_VERSION
+    assert features.head_text.startswith("Invoice Number: 42")
+    assert features.sample_text == "Invoice Number: 42\nTotal Amount: 1200.00"
+    assert features.field_names == ["invoice_number", "vendor_name", "total_amount"]
+    assert "invoice" in features.tokens and "the" not in features.tokens
+    assert features.page_count == 2
+    assert features.chunk_count == 1
+    # Stable across processes (crc32, not hash())
+    assert features.shingles == shingle_hashes(features.head_text)
+    assert features.shingles == sorted(set(features.shingles))
+
+
+@pytest.mark.unit
+def test_features_written_with_parse_result(db):
+    first = add_document(db, "a.pdf", invoice_parse(1))
+    second = add_document(db, "b.pdf", invoice_parse(1))
+
+    rows = db.query(MatchFeatures).all()
+    assert len(rows) == 1
+    assert rows[0].content_hash == first.physical_file.parse_result_hash == second.physical_file.parse_result_hash
+
+
+@pytest.mark.unit
+def test_for_documents_reads_features_only(engine, db):
+    documents = [add_document(db, f"{i}.pdf", invoice_parse(i)) for i in range(3)]
+    parse_result_store.get_parse_result_store().clear_cache()
+    db.expire_all()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, sql, *args: statements.append(sql))
+    features = MatchFeatureService(db).for_documents(documents)
+
+    assert [features[d.id].field_names[0] for d in documents] == ["invoice_number"] * 3
+    features_queries = [s for s in statements if "match_features" in s]
+    assert len(features_queries) == 1
+    assert not any("FROM parse_results" in s for s in statements)
+
+
+@pytest.mark.unit
+def test_missing_features_computed_on_read_and_backfilled(db):
+    documents = [add_document(db, f"{i}.pdf", invoice_parse(i)) for i in range(3)]
+    db.query(MatchFeatures).delete()
+    db.commit()
+
+    features = MatchFeatureService(db).for_documents(documents[:1])
+    db.commit()
+    assert features[documents[0].id].field_names == ["invoice_number", "vendor_name", "total_amount"]
+    assert db.query(MatchFeatures).count() == 1
+
+    assert MatchFeatureService(db).backfill(batch_size=1) == 2
+    assert db.query(MatchFeatures).count() == 3
+    assert MatchFeatureService(db).backfill() == 0
+
+
+@pytest.mark.unit
+def test_legacy_document_without_hash_gets_transient_features(db):
+    document = Document(filename="legacy.pdf")
+    document.legacy_parse_result = RECEIPT
+    db.add(document)
+    db.commit()
+
+    features = MatchFeatureService(db).get(document)
+    assert "grocery" in features.tokens
+    assert db.query(MatchFeatures).count() == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_clustering_uses_token_features(db):
+    invoices = [add_document(db, f"inv{i}.pdf", invoice_parse(i)) for i in range(3)]
+    receipt = add_document(db, "receipt.pdf", RECEIPT)
+
+    clusters = await PostgresService(db).cluster_uploaded_documents(invoices + [receipt], similarity_threshold=0.5)
+
+    grouped = sorted(sorted(c["document_ids"]) for c in clusters)
+    assert grouped == sorted([sorted(d.id for d in invoices), [receipt.id]])
+    assert jaccard(["a", "b"], ["b", "c"]) == pytest.approx(1 / 3)
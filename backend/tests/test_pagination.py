@@ -0,0 +1,111 @@
+"""
+Unit tests for keyset cursors and capped totals.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from app.api.documents import list_documents
+from app.models.document import Document, ExtractedField
+from app.models.physical_file import PhysicalFile
+from app.models.schema import Schema
+from app.models.search_index import DocumentSearchIndex
+from app.models.template import SchemaTemplate
+from app.utils.pagination import _Explain, count_total, decode_cursor, encode_cursor, keyset_after
+
+
+@pytest.fixture
+def engine(memory_engine):
+    return memory_engine(
+        SchemaTemplate.__table__, Schema.__table__, PhysicalFile.__table__, Document.__table__,
+        ExtractedField.__table__
+    )
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine, autoflush=False)()
+    started = datetime(2025, 1, 1)
+    # Pairs of documents share an upload time, so the id tie-breaker matters
+    for i in range(25):
+        session.add(Document(filename=f"doc{i}.pdf", file_path=f"uploads/doc{i}.pdf", status="completed",
+                             uploaded_at=started + timedelta(minutes=i // 2)))
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.mark.unit
+def test_cursor_round_trip_and_rejects_garbage():
+    cursor = encode_cursor({"rank": 0.125, "id": 42})
+    assert decode_cursor(cursor, ["rank", "id"]) == {"rank": 0.125, "id": 42}
+
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, ["t", "id"])  # Issued for a different ordering
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor!", ["id"])
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_count_total_modes(db):
+    stmt = select(Document.id)
+    assert await count_total(db, stmt, "exact") == (25, "eq")
+    assert await count_total(db, stmt, "capped", cap=10) == (10, "gte")
+    assert await count_total(db, stmt, "capped", cap=25) == (25, "eq")
+    # No planner estimate outside PostgreSQL: falls back to the capped count
+    assert await count_total(db, stmt, "estimate", cap=10) == (10, "gte")
+    assert await count_total(db, stmt, "none") == (None, None)
+    with pytest.raises(ValueError):
+        await count_total(db, stmt, "approximate")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_list_documents_cursor_walks_every_row_once(engine, db):
+    seen, cursor = [], None
+    while True:
+        page = await list_documents(size=10, cursor=cursor, total_mode="none", db=db)
+        seen.extend(d["id"] for d in page["documents"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    expected = [d.id for d in db.query(Document).order_by(Document.uploaded_at.desc(), Document.id.desc())]
+    assert seen == expected
+
+    page = await list_documents(size=10, total_mode="capped", db=db)
+    assert page["total"] == 25 and page["total_relation"] == "eq"
+
+    # The keyset order is read from ix_documents_uploaded_at_id instead of sorting the table
+    stmt = select(Document.id).order_by(Document.uploaded_at.desc(), Document.id.desc()).limit(11)
+    sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+    plan = " ".join(row[-1] for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+    assert "ix_documents_uploaded_at_id" in plan and "TEMP B-TREE" not in plan
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_list_documents_rejects_bad_cursor(db):
+    with pytest.raises(HTTPException) as exc:
+        await list_documents(cursor=encode_cursor({"id": 1}), db=db)
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.unit
+def test_keyset_and_explain_compile_for_postgres():
+    rank = DocumentSearchIndex.document_id * 1.0
+    clause = keyset_after([rank, DocumentSearchIndex.document_id], [0.5, 7])
+    sql = str(select(DocumentSearchIndex.id).where(clause).compile(dialect=postgresql.dialect()))
+    assert sql.count("document_search_index.document_id") >= 3
+    assert " OR " in sql
+
+    explained = str(_Explain(select(Document.id).where(Document.status == "completed")).compile(
+        dialect=postgresql.dialect()
+    ))
+    assert explained.startswith("EXPLAIN (FORMAT JSON) SELECT documents.id")
@@ -0,0 +1,159 @@
+"""
+Unit tests for the out-of-row parse result store.
+"""
+
+import os
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.document import Document
+from app.models.parse_result import MatchFeatures, ParseResult
+from app.models.physical_file import PhysicalFile
+from app.services import parse_result_store
+from app.services.parse_result_store import ParseResultStore
+
+PARSE = {"job_id": "job-1", "result": {"chunks": [{"content": "Invoice 42 " * 200, "blocks": []}]}}
+
+
+@pytest.fixture
+def engine(memory_engine):
+    return memory_engine(
+        ParseResult.__table__, MatchFeatures.__table__, PhysicalFile.__table__, Document.__table__
+    )
+
+
+@pytest.fixture
+def factory(engine):
+    return sessionmaker(bind=engine, autoflush=False)
+
+
+@pytest.fixture
+def store(factory, monkeypatch):
+    store = ParseResultStore(session_factory=factory, storage="db", codec="gzip")
+    monkeypatch.setattr(parse_result_store, "_parse_result_store", store)
+    return store
+
+
+def add_file(db, name: str, parse=PARSE) -> PhysicalFile:
+    physical_file = PhysicalFile(filename=name, file_hash=f"hash-{name}", file_path=f"uploads/{name}")
+    physical_file.reducto_parse_result = parse
+    db.add(physical_file)
+    db.commit()
+    return physical_file
+
+
+@pytest.mark.unit
+def test_round_trip_stores_compressed_blob(factory, store):
+    db = factory()
+    physical_file = add_file(db, "a.pdf")
+
+    row = db.query(ParseResult).one()
+    assert physical_file.parse_result_hash == row.content_hash
+    assert row.codec == "gzip" and row.storage == "db"
+    assert row.stored_size < row.raw_size
+
+    store.clear_cache()
+    fresh = factory()
+    loaded = fresh.get(PhysicalFile, physical_file.id)
+    assert loaded.has_parse_result
+    assert loaded.reducto_parse_result == PARSE
+
+
+@pytest.mark.unit
+def test_identical_parses_share_one_blob(factory, store):
+    db = factory()
+    first = add_file(db, "a.pdf")
+    second = add_file(db, "b.pdf")
+    document = Document(filename="a.pdf", physical_file_id=first.id)
+    document.reducto_parse_result = PARSE
+    db.add(document)
+    db.commit()
+
+    assert first.parse_result_hash == second.parse_result_hash == document.parse_result_hash
+    assert db.execute(select(func.count()).select_from(ParseResult)).scalar() == 1
+
+
+@pytest.mark.unit
+def test_loading_rows_does_not_fetch_parse_output(engine, factory, store):
+    db = factory()
+    physical_file = add_file(db, "a.pdf")
+    file_id = physical_file.id
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, sql, *args: statements.append(sql))
+    fresh = factory()
+    loaded = fresh.get(PhysicalFile, file_id)
+    assert loaded.has_parse_result
+    assert len(statements) == 1
+    # Only the legacy column's presence is selected, never its JSON
+    assert statements[0].count("reducto_parse_result") == statements[0].count("reducto_parse_result IS NOT NULL")
+    assert "parse_results" not in statements[0]
+
+    # Warm LRU: reading the attribute needs no further query
+    assert loaded.reducto_parse_result == PARSE
+    assert len(statements) == 1
+
+
+@pytest.mark.unit
+def test_lru_evicts_least_recently_used(factory):
+    store = ParseResultStore(session_factory=factory, storage="db", codec="gzip", cache_max_bytes=100)
+    store.cache_put("a", b"x" * 40)
+    store.cache_put("b", b"y" * 40)
+    store._cache_get("a")
+    store.cache_put("c", b"z" * 40)
+
+    assert list(store._cache) == ["a", "c"]
+    assert store._cache_bytes == 80
+
+    store.cache_put("huge", b"h" * 500)
+    assert "huge" not in store._cache
+
+
+@pytest.mark.unit
+def test_legacy_in_row_result_is_read_until_migrated(factory, store):
+    db = factory()
+    physical_file = PhysicalFile(filename="old.pdf", file_hash="old", file_path="uploads/old.pdf")
+    physical_file.legacy_parse_result = PARSE
+    db.add_all([physical_file, PhysicalFile(filename="new.pdf", file_hash="new", file_path="uploads/new.pdf")])
+    db.commit()
+
+    # Existence is answered from the row without loading the deferred JSON
+    fresh = factory()
+    loaded = {row.filename: row for row in fresh.query(PhysicalFile)}
+    assert loaded["old.pdf"].has_parse_result and not loaded["new.pdf"].has_parse_result
+    assert "legacy_parse_result" not in loaded["old.pdf"].__dict__
+
+    assert physical_file.has_parse_result
+    assert physical_file.reducto_parse_result == PARSE
+    assert physical_file.parse_result_hash is None
+
+    # Reassigning (as the migration does) moves it out of row
+    physical_file.reducto_parse_result = physical_file.legacy_parse_result
+    db.commit()
+    assert physical_file.legacy_parse_result is None
+    assert physical_file.parse_result_hash is not None
+    assert db.query(ParseResult).count() == 1
+
+
+@pytest.mark.unit
+def test_disk_storage_and_prune(factory, tmp_path, monkeypatch):
+    store = ParseResultStore(session_factory=factory, storage="disk", directory=str(tmp_path), codec="gzip")
+    monkeypatch.setattr(parse_result_store, "_parse_result_store", store)
+    db = factory()
+    physical_file = add_file(db, "a.pdf")
+
+    path = store.blob_path(physical_file.parse_result_hash)
+    assert os.path.exists(path)
+    assert db.query(ParseResult).one().data is None
+
+    store.clear_cache()
+    assert store.get(physical_file.parse_result_hash) == PARSE
+    assert store.find(db, "hash-a.pdf") == physical_file.parse_result_hash
+
+    physical_file.reducto_parse_result = {"job_id": "job-2", "result": {"chunks": []}}
+    db.commit()
+    assert store.prune_unreferenced(db) == 1
+    assert db.query(ParseResult).count() == 1
+    assert not os.path.exists(path)
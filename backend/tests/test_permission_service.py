@@ -0,0 +1,157 @@
+"""
+Unit tests for bulk document access checks: the effective_permissions table
+maintained on flush, folder-prefix inheritance and the per-service memo.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.document import Document
+from app.models.extraction import Extraction
+from app.models.folder import Folder
+from app.models.permissions import (
+    DocumentPermission,
+    EffectivePermission,
+    FolderPermission,
+    Permission,
+    PermissionAction,
+    PermissionAuditLog,
+    Role,
+    UserRole,
+    role_permissions,
+)
+from app.models.physical_file import PhysicalFile
+from app.models.schema import Schema
+from app.models.settings import Organization, User
+from app.models.template import SchemaTemplate
+from app.services.permission_service import PermissionService
+
+
+@pytest.fixture
+def engine(memory_engine):
+    return memory_engine(
+        Organization.__table__, User.__table__, Role.__table__, Permission.__table__, role_permissions,
+        UserRole.__table__, SchemaTemplate.__table__, Schema.__table__, PhysicalFile.__table__,
+        Document.__table__, Extraction.__table__, Folder.__table__, DocumentPermission.__table__,
+        FolderPermission.__table__, EffectivePermission.__table__, PermissionAuditLog.__table__
+    )
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    org, other_org = Organization(id=1, name="Acme", slug="acme"), Organization(id=2, name="Globex", slug="globex")
+    session.add_all([org, other_org])
+    session.flush()
+    session.add_all([
+        User(id=1, email="owner@acme.test", org_id=org.id),
+        User(id=2, email="reader@acme.test", org_id=org.id),
+        User(id=3, email="owner@globex.test", org_id=other_org.id),
+        SchemaTemplate(id=1, name="Contract", category="contract", description="Contracts", fields=[]),
+        Role(id=1, name="Legal", slug="legal"),
+        UserRole(user_id=2, role_id=1),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+def add_document(db, folder: str, **kwargs) -> Document:
+    name = f"{db.query(Document).count()}.pdf"
+    physical_file = PhysicalFile(filename=name, file_hash=name, file_path=f"uploads/{name}")
+    kwargs.setdefault("created_by_user_id", 1)
+    document = Document(filename=name, physical_file=physical_file, **kwargs)
+    db.add_all([document, Extraction(physical_file=physical_file, template_id=1,
+                                     organized_path=f"{folder}/{name}")])
+    db.commit()
+    return document
+
+
+@pytest.mark.unit
+def test_filter_accessible_resolves_grants_in_bulk(db, engine):
+    private = add_document(db, "hr")
+    shared = add_document(db, "hr")
+    by_role = add_document(db, "hr")
+    public = add_document(db, "hr", is_public=True)
+    expired = add_document(db, "hr")
+    nested = add_document(db, "contracts/2024/q1")
+    flat_only = add_document(db, "finance/2024")
+    other_org = add_document(db, "contracts/2024/q1", created_by_user_id=3, organization_id=2)
+    other_org_hr = add_document(db, "hr", created_by_user_id=3)
+    db.add_all([
+        DocumentPermission(document_id=shared.id, user_id=2, shared_by_user_id=1),
+        DocumentPermission(document_id=by_role.id, role_id=1, shared_by_user_id=1),
+        DocumentPermission(document_id=expired.id, user_id=2, shared_by_user_id=1,
+                           expires_at=datetime.utcnow() - timedelta(days=1)),
+        FolderPermission(folder_path="/contracts", user_id=2, granted_by_user_id=1),
+        FolderPermission(folder_path="/finance", role_id=1, granted_by_user_id=1, inherit_to_subfolders=False),
+        FolderPermission(folder_path="/hr", granted_by_user_id=3),  # Everyone, but made in the other org
+    ])
+    db.commit()
+    ids = [private.id, shared.id, by_role.id, public.id, expired.id, nested.id, flat_only.id, 999]
+    ids[-1:-1] = [other_org.id, other_org_hr.id]  # Same folders, other org: folder grants do not cross orgs
+
+    service = PermissionService(db)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert service.filter_accessible(2, ids) == [shared.id, by_role.id, public.id, nested.id]
+    assert len(statements) == 4  # User + roles (memoized), then grants + documents
+    assert service.filter_accessible(2, ids[::-1]) == [nested.id, public.id, by_role.id, shared.id]
+    assert service.check_document_access(2, nested.id)
+    assert len(statements) == 4  # Served from the memo
+
+    assert service.filter_accessible(2, ids, "write") == []
+    assert service.filter_accessible(1, ids) == ids[:-3]  # Owner
+    assert service.filter_accessible(3, ids) == [other_org.id, other_org_hr.id]
+    assert service.check_folder_access(2, "/contracts/2024")
+    assert not service.check_folder_access(2, "/hr")
+    assert not service.check_folder_access(2, "/finance/2024/q1")  # Grant does not inherit
+
+
+@pytest.mark.unit
+def test_grants_and_revokes_keep_effective_permissions_current(db):
+    document = add_document(db, "hr")
+    service = PermissionService(db)
+    assert not service.check_document_access(2, document.id)
+
+    service.grant_document_access(document.id, target_user_id=2, granted_by_user_id=1)
+    assert service.check_document_access(2, document.id)  # Memo dropped by the grant
+    assert db.query(EffectivePermission).one().document_id == document.id
+
+    folder_grant = FolderPermission(folder_path="hr/", role_id=1, granted_by_user_id=1)
+    db.add(folder_grant)
+    db.commit()
+    service.revoke_document_access(document.id, target_user_id=2, revoked_by_user_id=1)
+    assert service.check_document_access(2, document.id)  # Still readable through the role's folder grant
+    assert db.query(EffectivePermission).one().folder_prefix == "hr"
+
+    folder_grant.can_read = False
+    db.commit()
+    assert PermissionService(db).filter_accessible(2, [document.id]) == []
+
+    db.delete(folder_grant)
+    db.add(Permission(id=1, action=PermissionAction.READ_DOCUMENTS, name="Read Documents"))
+    db.execute(role_permissions.insert().values(role_id=1, permission_id=1))
+    db.commit()
+    assert db.query(EffectivePermission).count() == 0
+    assert PermissionService(db).filter_accessible(2, [document.id, 999]) == [document.id]  # Role-wide read
+
+
+@pytest.mark.unit
+def test_folder_grants_never_match_without_an_org(db):
+    db.add_all([User(id=4, email="solo@example.test"), User(id=5, email="other-solo@example.test")])
+    db.commit()
+    orgless = add_document(db, "hr", created_by_user_id=5)
+    db.add_all([
+        FolderPermission(folder_path="/hr", user_id=4, granted_by_user_id=1),
+        FolderPermission(folder_path="/hr", granted_by_user_id=5),  # Granter has no org: not stored
+    ])
+    db.commit()
+
+    assert db.query(EffectivePermission).one().org_id == 1
+    service = PermissionService(db)
+    assert service.filter_accessible(4, [orgless.id]) == []  # Both orgs None, still no match
+    assert not service.check_folder_access(4, "/hr")
@@ -0,0 +1,43 @@
+"""
+Unit tests for the compiled query intent matcher and the QueryOptimizer
+analysis built on it.
+"""
+
+import pytest
+
+from app.services.query_intent_matcher import AhoCorasick, QueryIntentMatcher
+from app.services.query_optimizer import DEFAULT_FIELD_ALIASES, QueryOptimizer
+
+
+@pytest.mark.unit
+def test_automaton_reports_overlapping_phrases():
+    automaton = AhoCorasick([("he", 1), ("she", 2), ("hers", 3), ("his", 4)])
+    assert sorted(automaton.findall("ushers")) == [1, 2, 3]
+    assert automaton.findall("xyz") == []
+
+    matches = QueryIntentMatcher(DEFAULT_FIELD_ALIASES).scan("total budget for the last 30 days")
+    assert matches.labels("intent") == {"retrieve", "aggregate"}  # "get" inside "budget", as before
+    assert matches.first("intent", ["retrieve", "aggregate", "filter"]) == "retrieve"
+    assert matches.labels("date") == {"last_30_days"}
+    assert matches.labels("field") == {"amount"}
+
+
+@pytest.mark.unit
+def test_analysis_keeps_precedence_and_resolves_fields_once():
+    optimizer = QueryOptimizer()
+    fields = ["invoice_total", "vendor_name", "status"]
+
+    analysis = optimizer.understand_query_intent(
+        "How many pending invoices between $1,000 and 2,500 this month, newest first?", fields
+    )
+    assert analysis["intent"] == "aggregate"
+    assert analysis["aggregations"] == [{"type": "count"}]
+    assert analysis["sort"] == {"field": "uploaded_at", "order": "desc"}
+    assert analysis["filters"] == [
+        {"type": "range", "field": "invoice_total", "operator": "range", "value": {"gte": 1000.0, "lte": 2500.0}},
+        {"type": "date_range", "field": "uploaded_at", "range": "this_month"},
+        {"type": "term", "field": "status", "value": "pending"},
+    ]
+
+    assert optimizer._resolve_field("vendor", fields) == "vendor_name"
+    assert optimizer.intent_matcher._resolved[("vendor", tuple(fields))] == "vendor_name"
@@ -0,0 +1,125 @@
+"""
+Unit tests for query patterns: literal abstraction, the compiled matcher and
+confidence updates from repeated Claude parses.
+"""
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.models.query_pattern import QueryPattern
+from app.services import query_pattern_service
+from app.services.query_pattern_service import (
+    QueryPatternMatcher,
+    abstract_query,
+    learn_query_pattern,
+)
+
+
+def _parse(vendor, amount, year):
+    """What Claude returns for 'invoices from <vendor> over $<amount> in <year>'."""
+    return {
+        "query_type": "search",
+        "explanation": f"Invoices from {vendor} with total over {amount} in {year}",
+        "elasticsearch_query": {"query": {"bool": {"filter": [
+            {"match": {"vendor_name": vendor}},
+            {"range": {"total_amount": {"gt": amount}}},
+            {"range": {"invoice_date": {"gte": f"{year}-01-01", "lte": f"{year}-12-31"}}}
+        ]}}}
+    }
+
+
+@pytest.fixture
+def db(memory_engine, monkeypatch):
+    engine = memory_engine(QueryPattern.__table__)
+    matcher = QueryPatternMatcher(min_confidence=0.75, reload_seconds=3600)
+    monkeypatch.setattr(query_pattern_service, "_query_pattern_matcher", matcher)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.mark.unit
+def test_abstract_query_keeps_literals_the_parse_does_not_use():
+    abstraction = abstract_query("Show me the top 5 invoices over $1,000 in 2024?", {
+        "query_type": "search",
+        "elasticsearch_query": {"query": {"bool": {"filter": [
+            {"range": {"total_amount": {"gt": 1000}}},
+            {"range": {"invoice_date": {"gte": "2024-01-01"}}}
+        ]}}}
+    })
+
+    assert abstraction.pattern == "show me the top 5 invoices over {p0} in {p1}"
+    assert abstraction.parameter_types == {"p0": "int", "p1": "year"}
+    assert abstraction.template["elasticsearch_query"]["query"]["bool"]["filter"] == [
+        {"range": {"total_amount": {"gt": "{{p0}}"}}},
+        {"range": {"invoice_date": {"gte": "{{p1}}-01-01"}}}
+    ]
+    assert abstract_query("show me all invoices", {"elasticsearch_query": {"query": {"match_all": {}}}}) is None
+
+
+@pytest.mark.unit
+def test_abstract_query_only_substitutes_value_positions():
+    abstraction = abstract_query("show invoices over 1", {
+        "query_type": "search",
+        "elasticsearch_query": {"query": {"bool": {
+            "should": [{"range": {"total_amount": {"gt": 1}}}, {"term": {"status": 1}}],
+            "minimum_should_match": 1
+        }}}
+    })
+
+    query = abstraction.template["elasticsearch_query"]["query"]["bool"]
+    assert query["should"] == [{"range": {"total_amount": {"gt": "{{p0}}"}}}, {"term": {"status": "{{p0}}"}}]
+    assert query["minimum_should_match"] == 1
+
+
+@pytest.mark.unit
+def test_text_capture_does_not_swallow_extra_clauses(db):
+    matcher = query_pattern_service.get_query_pattern_matcher()
+    parse = {"query_type": "search", "elasticsearch_query": {"query": {"match": {"vendor_name": "Acme"}}}}
+    learn_query_pattern(db, "invoices from Acme", parse)
+    db.query(QueryPattern).update({QueryPattern.confidence_score: 0.9})
+    db.commit()
+
+    assert matcher.match(db, "invoices from Globex Corp").params == {"p0": "Globex Corp"}
+    assert matcher.match(db, "invoices from Globex and over 500") is None
+    assert matcher.match(db, "invoices from Globex, unpaid") is None
+
+
+@pytest.mark.unit
+def test_matcher_instantiates_learned_pattern(db):
+    matcher = query_pattern_service.get_query_pattern_matcher()
+    learn_query_pattern(db, "invoices from Acme Corp over $1,000 in 2024", _parse("Acme Corp", 1000, 2024))
+
+    # Free-text (vendor) capture: not trusted until two more parses confirm the shape
+    assert matcher.match(db, "invoices from Globex over $250 in 2023") is None
+    learn_query_pattern(db, "invoices from Globex over $250 in 2023", _parse("Globex", 250, 2023))
+    assert matcher.match(db, "invoices from Hooli over $90 in 2021") is None
+    assert matcher.get_stats()["low_confidence"] == 2
+
+    learn_query_pattern(db, "invoices from Hooli over $90 in 2021", _parse("Hooli", 90, 2021))
+    match = matcher.match(db, "Invoices from Initech  over 7,500 in 2022?")
+
+    assert match is not None
+    assert match.nl_result == _parse("Initech", 7500, 2022)
+    assert matcher.match(db, "invoices from Initech over 7,500", template_id="schema_1") is None  # Other scope
+    assert db.query(QueryPattern).one().usage_count == 1
+    assert matcher.get_stats()["hits"] == 1 and matcher.get_stats()["lookups"] == 4
+
+
+@pytest.mark.unit
+def test_disagreeing_parse_lowers_confidence(db):
+    matcher = query_pattern_service.get_query_pattern_matcher()
+    for amount in (1000, 300):
+        learn_query_pattern(db, f"invoices over ${amount:,}", _parse("x", amount, 2024) | {"elasticsearch_query": {
+            "query": {"range": {"total_amount": {"gt": amount}}}
+        }})
+        # Served only once a second parse agreed with the first
+        assert (matcher.match(db, "invoices over 20") is not None) == (amount == 300)
+
+    # Claude reads the same shape differently: the pattern stops being served
+    learn_query_pattern(db, "invoices over $50", {"query_type": "search", "elasticsearch_query": {
+        "query": {"range": {"total_amount": {"gte": 50}}}
+    }})
+    pattern = db.query(QueryPattern).one()
+    assert pattern.confidence_score == pytest.approx(0.4)
+    assert matcher.match(db, "invoices over 20") is None
@@ -0,0 +1,90 @@
+"""
+Unit tests for the shared schema registry snapshot: reuse across services,
+rebuilds on local commits and on changes made by other processes.
+"""
+
+import pytest
+from sqlalchemy import event, update
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.models.canonical_mapping import CanonicalAlias, CanonicalFieldMapping
+from app.models.schema import Schema
+from app.models.settings import Organization, User
+from app.models.template import SchemaTemplate
+from app.services.canonical_field_service import CanonicalFieldService
+from app.services.query_optimizer import QueryOptimizer
+from app.services.schema_registry import SchemaRegistry
+
+
+@pytest.fixture
+def engine(memory_engine):
+    return memory_engine(
+        Organization.__table__, User.__table__, Schema.__table__, SchemaTemplate.__table__,
+        CanonicalFieldMapping.__table__, CanonicalAlias.__table__
+    )
+
+
+@pytest.fixture
+def db(engine, monkeypatch):
+    monkeypatch.setattr(settings, "SCHEMA_REGISTRY_VERSION_CHECK_SECONDS", 3600.0)
+    session = sessionmaker(bind=engine)()
+    session.add(Schema(name="Invoice", fields=[
+        {"name": "invoice_total", "type": "number"}, {"name": "vendor_name", "type": "text"}
+    ]))
+    mapping = CanonicalFieldMapping(canonical_name="revenue", field_mappings={"Invoice": "invoice_total"},
+                                    aggregation_type="sum")
+    session.add(mapping)
+    session.flush()
+    session.add(CanonicalAlias(canonical_field_id=mapping.id, alias="sales"))
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_snapshot_shared_by_registry_optimizer_and_canonical_service(db, engine):
+    registry = SchemaRegistry(db)
+    snapshot = await registry.snapshot()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    contexts = await SchemaRegistry(db).get_all_templates_context()
+    first, second = QueryOptimizer(SchemaRegistry(db)), QueryOptimizer(SchemaRegistry(db))
+    await first.initialize_from_registry()
+    await second.initialize_from_registry()
+    service = CanonicalFieldService(db)
+    assert statements == []  # Served from the snapshot
+
+    assert contexts[0]["template_name"] == "Invoice"
+    assert (await registry.get_field_context(template_name="Invoice")) is snapshot.contexts[0]
+    assert first.field_aliases is second.field_aliases  # Derived once per snapshot
+    assert first.intent_matcher is second.intent_matcher
+    assert "invoice_total" in first.field_aliases["amount"]
+    assert service.resolve_canonical_name("sales") == "revenue"
+    assert service.get_mapping("revenue").get_templates() == ["Invoice"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_snapshot_rebuilt_after_local_and_remote_changes(db, engine, monkeypatch):
+    registry = SchemaRegistry(db)
+    version = (await registry.snapshot()).version
+
+    # Local write: the commit hook marks the snapshot stale
+    service = CanonicalFieldService(db)
+    service.add_alias("revenue", "income")
+    assert service.resolve_canonical_name("income") == "revenue"
+    snapshot = await registry.snapshot()
+    assert snapshot.version > version
+
+    # Another process (no hook here): noticed by the fingerprint check
+    with engine.begin() as conn:
+        conn.execute(update(CanonicalAlias).where(CanonicalAlias.alias == "sales").values(is_active=False))
+    assert (await registry.snapshot()) is snapshot  # Not checked again yet
+    monkeypatch.setattr(settings, "SCHEMA_REGISTRY_VERSION_CHECK_SECONDS", 0.0)
+    assert "sales" not in CanonicalFieldService(db)._alias_cache
+
+    unchanged = await registry.snapshot()
+    assert (await registry.snapshot()) is unchanged  # Same fingerprint: no rebuild
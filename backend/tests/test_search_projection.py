@@ -0,0 +1,97 @@
+"""
+Unit tests for search result projection and ts_headline snippets.
+
+document_search_index is Postgres-only (JSONB, tsvector), so the page query is
+compiled with the PostgreSQL dialect and fed back canned rows.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services import typed_field_index_service
+from app.services.postgres_service import SNIPPET_DELIMITER, PostgresService
+from app.services.typed_field_index_service import TypedFieldRegistry
+
+
+@pytest.fixture(autouse=True)
+def typed_fields(monkeypatch):
+    registry = TypedFieldRegistry(ttl_seconds=3600)
+    registry.set_fields(set())
+    monkeypatch.setattr(typed_field_index_service, "_typed_field_registry", registry)
+    return registry
+
+
+class Row(tuple):
+    """Result row: positional access plus a label mapping."""
+
+    def __new__(cls, values, mapping):
+        row = super().__new__(cls, values)
+        row._mapping = mapping
+        return row
+
+
+class RecordingSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        result = SimpleNamespace(all=lambda: self.rows)
+        result.unique = lambda strategy=None: result
+        return result
+
+
+def _hit(document_id, **columns):
+    entity = SimpleNamespace(
+        id=document_id, document_id=document_id, document=SimpleNamespace(filename=f"doc{document_id}.pdf"),
+        query_context={"template_name": "Invoice"}, field_index=["vendor", "total"],
+        confidence_metrics={"avg_confidence": 0.9}, citation_metadata={}
+    )
+    return Row((entity, 0.5, *columns.values()), {"rank": 0.5, **columns})
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_projected_search_selects_fields_and_snippets_only():
+    session = RecordingSession([_hit(
+        7, _field_0="Acme", _confidence_0=0.93, _field_1=None, _confidence_1=None,
+        _snippet=f"paid to <mark>Acme</mark>{SNIPPET_DELIMITER} <mark>Acme</mark> net 30"
+    )])
+    result = await PostgresService(session).search(
+        query="acme", fields=["vendor", "po_number"], include_text=False, snippets=2, total_mode="none"
+    )
+
+    sql = session.statements[-1]
+    assert "ts_headline" in sql
+    assert "document_search_index.extracted_fields ->" in sql
+    entity_columns = sql.split("ts_rank(")[0]  # Full text is only read inside ts_headline
+    assert "document_search_index.all_text," not in entity_columns
+    assert "document_search_index.full_text," not in entity_columns
+    assert "documents.file_path" not in sql  # Joined document loads id and filename only
+
+    doc = result["documents"][0]
+    assert doc["data"]["vendor"] == "Acme" and "po_number" not in doc["data"]
+    assert doc["data"]["confidence_scores"] == {"vendor": 0.93}
+    assert "full_text" not in doc["data"] and "_all_text" not in doc["data"]
+    assert doc["highlights"]["full_text"] == ["paid to <mark>Acme</mark>", "<mark>Acme</mark> net 30"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_default_search_still_returns_full_payload():
+    hit = _hit(3)
+    hit[0].full_text, hit[0].all_text = "Invoice body", "Invoice body Acme"
+    hit[0].extracted_fields = {"vendor": "Acme"}
+    hit[0].field_metadata = {"vendor": {"confidence": 0.8}}
+    session = RecordingSession([hit])
+
+    result = await PostgresService(session).search(query="acme", total_mode="none")
+
+    assert "ts_headline" not in session.statements[-1]
+    doc = result["documents"][0]
+    assert doc["data"]["full_text"] == "Invoice body"
+    assert doc["data"]["vendor"] == "Acme"
+    assert doc["highlights"] == {}
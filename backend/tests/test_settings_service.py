@@ -0,0 +1,147 @@
+"""
+Unit tests for SettingsService hierarchical resolution.
+
+Runs the same checks against a sync Session and an AsyncSession, since the
+service accepts either while the app migrates onto get_async_db.
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import create_engine, event, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.settings import Organization, Settings, SettingsVersion, User
+from app.services import settings_service
+from app.services.settings_service import SettingsCache, SettingsService
+
+SETTINGS_TABLES = [Organization.__table__, User.__table__, Settings.__table__, SettingsVersion.__table__]
+
+
+@pytest.fixture
+def sync_db(memory_engine):
+    session = sessionmaker(bind=memory_engine(*SETTINGS_TABLES), autoflush=False)()
+    yield session
+    session.close()
+
+
+@pytest_asyncio.fixture
+async def async_db(async_memory_engine):
+    engine = await async_memory_engine(*SETTINGS_TABLES)
+    session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)()
+    yield session
+    await session.close()
+
+
+async def _assert_hierarchy(db):
+    service = SettingsService(db)
+    org = await service.get_or_create_default_org()
+    user = await service.get_or_create_default_user(org.id)
+
+    # Hardcoded default when nothing is stored
+    assert await service.get_setting("review_threshold", user.id, org.id) == 0.6
+
+    await service.set_setting("review_threshold", 0.5, "float")
+    assert await service.get_setting("review_threshold", user.id, org.id) == 0.5
+
+    await service.set_setting("review_threshold", 0.7, "float", org_id=org.id)
+    assert await service.get_setting("review_threshold", user.id, org.id) == 0.7
+
+    await service.set_setting("review_threshold", 0.9, "float", user_id=user.id, org_id=org.id)
+    assert await service.get_setting("review_threshold", user.id, org.id) == 0.9
+
+    assert await service.delete_setting("review_threshold", user_id=user.id, org_id=org.id)
+    assert await service.get_setting("review_threshold", user.id, org.id) == 0.7
+
+    resolved = await service.get_all_settings(user_id=user.id, org_id=org.id, include_metadata=True)
+    assert resolved["review_threshold"]["source"] == "organization"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_settings_hierarchy_sync_session(sync_db):
+    await _assert_hierarchy(sync_db)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_settings_hierarchy_async_session(async_db):
+    await _assert_hierarchy(async_db)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_initialize_defaults_is_idempotent(sync_db):
+    service = SettingsService(sync_db)
+    await service.initialize_defaults()
+    count = sync_db.query(Settings).count()
+    await service.initialize_defaults()
+    assert sync_db.query(Settings).count() == count > 0
+
+
+def _count_queries(db) -> list:
+    queries = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: queries.append(args[2]))
+    return queries
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_settings_are_cached_per_org(sync_db, monkeypatch):
+    monkeypatch.setattr(settings_service, "_settings_cache", SettingsCache(ttl_seconds=300, version_check_seconds=0))
+    service = SettingsService(sync_db)
+    org_id, user_id = await service.get_default_scope()
+    await service.set_setting("review_threshold", 0.7, "float", org_id=org_id)
+
+    queries = _count_queries(sync_db)
+    assert await service.get_default_scope() == (org_id, user_id)
+    assert await service.get_setting("review_threshold", user_id, org_id) == 0.7
+    assert await service.get_setting("auto_match_threshold", user_id, org_id) == 0.70
+    assert await SettingsService(sync_db).get_setting("review_threshold", user_id, org_id) == 0.7
+    # One query loads every setting visible to the org; the rest are cache hits
+    assert len(queries) == 1
+
+    await service.set_setting("review_threshold", 0.8, "float", user_id=user_id, org_id=org_id)
+    assert await service.get_setting("review_threshold", user_id, org_id) == 0.8
+    assert await service.delete_setting("review_threshold", user_id=user_id, org_id=org_id)
+    assert await service.get_setting("review_threshold", user_id, org_id) == 0.7
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_settings_version_invalidates_other_processes(sync_db, monkeypatch):
+    cache = SettingsCache(ttl_seconds=300, version_check_seconds=0.001)
+    monkeypatch.setattr(settings_service, "_settings_cache", cache)
+    service = SettingsService(sync_db)
+    org_id, user_id = await service.get_default_scope()
+
+    await service.set_setting("review_threshold", 0.7, "float", org_id=org_id)
+    assert sync_db.query(SettingsVersion.version).scalar() == 1
+    assert await service.get_setting("review_threshold", user_id, org_id) == 0.7
+
+    # Another process changes the setting and bumps the version
+    sync_db.query(Settings).filter(Settings.org_id == org_id).update({"value": "0.9"})
+    sync_db.execute(update(SettingsVersion).values(version=SettingsVersion.version + 1))
+    sync_db.commit()
+
+    cache.version_check_seconds = 300  # Version already checked: stale value served until the next poll
+    assert await service.get_setting("review_threshold", user_id, org_id) == 0.7
+    cache.for_bind(sync_db.get_bind()).version_checked_at = 0
+    assert await service.get_setting("review_threshold", user_id, org_id) == 0.9
+
+
+@pytest.mark.unit
+def test_engines_of_one_database_share_cache_state(tmp_path):
+    cache = SettingsCache(ttl_seconds=300, version_check_seconds=300)
+    path = tmp_path / "settings.db"
+    sync_engine = create_engine(f"sqlite:///{path}")
+    other_engine = create_async_engine(f"sqlite+aiosqlite:///{path}").sync_engine  # AsyncSession.get_bind()
+
+    state = cache.for_bind(sync_engine)
+    state.resolved[("review_threshold", None, None)] = ("0.7", "float")
+    assert cache.for_bind(other_engine) is state
+    cache.invalidate(other_engine)
+    assert state.resolved == {}
+
+    memory_engine = create_engine("sqlite://")
+    assert cache.for_bind(memory_engine) is not cache.for_bind(create_engine("sqlite://"))
@@ -0,0 +1,139 @@
+"""
+Unit tests for the streaming export writers.
+"""
+
+import csv
+import io
+import json
+
+import pytest
+from openpyxl import load_workbook
+from sqlalchemy.orm import sessionmaker
+
+from app.models.document import Document, ExtractedField
+from app.services.export_service import ExportService
+from app.services.streaming_export_service import ExportFilters, StreamingExportService
+
+
+@pytest.fixture
+def session_factory(memory_engine):
+    engine = memory_engine(Document.__table__, ExtractedField.__table__)
+    factory = sessionmaker(bind=engine, autoflush=False)
+
+    db = factory()
+    for i in range(7):
+        doc = Document(filename=f"invoice_{i}.pdf", status="completed")
+        doc.extracted_fields = [
+            ExtractedField(field_name="vendor", field_type="text", field_value=f"Vendor {i}", confidence_score=0.9),
+            ExtractedField(
+                field_name="total", field_type="number", field_value=str(i * 10),
+                confidence_score=0.4 if i % 2 else 0.95,
+                verified=i == 0, verified_value="999" if i == 0 else None
+            ),
+            ExtractedField(
+                field_name="line_items", field_type="array_of_objects", confidence_score=0.8,
+                field_value_json=[{"sku": f"A{i}", "qty": 1}, {"sku": f"B{i}", "qty": 2, "note": "x"}]
+            ),
+        ]
+        if i == 3:
+            doc.extracted_fields.append(ExtractedField(
+                field_name="grades", field_type="table", confidence_score=0.7,
+                field_value_json={"rows": [{"temp": 1, "value": 2.5}]}
+            ))
+        db.add(doc)
+    db.add(Document(filename="unprocessed.pdf", status="uploaded"))  # No fields: never exported
+    db.commit()
+    db.close()
+
+    yield factory
+
+
+def _exporter(session_factory, **filters) -> StreamingExportService:
+    return StreamingExportService(ExportFilters(**filters), session_factory=session_factory, batch_size=3)
+
+
+@pytest.mark.unit
+def test_streamed_csv_matches_in_memory_export(session_factory):
+    streamed = b"".join(_exporter(session_factory).stream_csv()).decode("utf-8")
+    rows = list(csv.DictReader(io.StringIO(streamed)))
+
+    db = session_factory()
+    try:
+        documents = ExportService.build_export_query(db).order_by(Document.id).all()
+        legacy = ExportService.export_to_csv(ExportService.documents_to_records(documents)).decode("utf-8")
+    finally:
+        db.close()
+    legacy_rows = list(csv.DictReader(io.StringIO(legacy)))
+
+    assert len(rows) == 7
+    assert rows[0]["total"] == "999"
+    assert json.loads(rows[2]["line_items"])[0]["sku"] == "A2"
+    assert [row["document_id"] for row in rows] == [row["document_id"] for row in legacy_rows]
+    assert [row["vendor"] for row in rows] == [row["vendor"] for row in legacy_rows]
+    assert set(rows[0]) == set(legacy_rows[0])
+
+
+@pytest.mark.unit
+def test_field_filters_and_json_formats(session_factory):
+    exporter = _exporter(session_factory, confidence_min=0.95)
+
+    # Any field meeting the threshold qualifies the document (even ids only)
+    records = json.loads(b"".join(exporter.stream_json_array(pretty=True)))
+    assert [record["filename"] for record in records] == [f"invoice_{i}.pdf" for i in (0, 2, 4, 6)]
+
+    lines = b"".join(exporter.stream_ndjson(format_type="long")).decode("utf-8").splitlines()
+    assert len(lines) == 4 * 3
+    assert json.loads(lines[0])["field_name"] == "vendor"
+
+    empty = _exporter(session_factory, status="missing")
+    assert json.loads(b"".join(empty.stream_json_array())) == []
+    db = session_factory()
+    try:
+        assert empty.has_documents(db) is False
+        assert exporter.has_documents(db) is True
+    finally:
+        db.close()
+
+
+@pytest.mark.unit
+def test_excel_fills_complex_field_sheets(session_factory):
+    output = io.BytesIO()
+    _exporter(session_factory).write_excel(output, include_metadata=False, sheet_name="Invoices")
+    output.seek(0)
+    workbook = load_workbook(output)
+
+    assert workbook.sheetnames == ["Invoices", "grades_table", "line_items_items"]
+
+    main = list(workbook["Invoices"].iter_rows(values_only=True))
+    assert main[0] == ("document_id", "filename", "status", "uploaded_at", "processed_at",
+                       "vendor", "total", "line_items", "grades")
+    assert workbook["Invoices"]["A1"].font.bold
+    assert len(main) == 8
+
+    items = list(workbook["line_items_items"].iter_rows(values_only=True))
+    assert items[0] == ("document_id", "filename", "sku", "qty", "note")
+    assert len(items) == 1 + 7 * 2
+    assert items[2][1:] == ("invoice_0.pdf", "B0", 2, "x")
+
+    grades = list(workbook["grades_table"].iter_rows(values_only=True))
+    assert grades == [("document_id", "filename", "temp", "value"), (4, "invoice_3.pdf", 1, 2.5)]
+
+
+@pytest.mark.unit
+def test_excel_truncates_long_complex_sheet_names(session_factory):
+    db = session_factory()
+    doc = db.query(Document).filter(Document.filename == "invoice_0.pdf").one()
+    doc.extracted_fields.append(ExtractedField(
+        field_name="quarterly_shipment_reconciliation_lines", field_type="table", confidence_score=0.7,
+        field_value_json={"rows": [{"sku": "A0", "qty": 3}]}
+    ))
+    db.commit()
+    db.close()
+
+    output = io.BytesIO()
+    _exporter(session_factory).write_excel(output, include_metadata=False)
+    output.seek(0)
+    workbook = load_workbook(output)
+
+    assert "quarterly_shipment_reconc_table" in workbook.sheetnames
+    assert all(len(name) <= 31 for name in workbook.sheetnames)
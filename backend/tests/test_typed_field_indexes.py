@@ -0,0 +1,160 @@
+"""
+Unit tests for typed field indexes (recommendations, registry, query expressions).
+"""
+
+import re
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from app.models.query_history import QueryHistory
+from app.models.query_pattern import QueryCache
+from app.models.schema import Schema
+from app.models.search_index import DocumentSearchIndex, TypedFieldIndex
+from app.services import typed_field_index_service
+from app.services.postgres_service import PostgresService
+from app.services.typed_field_index_service import (
+    NUMERIC_TEXT_REGEX,
+    TIMESTAMP_TEXT_REGEX,
+    TYPED_FUNCTIONS_SQL,
+    TypedFieldIndexService,
+    TypedFieldRegistry,
+    iter_typed_field_usage,
+    typed_index_ddl,
+    typed_index_name,
+)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = TypedFieldRegistry(ttl_seconds=60)
+    monkeypatch.setattr(typed_field_index_service, "_typed_field_registry", registry)
+    return registry
+
+
+@pytest.fixture
+def db(memory_engine):
+    engine = memory_engine(
+        Schema.__table__, QueryCache.__table__, QueryHistory.__table__, TypedFieldIndex.__table__
+    )
+    session = sessionmaker(bind=engine, autoflush=False)()
+    session.add(Schema(name="Invoices", fields=[
+        {"name": "total_amount", "type": "number"},
+        {"name": "invoice_date", "type": "date"},
+        {"name": "vendor", "type": "text"},
+        {"name": "tax", "type": "currency"},
+    ]))
+    session.add(QueryCache(query_hash="a", original_query="invoices over 1000", hit_count=6, es_query={
+        "bool": {"filter": [{"range": {"total_amount": {"gte": 1000}}}, {"term": {"vendor.keyword": "Acme"}}]}
+    }))
+    session.add(QueryCache(query_hash="b", original_query="monthly totals", hit_count=1, es_query={
+        "size": 0, "aggs": {"by_month": {"date_histogram": {"field": "invoice_date", "calendar_interval": "month"}}}
+    }))
+    session.add_all([
+        QueryHistory(query_text=f"what is the tax on invoice {i}", query_source="ask_ai", document_ids=[],
+                     answer="-", created_at=datetime.utcnow())
+        for i in range(2)
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+def _sql(expr) -> str:
+    return str(expr.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+@pytest.mark.unit
+def test_usage_extraction_from_es_queries():
+    usage = set(iter_typed_field_usage({
+        "query": {"bool": {"must": [{"range": {"amount.keyword": {"gt": 5}}}]}},
+        "aggs": {"a": {"stats": {"field": "amount"}}, "b": {"range": {"field": "tax", "ranges": [{"to": 1}]}},
+                 "c": {"date_histogram": {"field": "due_date"}}, "d": {"terms": {"field": "vendor"}}}
+    }))
+    assert usage == {("amount", None), ("amount", "numeric"), ("tax", "numeric"), ("due_date", "date")}
+
+
+@pytest.mark.unit
+def test_recommendations_follow_query_history_and_schema_types(db):
+    service = TypedFieldIndexService(db)
+
+    recommendations = service.recommend(min_score=2)
+    # vendor is used but untyped; tax scores from two questions; amount from 6 cache hits
+    assert [(r["field_name"], r["value_type"], r["score"]) for r in recommendations] == [
+        ("total_amount", "numeric", 7), ("invoice_date", "date", 2), ("tax", "numeric", 2)
+    ]
+    assert not any(r["exists"] for r in recommendations)
+
+    index = service.register_index("total_amount", "numeric", usage_score=7)
+    assert index.status == "pending" and index.index_name == typed_index_name("total_amount", "numeric")
+    assert service.register_index("total_amount", "numeric").id == index.id
+    assert service.recommend(min_score=2)[0]["exists"] is True
+
+    with pytest.raises(ValueError):
+        service.register_index("total_amount", "boolean")
+
+
+@pytest.mark.unit
+def test_index_names_and_ddl():
+    name = typed_index_name("Total Amount (USD) with a very long descriptive field name", "numeric")
+    assert len(name) <= 63 and name.startswith("ix_dsi_num_total_amount_usd")
+    assert typed_index_name("a", "numeric") != typed_index_name("a", "date")
+    assert typed_index_ddl("o'brien", "date", "ix_x") == (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_x "
+        "ON document_search_index (pb_try_timestamp(extracted_fields ->> 'o''brien'))"
+    )
+
+
+@pytest.mark.unit
+def test_query_builders_use_indexed_expressions(registry):
+    service = PostgresService(None)
+    registry.set_fields({("total_amount", "numeric"), ("invoice_date", "date")})
+
+    stmt = service._apply_filters(select(DocumentSearchIndex.id), {"total_amount": {"gte": 1000}, "other": {"lte": 5}})
+    sql = _sql(stmt)
+    assert "pb_try_numeric(document_search_index.extracted_fields ->> 'total_amount') >= 1000" in sql
+    assert "CAST((document_search_index.extracted_fields ->> 'other') AS FLOAT) <= 5" in sql
+
+    stmt, _ = service._translate_es_clause(select(DocumentSearchIndex.id), {
+        "range": {"invoice_date": {"gte": "2024-01-01"}}
+    })
+    assert "pb_try_timestamp(document_search_index.extracted_fields ->> 'invoice_date') >= '2024-01-01'" in _sql(stmt)
+
+    # Dropped from the registry: plain casts again
+    registry.set_fields(set())
+    stmt = service._apply_filters(select(DocumentSearchIndex.id), {"total_amount": {"gte": 1000}})
+    assert "pb_try_numeric" not in _sql(stmt)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_registry_loads_active_indexes_only(db, registry):
+    db.add_all([
+        TypedFieldIndex(field_name="total_amount", value_type="numeric", index_name="ix_a", status="active"),
+        TypedFieldIndex(field_name="tax", value_type="numeric", index_name="ix_b", status="pending"),
+    ])
+    db.commit()
+
+    await registry.refresh_if_stale(db)
+    assert registry.fields == {("total_amount", "numeric")}
+    assert not registry.is_stale()
+
+    registry.invalidate()
+    assert registry.is_stale()
+
+
+@pytest.mark.unit
+def test_typed_functions_guard_casts_without_exception_blocks():
+    # Exception blocks start subtransactions, which parallel workers cannot run
+    assert all("LANGUAGE sql IMMUTABLE PARALLEL SAFE" in sql and "EXCEPTION" not in sql for sql in TYPED_FUNCTIONS_SQL)
+
+    numbers = {"42": True, " -1.5e3 ": True, ".5": True, "1,000": False, "$5": False, "1e400": False, "n/a": False}
+    assert {value: bool(re.match(NUMERIC_TEXT_REGEX, value)) for value in numbers} == numbers
+    dates = {
+        "2024-02-29": True, "2024-02-29T10:15:00Z": True, "2024-01-31 23:59:59.5+02:00": True,
+        "2024-13-01": False, "2024-01-01T24:00": False, "0000-01-01": False, "Jan 5, 2024": False,
+    }
+    assert {value: bool(re.match(TIMESTAMP_TEXT_REGEX, value)) for value in dates} == dates
@@ -210,7 +210,7 @@ def test_document_chunks():
             # Get chunks
             chunks_response = requests.get(
                 f"{BASE_URL}/api/mcp/search/document/{doc_id}/chunks",
-                params={"chunk_size": 1000, "page": 1}
+                params={"page": 1}
             )
             print_result(f"Get Document Chunks (ID: {doc_id})", chunks_response)
             return chunks_response.status_code == 200